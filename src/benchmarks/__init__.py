@@ -0,0 +1 @@
+"""성능 회귀 벤치마크 (run_benchmarks.py에서 실행)"""
@@ -0,0 +1,81 @@
+"""관계 추출 컨텍스트 선택 방식별 프롬프트 토큰 측정
+
+합성 법령의 조항마다 관계 추출 프롬프트를 실제 템플릿으로 구성해 토큰 수(estimate_tokens)를
+세고, 원문이 참조하는 같은 법령 조항 중 컨텍스트에 포함된 비율을 비교합니다.
+    previous:  이전 조항 3개 (기존 방식)
+    reference: 참조·상위 조항, 토큰 예산 이내 (utils.relation_context)
+"""
+import re
+from typing import Any, Dict, List
+
+from benchmarks.synthetic_corpus import SyntheticStatuteGenerator
+from chains.relation_extraction_chain import RelationExtractionChain
+from llm.stub_client import StubLLM
+from models.schemas import LegalEntity
+from utils.metrics import estimate_tokens
+from utils.reference_resolver import article_label, law_identity, parse_references
+from utils.relation_context import format_context, select_relation_contexts
+from utils.text_processor import split_articles
+
+# 기존 방식의 이전 조항 수
+PREVIOUS_CONTEXT_SIZE = 3
+
+
+def _entities(text: str) -> List[LegalEntity]:
+    """스텁 개체 추출과 같은 규칙으로 조항 개체 구성 (LLM 호출 없이)"""
+    entities = []
+    for article in split_articles(text):
+        title = re.search(r'\(([^)]*)\)', article[:80])
+        entities.append(LegalEntity(
+            article_number=article_label(article) or "Unknown",
+            concept=title.group(1) if title else article[:20],
+            full_text=article
+        ))
+    return entities
+
+
+def run_context_report(article_count: int = 2000, seed: int = 0) -> List[Dict[str, Any]]:
+    """컨텍스트 선택 방식별 호출당 평균 토큰과 참조 조항 포함률
+
+    Returns:
+        [{strategy, calls, prompt_tokens, context_tokens, context_articles, reference_coverage}, ...]
+    """
+    document = SyntheticStatuteGenerator(seed=seed).generate_document(article_count)
+    entities = _entities(document.content)
+    identity = law_identity(document.title)
+    labels = [article_label(entity.article_number) for entity in entities]
+    chain = RelationExtractionChain(llm=StubLLM())
+
+    strategies = {
+        "previous": [entities[max(0, i - PREVIOUS_CONTEXT_SIZE):i] for i in range(len(entities))],
+        "reference": select_relation_contexts(entities, document.title),
+    }
+
+    rows = []
+    for name, contexts in strategies.items():
+        prompt_tokens = context_tokens = context_articles = 0
+        referenced = covered = 0
+        for entity, label, context in zip(entities, labels, contexts):
+            messages = chain.prompt.format_messages(**chain.inputs(entity, context))
+            prompt_tokens += sum(estimate_tokens(message.content) for message in messages)
+            context_tokens += estimate_tokens(format_context(context))
+            context_articles += len(context)
+
+            targets = {
+                ref.key[2] for ref in parse_references(entity.text, identity, label)
+                if ref.key[:2] == tuple(identity)
+            }
+            included = {article_label(e.article_number) for e in context}
+            referenced += len(targets)
+            covered += len(targets & included)
+
+        calls = len(entities)
+        rows.append({
+            "strategy": name,
+            "calls": calls,
+            "prompt_tokens": prompt_tokens / calls,
+            "context_tokens": context_tokens / calls,
+            "context_articles": context_articles / calls,
+            "reference_coverage": covered / referenced if referenced else 1.0,
+        })
+    return rows
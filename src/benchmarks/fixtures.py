@@ -0,0 +1,102 @@
+"""벤치마크용 픽스처 (data/ 디렉토리의 Memgraph 내보내기 파일 기반)"""
+import csv
+import os
+import zlib
+from typing import List
+
+from models.compact import CompactEntity, CompactTriplet
+from models.schemas import LegalEntity, GraphTriplet, LegalDocument
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+TRIPLETS_TSV = os.path.join(DATA_DIR, "memgraph-query-results-export-20260221.tsv")
+ARTICLES_CSV = os.path.join(DATA_DIR, "memgraph-test-export.csv")
+
+
+def load_triplets(path: str = TRIPLETS_TSV, compact: bool = False) -> List[GraphTriplet]:
+    """주체/관계유형/대상 TSV를 트리플 리스트로 로드
+
+    내보내기 파일에는 조항 번호와 신뢰도가 없으므로, 중복 제거 시 최대 신뢰도 선택 경로를
+    거치도록 행 번호 기반의 결정적인 값으로 채웁니다. compact=True면 경량 표현으로 로드합니다.
+    """
+    triplet_class = CompactTriplet if compact else GraphTriplet
+    triplets = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f, delimiter="\t")
+        next(reader, None)
+        for i, row in enumerate(reader):
+            if len(row) < 3:
+                continue
+            subject, relation, obj = row[:3]
+            triplets.append(triplet_class(
+                subject=subject,
+                relation=relation,
+                object=obj,
+                article_number=f"제{i % 500 + 1}조",
+                confidence=(zlib.crc32(f"{i}".encode()) % 100) / 100
+            ))
+    return triplets
+
+
+def load_entities(path: str = ARTICLES_CSV, compact: bool = False) -> List[LegalEntity]:
+    """Memgraph Lab 조항 내보내기 CSV를 개체 리스트로 로드 (compact=True면 경량 표현)"""
+    entity_class = CompactEntity if compact else LegalEntity
+    entities = []
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            entities.append(entity_class(
+                article_number=row["a.number"],
+                concept=row["a.concept"],
+                subject=row["a.subject"] or None,
+                action=row["a.action"] or None,
+                object=row["a.object"] or None,
+                full_text=row["a.full_text"]
+            ))
+    return entities
+
+
+def scaled_entities(entities: List[LegalEntity], count: int) -> List[LegalEntity]:
+    """샘플 조항을 반복해 count개의 조항으로 확장 (조항 번호는 새로 부여)"""
+    return [
+        entities[i % len(entities)].model_copy(update={"article_number": f"제{i + 1}조"})
+        for i in range(count)
+    ]
+
+
+def law_text(entities: List[LegalEntity]) -> str:
+    """조항 원문을 PDF 추출 결과처럼 줄바꿈/공백이 섞인 법령 텍스트로 결합"""
+    parts = []
+    for i, entity in enumerate(entities):
+        body = entity.full_text.split(")", 1)[-1].strip()
+        body = body.replace(". ", ".\n").replace(", ", ",\xa0 ")
+        parts.append(f"제{i + 1}조(조항 {i + 1})  {body}")
+    return "\n\n".join(parts)
+
+
+def build_document(entity_count: int, triplets: List[GraphTriplet]) -> LegalDocument:
+    """개체/트리플이 채워진 법률 문서"""
+    entities = scaled_entities(load_entities(), entity_count)
+    return LegalDocument(
+        title="자본시장과 금융투자업에 관한 법률",
+        law_number="법률 제21134호",
+        content=law_text(entities),
+        entities=entities,
+        triplets=triplets
+    )
+
+
+def build_pdf(text: str, path: str, chars_per_page: int = 1800) -> str:
+    """텍스트로 한글 PDF 생성 (extract_text_from_pdf 벤치마크용)"""
+    import fitz  # PyMuPDF
+
+    doc = fitz.open()
+    for start in range(0, len(text), chars_per_page):
+        page = doc.new_page()
+        page.insert_textbox(
+            fitz.Rect(36, 36, page.rect.width - 36, page.rect.height - 36),
+            text[start:start + chars_per_page],
+            fontname="korea",
+            fontsize=9
+        )
+    doc.save(path)
+    doc.close()
+    return path
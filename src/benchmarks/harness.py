@@ -0,0 +1,86 @@
+"""벤치마크 실행 및 기준값(baseline) 비교"""
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+
+class BenchmarkResult(BaseModel):
+    """벤치마크 측정 결과"""
+    name: str = Field(description="벤치마크 이름")
+    rounds: int = Field(description="측정 횟수")
+    min_seconds: float = Field(description="최소 소요 시간")
+    median_seconds: float = Field(description="중앙값 소요 시간")
+    baseline_seconds: Optional[float] = Field(default=None, description="저장된 기준값")
+    ratio: Optional[float] = Field(default=None, description="기준값 대비 배율")
+    passed: bool = Field(default=True, description="임계값 통과 여부")
+
+
+def measure(fn: Callable[[Any], Any], arg: Any, rounds: int = 5, warmup: int = 1) -> List[float]:
+    """fn(arg) 실행 시간을 rounds회 측정 (warmup회는 버림)"""
+    for _ in range(warmup):
+        fn(arg)
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn(arg)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict[str, float]:
+    """저장된 기준값 (벤치마크 이름 -> 중앙값 초)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f).get("benchmarks", {})
+
+
+def save_baselines(results: List[BenchmarkResult], path: str = BASELINES_PATH):
+    """측정 결과를 기준값으로 저장 (기존 항목은 갱신)"""
+    baselines = load_baselines(path)
+    for result in results:
+        baselines[result.name] = round(result.median_seconds, 6)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"benchmarks": dict(sorted(baselines.items()))}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def run_benchmarks(
+    benchmarks: Dict[str, tuple],
+    threshold: float = 1.5,
+    rounds: int = 5,
+    selected: Optional[List[str]] = None
+) -> List[BenchmarkResult]:
+    """벤치마크 실행 후 기준값과 비교
+
+    Args:
+        benchmarks: 이름 -> (setup 함수, 측정 함수) 딕셔너리. setup 결과가 측정 함수 인자로 전달됩니다.
+        threshold: 중앙값이 기준값의 이 배율을 넘으면 실패
+        rounds: 측정 횟수
+        selected: 실행할 벤치마크 이름 (None이면 전체)
+    """
+    baselines = load_baselines()
+    results = []
+    for name, (setup, fn) in benchmarks.items():
+        if selected and name not in selected:
+            continue
+        timings = measure(fn, setup(), rounds=rounds)
+        median = statistics.median(timings)
+        baseline = baselines.get(name)
+        ratio = median / baseline if baseline else None
+        results.append(BenchmarkResult(
+            name=name,
+            rounds=rounds,
+            min_seconds=min(timings),
+            median_seconds=median,
+            baseline_seconds=baseline,
+            ratio=ratio,
+            passed=ratio is None or ratio <= threshold
+        ))
+    return results
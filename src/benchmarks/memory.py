@@ -0,0 +1,61 @@
+"""샘플 내보내기 파일 기반 메모리 벤치마크
+
+data/의 트리플(TSV)과 조항(CSV) 내보내기를 표현 방식별로 메모리에 올려
+tracemalloc으로 유지 메모리(파일 읽기 중 생성된 문자열 포함)와 로드 시간을 측정합니다.
+"""
+import gc
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from benchmarks.fixtures import load_entities, load_triplets
+from models.triplet_table import TripletTable
+
+# 트리플 수를 늘려 측정할 배수 (샘플 39k -> 약 390k)
+TRIPLET_REPEAT = 10
+
+
+def _measure(name: str, load: Callable[[], Any], count: Callable[[Any], int]) -> Dict[str, Any]:
+    """load() 결과가 유지하는 메모리와 소요 시간"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    items = count(result)
+    del result
+    return {
+        "name": name,
+        "items": items,
+        "retained_mb": round(retained / 1e6, 2),
+        "peak_mb": round(peak / 1e6, 2),
+        "bytes_per_item": round(retained / items) if items else 0,
+        "seconds": round(elapsed, 3),
+    }
+
+
+def _repeat(loader: Callable[..., List[Any]], **kwargs) -> Callable[[], List[Any]]:
+    """분석용 대형 그래프를 흉내 내도록 파일을 여러 번 읽어 이어 붙임"""
+    return lambda: [item for _ in range(TRIPLET_REPEAT) for item in loader(**kwargs)]
+
+
+def run_memory() -> List[Dict[str, Any]]:
+    """표현 방식별 메모리 측정
+
+    Returns:
+        [{name, items, retained_mb, peak_mb, bytes_per_item, seconds}, ...]
+    """
+    return [
+        _measure("triplets: pydantic", _repeat(load_triplets), len),
+        _measure("triplets: compact", _repeat(load_triplets, compact=True), len),
+        _measure(
+            "triplets: columnar",
+            lambda: TripletTable.from_triplets(_repeat(load_triplets, compact=True)()),
+            len
+        ),
+        _measure("entities: pydantic", _repeat(load_entities), len),
+        _measure("entities: compact", _repeat(load_entities, compact=True), len),
+    ]
@@ -0,0 +1,157 @@
+"""텍스트 처리, 그래프 검증, Memgraph 파라미터 구성 마이크로 벤치마크"""
+import os
+import tempfile
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+
+from benchmarks.fixtures import (
+    load_entities, load_triplets, scaled_entities, law_text, build_document, build_pdf
+)
+from database.entity_name_index import EntityNameIndex
+from database.fulltext_index import FullTextIndex
+from database.memgraph_client import build_save_parameters
+from graphs.legal_graph import LegalKnowledgeGraphWorkflow
+from models.schemas import GraphTriplet
+from models.triplet_table import TripletTable
+from utils.pdf_processor import extract_text_from_pdf
+from utils.text_processor import clean_text, split_articles
+
+# 대형 법령(자본시장법) 규모에 맞춘 조항 수
+ARTICLE_COUNT = 2000
+PDF_ARTICLE_COUNT = 300
+TABLE_TRIPLET_COUNT = 1_000_000
+FULLTEXT_DOCUMENT_COUNT = 5
+ENTITY_NAME_COUNT = 100_000
+ENTITY_NAME_QUERIES = ("금융투자업자", "금융투자엽자", "금융 투자업", "금융투자", "집합투자기구", "금융위원휘")
+# 질의 묶음 반복 횟수 (1회는 1ms 미만이라 타이머·스케줄링 잡음이 결과를 좌우함)
+ENTITY_NAME_ROUNDS = 20
+FULLTEXT_QUERIES = ("금융투자업자의 인가", "투자자 보호", "집합투자기구", "과징금 부과", "증권신고서 제출")
+
+
+@lru_cache(maxsize=None)
+def _raw_law_text(count: int = ARTICLE_COUNT) -> str:
+    return law_text(scaled_entities(load_entities(), count))
+
+
+@lru_cache(maxsize=None)
+def _triplets():
+    return load_triplets()
+
+
+@lru_cache(maxsize=None)
+def _pdf_path() -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="kg-bench-"), "law.pdf")
+    return build_pdf(_raw_law_text(PDF_ARTICLE_COUNT), path)
+
+
+@lru_cache(maxsize=None)
+def _triplet_table(count: int = TABLE_TRIPLET_COUNT) -> TripletTable:
+    """샘플 트리플을 count개로 반복하고 신뢰도를 무작위로 바꾼 열 지향 테이블"""
+    base = TripletTable.from_triplets(_triplets())
+    reps = -(-count // len(base))
+    return TripletTable(
+        base.strings,
+        *(np.tile(column, reps)[:count] for column in (base.subject, base.relation, base.object, base.article)),
+        np.random.default_rng(0).random(count, dtype=np.float32)
+    )
+
+
+@lru_cache(maxsize=None)
+def _fulltext_index() -> FullTextIndex:
+    """대형 법령 FULLTEXT_DOCUMENT_COUNT개(세그먼트별 하나)를 색인한 임시 전문 검색 색인"""
+    index = FullTextIndex(tempfile.mkdtemp(prefix="kg-bench-fts-"))
+    document = build_document(ARTICLE_COUNT, [])
+    for i in range(FULLTEXT_DOCUMENT_COUNT):
+        index.add_document(document.model_copy(update={"title": f"{document.title} {i}"}))
+    return index
+
+
+def _fulltext_search(index: FullTextIndex):
+    for query in FULLTEXT_QUERIES:
+        index.search(query, limit=10)
+
+
+@lru_cache(maxsize=None)
+def _entity_name_index() -> EntityNameIndex:
+    """샘플 개체 이름에 같은 음절로 만든 무작위 이름을 더해 ENTITY_NAME_COUNT개를 색인"""
+    names = {name for triplet in _triplets() for name in (triplet.subject, triplet.object)}
+    syllables = sorted({c for name in names for c in name if "가" <= c <= "힣"})
+    rng = np.random.default_rng(0)
+    while len(names) < ENTITY_NAME_COUNT:
+        names.add("".join(rng.choice(syllables, rng.integers(3, 10))))
+
+    index = EntityNameIndex(path="")
+    document = build_document(0, [])
+    anchor = next(iter(names))
+    index.add_document(document.model_copy(update={"triplets": [
+        GraphTriplet(subject=name, relation="정의함", object=anchor, article_number="제1조")
+        for name in sorted(names)
+    ]}))
+    return index
+
+
+def _entity_name_lookup(index: EntityNameIndex):
+    for _ in range(ENTITY_NAME_ROUNDS):
+        for query in ENTITY_NAME_QUERIES:
+            index.lookup(query, limit=10)
+
+
+def _table_validate(table: TripletTable):
+    table.dedup().filter_confidence(0.5).group_by_article()
+
+
+def _validate(args):
+    document, triplets = args
+    LegalKnowledgeGraphWorkflow._validate_graph({
+        "document": document,
+        "articles": [],
+        "article_refs": [],
+        "entities": [],
+        "entity_positions": [],
+        "triplets": triplets,
+        "current_index": 0,
+        "errors": [],
+        "canonicalization": {},
+        "duplicates": None,
+        "reuse": {},
+        "deadline": None,
+        "retry": []
+    })
+
+
+BENCHMARKS: Dict[str, tuple] = {
+    "clean_text": (
+        _raw_law_text,
+        clean_text
+    ),
+    "split_articles": (
+        lambda: clean_text(_raw_law_text()),
+        split_articles
+    ),
+    "extract_text_from_pdf": (
+        _pdf_path,
+        extract_text_from_pdf
+    ),
+    "validate_graph_dedup": (
+        lambda: (build_document(0, []), _triplets()),
+        _validate
+    ),
+    "triplet_table_validate_1m": (
+        _triplet_table,
+        _table_validate
+    ),
+    "fulltext_search": (
+        _fulltext_index,
+        _fulltext_search
+    ),
+    "entity_name_lookup": (
+        _entity_name_index,
+        _entity_name_lookup
+    ),
+    "save_document_parameters": (
+        lambda: build_document(ARTICLE_COUNT, _triplets()),
+        build_save_parameters
+    ),
+}
@@ -0,0 +1,102 @@
+"""합성 코퍼스 기반 엔드투엔드 스케일링 벤치마크
+
+조항 수를 두 배씩 늘려가며 스텁 LLM으로 전체 워크플로우를 실행하고,
+처리량, 메모리 증가량, (선택적으로) Memgraph 적재 시간을 측정합니다.
+"""
+import gc
+import os
+import resource
+import time
+from typing import Any, Dict, List
+
+from benchmarks.synthetic_corpus import SyntheticStatuteGenerator
+from chains.entity_extraction_chain import EntityExtractionChain
+from chains.relation_extraction_chain import RelationExtractionChain
+from graphs.legal_graph import LegalKnowledgeGraphWorkflow
+from llm.stub_client import StubLLM
+from utils.near_duplicate import NearDuplicateIndex
+
+
+def _rss_mb() -> float:
+    """현재 프로세스 RSS (MB)"""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        # /proc이 없는 환경에서는 최대 RSS로 대체
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def _ingest_seconds(document) -> float:
+    """Memgraph 적재 시간 (초)"""
+    from database.memgraph_client import MemgraphClient
+
+    client = MemgraphClient()
+    try:
+        client.create_indexes()
+        started = time.perf_counter()
+        client.save_document(document)
+        return time.perf_counter() - started
+    finally:
+        client.close()
+
+
+def run_scaling(
+    start_articles: int = 1000,
+    max_articles: int = 16000,
+    stub_latency: float = 0.0,
+    ingest: bool = False,
+    seed: int = 0
+) -> List[Dict[str, Any]]:
+    """조항 수를 두 배씩 늘리며 워크플로우 실행
+
+    Args:
+        start_articles: 첫 단계 조항 수
+        max_articles: 마지막 단계 최대 조항 수
+        stub_latency: 스텁 LLM 호출당 모의 지연 (초)
+        ingest: True면 결과를 Memgraph에 적재하고 시간 측정 (합성 문서 제목으로 저장됨)
+        seed: 코퍼스 생성 시드
+
+    Returns:
+        단계별 측정 결과 리스트
+    """
+    generator = SyntheticStatuteGenerator(seed=seed)
+    llm = StubLLM(latency=stub_latency)
+    workflow = LegalKnowledgeGraphWorkflow(
+        entity_chain=EntityExtractionChain(llm=llm),
+        relation_chain=RelationExtractionChain(llm=llm),
+        duplicate_index=NearDuplicateIndex(path="")
+    )
+
+    rows = []
+    baseline_rss = _rss_mb()
+    size = start_articles
+    while size <= max_articles:
+        document = generator.generate_document(size)
+        # 단계마다 빈 메모리 색인 (이전 단계 결과 재사용 방지, 스텁 결과를 색인 파일에 남기지 않음)
+        workflow.duplicate_index = NearDuplicateIndex(path="")
+        gc.collect()
+        rss_before = _rss_mb()
+
+        started = time.perf_counter()
+        result = workflow.process(document)
+        elapsed = time.perf_counter() - started
+        rss_after = _rss_mb()
+
+        rows.append({
+            "articles": size,
+            "split_articles": len(result.entities),
+            "triplets": len(result.triplets),
+            "seconds": round(elapsed, 3),
+            "articles_per_second": round(len(result.entities) / elapsed, 1) if elapsed else 0.0,
+            "rss_mb": round(rss_after, 1),
+            "rss_growth_mb": round(rss_after - rss_before, 1),
+            "rss_total_growth_mb": round(rss_after - baseline_rss, 1),
+            "ingest_seconds": round(_ingest_seconds(result), 3) if ingest else None,
+        })
+
+        del document, result
+        size *= 2
+
+    return rows
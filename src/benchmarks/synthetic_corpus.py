@@ -0,0 +1,135 @@
+"""합성 법령 코퍼스 생성기 (대규모 스케일링 테스트용)
+
+편/장/절/조/항/호 구조, 조항 간 참조("제N조에 따라"), 하위 법령 위임("대통령령으로 정한다"),
+삭제 조항("삭제 <2020. 1. 1.>")을 포함한 한국어 법령 텍스트를 결정적으로 생성합니다.
+"""
+import random
+from typing import List
+
+from models.schemas import LegalDocument
+
+CIRCLED_NUMBERS = "①②③④⑤⑥⑦⑧⑨⑩"
+
+SUBJECTS = [
+    "금융위원회", "금융투자업자", "투자매매업자", "집합투자업자", "신탁업자", "거래소",
+    "예탁결제원", "증권금융회사", "발행인", "투자자", "금융감독원장", "한국금융투자협회",
+]
+OBJECTS = [
+    "금융투자상품", "투자설명서", "증권신고서", "집합투자기구", "신탁재산", "파생상품",
+    "투자자예탁금", "영업보고서", "내부통제기준", "전문투자자", "의결권", "공시서류",
+]
+TOPICS = [
+    "목적", "정의", "적용범위", "인가", "등록", "신고", "보고", "공시", "검사", "감독",
+    "업무의 위탁", "손해배상책임", "과징금", "과태료", "벌칙", "준용", "적용의 특례",
+]
+OBLIGATIONS = [
+    "{subject_topic} {object}에 관한 사항을 {authority}에 보고하여야 한다.",
+    "{subject_topic} {object_target} 작성하여 공시하여야 한다.",
+    "{subject_topic} {object_target} 부당하게 이용하여서는 아니 된다.",
+    "{subject_topic} {object}의 보호를 위하여 필요한 조치를 할 수 있다.",
+    "{authority_topic} {subject}에 대하여 {object}의 제출을 요구할 수 있다.",
+]
+
+
+def _josa(word: str, with_final: str, without_final: str) -> str:
+    """받침 유무에 따라 조사 선택 (은/는, 을/를)"""
+    code = ord(word[-1]) - ord("가")
+    has_final = 0 <= code <= 11171 and code % 28 != 0
+    return word + (with_final if has_final else without_final)
+
+
+class SyntheticStatuteGenerator:
+    """결정적 합성 법령 생성기
+
+    Args:
+        seed: 난수 시드 (같은 시드와 조항 수면 같은 텍스트)
+        deleted_ratio: 삭제 조항 비율
+        reference_ratio: 다른 조항을 참조하는 항 비율
+        delegation_ratio: 대통령령 위임 문구를 포함하는 항 비율
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        deleted_ratio: float = 0.03,
+        reference_ratio: float = 0.3,
+        delegation_ratio: float = 0.25
+    ):
+        self.seed = seed
+        self.deleted_ratio = deleted_ratio
+        self.reference_ratio = reference_ratio
+        self.delegation_ratio = delegation_ratio
+
+    def generate_text(self, article_count: int) -> str:
+        """article_count개 조항으로 구성된 법령 텍스트"""
+        rng = random.Random(self.seed)
+        lines: List[str] = []
+        part = chapter = section = 0
+
+        for number in range(1, article_count + 1):
+            # 편(2000조마다) / 장(200조마다) / 절(40조마다) 구분
+            if (number - 1) % 2000 == 0:
+                part += 1
+                chapter = 0
+                lines.append(f"제{part}편 {rng.choice(SUBJECTS)}")
+            if (number - 1) % 200 == 0:
+                chapter += 1
+                section = 0
+                lines.append(f"제{chapter}장 {rng.choice(TOPICS)}")
+            if (number - 1) % 40 == 0:
+                section += 1
+                lines.append(f"제{section}절 {rng.choice(OBJECTS)}")
+
+            lines.append(self._article(rng, number, article_count))
+
+            # 가지 조항 (제N조의2)
+            if rng.random() < 0.05:
+                lines.append(self._article(rng, number, article_count, branch=2))
+
+        return "\n".join(lines)
+
+    def generate_document(self, article_count: int, title: str = None) -> LegalDocument:
+        """합성 법령 문서"""
+        return LegalDocument(
+            title=title or f"합성 금융투자법 ({article_count}조)",
+            law_number=f"법률 제{90000 + article_count}호",
+            content=self.generate_text(article_count)
+        )
+
+    def _article(self, rng: random.Random, number: int, article_count: int, branch: int = 0) -> str:
+        label = f"제{number}조의{branch}" if branch else f"제{number}조"
+        if rng.random() < self.deleted_ratio:
+            year = rng.randint(2009, 2025)
+            return f"{label} 삭제 <{year}. {rng.randint(1, 12)}. {rng.randint(1, 28)}.>"
+
+        paragraphs = []
+        for i in range(rng.choices([1, 2, 3, 4, 5], weights=[4, 3, 2, 1, 1])[0]):
+            subject = rng.choice(SUBJECTS)
+            obj = rng.choice(OBJECTS)
+            authority = rng.choice(SUBJECTS[:2] + SUBJECTS[-2:])
+            sentence = rng.choice(OBLIGATIONS).format(
+                subject=subject,
+                subject_topic=_josa(subject, "은", "는"),
+                object=obj,
+                object_target=_josa(obj, "을", "를"),
+                authority=authority,
+                authority_topic=_josa(authority, "은", "는")
+            )
+            if rng.random() < self.reference_ratio and article_count > 1:
+                target = rng.randint(1, article_count - 1)
+                target += target >= number
+                sentence = f"제{target}조에 따라 " + sentence
+            if rng.random() < self.delegation_ratio:
+                sentence += " 이 경우 그 절차 및 방법 등에 관하여 필요한 사항은 대통령령으로 정한다."
+
+            items = ""
+            if rng.random() < 0.3:
+                items = " " + " ".join(
+                    f"{j}. {rng.choice(OBJECTS)}에 관한 사항" for j in range(1, rng.randint(2, 6))
+                )
+            marker = f"{CIRCLED_NUMBERS[i]} " if i < len(CIRCLED_NUMBERS) else ""
+            paragraphs.append(f"{marker}{sentence}{items}")
+
+        if len(paragraphs) == 1:
+            paragraphs[0] = paragraphs[0].lstrip(CIRCLED_NUMBERS + " ")
+        return f"{label}({rng.choice(TOPICS)}) " + " ".join(paragraphs)
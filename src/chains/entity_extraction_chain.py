@@ -1,21 +1,104 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-# from langchain_core.exceptions import OutputParserException
-from typing import List
-from models.schemas import LegalEntity
+from typing import Any, Dict, List, Optional, Tuple
+from models.schemas import ErrorCode, ExtractionError, LegalEntity
 from llm.gemini_client import get_llm as gemini_llm
-# import json
+from llm.router import ModelRouter
+from utils.deadline import CallTimeout, DeadlineExceeded, bounded_call, client_timeout, in_context
+from utils.json_repair import TolerantJsonOutputParser, json_objects
+from utils.metrics import estimate_tokens, metrics, LLMMetricsCallback
+from utils.reference_resolver import article_label
 # from llm.llama_client import get_llm as opensource_llm
 
+# 누락되거나 잘못된 필드를 조항당 다시 물어볼 최대 횟수
+ENTITY_REASK_ATTEMPTS = int(os.getenv("ENTITY_REASK_ATTEMPTS", "2"))
+# 재질문 전 대기 시간 (초, 실패할 때마다 두 배)
+ENTITY_REASK_BACKOFF = float(os.getenv("ENTITY_REASK_BACKOFF", "0.5"))
+# 문서(batch_extract_all 호출) 하나에서 쓸 수 있는 재질문 수
+ENTITY_REASK_BUDGET = int(os.getenv("ENTITY_REASK_BUDGET", "50"))
+# 재질문 프롬프트에 넣을 원문 최대 글자 수
+ENTITY_REASK_TEXT_CHARS = int(os.getenv("ENTITY_REASK_TEXT_CHARS", "600"))
+
+ENTITY_FIELDS = ("article_number", "concept", "subject", "action", "object")
+REQUIRED_FIELDS = ("article_number", "concept")
+# 값이 없다는 뜻으로 쓰인 문자열 (비교는 소문자)
+PLACEHOLDERS = {"", "unknown", "none", "null", "n/a", "없음", "미상"}
+# 조항 제목: 제N조(제목)
+ARTICLE_HEADING = re.compile(r'^\s*(제\s*\d+\s*조(?:\s*의\s*\d+)?)\s*(?:\(([^()\n]{1,40})\))?')
+
+
+def known_fields(text: str) -> Dict[str, str]:
+    """LLM 없이 원문 제목에서 알 수 있는 필드 (조항 번호, 제목이 있으면 핵심 개념)"""
+    match = ARTICLE_HEADING.match(text)
+    if match is None:
+        return {}
+    known = {"article_number": article_label(match.group(1))}
+    if match.group(2) and match.group(2).strip() != "삭제":
+        known["concept"] = match.group(2).strip()
+    return known
+
+
+def _is_missing(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and value.strip().lower() in PLACEHOLDERS)
+
+
+def field_problems(item: Dict[str, Any], fields=ENTITY_FIELDS, optional: bool = False) -> Dict[str, ErrorCode]:
+    """필드별 문제 (누락/형식 오류)
+
+    Args:
+        optional: 선택 필드(subject/action/object)가 비어 있는 것도 누락으로 볼지 여부
+    """
+    problems: Dict[str, ErrorCode] = {}
+    for field in fields:
+        value = item.get(field)
+        if _is_missing(value):
+            if field in REQUIRED_FIELDS or optional:
+                problems[field] = ErrorCode.ENTITY_FIELD_MISSING
+        elif not isinstance(value, str) or (field == "article_number" and article_label(value) is None):
+            problems[field] = ErrorCode.ENTITY_FIELD_INVALID
+    return problems
+
+
+class ReaskBudget:
+    """문서 하나의 재질문 예산 (조각을 동시에 추출하는 스레드가 공유)"""
+
+    def __init__(self, total: int = None):
+        self.remaining = ENTITY_REASK_BUDGET if total is None else total
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
 class EntityExtractionChain:  
-    """법률 개체 추출 체인"""
+    """법률 개체 추출 체인
+    
+    router를 지정하면 조항마다 라우터가 고른 모델 단계로 추출하고, 응답이 검증(필수 필드)을
+    통과하지 못하면 다음 단계로 올립니다 (llm은 무시).
+    """
     
-    def __init__(self, temperature: float = 0.0):
-        self.llm = gemini_llm()
+    def __init__(self, temperature: float = 0.0, llm=None, router: Optional[ModelRouter] = None):
+        self.router = router
+        self.llm = None if router is not None else llm or gemini_llm()
         # self.llm = opensource_llm() # 추후에 변경해서도 테스트 가능
         # Gemini는 temperature를 생성 시 지정
         self.temperature = temperature
-        self.parser = PydanticOutputParser(pydantic_object=LegalEntity)
+        # 형식 안내는 스키마에서 한 번만 만들고, 응답은 결함을 고쳐 읽는 파서로 파싱
+        self.format_instructions = PydanticOutputParser(pydantic_object=LegalEntity).get_format_instructions()
+        self.parser = TolerantJsonOutputParser(chain="entity")
+        self.reask_attempts = ENTITY_REASK_ATTEMPTS
+        self.reask_backoff = ENTITY_REASK_BACKOFF
+        self.reask_budget = ENTITY_REASK_BUDGET
         
         # Chat 형식 프롬프트
         self.prompt = ChatPromptTemplate.from_messages([
@@ -30,63 +113,249 @@ class EntityExtractionChain:
 5. 대상 (무엇에 대해)
 
 ⚠️ 중요: 
-- 하나의 조항에 여러 항이 있더라도, 전체를 통합하여 **단일 JSON 객체**만 반환하세요.
-- 배열이나 리스트를 반환하지 마세요.
-- article_number는 전체 조항을 대표하는 하나의 번호만 사용하세요.
+- 기본적으로 조항 전체를 통합한 **단일 JSON 객체**를 반환하세요.
+- 항마다 의무 주체나 행위가 뚜렷이 다르면 항별 객체의 JSON 배열로 반환할 수 있습니다.
+  이때 article_number는 "제3조제1항"처럼 항까지 적으세요.
 
 출력은 반드시 다음 JSON 형식으로 작성하세요:
 {format_instructions}"""),
             ("user", "다음 법령 조항을 분석하세요:\n\n{text}")
         ])
         
-        self.chain = self.prompt | self.llm | self.parser
+        # 필드 재질문: 스키마 안내 없이 부분 결과와 빠진 필드만 보내는 작은 프롬프트
+        self.reask_prompt = ChatPromptTemplate.from_messages([
+            ("system", "법령 조항 분석 결과의 빠진 필드를 채웁니다. 요청한 필드만 담은 JSON 객체 하나로 답하세요."),
+            ("user", "조항:\n{text}\n\n현재 결과: {partial}\n\n채울 필드:\n{fields}")
+        ])
+        
+        self._pipelines: Dict[Optional[str], Tuple[Any, Any]] = {}
+        if self.llm is not None:
+            self.chain = self.prompt | self.llm | self.parser
+            self.reask_chain = self.reask_prompt | self.llm | self.parser
+            self._pipelines[None] = (self.chain, self.reask_chain)
+        self.callbacks = [LLMMetricsCallback("entity")]
+        self.reask_callbacks = [LLMMetricsCallback("entity_reask")]
+    
+    def _llm(self, tier: Optional[str]):
+        """모델 단계의 LLM (단계가 None이면 기본 LLM)"""
+        return self.llm if tier is None else self.router.llm(tier)
+    
+    def _pipeline(self, tier: Optional[str]) -> Tuple[Any, Any]:
+        """모델 단계의 (추출, 재질문) 체인 (단계가 None이면 기본 LLM)"""
+        if tier not in self._pipelines:
+            llm = self._llm(tier)
+            self._pipelines[tier] = (self.prompt | llm | self.parser, self.reask_prompt | llm | self.parser)
+        return self._pipelines[tier]
+    
+    def _callbacks(self, callbacks: List, tier: Optional[str]) -> List:
+        return callbacks + self.router.callbacks(tier) if tier is not None else callbacks
     
-    def extract(self, text: str) -> LegalEntity:
-        """개체 추출 실행"""
+    @staticmethod
+    def _latency_key(chain: str, tier: Optional[str]) -> str:
+        return f"{chain}/{tier}" if tier is not None else chain
+    
+    def _call(self, text: str, tier: Optional[str]) -> List[Dict[str, Any]]:
+        """추출 프롬프트 호출 (응답의 JSON 객체 목록, 관측 지연 기반 제한 시간과 문서 마감 적용)
+        
+        제한 시간 상한은 그 단계 LLM 클라이언트의 timeout (로컬 llama.cpp는 기본 600초)
+        """
+        return bounded_call(self._latency_key("entity", tier), lambda: json_objects(self._pipeline(tier)[0].invoke({
+            "text": text,
+            "format_instructions": self.format_instructions
+        }, config={"callbacks": self._callbacks(self.callbacks, tier)})), estimate_tokens(text),
+            max_timeout=client_timeout(self._llm(tier)))
+    
+    @staticmethod
+    def _acceptable(objects: List[Dict[str, Any]], known: Dict[str, str]) -> bool:
+        """원문 제목으로 채운 뒤에도 필수 필드 누락·형식 오류가 없는지 (라우팅 올림 기준)"""
+        return bool(objects) and not any(
+            field_problems({**item, **{field: value for field, value in known.items() if _is_missing(item.get(field))}})
+            for item in objects
+        )
+    
+    def extract_all(
+        self,
+        text: str,
+        errors: Optional[List[ExtractionError]] = None,
+        budget: Optional[ReaskBudget] = None
+    ) -> List[LegalEntity]:
+        """개체 추출 실행 (응답의 객체를 모두 반환, 항별 배열 지원)
+        
+        누락되거나 잘못된 필드는 그 필드만 다시 묻고, 필수 필드를 끝내 채우지 못한 개체는
+        버립니다 (조항 번호가 "Unknown"인 개체를 만들지 않음).
+        
+        Args:
+            text: 조항 원문
+            errors: 해결하지 못한 문제를 기록할 목록 (GraphState["errors"])
+            budget: 재질문 예산 (기본: 이 호출만의 ENTITY_REASK_BUDGET)
+        
+        호출이 제한 시간을 넘기거나 문서 마감이 지나면 재질문 없이 그때까지 만든 개체만 반환하고
+        llm_call_timeout/deadline_exceeded로 기록합니다 (조항 재처리 대상).
+        """
+        budget = budget or ReaskBudget(self.reask_budget)
+        errors = errors if errors is not None else []
+        known = known_fields(text)
+        failures = 0
+        tier = None
         try:
-            result = self.chain.invoke({
-                "text": text,
-                "format_instructions": self.parser.get_format_instructions()
-            })
-            return result
+            if self.router is None:
+                objects = self._call(text, None)
+            else:
+                # 작은 모델부터 묻고 필수 필드를 채우지 못하면 다음 단계로 (재질문은 마지막 응답 단계에서)
+                objects, tier = self.router.invoke(
+                    "entity", text, lambda t: self._call(text, t), lambda found: self._acceptable(found, known)
+                )
+        except (CallTimeout, DeadlineExceeded) as e:
+            errors.append(self._timed_out(e, known))
+            return []
         except Exception as e:
-            error_msg = str(e)
+            metrics.inc("kg_parse_failures_total", chain="entity")
             print(f"⚠️ 개체 추출 중 오류: {e}")
-            
-            # LLM이 리스트를 반환한 경우 처리
-            if "Input should be a valid dictionary" in error_msg and "input_type=list" in error_msg:
-                try:
-                    # 에러 메시지에서 JSON 추출 시도
-                    import json
-                    import re
-                    
-                    # completion 부분에서 JSON 추출
-                    match = re.search(r'completion \[(.*?)\]\.', error_msg, re.DOTALL)
-                    if match:
-                        json_str = '[' + match.group(1) + ']'
-                        entities_list = json.loads(json_str)
-                        
-                        if entities_list and len(entities_list) > 0:
-                            # 첫 번째 항목 사용
-                            first_entity = entities_list[0]
-                            print(f"   ℹ️ 리스트에서 첫 번째 항목 사용: {first_entity.get('article_number', 'Unknown')}")
-                            return LegalEntity(**first_entity)
-                except Exception as parse_error:
-                    print(f"   ⚠️ 리스트 파싱 실패: {parse_error}")
-            
-            # 기본값 반환
-            return LegalEntity(
-                article_number="Unknown",
-                concept="Unknown",
-                subject=None,
-                action=None,
-                object=None,
-                full_text=text
-            )
+            errors.append(ExtractionError(
+                code=ErrorCode.ENTITY_CALL_FAILED, article_number=known.get("article_number"),
+                message=str(e).splitlines()[0] if str(e) else type(e).__name__
+            ))
+            objects, failures = [], 1
+            tier = self.router.last_tier if self.router is not None else None
+        
+        # 응답이 없으면 빈 결과에서 모든 필드를 필드 단위로 채움
+        entities = []
+        try:
+            for item in objects or [{}]:
+                entity = self._complete(item, text, known, errors, budget, optional=not objects, failures=failures, tier=tier)
+                if entity is not None:
+                    entities.append(entity)
+        except (CallTimeout, DeadlineExceeded) as e:
+            errors.append(self._timed_out(e, known))
+        return entities
+    
+    @staticmethod
+    def _timed_out(error: TimeoutError, known: Dict[str, str]) -> ExtractionError:
+        print(f"⏰ 개체 추출 시간 초과: {error}")
+        return ExtractionError(
+            code=ErrorCode.DEADLINE_EXCEEDED if isinstance(error, DeadlineExceeded) else ErrorCode.LLM_CALL_TIMEOUT,
+            article_number=known.get("article_number"), message=str(error)
+        )
     
-    def batch_extract(self, texts: List[str]) -> List[LegalEntity]:
-        """여러 조항 일괄 추출"""
-        results = []
-        for text in texts:
-            results.append(self.extract(text))
-        return results
+    def _complete(
+        self,
+        item: Dict[str, Any],
+        text: str,
+        known: Dict[str, str],
+        errors: List[ExtractionError],
+        budget: ReaskBudget,
+        optional: bool,
+        failures: int,
+        tier: Optional[str] = None
+    ) -> Optional[LegalEntity]:
+        """원문에서 아는 필드를 채우고 남은 문제 필드만 재질문해 개체 생성"""
+        item = {field: item.get(field) for field in ENTITY_FIELDS}
+        for field, value in known.items():
+            current = item[field]
+            # 조항 번호는 원문이 기준 (항 단위 번호 "제3조제1항"은 같은 조이므로 유지)
+            wrong = field == "article_number" and not _is_missing(current) and article_label(str(current)) != value
+            if field in field_problems(item, (field,)) or wrong:
+                item[field] = value
+                metrics.inc("kg_entity_fields_filled_total", field=field, source="text")
+        
+        problems = field_problems(item, optional=optional)
+        attempts = 0
+        while problems and attempts < self.reask_attempts:
+            if not budget.take():
+                errors.append(ExtractionError(
+                    code=ErrorCode.ENTITY_REASK_BUDGET, article_number=item["article_number"] or known.get("article_number"),
+                    message=f"재질문 예산 소진 ({', '.join(problems)})"
+                ))
+                break
+            if failures:
+                time.sleep(self.reask_backoff * 2 ** (failures - 1))
+            attempts += 1
+            answer = self._reask(text, item, problems, tier)
+            for field in problems:
+                if field in answer:
+                    item[field] = answer[field]
+            remaining = field_problems(item, tuple(problems), optional=optional)
+            for field in problems:
+                if field not in remaining:
+                    metrics.inc("kg_entity_fields_filled_total", field=field, source="reask")
+            failures = failures + 1 if remaining else failures
+            problems = remaining
+        
+        article_number = item["article_number"] if "article_number" not in problems else known.get("article_number")
+        for field, code in problems.items():
+            errors.append(ExtractionError(
+                code=code, article_number=article_number, field=field,
+                message=f"재질문 {attempts}회 후에도 해결되지 않음: {item[field]!r}"
+            ))
+            # 선택 필드는 비워 두고 개체는 유지
+            item[field] = None
+        if any(field in problems for field in REQUIRED_FIELDS):
+            errors.append(ExtractionError(
+                code=ErrorCode.ENTITY_DROPPED, article_number=article_number,
+                message="필수 필드를 채우지 못해 개체를 만들지 않음"
+            ))
+            return None
+        return LegalEntity(**item, full_text=text)
+    
+    def _reask(
+        self,
+        text: str,
+        item: Dict[str, Any],
+        problems: Dict[str, ErrorCode],
+        tier: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """문제 필드만 다시 질문 (실패하면 빈 결과)"""
+        metrics.inc("kg_entity_reasks_total")
+        metrics.inc("kg_retries_total", stage="entity_reask")
+        partial = {field: value for field, value in item.items() if field not in problems and value is not None}
+        fields = "\n".join(
+            f"- {field}: {LegalEntity.model_fields[field].description}"
+            f" ({'비어 있음' if code == ErrorCode.ENTITY_FIELD_MISSING else '형식 오류'})"
+            for field, code in problems.items()
+        )
+        excerpt = text[:ENTITY_REASK_TEXT_CHARS]
+        try:
+            result = bounded_call(self._latency_key("entity_reask", tier), lambda: self._pipeline(tier)[1].invoke({
+                "text": excerpt,
+                "partial": json.dumps(partial, ensure_ascii=False),
+                "fields": fields
+            }, config={"callbacks": self._callbacks(self.reask_callbacks, tier)}), estimate_tokens(excerpt),
+                max_timeout=client_timeout(self._llm(tier)))
+        except (CallTimeout, DeadlineExceeded):
+            raise
+        except Exception as e:
+            print(f"  ⚠️ 필드 재질문 실패 ({', '.join(problems)}): {e}")
+            return {}
+        objects = json_objects(result)
+        return objects[0] if objects else {}
+    
+    def extract(self, text: str, errors: Optional[List[ExtractionError]] = None) -> LegalEntity:
+        """개체 추출 실행 (첫 번째 개체)"""
+        entities = self.extract_all(text, errors)
+        if not entities:
+            raise ValueError("개체를 추출하지 못했습니다")
+        return entities[0]
+    
+    def batch_extract(self, texts: List[str], errors: Optional[List[ExtractionError]] = None) -> List[Optional[LegalEntity]]:
+        """여러 조항 일괄 추출 (조항당 첫 번째 개체, 추출하지 못한 조항은 None)"""
+        return [entities[0] if entities else None for entities in self.batch_extract_all(texts, errors)]
+    
+    def batch_extract_all(
+        self,
+        texts: List[str],
+        errors: Optional[List[ExtractionError]] = None,
+        budget: Optional[ReaskBudget] = None,
+        workers: int = 1
+    ) -> List[List[LegalEntity]]:
+        """여러 조항(또는 한 조항의 조각) 일괄 추출
+
+        Args:
+            budget: 재질문 예산 (기본: 이 호출 전체에서 공유하는 새 예산)
+            workers: 동시 호출 수 (결과 순서는 texts 순서)
+        """
+        budget = budget or ReaskBudget(self.reask_budget)
+        if workers <= 1 or len(texts) <= 1:
+            return [self.extract_all(text, errors, budget) for text in texts]
+        with ThreadPoolExecutor(max_workers=min(workers, len(texts))) as pool:
+            # 문서 마감을 조각 추출 스레드로 전달
+            return list(pool.map(in_context(lambda text: self.extract_all(text, errors, budget)), texts))
@@ -1,20 +1,31 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
-from typing import List
-from models.schemas import GraphTriplet, LegalEntity
+from langchain_core.exceptions import OutputParserException
+from typing import Any, Dict, List, Optional, Tuple
+from models.schemas import ErrorCode, ExtractionError, GraphTriplet, LegalEntity
 from llm.gemini_client import get_llm as gemini_llm
+from llm.router import ModelRouter
+from utils.deadline import CallTimeout, DeadlineExceeded, bounded_call, client_timeout
+from utils.json_repair import TolerantJsonOutputParser, json_objects
+from utils.metrics import estimate_tokens, metrics, LLMMetricsCallback
+from utils.relation_context import format_context
 # from llm.llama_client import get_llm as opensource_llm
 
 
 class RelationExtractionChain:
-    """법률 관계 추출 체인"""
+    """법률 관계 추출 체인
     
-    def __init__(self, temperature: float = 0.0):
-        self.llm = gemini_llm()
+    router를 지정하면 조항마다 라우터가 고른 모델 단계로 추출하고, 응답을 파싱하지 못하거나
+    변환에 실패한 항목이 있거나 평균 신뢰도가 정책의 min_confidence보다 낮으면 다음 단계로
+    올립니다 (llm은 무시). 목적·시행일·삭제 조항처럼 관계가 없는 조항의 빈 배열은 통과합니다.
+    """
+    
+    def __init__(self, temperature: float = 0.0, llm=None, router: Optional[ModelRouter] = None):
+        self.router = router
+        self.llm = None if router is not None else llm or gemini_llm()
         # self.llm = opensource_llm() # 추후에 변경해서도 테스트 가능
         self.temperature = temperature
-        # JSON 리스트를 파싱하도록 변경
-        self.parser = JsonOutputParser()
+        # 코드 펜스, 후행 쉼표, 잘린 배열 등을 고쳐 가장 긴 유효 접두부를 파싱
+        self.parser = TolerantJsonOutputParser(chain="relation")
         
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", """당신은 한국 법률 지식 그래프 전문가입니다.  
@@ -70,53 +81,110 @@ class RelationExtractionChain:
 대상: {object}
 원문: {full_text}
 
-이전 조항들: {context}
+관련 조항들 (이 조항이 참조하거나 속한 조항): {context}
 
 JSON 배열 형식으로만 응답하세요. 설명은 필요 없습니다.""")
         ])
         
-        self.chain = self.prompt | self.llm | self.parser
+        self._pipelines: Dict[Optional[str], Any] = {}
+        if self.llm is not None:
+            self.chain = self.prompt | self.llm | self.parser
+            self._pipelines[None] = self.chain
+        self.callbacks = [LLMMetricsCallback("relation")]
     
-    def extract(self, entity: LegalEntity, context: List[LegalEntity] = None) -> List[GraphTriplet]:
-        """관계 추출 실행"""
-        context_str = "\n".join([
-            f"- {e.article_number}: {e.concept}"
-            for e in (context or [])
-        ])
+    def _llm(self, tier: Optional[str]):
+        """모델 단계의 LLM (단계가 None이면 기본 LLM)"""
+        return self.llm if tier is None else self.router.llm(tier)
+    
+    def _pipeline(self, tier: Optional[str]):
+        """모델 단계의 체인 (단계가 None이면 기본 LLM)"""
+        if tier not in self._pipelines:
+            self._pipelines[tier] = self.prompt | self._llm(tier) | self.parser
+        return self._pipelines[tier]
+    
+    def _call(self, inputs: Dict[str, Any], tier: Optional[str]) -> Tuple[List[GraphTriplet], int]:
+        """관계 프롬프트 호출 (트리플, 변환에 실패한 항목 수, 관측 지연 기반 제한 시간과 문서 마감 적용)
+        
+        제한 시간 상한은 그 단계 LLM 클라이언트의 timeout (로컬 llama.cpp는 기본 600초)
+        """
+        callbacks = self.callbacks + self.router.callbacks(tier) if tier is not None else self.callbacks
+        result = bounded_call(
+            f"relation/{tier}" if tier is not None else "relation",
+            lambda: self._pipeline(tier).invoke(inputs, config={"callbacks": callbacks}),
+            estimate_tokens(inputs["full_text"]) + estimate_tokens(inputs["context"]),
+            max_timeout=client_timeout(self._llm(tier))
+        )
+        
+        # JSON 배열(또는 단일 객체, {"triplets": [...]} 래퍼)을 GraphTriplet 목록으로 변환
+        triplets, invalid = [], 0
+        for item in json_objects(result):
+            try:
+                triplets.append(GraphTriplet(**item))
+            except Exception as e:
+                metrics.inc("kg_parse_failures_total", chain="relation")
+                print(f"  ⚠️ 트리플 변환 실패: {e}")
+                invalid += 1
+        return triplets, invalid
+    
+    def _acceptable(self, result: Tuple[List[GraphTriplet], int]) -> bool:
+        """모두 변환됐고 평균 신뢰도가 기준 이상인지 (라우팅 올림 기준, 변환 실패 없는 빈 배열은 통과)"""
+        triplets, invalid = result
+        if invalid:
+            return False
+        return not triplets or (
+            sum(triplet.confidence for triplet in triplets) / len(triplets) >= self.router.policy.min_confidence
+        )
+    
+    @staticmethod
+    def inputs(entity: LegalEntity, context: List[LegalEntity] = None) -> Dict[str, Any]:
+        """프롬프트 입력값"""
+        return {
+            "article_number": entity.article_number,
+            "concept": entity.concept,
+            "subject": entity.subject or "N/A",
+            "action": entity.action or "N/A",
+            "object": entity.object or "N/A",
+            "full_text": entity.text,
+            "context": format_context(context) or "없음"
+        }
+    
+    def extract(
+        self,
+        entity: LegalEntity,
+        context: List[LegalEntity] = None,
+        errors: Optional[List[ExtractionError]] = None
+    ) -> List[GraphTriplet]:
+        """관계 추출 실행
+        
+        호출·파싱에 실패하면 빈 결과를 반환하고 relation_call_failed로 기록합니다. 빈 결과가
+        "관계 없음"인지 실패인지는 errors로 구분합니다 (실패한 조항의 결과는 재사용 색인에 넣지 않음).
+        
+        Args:
+            entity: 관계를 추출할 조항
+            context: 관련 조항 (utils.relation_context.select_relation_contexts로 선택)
+            errors: 실패를 기록할 목록 (GraphState["errors"])
         
+        Raises:
+            CallTimeout, DeadlineExceeded: 시간 초과는 빈 결과 대신 호출자에게 알려 조항을 재처리 대상으로
+        """
+        inputs = self.inputs(entity, context)
         try:
-            result = self.chain.invoke({
-                "article_number": entity.article_number,
-                "concept": entity.concept,
-                "subject": entity.subject or "N/A",
-                "action": entity.action or "N/A",
-                "object": entity.object or "N/A",
-                "full_text": entity.full_text,
-                "context": context_str or "없음"
-            })
-            
-            # JSON 리스트를 GraphTriplet 객체 리스트로 변환
-            triplets = []
-            
-            # result가 리스트인 경우
-            if isinstance(result, list):
-                for item in result:
-                    try:
-                        triplet = GraphTriplet(**item)
-                        triplets.append(triplet)
-                    except Exception as e:
-                        print(f"  ⚠️ 트리플 변환 실패: {e}")
-                        continue
-            # result가 딕셔너리인 경우 (단일 객체)
-            elif isinstance(result, dict):
-                try:
-                    triplet = GraphTriplet(**result)
-                    triplets.append(triplet)
-                except Exception as e:
-                    print(f"  ⚠️ 트리플 변환 실패: {e}")
-            
+            if self.router is None:
+                triplets, _ = self._call(inputs, None)
+            else:
+                (triplets, _), _ = self.router.invoke(
+                    "relation", entity.text, lambda tier: self._call(inputs, tier), self._acceptable
+                )
             return triplets
             
+        except (CallTimeout, DeadlineExceeded):
+            raise
         except Exception as e:
+            if isinstance(e, OutputParserException):
+                metrics.inc("kg_parse_failures_total", chain="relation")
             print(f"⚠️ 관계 추출 중 오류: {e}")
+            if errors is not None:
+                errors.append(ExtractionError(
+                    code=ErrorCode.RELATION_CALL_FAILED, article_number=entity.article_number, message=str(e)
+                ))
             return []
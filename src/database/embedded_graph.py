@@ -0,0 +1,831 @@
+"""Memgraph 없이 사용하는 내장(in-memory) 그래프 백엔드
+
+MemgraphClient와 같은 인터페이스(save_document, query_article, query_relations,
+get_graph_statistics, clear_database)를 제공합니다. 노드는 정수 ID, 문자열은 인터닝된
+ID로 저장하고, 간선은 배열에 모은 뒤 조회 시 CSR(압축 희소 행) 인접 구조로 정렬합니다.
+"""
+import os
+import pickle
+from array import array
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from database.graph_common import NEIGHBORHOOD_MAX_DEGREE, new_version, print_progress
+from models.schemas import LegalDocument
+
+# 노드 종류
+DOCUMENT = 0
+ARTICLE = 1
+ENTITY = 2
+
+# 간선 종류
+CONTAINS = 0
+RELATION = 1
+REFERENCES = 2     # 조항 -> 조항 참조 (관계 유형, 항 번호는 article 필드)
+
+NONE = -1
+ARTICLE_FIELDS = ("number", "concept", "subject", "action", "object", "full_text")
+DOCUMENT_FIELDS = ("title", "law_number", "created_at", "version")
+
+# 스냅샷 형식 버전 (배열 구성이 바뀌면 올리고, 다른 버전은 읽지 않음)
+SNAPSHOT_VERSION = 2
+
+
+class EmbeddedGraphClient:
+    """순수 파이썬 내장 그래프 (MemgraphClient 대체용)
+
+    Args:
+        path: 스냅샷 파일 경로. 지정하면 생성 시 불러오고 close() 시 저장합니다.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._stamp = 0
+        self._import_documents = None
+        self._reset()
+        if self.path and os.path.exists(self.path):
+            self.load_snapshot(self.path)
+
+    def _reset(self):
+        # 문자열 인터닝 테이블
+        self._strings: List[str] = []
+        self._string_ids: Dict[str, int] = {}
+
+        # 노드: 종류와 종류별 순번
+        self._node_kind = array("b")
+        self._node_ordinal = array("l")
+        self._document_fields = array("l")   # 문서당 len(DOCUMENT_FIELDS)개 문자열 ID
+        self._article_fields = array("l")    # 조항당 len(ARTICLE_FIELDS)개 문자열 ID
+        self._article_owner = array("l")     # 조항 순번 -> 문서 노드 ID
+        self._entity_names = array("l")      # 개체당 이름 문자열 ID
+
+        # 간선 배열
+        self._edge_kind = array("b")
+        self._edge_src = array("l")
+        self._edge_dst = array("l")
+        self._edge_type = array("l")
+        self._edge_article = array("l")
+        self._edge_confidence = array("d")
+        self._edge_document = array("l")     # 간선을 만든 문서 노드 ID
+
+        # 보조 인덱스
+        self._entity_by_name: Dict[int, int] = {}
+        self._documents_by_title: Dict[int, List[int]] = {}   # 제목 문자열 ID -> 문서 노드 ID
+        self._articles_by_number: Dict[int, List[int]] = {}
+        self._relations_by_article: Dict[int, List[int]] = {}
+        self._reference_keys: Set[tuple] = set()   # (출발 조항, 대상 조항, 관계 유형)
+
+        # 통계 카운터 (저장/삭제 시 갱신): 문서 노드 ID -> 관계 유형 문자열 ID -> 개수
+        self._article_counts: Dict[int, int] = {}
+        self._relation_type_counts: Dict[int, Dict[int, int]] = {}
+
+        # CSR 인접 구조 (쓰기 후 첫 조회 시 재구성)
+        self._csr_dirty = True
+        self._out_offsets = array("l")
+        self._out_edges = array("l")
+        self._in_offsets = array("l")
+        self._in_edges = array("l")
+
+    # ------------------------------------------------------------------
+    # 내부 헬퍼
+    # ------------------------------------------------------------------
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        sid = self._string_ids.get(value)
+        if sid is None:
+            sid = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = sid
+        return sid
+
+    def _string(self, sid: int) -> Optional[str]:
+        return None if sid == NONE else self._strings[sid]
+
+    def _add_node(self, kind: int, ordinal: int) -> int:
+        node_id = len(self._node_kind)
+        self._node_kind.append(kind)
+        self._node_ordinal.append(ordinal)
+        return node_id
+
+    def _add_edge(self, kind: int, src: int, dst: int, rel_type: int = NONE,
+                  article: int = NONE, confidence: float = 0.0, document: int = NONE) -> int:
+        edge_id = len(self._edge_kind)
+        self._edge_kind.append(kind)
+        self._edge_src.append(src)
+        self._edge_dst.append(dst)
+        self._edge_type.append(rel_type)
+        self._edge_article.append(article)
+        self._edge_confidence.append(confidence)
+        self._edge_document.append(document)
+        self._csr_dirty = True
+        return edge_id
+
+    def _entity_node(self, name: str) -> int:
+        """이름으로 개체 노드 조회, 없으면 생성 (MERGE)"""
+        sid = self._intern(name)
+        node_id = self._entity_by_name.get(sid)
+        if node_id is None:
+            node_id = self._add_node(ENTITY, len(self._entity_names))
+            self._entity_names.append(sid)
+            self._entity_by_name[sid] = node_id
+        return node_id
+
+    def _article_dict(self, node_id: int) -> Dict[str, Any]:
+        base = self._node_ordinal[node_id] * len(ARTICLE_FIELDS)
+        return {
+            field: self._string(self._article_fields[base + i])
+            for i, field in enumerate(ARTICLE_FIELDS)
+        }
+
+    def _node_name(self, node_id: int) -> Optional[str]:
+        return self._string(self._entity_names[self._node_ordinal[node_id]])
+
+    def _relation_dict(self, edge_id: int) -> Dict[str, Any]:
+        return {
+            "subject": self._node_name(self._edge_src[edge_id]),
+            "relation": self._string(self._edge_type[edge_id]),
+            "object": self._node_name(self._edge_dst[edge_id]),
+            "confidence": self._edge_confidence[edge_id],
+        }
+
+    def _build_csr(self):
+        """간선 배열을 출발/도착 노드 기준 CSR 구조로 정렬 (계수 정렬)"""
+        node_count = len(self._node_kind)
+        self._out_offsets, self._out_edges = _csr(self._edge_src, node_count)
+        self._in_offsets, self._in_edges = _csr(self._edge_dst, node_count)
+        self._csr_dirty = False
+
+    def _adjacent_edges(self, node_id: int, outgoing: bool = True) -> array:
+        if self._csr_dirty:
+            self._build_csr()
+        offsets, edges = (
+            (self._out_offsets, self._out_edges) if outgoing
+            else (self._in_offsets, self._in_edges)
+        )
+        return edges[offsets[node_id]:offsets[node_id + 1]]
+
+    # ------------------------------------------------------------------
+    # MemgraphClient 호환 인터페이스
+    # ------------------------------------------------------------------
+
+    def clear_database(self, progress: Callable[[str, int, int], None] = None):
+        """데이터베이스 초기화"""
+        self._reset()
+        self._stamp += 1
+        print("🗑️  데이터베이스 초기화 완료")
+
+    def create_indexes(self):
+        """인덱스 생성 (내장 그래프는 항상 인덱싱되어 있음)"""
+        pass
+
+    def save_document(self, document: LegalDocument, version: str = None) -> str:
+        """법률 문서를 내장 그래프에 저장
+        
+        Returns:
+            저장된 버전 문자열
+        """
+        version = version or new_version()
+        
+        # 1. 문서 노드 생성
+        doc_node = self._add_node(DOCUMENT, len(self._document_fields) // len(DOCUMENT_FIELDS))
+        self._document_fields.extend((
+            self._intern(document.title),
+            self._intern(document.law_number),
+            self._intern(datetime.now().isoformat(timespec="seconds")),
+            self._intern(version),
+        ))
+        self._documents_by_title.setdefault(self._intern(document.title), []).append(doc_node)
+        document_articles = set()
+
+        # 2. 조항 노드 및 관계 생성
+        for entity in document.entities:
+            ordinal = len(self._article_fields) // len(ARTICLE_FIELDS)
+            article_node = self._add_node(ARTICLE, ordinal)
+            self._article_fields.extend((
+                self._intern(entity.article_number),
+                self._intern(entity.concept),
+                self._intern(entity.subject),
+                self._intern(entity.action),
+                self._intern(entity.object),
+                self._intern(entity.text),
+            ))
+            number = self._article_fields[ordinal * len(ARTICLE_FIELDS)]
+            self._articles_by_number.setdefault(number, []).append(article_node)
+            self._article_owner.append(doc_node)
+            document_articles.add(number)
+            self._add_edge(CONTAINS, doc_node, article_node, document=doc_node)
+        self._article_counts[doc_node] = len(document.entities)
+        relation_types = self._relation_type_counts.setdefault(doc_node, {})
+
+        # 3. 트리플 관계 생성 (Memgraph와 같이 해당 조항이 있는 트리플만)
+        for triplet in document.triplets:
+            article = self._intern(triplet.article_number)
+            if article not in document_articles:
+                continue
+            edge_id = self._add_edge(
+                RELATION,
+                self._entity_node(triplet.subject),
+                self._entity_node(triplet.object),
+                rel_type=self._intern(triplet.relation),
+                article=article,
+                confidence=triplet.confidence,
+                document=doc_node
+            )
+            self._relations_by_article.setdefault(article, []).append(edge_id)
+            rel_type = self._edge_type[edge_id]
+            relation_types[rel_type] = relation_types.get(rel_type, 0) + 1
+
+        self._stamp += 1
+        print(f"✅ '{document.title}' 지식 그래프가 내장 그래프에 저장되었습니다.")
+        return version
+
+    def delete_document(
+        self,
+        title: str,
+        version: str = None,
+        keep_version: str = None,
+        progress: Callable[[str, int, int], None] = print_progress
+    ) -> Dict[str, int]:
+        """문서 단위 삭제 (MemgraphClient.delete_document와 같은 의미)"""
+        width = len(DOCUMENT_FIELDS)
+        removed = set()
+        for node_id in self._documents_by_title.get(self._string_ids.get(title), []):
+            doc_version = self._string(self._document_fields[self._node_ordinal[node_id] * width + 3])
+            if version is not None and doc_version != version:
+                continue
+            if keep_version is not None and doc_version == keep_version:
+                continue
+            removed.add(node_id)
+
+        counts = self._compact(removed) if removed else dict.fromkeys(
+            ("relations", "entities", "articles", "documents"), 0
+        )
+        self._stamp += 1
+        if progress:
+            for stage, key in (("관계", "relations"), ("개체", "entities"), ("조항", "articles")):
+                if counts[key]:
+                    progress(stage, counts[key], counts[key])
+        print(f"🗑️  '{title}' 삭제 완료 - 문서: {counts['documents']}, 조항: {counts['articles']}, "
+              f"관계: {counts['relations']}, 개체: {counts['entities']}")
+        return counts
+
+    def replace_document(
+        self,
+        document: LegalDocument,
+        progress: Callable[[str, int, int], None] = print_progress
+    ) -> str:
+        """같은 제목의 문서를 새 버전으로 교체 (새 버전 저장 후 이전 버전 삭제)"""
+        version = self.save_document(document)
+        self.delete_document(document.title, keep_version=version, progress=progress)
+        return version
+
+    def _current_documents(self, title: Optional[str]) -> Optional[Set[int]]:
+        """제목이 같은 문서 노드 중 최신 버전 (title이 None이면 None = 전체)"""
+        if title is None:
+            return None
+        width = len(DOCUMENT_FIELDS)
+        versions = {
+            node_id: self._string(self._document_fields[self._node_ordinal[node_id] * width + 3]) or ""
+            for node_id in self._documents_by_title.get(self._string_ids.get(title), [])
+        }
+        latest = max(versions.values(), default=None)
+        return {node_id for node_id, version in versions.items() if version == latest}
+
+    def _article_edges(self, article_number: str, document: Optional[str],
+                       relation_types: Optional[List[str]]) -> List[int]:
+        documents = self._current_documents(document)
+        types = None if relation_types is None else {self._string_ids.get(t) for t in relation_types}
+        return [
+            edge_id for edge_id in self._relations_by_article.get(self._string_ids.get(article_number), [])
+            if (documents is None or self._edge_document[edge_id] in documents)
+            and (types is None or self._edge_type[edge_id] in types)
+        ]
+
+    def query_article(self, article_number: str, document: str = None) -> Dict[str, Any]:
+        """조항 조회 (document 지정 시 해당 문서의 현재 버전에서만)"""
+        documents = self._current_documents(document)
+        for node_id in self._articles_by_number.get(self._string_ids.get(article_number), []):
+            if documents is None or self._article_document(node_id) in documents:
+                return self._article_dict(node_id)
+        return None
+
+    def query_relations(
+        self,
+        article_number: str,
+        document: str = None,
+        relation_types: List[str] = None,
+        limit: int = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조항에서 추출된 관계 조회 (신뢰도 내림차순)"""
+        rows = [
+            self._relation_dict(edge_id)
+            for edge_id in self._article_edges(article_number, document, relation_types)
+        ]
+        rows.sort(key=lambda row: (-row["confidence"], row["subject"], row["relation"], row["object"]))
+        return rows[offset:None if limit is None else offset + limit]
+
+    def query_neighborhood(
+        self,
+        article_number: str,
+        document: str = None,
+        hops: int = 1,
+        relation_types: List[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조항 주변 부분 그래프 조회 (CSR 인접 구조 위에서 너비 우선 탐색)
+
+        MemgraphClient.query_neighborhood와 같이 각 문서 현재 버전의 간선만 따라가고,
+        차수가 NEIGHBORHOOD_MAX_DEGREE를 넘는 허브 개체는 거쳐 가지 않습니다.
+        """
+        types = None if relation_types is None else {self._string_ids.get(t) for t in relation_types}
+        found = set(self._article_edges(article_number, document, relation_types))
+        frontier = set()
+        for edge_id in found:
+            frontier.add(self._edge_src[edge_id])
+            frontier.add(self._edge_dst[edge_id])
+        frontier = {node_id for node_id in frontier if self._degree(node_id) <= NEIGHBORHOOD_MAX_DEGREE}
+
+        visited = set(frontier)
+        # 문서 노드 -> 현재 버전인지
+        current: Dict[int, bool] = {}
+        for _ in range(max(1, int(hops))):
+            next_frontier = set()
+            for node_id in frontier:
+                for outgoing in (True, False):
+                    for edge_id in self._adjacent_edges(node_id, outgoing=outgoing):
+                        if self._edge_kind[edge_id] != RELATION:
+                            continue
+                        if types is not None and self._edge_type[edge_id] not in types:
+                            continue
+                        if not self._is_current(self._edge_document[edge_id], current):
+                            continue
+                        neighbor = self._edge_dst[edge_id] if outgoing else self._edge_src[edge_id]
+                        if self._degree(neighbor) > NEIGHBORHOOD_MAX_DEGREE:
+                            continue
+                        found.add(edge_id)
+                        if neighbor not in visited:
+                            visited.add(neighbor)
+                            next_frontier.add(neighbor)
+            frontier = next_frontier
+
+        rows = []
+        for edge_id in found:
+            row = self._relation_dict(edge_id)
+            document_node = self._edge_document[edge_id]
+            row["article"] = self._string(self._edge_article[edge_id])
+            row["document"] = None if document_node == NONE else self._string(
+                self._document_fields[self._node_ordinal[document_node] * len(DOCUMENT_FIELDS)]
+            )
+            rows.append(row)
+        rows.sort(key=lambda row: (row["document"] or "", row["article"] or "",
+                                   row["subject"], row["relation"], row["object"]))
+        return rows[offset:offset + limit]
+
+    def query_article_context(
+        self,
+        article_number: str,
+        document: str = None,
+        hops: int = 1,
+        relation_types: List[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """조항, 주변 부분 그래프 한 페이지, 그래프 버전 스탬프 (MemgraphClient와 같은 형태)"""
+        return {
+            "article": self.query_article(article_number, document=document),
+            "relations": self.query_neighborhood(
+                article_number, document=document, hops=hops,
+                relation_types=relation_types, limit=limit, offset=offset
+            ),
+            "stamp": self._stamp,
+        }
+
+    def _degree(self, node_id: int) -> int:
+        """노드에 연결된 간선 수 (모든 종류, 양방향)"""
+        if self._csr_dirty:
+            self._build_csr()
+        return (self._out_offsets[node_id + 1] - self._out_offsets[node_id]
+                + self._in_offsets[node_id + 1] - self._in_offsets[node_id])
+
+    def _is_current(self, document_node: int, cache: Dict[int, bool]) -> bool:
+        """문서 노드가 그 제목의 최신 버전인지 (문서가 없는 간선은 현재로 봄)"""
+        if document_node == NONE:
+            return True
+        if document_node not in cache:
+            title = self._document_fields[self._node_ordinal[document_node] * len(DOCUMENT_FIELDS)]
+            cache[document_node] = document_node in self._current_documents(self._string(title))
+        return cache[document_node]
+
+    def _article_document(self, node_id: int) -> int:
+        """조항 노드를 포함하는 문서 노드"""
+        return self._article_owner[self._node_ordinal[node_id]]
+
+    def _current_article(self, title: str, article_number: str) -> int:
+        """문서 현재 버전의 조항 노드"""
+        documents = self._current_documents(title)
+        for node_id in self._articles_by_number.get(self._string_ids.get(article_number), []):
+            if self._article_document(node_id) in documents:
+                return node_id
+        return NONE
+
+    def save_article_references(self, edges: List[Any]) -> int:
+        """조항 간 참조 간선 저장 (각 문서 현재 버전의 조항끼리, 이미 있는 간선은 건너뜀)
+
+        Args:
+            edges: utils.reference_resolver.ArticleReference 목록
+
+        Returns:
+            새로 만든 간선 수
+        """
+        # 간선을 추가하면 CSR이 다시 만들어지므로 조항 노드를 먼저 모두 찾음
+        nodes: Dict[tuple, int] = {}
+        resolved = []
+        for edge in edges:
+            for key in ((edge.source_document, edge.source_article), (edge.target_document, edge.target_article)):
+                if key not in nodes:
+                    nodes[key] = self._current_article(*key)
+            src = nodes[(edge.source_document, edge.source_article)]
+            dst = nodes[(edge.target_document, edge.target_article)]
+            if src != NONE and dst != NONE:
+                resolved.append((edge, src, dst, self._article_document(src)))
+
+        linked = 0
+        for edge, src, dst, source_document in resolved:
+            key = (src, dst, self._intern(edge.relation))
+            if key in self._reference_keys:
+                continue
+            self._reference_keys.add(key)
+            self._add_edge(
+                REFERENCES, src, dst, rel_type=key[2],
+                article=self._intern(None if edge.paragraph is None else str(edge.paragraph)),
+                document=source_document
+            )
+            linked += 1
+        if linked:
+            self._stamp += 1
+        return linked
+
+    def query_article_references(self, article_number: str, document: str = None) -> List[Dict[str, Any]]:
+        """조항에서 나가는/들어오는 조항 참조
+
+        Returns:
+            [{direction("out"/"in"), relation, document, article, paragraph}, ...]
+        """
+        documents = self._current_documents(document)
+        rows = []
+        for node_id in self._articles_by_number.get(self._string_ids.get(article_number), []):
+            if documents is not None and self._article_document(node_id) not in documents:
+                continue
+            for outgoing in (True, False):
+                for edge_id in self._adjacent_edges(node_id, outgoing=outgoing):
+                    if self._edge_kind[edge_id] != REFERENCES:
+                        continue
+                    other = self._edge_dst[edge_id] if outgoing else self._edge_src[edge_id]
+                    paragraph = self._string(self._edge_article[edge_id])
+                    rows.append({
+                        "direction": "out" if outgoing else "in",
+                        "relation": self._string(self._edge_type[edge_id]),
+                        "document": self._string(self._document_fields[
+                            self._node_ordinal[self._article_document(other)] * len(DOCUMENT_FIELDS)
+                        ]),
+                        "article": self._string(self._article_fields[self._node_ordinal[other] * len(ARTICLE_FIELDS)]),
+                        "paragraph": int(paragraph) if paragraph is not None else None,
+                    })
+        rows.sort(key=lambda row: (row["direction"] != "out", row["document"] or "", row["article"] or "", row["relation"]))
+        return rows
+
+    def graph_version(self) -> int:
+        """그래프 버전 스탬프 (저장/삭제/교체 시 증가)"""
+        return self._stamp
+
+    def query_entity_relations(self, name: str) -> List[Dict[str, Any]]:
+        """개체에 연결된 관계 조회 (나가는 관계와 들어오는 관계)"""
+        node_id = self._entity_by_name.get(self._string_ids.get(name))
+        if node_id is None:
+            return []
+        edges = list(self._adjacent_edges(node_id, outgoing=True))
+        edges.extend(self._adjacent_edges(node_id, outgoing=False))
+        return [
+            self._relation_dict(edge_id) for edge_id in edges
+            if self._edge_kind[edge_id] == RELATION
+        ]
+
+    def get_graph_statistics(self) -> Dict[str, Any]:
+        """그래프 통계 (저장/삭제 시 갱신되는 카운터에서 조회)"""
+        stats = {
+            "documents": len(self._document_fields) // len(DOCUMENT_FIELDS),
+            "articles": len(self._article_fields) // len(ARTICLE_FIELDS),
+            "entities": len(self._entity_names),
+            "relations": 0,
+            "relation_types": {},
+            "by_document": [],
+        }
+        for doc_node, counts in self._relation_type_counts.items():
+            base = self._node_ordinal[doc_node] * len(DOCUMENT_FIELDS)
+            relation_types = {self._strings[sid]: n for sid, n in counts.items()}
+            for rel_type, n in relation_types.items():
+                stats["relation_types"][rel_type] = stats["relation_types"].get(rel_type, 0) + n
+            stats["by_document"].append({
+                "title": self._string(self._document_fields[base]),
+                "version": self._string(self._document_fields[base + 3]),
+                "articles": self._article_counts.get(doc_node, 0),
+                "relations": sum(counts.values()),
+                "relation_types": relation_types,
+            })
+        stats["relations"] = sum(stats["relation_types"].values())
+        stats["by_document"].sort(key=lambda row: (row["title"], row["version"] or ""))
+        return stats
+
+    # ------------------------------------------------------------------
+    # 대량 내보내기/가져오기 (database.graph_transfer에서 사용)
+    # ------------------------------------------------------------------
+
+    def _document_row(self, doc_node: int) -> Dict[str, Any]:
+        base = self._node_ordinal[doc_node] * len(DOCUMENT_FIELDS)
+        return {
+            field: self._string(self._document_fields[base + i])
+            for i, field in enumerate(DOCUMENT_FIELDS)
+        }
+
+    def _export_iter(self, kind: str):
+        if kind == "documents":
+            for node_id, node_kind in enumerate(self._node_kind):
+                if node_kind == DOCUMENT:
+                    row = self._document_row(node_id)
+                    yield {field: row[field] for field in ("title", "law_number", "version", "created_at")}
+        elif kind == "articles":
+            for edge_id, edge_kind in enumerate(self._edge_kind):
+                if edge_kind == CONTAINS:
+                    document = self._document_row(self._edge_src[edge_id])
+                    yield dict(
+                        document=document["title"],
+                        version=document["version"],
+                        **self._article_dict(self._edge_dst[edge_id])
+                    )
+        elif kind == "entities":
+            for sid in self._entity_names:
+                yield {"name": self._strings[sid]}
+        elif kind == "relations":
+            for edge_id, edge_kind in enumerate(self._edge_kind):
+                if edge_kind != RELATION:
+                    continue
+                document = self._edge_document[edge_id]
+                document = self._document_row(document) if document != NONE else {}
+                yield {
+                    "subject": self._node_name(self._edge_src[edge_id]),
+                    "object": self._node_name(self._edge_dst[edge_id]),
+                    "type": self._string(self._edge_type[edge_id]),
+                    "confidence": self._edge_confidence[edge_id],
+                    "article": self._string(self._edge_article[edge_id]),
+                    "document": document.get("title"),
+                    "version": document.get("version"),
+                }
+        else:
+            raise ValueError(f"알 수 없는 종류: {kind}")
+
+    def document_versions(self) -> Set[Tuple[str, str]]:
+        """저장된 문서의 (제목, 버전) 목록"""
+        return {
+            (row["title"], row["version"])
+            for node_ids in self._documents_by_title.values()
+            for row in map(self._document_row, node_ids)
+        }
+
+    def export_rows(self, kind: str, chunk_size: int = 10000):
+        """종류별 행을 chunk_size 단위로 생성"""
+        chunk = []
+        for row in self._export_iter(kind):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def import_rows(self, kind: str, rows: List[Dict[str, Any]]):
+        """행 배치를 배열에 직접 적재 (save_document와 같은 보조 인덱스/카운터 갱신)"""
+        if self._import_documents is None:
+            self._import_documents = {}
+            for node_ids in self._documents_by_title.values():
+                for node_id in node_ids:
+                    document = self._document_row(node_id)
+                    self._import_documents[(document["title"], document["version"])] = node_id
+        documents = self._import_documents
+
+        for row in rows:
+            if kind == "documents":
+                doc_node = self._add_node(DOCUMENT, len(self._document_fields) // len(DOCUMENT_FIELDS))
+                self._document_fields.extend(self._intern(row.get(field)) for field in DOCUMENT_FIELDS)
+                self._documents_by_title.setdefault(self._intern(row["title"]), []).append(doc_node)
+                documents[(row["title"], row["version"])] = doc_node
+                self._article_counts[doc_node] = 0
+                self._relation_type_counts[doc_node] = {}
+            elif kind == "articles":
+                doc_node = documents.get((row["document"], row["version"]))
+                if doc_node is None:
+                    continue
+                ordinal = len(self._article_fields) // len(ARTICLE_FIELDS)
+                article_node = self._add_node(ARTICLE, ordinal)
+                self._article_fields.extend(self._intern(row.get(field)) for field in ARTICLE_FIELDS)
+                number = self._article_fields[ordinal * len(ARTICLE_FIELDS)]
+                self._articles_by_number.setdefault(number, []).append(article_node)
+                self._article_owner.append(doc_node)
+                self._add_edge(CONTAINS, doc_node, article_node, document=doc_node)
+                self._article_counts[doc_node] += 1
+            elif kind == "entities":
+                self._entity_node(row["name"])
+            elif kind == "relations":
+                doc_node = documents.get((row.get("document"), row.get("version")), NONE)
+                article = self._intern(row.get("article"))
+                edge_id = self._add_edge(
+                    RELATION,
+                    self._entity_node(row["subject"]),
+                    self._entity_node(row["object"]),
+                    rel_type=self._intern(row["type"]),
+                    article=article,
+                    confidence=float(row["confidence"]),
+                    document=doc_node
+                )
+                self._relations_by_article.setdefault(article, []).append(edge_id)
+                if doc_node != NONE:
+                    counts = self._relation_type_counts[doc_node]
+                    counts[self._edge_type[edge_id]] = counts.get(self._edge_type[edge_id], 0) + 1
+            else:
+                raise ValueError(f"알 수 없는 종류: {kind}")
+
+    def finish_import(self):
+        """가져오기 종료"""
+        self._import_documents = None
+        self._stamp += 1
+
+    def close(self):
+        """연결 종료 (경로가 지정되어 있으면 스냅샷 저장)"""
+        if self.path:
+            self.save_snapshot(self.path)
+            print(f"💾 내장 그래프 스냅샷 저장: {self.path}")
+
+    # ------------------------------------------------------------------
+    # 스냅샷
+    # ------------------------------------------------------------------
+
+    def save_snapshot(self, path: str):
+        """그래프를 디스크에 저장 (원자적 교체)"""
+        state = {
+            "version": SNAPSHOT_VERSION,
+            "strings": self._strings,
+            "node_kind": self._node_kind,
+            "node_ordinal": self._node_ordinal,
+            "document_fields": self._document_fields,
+            "article_fields": self._article_fields,
+            "entity_names": self._entity_names,
+            "edge_kind": self._edge_kind,
+            "edge_src": self._edge_src,
+            "edge_dst": self._edge_dst,
+            "edge_type": self._edge_type,
+            "edge_article": self._edge_article,
+            "edge_confidence": self._edge_confidence,
+            "edge_document": self._edge_document,
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def load_snapshot(self, path: str):
+        """디스크의 스냅샷으로 그래프 교체"""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(
+                f"지원하지 않는 스냅샷 버전: {state.get('version')} (현재 {SNAPSHOT_VERSION}, 문서를 다시 저장하세요)"
+            )
+
+        self._reset()
+        self._strings = state["strings"]
+        self._string_ids = {value: sid for sid, value in enumerate(self._strings)}
+        for name in ("node_kind", "node_ordinal", "document_fields", "article_fields",
+                     "entity_names", "edge_kind", "edge_src", "edge_dst", "edge_type",
+                     "edge_article", "edge_confidence", "edge_document"):
+            setattr(self, f"_{name}", state[name])
+        self._rebuild_indexes()
+        self._stamp += 1
+
+    def _rebuild_indexes(self):
+        """배열로부터 보조 인덱스 재구성"""
+        self._article_owner = array("l", [NONE]) * (len(self._article_fields) // len(ARTICLE_FIELDS))
+        for node_id, kind in enumerate(self._node_kind):
+            if kind == ENTITY:
+                self._entity_by_name[self._entity_names[self._node_ordinal[node_id]]] = node_id
+            elif kind == ARTICLE:
+                number = self._article_fields[self._node_ordinal[node_id] * len(ARTICLE_FIELDS)]
+                self._articles_by_number.setdefault(number, []).append(node_id)
+            elif kind == DOCUMENT:
+                title = self._document_fields[self._node_ordinal[node_id] * len(DOCUMENT_FIELDS)]
+                self._documents_by_title.setdefault(title, []).append(node_id)
+                self._article_counts[node_id] = 0
+                self._relation_type_counts[node_id] = {}
+        for edge_id, kind in enumerate(self._edge_kind):
+            document = self._edge_document[edge_id]
+            if kind == RELATION:
+                self._relations_by_article.setdefault(self._edge_article[edge_id], []).append(edge_id)
+                if document != NONE:
+                    counts = self._relation_type_counts[document]
+                    rel_type = self._edge_type[edge_id]
+                    counts[rel_type] = counts.get(rel_type, 0) + 1
+            elif kind == REFERENCES:
+                self._reference_keys.add((self._edge_src[edge_id], self._edge_dst[edge_id], self._edge_type[edge_id]))
+            else:
+                self._article_owner[self._node_ordinal[self._edge_dst[edge_id]]] = self._edge_src[edge_id]
+                if document != NONE:
+                    self._article_counts[document] += 1
+        self._csr_dirty = True
+
+    def _compact(self, removed_documents: Set[int]) -> Dict[str, int]:
+        """문서 노드와 그 조항/관계/고아 개체를 제거하고 배열과 문자열 테이블을 다시 구성"""
+        removed_nodes = set(removed_documents)
+        kept_edges = []
+        connected = set()
+        for edge_id, kind in enumerate(self._edge_kind):
+            if self._edge_document[edge_id] in removed_documents:
+                if kind == CONTAINS:
+                    removed_nodes.add(self._edge_dst[edge_id])
+                continue
+            kept_edges.append(edge_id)
+            connected.add(self._edge_src[edge_id])
+            connected.add(self._edge_dst[edge_id])
+        # 다른 문서에서 삭제된 조항으로 들어오던 참조 간선도 제거
+        kept_edges = [
+            edge_id for edge_id in kept_edges
+            if self._edge_kind[edge_id] != REFERENCES or self._edge_dst[edge_id] not in removed_nodes
+        ]
+
+        counts = {"relations": 0, "entities": 0, "articles": 0, "documents": len(removed_documents)}
+        for node_id, kind in enumerate(self._node_kind):
+            if kind == ENTITY and node_id not in connected:
+                removed_nodes.add(node_id)
+                counts["entities"] += 1
+            elif kind == ARTICLE and node_id in removed_nodes:
+                counts["articles"] += 1
+        counts["relations"] = sum(
+            1 for edge_id, kind in enumerate(self._edge_kind)
+            if kind == RELATION and self._edge_document[edge_id] in removed_documents
+        )
+
+        old = self.__dict__.copy()
+        strings = old["_strings"]
+        self._reset()
+
+        def reintern(sid: int) -> int:
+            return NONE if sid == NONE else self._intern(strings[sid])
+
+        remap: Dict[int, int] = {}
+        fields_by_kind = {
+            DOCUMENT: ("_document_fields", len(DOCUMENT_FIELDS)),
+            ARTICLE: ("_article_fields", len(ARTICLE_FIELDS)),
+            ENTITY: ("_entity_names", 1),
+        }
+        for node_id, kind in enumerate(old["_node_kind"]):
+            if node_id in removed_nodes:
+                continue
+            name, width = fields_by_kind[kind]
+            base = old["_node_ordinal"][node_id] * width
+            target = getattr(self, name)
+            ordinal = len(target) // width
+            target.extend(reintern(sid) for sid in old[name][base:base + width])
+            remap[node_id] = self._add_node(kind, ordinal)
+
+        for edge_id in kept_edges:
+            document = old["_edge_document"][edge_id]
+            self._add_edge(
+                old["_edge_kind"][edge_id],
+                remap[old["_edge_src"][edge_id]],
+                remap[old["_edge_dst"][edge_id]],
+                rel_type=reintern(old["_edge_type"][edge_id]),
+                article=reintern(old["_edge_article"][edge_id]),
+                confidence=old["_edge_confidence"][edge_id],
+                document=remap.get(document, NONE)
+            )
+        self._rebuild_indexes()
+        return counts
+
+
+def _csr(keys: array, node_count: int):
+    """keys[edge_id] = node_id 배열로부터 (offsets, edge_ids) CSR 생성"""
+    offsets = array("l", bytes(array("l").itemsize * (node_count + 1)))
+    for node_id in keys:
+        offsets[node_id + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+
+    cursor = array("l", offsets)
+    edges = array("l", bytes(array("l").itemsize * len(keys)))
+    for edge_id, node_id in enumerate(keys):
+        edges[cursor[node_id]] = edge_id
+        cursor[node_id] += 1
+    return offsets, edges
@@ -0,0 +1,309 @@
+"""개체 이름 퍼지 조회 색인 (자동 완성, 개체 연결)
+
+Entity 노드는 name 정확 일치로만 색인되어 "금융투자업자등", "금융 투자업자"처럼 표기가 조금
+다른 이름을 찾으려면 CONTAINS 전체 탐색이 필요합니다. 이 색인은 공백을 지우고 소문자로 바꾼
+이름 키를 기준으로 다음을 제공합니다.
+    - 접두어 조회: 정렬된 키 목록에서 이분 탐색
+    - 오타 허용 조회: 글자 2-gram 역색인으로 후보를 고르고(공유 2-gram 수·길이 필터)
+      비트 병렬 편집 거리(Myers)로 확인
+
+문서를 저장할 때마다 그 문서 트리플의 주체/대상 이름을 추가하고, 같은 제목의 이전 문서가
+가져온 이름은 참조 수를 줄여 더 이상 쓰이지 않으면 조회에서 뺍니다.
+
+사용 예:
+    index = EntityNameIndex()
+    index.add_document(document)
+    index.lookup("금융투자엽자")  # [{"name": "금융투자업자", "match": "fuzzy", "distance": 1, ...}]
+"""
+import os
+import pickle
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from models.schemas import LegalDocument
+
+# 색인 파일 (문서별 개체 이름, 비우면 메모리에만 유지)
+ENTITY_NAME_INDEX_PATH = os.getenv("ENTITY_NAME_INDEX_PATH", "data/entity_name_index.pkl")
+# 오타 허용 조회의 최대 편집 거리 (짧은 이름은 길이 4자당 1로 줄임)
+ENTITY_FUZZY_MAX_DISTANCE = int(os.getenv("ENTITY_FUZZY_MAX_DISTANCE", "2"))
+
+INDEX_VERSION = 1
+# 접두어 조회 시 살펴볼 최대 키 수 (짧은 접두어가 색인 전체를 훑지 않도록)
+PREFIX_SCAN = 256
+# 편집 거리를 계산할 최대 후보 수 (공유 2-gram이 많은 순)
+MAX_CANDIDATES = 64
+# 쓰이지 않는 이름이 이 비율을 넘으면 색인을 다시 구성
+COMPACT_RATIO = 0.5
+
+MATCH_ORDER = {"exact": 0, "prefix": 1, "fuzzy": 2}
+
+
+def name_key(name: str) -> str:
+    """비교용 이름 키 (NFKC, 공백 제거, 소문자)"""
+    return re.sub(r'\s+', '', unicodedata.normalize("NFKC", name)).lower()
+
+
+def _grams(key: str) -> List[int]:
+    """키의 글자 2-gram 값 (한 글자 키는 그 글자)"""
+    if len(key) < 2:
+        return [ord(c) for c in key]
+    return list({(ord(a) << 21) | ord(b) for a, b in zip(key, key[1:])})
+
+
+def edit_distance(a: str, b: str) -> int:
+    """레벤슈타인 편집 거리 (Myers/Hyyrö 비트 병렬 알고리즘)"""
+    if not a:
+        return len(b)
+    peq: Dict[str, int] = {}
+    for i, c in enumerate(a):
+        peq[c] = peq.get(c, 0) | (1 << i)
+    full = (1 << len(a)) - 1
+    last = 1 << (len(a) - 1)
+    pv, mv, score = full, 0, len(a)
+    for c in b:
+        eq = peq.get(c, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | ~(xh | pv)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = (ph << 1) | 1
+        mh <<= 1
+        pv = (mh | ~(xv | ph)) & full
+        mv = ph & xv & full
+    return score
+
+
+def _document_names(document: LegalDocument) -> List[str]:
+    """문서 트리플의 주체/대상 이름 (Entity 노드, 등장 순서)"""
+    names = dict.fromkeys(
+        name.strip()
+        for triplet in document.triplets
+        for name in (triplet.subject, triplet.object)
+        if name and name.strip()
+    )
+    return list(names)
+
+
+class EntityNameIndex:
+    """개체 이름 접두어·오타 허용 조회 색인
+
+    Args:
+        path: 색인 파일 경로 (기본: ENTITY_NAME_INDEX_PATH, 빈 문자열이면 저장하지 않음)
+    """
+
+    def __init__(self, path: str = None):
+        self.path = ENTITY_NAME_INDEX_PATH if path is None else path
+        self._documents: Dict[str, List[str]] = {}
+        self._reset()
+        if self.path and os.path.exists(self.path):
+            self.load(self.path)
+
+    def _reset(self):
+        self._keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # 키별 원래 표기 -> 참조 문서 수 (비면 쓰이지 않는 이름)
+        self._variants: List[Dict[str, int]] = []
+        self._lengths = array("I")
+        self._grams: Dict[int, array] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._unused = 0
+
+    def __len__(self) -> int:
+        return len(self._keys) - self._unused
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def _add_names(self, names: List[str]):
+        added: List[Tuple[str, int]] = []
+        for name in names:
+            key = name_key(name)
+            if not key:
+                continue
+            name_id = self._ids.get(key)
+            if name_id is None:
+                name_id = self._ids[key] = len(self._keys)
+                self._keys.append(key)
+                self._variants.append({})
+                self._lengths.append(len(key))
+                for gram in _grams(key):
+                    self._grams.setdefault(gram, array("I")).append(name_id)
+                added.append((key, name_id))
+            elif not self._variants[name_id]:
+                self._unused -= 1
+            variants = self._variants[name_id]
+            variants[name] = variants.get(name, 0) + 1
+        if added:
+            # 정렬된 목록 뒤에 정렬된 새 키를 붙이면 병합 한 번으로 정렬됨
+            self._sorted.extend(sorted(added))
+            self._sorted.sort()
+
+    def _remove_names(self, names: List[str]):
+        for name in names:
+            name_id = self._ids.get(name_key(name))
+            if name_id is None:
+                continue
+            variants = self._variants[name_id]
+            if variants.get(name, 0) <= 1:
+                variants.pop(name, None)
+                if not variants:
+                    self._unused += 1
+            else:
+                variants[name] -= 1
+
+    def _rebuild(self):
+        """쓰이지 않는 이름을 빼고 문서별 이름으로 다시 구성"""
+        self._reset()
+        for names in self._documents.values():
+            self._add_names(names)
+
+    def add_document(self, document: LegalDocument) -> int:
+        """문서의 개체 이름 추가 (같은 제목의 이전 이름은 교체)
+
+        Returns:
+            문서의 개체 이름 수
+        """
+        self.remove_document(document.title)
+        names = _document_names(document)
+        self._documents[document.title] = names
+        self._add_names(names)
+        return len(names)
+
+    def remove_document(self, title: str) -> bool:
+        """문서가 가져온 개체 이름 제거 (다른 문서도 쓰는 이름은 유지)"""
+        names = self._documents.pop(title, None)
+        if names is None:
+            return False
+        self._remove_names(names)
+        if self._unused > COMPACT_RATIO * len(self._keys):
+            self._rebuild()
+        return True
+
+    def clear(self):
+        """색인 전체 삭제"""
+        self._documents = {}
+        self._reset()
+
+    def save(self, path: str = None) -> Optional[str]:
+        """문서별 개체 이름 저장 (경로가 없으면 저장하지 않음)"""
+        path = path or self.path
+        if not path:
+            return None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "documents": self._documents}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, path: str):
+        """저장된 문서별 개체 이름으로 색인 구성 (형식이 다르면 무시)"""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != INDEX_VERSION:
+            return
+        self._documents = state["documents"]
+        self._rebuild()
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def _prefix(self, key: str) -> List[int]:
+        """키가 접두어인 이름 (PREFIX_SCAN개까지)"""
+        found = []
+        start = bisect_left(self._sorted, (key,))
+        for other, name_id in self._sorted[start:start + PREFIX_SCAN]:
+            if not other.startswith(key):
+                break
+            if self._variants[name_id]:
+                found.append(name_id)
+        return found
+
+    def _fuzzy(self, key: str, max_distance: int) -> List[Tuple[int, int]]:
+        """편집 거리 max_distance 이내 이름 (이름 ID, 거리)"""
+        grams = _grams(key)
+        postings = [self._grams[gram] for gram in grams if gram in self._grams]
+        if not postings:
+            return []
+        ids, shared = np.unique(
+            np.concatenate([np.frombuffer(posting, dtype=np.uint32) for posting in postings]),
+            return_counts=True
+        )
+        # 편집 한 번은 2-gram을 최대 두 개 바꿈
+        lengths = np.frombuffer(self._lengths, dtype=np.uint32)[ids].astype(np.int64)
+        keep = (shared >= max(1, len(grams) - 2 * max_distance)) & (np.abs(lengths - len(key)) <= max_distance)
+        ids, shared = ids[keep], shared[keep]
+        if len(ids) > MAX_CANDIDATES:
+            top = np.argpartition(-shared, MAX_CANDIDATES - 1)[:MAX_CANDIDATES]
+            ids = ids[top]
+
+        found = []
+        for name_id in ids.tolist():
+            if not self._variants[name_id]:
+                continue
+            distance = edit_distance(key, self._keys[name_id])
+            if distance <= max_distance:
+                found.append((name_id, distance))
+        return found
+
+    def lookup(self, query: str, limit: int = 10, max_distance: int = None) -> List[Dict[str, Any]]:
+        """정확 일치, 접두어, 오타 허용 순으로 개체 이름 조회
+
+        Args:
+            query: 이름 또는 입력 중인 접두어 (공백·대소문자 무시)
+            limit: 최대 결과 수
+            max_distance: 최대 편집 거리 (기본: 이름 길이 4자당 1, 최대 ENTITY_FUZZY_MAX_DISTANCE)
+
+        Returns:
+            [{name, names, match, distance, documents}, ...]
+            name은 가장 많이 쓰인 표기, names는 같은 키의 모든 표기(그래프의 Entity.name)입니다.
+        """
+        key = name_key(query)
+        if not key or limit <= 0:
+            return []
+        if max_distance is None:
+            max_distance = min(ENTITY_FUZZY_MAX_DISTANCE, max(1, len(key) // 4))
+
+        matches: Dict[int, Tuple[str, int]] = {}
+        exact = self._ids.get(key)
+        if exact is not None and self._variants[exact]:
+            matches[exact] = ("exact", 0)
+        for name_id in self._prefix(key):
+            matches.setdefault(name_id, ("prefix", len(self._keys[name_id]) - len(key)))
+        if len(matches) < limit and len(key) > 1:
+            for name_id, distance in self._fuzzy(key, max_distance):
+                matches.setdefault(name_id, ("fuzzy", distance))
+
+        ranked = sorted(
+            matches.items(),
+            key=lambda item: (
+                MATCH_ORDER[item[1][0]], item[1][1],
+                -sum(self._variants[item[0]].values()), self._keys[item[0]]
+            )
+        )[:limit]
+        results = []
+        for name_id, (match, distance) in ranked:
+            variants = self._variants[name_id]
+            results.append({
+                "name": max(variants, key=lambda name: (variants[name], name)),
+                "names": sorted(variants),
+                "match": match,
+                "distance": distance if match == "fuzzy" else 0,
+                "documents": sum(variants.values()),
+            })
+        return results
+
+    def stats(self) -> Dict[str, int]:
+        """색인 통계"""
+        return {"documents": len(self._documents), "names": len(self), "grams": len(self._grams)}
@@ -0,0 +1,567 @@
+"""조항 원문·핵심 개념 전문 검색 색인 (한국어 문자 n-gram + BM25)
+
+형태소 분석기 없이 조항 원문과 핵심 개념을 어절 안의 글자 2-gram/3-gram(한 글자 어절은
+1-gram)으로 색인합니다. n-gram 값은 글자 코드 포인트를 21비트씩 묶은 64비트 정수라 해시
+충돌이 없고, 토큰화와 포스팅 구성·점수 계산을 numpy로 한 번에 처리합니다.
+
+색인은 문서를 저장할 때마다 세그먼트 파일을 하나씩 추가해 갱신하고, 세그먼트가
+FULLTEXT_MAX_SEGMENTS를 넘으면 하나로 병합합니다. 교체/삭제된 문서는 매니페스트에 삭제
+표시만 해 두었다가 병합할 때 실제로 지웁니다.
+
+세그먼트 파일 구성 (리틀 엔디언, 각 섹션은 8바이트 정렬):
+    헤더        매직/버전/개수/섹션 오프셋
+    용어        정렬된 u64 n-gram 값 + u64 포스팅 오프셋
+    포스팅      u32 조항 위치 + f32 가중 빈도 (원문 + 핵심 개념 × FULLTEXT_CONCEPT_WEIGHT)
+    조항        f32 가중 길이, u32 문서 위치, u32 원문 시작/끝
+    메타데이터   JSON (문서 제목, 조항 번호, 핵심 개념)
+    원문        문서별 zlib 압축 블록의 u64 오프셋 + 압축 데이터
+
+사용 예:
+    index = FullTextIndex()
+    index.add_document(document)
+    for hit in index.search("금융투자업자 인가", limit=10):
+        print(hit["document"], hit["article"], hit["snippet"])
+"""
+import json
+import mmap
+import os
+import re
+import struct
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.schemas import LegalDocument
+from utils.metrics import metrics
+
+# 세그먼트와 매니페스트를 둘 디렉토리
+FULLTEXT_INDEX_DIR = os.getenv("FULLTEXT_INDEX_DIR", "data/fulltext_index")
+# 이 수를 넘으면 세그먼트를 하나로 병합
+FULLTEXT_MAX_SEGMENTS = int(os.getenv("FULLTEXT_MAX_SEGMENTS", "8"))
+# 핵심 개념에 나온 n-gram의 가중치 (원문 대비)
+FULLTEXT_CONCEPT_WEIGHT = float(os.getenv("FULLTEXT_CONCEPT_WEIGHT", "2.0"))
+
+MAGIC = b"KGFTS001"
+VERSION = 1
+MANIFEST = "manifest.json"
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_CHARS = 80
+# 압축을 풀어 둘 문서 원문 수 (세그먼트당)
+TEXT_CACHE_SIZE = 8
+
+ARRAYS = {
+    "terms": "<u8",
+    "term_offsets": "<u8",
+    "posting_articles": "<u4",
+    "posting_weights": "<f4",
+    "article_lengths": "<f4",
+    "article_documents": "<u4",
+    "article_starts": "<u4",
+    "article_ends": "<u4",
+    "text_offsets": "<u8",
+}
+SECTIONS = (*ARRAYS, "meta", "text_data")
+
+# magic, version, 용어/포스팅/조항/문서 수, 섹션별 (오프셋, 길이)
+HEADER = struct.Struct(f"<8sI4I{len(SECTIONS) * 2}Q")
+
+# 어절 구분 (글자·숫자가 아닌 문자)
+SEPARATOR = re.compile(r'[\W_]+')
+
+_CHAR_BITS = np.uint64(21)
+_CHAR_MASK = (1 << 21) - 1
+
+
+# ----------------------------------------------------------------------
+# 토큰화
+# ----------------------------------------------------------------------
+
+def _normalize(text: str) -> str:
+    """소문자로 바꾸고 어절 사이를 NUL 한 글자로 구분"""
+    return SEPARATOR.sub("\0", text.lower())
+
+
+def _codes(normalized: str) -> np.ndarray:
+    return np.frombuffer(normalized.encode("utf-32-le"), dtype="<u4").astype(np.uint64)
+
+
+def _ngrams(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """n-gram 값과 시작 위치 (어절 안의 2-gram, 3-gram, 한 글자 어절은 1-gram)"""
+    n = len(codes)
+    padded = np.zeros(n + 3, dtype=np.uint64)
+    padded[1:n + 1] = codes
+    prev, c0, c1, c2 = padded[:n], padded[1:n + 1], padded[2:n + 2], padded[3:n + 3]
+
+    live = c0 != 0
+    bigram = live & (c1 != 0)
+    trigram = bigram & (c2 != 0)
+    unigram = live & (prev == 0) & (c1 == 0)
+
+    head = c0 << (_CHAR_BITS * np.uint64(2))
+    pair = head | (c1 << _CHAR_BITS)
+    values = np.concatenate((pair[bigram], (pair | c2)[trigram], head[unigram]))
+    positions = np.concatenate((np.flatnonzero(bigram), np.flatnonzero(trigram), np.flatnonzero(unigram)))
+    return values, positions
+
+
+def query_terms(query: str) -> np.ndarray:
+    """질의의 n-gram 값 (중복 제거, 정렬)"""
+    values, _ = _ngrams(_codes(_normalize(query)))
+    return np.unique(values)
+
+
+def term_text(value: int) -> str:
+    """n-gram 값 -> 문자열"""
+    value = int(value)
+    chars = (value >> 42, (value >> 21) & _CHAR_MASK, value & _CHAR_MASK)
+    return "".join(chr(c) for c in chars if c)
+
+
+def _field_postings(texts: Sequence[str], weight: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """조항별 텍스트를 한 번에 토큰화한 (n-gram, 조항 위치, 가중치)"""
+    normalized = [_normalize(text) for text in texts]
+    starts = np.cumsum([0] + [len(text) + 1 for text in normalized[:-1]], dtype=np.int64)
+    values, positions = _ngrams(_codes("\0".join(normalized)))
+    articles = np.searchsorted(starts, positions, side="right") - 1
+    return values, articles, np.full(len(values), weight, dtype=np.float32)
+
+
+# ----------------------------------------------------------------------
+# 세그먼트 파일
+# ----------------------------------------------------------------------
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _write_segment(
+    path: str,
+    terms: np.ndarray,
+    articles: np.ndarray,
+    weights: np.ndarray,
+    columns: Dict[str, np.ndarray],
+    meta: Dict[str, List[str]],
+    blobs: List[bytes]
+) -> str:
+    """(n-gram, 조항, 가중치) 목록을 합쳐 포스팅을 구성하고 세그먼트 파일로 저장
+
+    Args:
+        columns: article_lengths, article_documents, article_starts, article_ends
+        meta: {"documents": [...], "numbers": [...], "concepts": [...]}
+        blobs: 문서별 zlib 압축 원문
+    """
+    order = np.lexsort((articles, terms))
+    terms, articles, weights = terms[order], articles[order], weights[order]
+    if len(terms):
+        starts = np.flatnonzero(np.r_[True, (terms[1:] != terms[:-1]) | (articles[1:] != articles[:-1])])
+        terms, articles, weights = terms[starts], articles[starts], np.add.reduceat(weights, starts)
+    term_starts = np.flatnonzero(np.r_[True, terms[1:] != terms[:-1]]) if len(terms) else np.empty(0, np.int64)
+
+    data = {
+        "terms": terms[term_starts],
+        "term_offsets": np.r_[term_starts, len(terms)],
+        "posting_articles": articles,
+        "posting_weights": weights,
+        **columns,
+        "text_offsets": np.cumsum([0] + [len(blob) for blob in blobs]),
+    }
+    sections = {name: np.ascontiguousarray(data[name], dtype=dtype).tobytes() for name, dtype in ARRAYS.items()}
+    sections["meta"] = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+    sections["text_data"] = b"".join(blobs)
+
+    layout: List[int] = []
+    offset = _align(HEADER.size)
+    for name in SECTIONS:
+        layout += [offset, len(sections[name])]
+        offset = _align(offset + len(sections[name]))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(
+            MAGIC, VERSION, len(term_starts), len(terms),
+            len(columns["article_lengths"]), len(blobs), *layout
+        ))
+        for name, start in zip(SECTIONS, layout[::2]):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(sections[name])
+    os.replace(tmp_path, path)
+    return path
+
+
+class _Segment:
+    """mmap으로 여는 읽기 전용 세그먼트"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        fields = HEADER.unpack_from(self._mmap, 0)
+        if fields[0] != MAGIC or fields[1] != VERSION:
+            self.close()
+            raise ValueError(f"전문 검색 세그먼트 형식이 아닙니다: {path}")
+        self.term_count, self.posting_count, self.article_count, self.document_count = fields[2:6]
+        layout = fields[6:]
+        self._sections = {name: (layout[i * 2], layout[i * 2 + 1]) for i, name in enumerate(SECTIONS)}
+
+        for name, dtype in ARRAYS.items():
+            offset, length = self._sections[name]
+            setattr(self, name, np.frombuffer(
+                self._mmap, dtype=dtype, count=length // np.dtype(dtype).itemsize, offset=offset
+            ))
+        offset, length = self._sections["meta"]
+        meta = json.loads(self._mmap[offset:offset + length].decode("utf-8"))
+        self.documents: List[str] = meta["documents"]
+        self.numbers: List[str] = meta["numbers"]
+        self.concepts: List[str] = meta["concepts"]
+
+        self.deleted: Tuple[int, ...] = ()
+        self.live = np.ones(self.article_count, dtype=bool)
+        self._texts: "OrderedDict[int, str]" = OrderedDict()
+
+    def mark_deleted(self, deleted: Sequence[int]):
+        """삭제 표시된 문서의 조항을 검색 대상에서 제외"""
+        deleted = tuple(sorted(deleted))
+        if deleted != self.deleted:
+            self.deleted = deleted
+            self.live = ~np.isin(self.article_documents, np.asarray(deleted, dtype=np.uint32))
+
+    def close(self):
+        """mmap 해제"""
+        for name in ARRAYS:
+            self.__dict__.pop(name, None)
+        if getattr(self, "_mmap", None) is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                pass  # 아직 참조 중인 배열이 있으면 가비지 컬렉션에 맡김
+            self._mmap = None
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+            self._file = None
+
+    def postings(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """용어 위치 -> (조항 위치, 가중 빈도)"""
+        lo, hi = int(self.term_offsets[index]), int(self.term_offsets[index + 1])
+        return self.posting_articles[lo:hi], self.posting_weights[lo:hi]
+
+    def lookup(self, terms: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 n-gram별 용어 위치와 문서 빈도 (없으면 위치 -1, 빈도 0)"""
+        index = np.searchsorted(self.terms, terms)
+        clipped = np.minimum(index, max(self.term_count - 1, 0))
+        found = (index < self.term_count) & (self.terms[clipped] == terms) if self.term_count else np.zeros(len(terms), bool)
+        index = np.where(found, index, -1)
+        df = np.zeros(len(terms), dtype=np.int64)
+        df[found] = (self.term_offsets[index[found] + 1] - self.term_offsets[index[found]]).astype(np.int64)
+        return index, df
+
+    def blob(self, document: int) -> bytes:
+        """문서 압축 원문"""
+        base = self._sections["text_data"][0]
+        lo, hi = int(self.text_offsets[document]), int(self.text_offsets[document + 1])
+        return self._mmap[base + lo:base + hi]
+
+    def text(self, article: int) -> str:
+        """조항 원문 (문서 단위로 압축을 풀어 LRU 보관)"""
+        document = int(self.article_documents[article])
+        if document in self._texts:
+            self._texts.move_to_end(document)
+        else:
+            self._texts[document] = zlib.decompress(self.blob(document)).decode("utf-8")
+            if len(self._texts) > TEXT_CACHE_SIZE:
+                self._texts.popitem(last=False)
+        return self._texts[document][int(self.article_starts[article]):int(self.article_ends[article])]
+
+
+def _document_segment(document: LegalDocument, path: str) -> int:
+    """문서 하나로 세그먼트 작성 후 조항 수 반환"""
+    entities = document.entities
+    texts = [entity.text for entity in entities]
+    concepts = [entity.concept for entity in entities]
+
+    text_terms, text_articles, text_weights = _field_postings(texts, 1.0)
+    concept_terms, concept_articles, concept_weights = _field_postings(concepts, FULLTEXT_CONCEPT_WEIGHT)
+    articles = np.concatenate((text_articles, concept_articles))
+    weights = np.concatenate((text_weights, concept_weights))
+
+    lengths = np.cumsum([0] + [len(text) + 1 for text in texts])
+    _write_segment(
+        path,
+        np.concatenate((text_terms, concept_terms)), articles, weights,
+        {
+            "article_lengths": np.bincount(articles, weights=weights, minlength=len(entities)),
+            "article_documents": np.zeros(len(entities)),
+            "article_starts": lengths[:-1],
+            "article_ends": lengths[1:] - 1,
+        },
+        {
+            "documents": [document.title],
+            "numbers": [entity.article_number for entity in entities],
+            "concepts": concepts,
+        },
+        [zlib.compress("\n".join(texts).encode("utf-8"), 6)]
+    )
+    return len(entities)
+
+
+def snippet(text: str, terms: Sequence[str], width: int = SNIPPET_CHARS) -> str:
+    """질의 n-gram이 가장 많이 모인 구간 (앞뒤 생략 표시 포함)"""
+    lowered = text.lower()
+    hits: List[int] = []
+    for term in terms:
+        position = lowered.find(term)
+        while position >= 0 and len(hits) < 1000:
+            hits.append(position)
+            position = lowered.find(term, position + 1)
+    hits.sort()
+
+    best, best_count, lo = 0, 0, 0
+    for hi, position in enumerate(hits):
+        while position - hits[lo] >= width:
+            lo += 1
+        if hi - lo + 1 > best_count:
+            best, best_count = hits[lo], hi - lo + 1
+    start = max(0, min(best - width // 4, len(text) - width))
+    end = min(len(text), start + width)
+    body = re.sub(r'\s+', ' ', text[start:end]).strip()
+    return f"{'…' if start > 0 else ''}{body}{'…' if end < len(text) else ''}"
+
+
+# ----------------------------------------------------------------------
+# 색인
+# ----------------------------------------------------------------------
+
+class FullTextIndex:
+    """세그먼트 기반 조항 전문 검색 색인
+
+    Args:
+        directory: 세그먼트와 매니페스트 디렉토리 (기본: FULLTEXT_INDEX_DIR)
+        max_segments: 병합 전까지 유지할 최대 세그먼트 수 (기본: FULLTEXT_MAX_SEGMENTS)
+    """
+
+    def __init__(self, directory: str = None, max_segments: int = None):
+        self.directory = directory or FULLTEXT_INDEX_DIR
+        self.max_segments = max_segments or FULLTEXT_MAX_SEGMENTS
+        self._manifest = self._read_manifest()
+        self._segments: Dict[str, _Segment] = {}
+
+    # ------------------------------------------------------------------
+    # 매니페스트
+    # ------------------------------------------------------------------
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        path = os.path.join(self.directory, MANIFEST)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == VERSION:
+                return manifest
+        return {"version": VERSION, "next": 0, "segments": []}
+
+    def _write_manifest(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, MANIFEST)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _segment(self, entry: Dict[str, Any]) -> _Segment:
+        segment = self._segments.get(entry["file"])
+        if segment is None:
+            segment = self._segments[entry["file"]] = _Segment(os.path.join(self.directory, entry["file"]))
+        segment.mark_deleted(entry["deleted"])
+        return segment
+
+    def _drop(self, entry: Dict[str, Any]):
+        """세그먼트 파일 삭제"""
+        segment = self._segments.pop(entry["file"], None)
+        if segment is not None:
+            segment.close()
+        path = os.path.join(self.directory, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _mark_deleted(self, title: str) -> bool:
+        """같은 제목의 문서에 삭제 표시, 모두 삭제된 세그먼트는 파일째 제거"""
+        found = False
+        for entry in list(self._manifest["segments"]):
+            for i, name in enumerate(entry["documents"]):
+                if name == title and i not in entry["deleted"]:
+                    entry["deleted"].append(i)
+                    found = True
+            if len(entry["deleted"]) == len(entry["documents"]):
+                self._manifest["segments"].remove(entry)
+                self._drop(entry)
+        return found
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+
+    def add_document(self, document: LegalDocument) -> int:
+        """문서 조항을 새 세그먼트로 색인 (같은 제목의 이전 색인은 삭제 표시)
+
+        Returns:
+            색인한 조항 수
+        """
+        self._mark_deleted(document.title)
+        count = 0
+        if document.entities:
+            name = f"seg-{self._manifest['next']:06d}.fts"
+            self._manifest["next"] += 1
+            count = _document_segment(document, os.path.join(self.directory, name))
+            self._manifest["segments"].append({"file": name, "documents": [document.title], "deleted": []})
+            metrics.inc("kg_fulltext_indexed_articles_total", count)
+        if len(self._manifest["segments"]) > self.max_segments:
+            self.merge()
+        self._write_manifest()
+        return count
+
+    def remove_document(self, title: str) -> bool:
+        """문서 색인 삭제"""
+        found = self._mark_deleted(title)
+        if found:
+            self._write_manifest()
+        return found
+
+    def clear(self):
+        """색인 전체 삭제"""
+        for entry in self._manifest["segments"]:
+            self._drop(entry)
+        self._manifest = {"version": VERSION, "next": self._manifest["next"], "segments": []}
+        self._write_manifest()
+
+    def merge(self) -> Optional[str]:
+        """모든 세그먼트를 삭제 표시된 문서를 뺀 세그먼트 하나로 병합
+
+        Returns:
+            병합한 세그먼트 파일 이름 (세그먼트가 없으면 None)
+        """
+        entries = list(self._manifest["segments"])
+        if not entries:
+            return None
+
+        terms, articles, weights, columns = [], [], [], {name: [] for name in (
+            "article_lengths", "article_documents", "article_starts", "article_ends"
+        )}
+        meta: Dict[str, List[str]] = {"documents": [], "numbers": [], "concepts": []}
+        blobs: List[bytes] = []
+        for entry in entries:
+            segment = self._segment(entry)
+            live_documents = [i for i in range(segment.document_count) if i not in entry["deleted"]]
+            document_map = np.full(segment.document_count, -1, dtype=np.int64)
+            document_map[live_documents] = np.arange(len(live_documents)) + len(blobs)
+            article_map = np.cumsum(segment.live) - 1 + len(meta["numbers"])
+
+            posting_articles = segment.posting_articles.astype(np.int64)
+            keep = segment.live[posting_articles]
+            terms.append(np.repeat(segment.terms, np.diff(segment.term_offsets).astype(np.int64))[keep])
+            articles.append(article_map[posting_articles[keep]])
+            weights.append(np.asarray(segment.posting_weights)[keep])
+
+            live = segment.live
+            columns["article_lengths"].append(np.asarray(segment.article_lengths)[live])
+            columns["article_documents"].append(document_map[segment.article_documents[live]])
+            columns["article_starts"].append(np.asarray(segment.article_starts)[live])
+            columns["article_ends"].append(np.asarray(segment.article_ends)[live])
+            meta["documents"] += [segment.documents[i] for i in live_documents]
+            meta["numbers"] += [n for n, alive in zip(segment.numbers, live) if alive]
+            meta["concepts"] += [c for c, alive in zip(segment.concepts, live) if alive]
+            blobs += [bytes(segment.blob(i)) for i in live_documents]
+
+        name = f"seg-{self._manifest['next']:06d}.fts"
+        self._manifest["next"] += 1
+        _write_segment(
+            os.path.join(self.directory, name),
+            np.concatenate(terms), np.concatenate(articles), np.concatenate(weights),
+            {key: np.concatenate(values) for key, values in columns.items()},
+            meta, blobs
+        )
+        for entry in entries:
+            self._drop(entry)
+        self._manifest["segments"] = [{"file": name, "documents": meta["documents"], "deleted": []}]
+        self._write_manifest()
+        return name
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 10, document: str = None) -> List[Dict[str, Any]]:
+        """BM25 순위 조항 검색
+
+        Args:
+            query: 검색어 (띄어쓰기와 관계없이 글자 n-gram으로 비교)
+            limit: 최대 결과 수
+            document: 특정 문서(제목)로 한정
+
+        Returns:
+            [{document, article, concept, score, snippet}, ...] 점수 내림차순.
+            (document, article)은 GraphQueryService.article()로 조항을 조회하는 키입니다.
+        """
+        terms = query_terms(query)
+        if not len(terms) or limit <= 0:
+            return []
+
+        with metrics.timer("kg_fulltext_search_seconds"):
+            segments = [self._segment(entry) for entry in self._manifest["segments"]]
+            lookups = [segment.lookup(terms) for segment in segments]
+            total = sum(int(segment.live.sum()) for segment in segments)
+            if not total:
+                return []
+            avgdl = sum(float(segment.article_lengths[segment.live].sum()) for segment in segments) / total
+            df = np.sum([found_df for _, found_df in lookups], axis=0)
+            idf = np.log1p((total - df + 0.5) / (df + 0.5))
+
+            candidates: List[Tuple[float, int, int]] = []
+            for s, (segment, (index, _)) in enumerate(zip(segments, lookups)):
+                mask = segment.live
+                if document is not None:
+                    if document not in segment.documents:
+                        continue
+                    mask = mask & (segment.article_documents == segment.documents.index(document))
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * segment.article_lengths / avgdl)
+                scores = np.zeros(segment.article_count, dtype=np.float64)
+                for j in np.flatnonzero(index >= 0):
+                    posting_articles, tf = segment.postings(int(index[j]))
+                    scores[posting_articles] += idf[j] * tf * (BM25_K1 + 1) / (tf + norm[posting_articles])
+                scores[~mask] = 0
+                hits = np.flatnonzero(scores > 0)
+                if len(hits) > limit:
+                    hits = hits[np.argpartition(-scores[hits], limit - 1)[:limit]]
+                candidates += [(float(scores[a]), s, int(a)) for a in hits]
+
+            candidates.sort(key=lambda item: (-item[0], item[1], item[2]))
+            strings = [term_text(term) for term in terms]
+            return [
+                {
+                    "document": segments[s].documents[int(segments[s].article_documents[a])],
+                    "article": segments[s].numbers[a],
+                    "concept": segments[s].concepts[a],
+                    "score": round(score, 4),
+                    "snippet": snippet(segments[s].text(a), strings),
+                }
+                for score, s, a in candidates[:limit]
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        """색인 통계 (삭제 표시된 문서 제외)"""
+        segments = [self._segment(entry) for entry in self._manifest["segments"]]
+        return {
+            "documents": sum(len(entry["documents"]) - len(entry["deleted"]) for entry in self._manifest["segments"]),
+            "articles": sum(int(segment.live.sum()) for segment in segments),
+            "segments": len(segments),
+            "terms": sum(segment.term_count for segment in segments),
+        }
+
+    def close(self):
+        """열린 세그먼트 mmap 해제"""
+        for segment in self._segments.values():
+            segment.close()
+        self._segments = {}
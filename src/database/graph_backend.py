@@ -0,0 +1,28 @@
+"""그래프 백엔드 선택 (Memgraph / 내장 그래프)"""
+import os
+
+from database.embedded_graph import EmbeddedGraphClient
+
+
+def get_embedded_client(path: str = None) -> EmbeddedGraphClient:
+    """스냅샷 경로가 연결된 내장 그래프 클라이언트"""
+    return EmbeddedGraphClient(path or os.getenv("EMBEDDED_GRAPH_PATH", "data/embedded_graph.snapshot"))
+
+
+def get_graph_client(backend: str = None):
+    """
+    그래프 클라이언트 인스턴스 가져오기
+
+    Args:
+        backend: "memgraph" 또는 "embedded"
+                 None이면 환경변수 GRAPH_BACKEND 확인 (기본 memgraph)
+    """
+    backend = (backend or os.getenv("GRAPH_BACKEND", "memgraph")).lower()
+
+    if backend == "embedded":
+        return get_embedded_client()
+    if backend == "memgraph":
+        # neo4j 드라이버가 없는 환경에서도 내장 백엔드를 쓸 수 있도록 지연 임포트
+        from database.memgraph_client import MemgraphClient
+        return MemgraphClient()
+    raise ValueError(f"알 수 없는 그래프 백엔드: {backend}")
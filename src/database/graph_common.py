@@ -0,0 +1,16 @@
+"""그래프 백엔드(Memgraph, 내장 그래프) 공통 헬퍼"""
+import os
+from datetime import datetime
+
+# 주변 부분 그래프 확장에서 건너뛰는 허브 개체의 기준 차수 ("이 법"처럼 모든 문서가 공유하는 개체)
+NEIGHBORHOOD_MAX_DEGREE = int(os.getenv("NEIGHBORHOOD_MAX_DEGREE", "200"))
+
+
+def new_version() -> str:
+    """문서 버전 문자열 (저장 시각 기반, 사전순 = 시간순)"""
+    return datetime.now().strftime("%Y%m%d%H%M%S%f")
+
+
+def print_progress(stage: str, deleted: int, total: int):
+    """삭제 진행 상황 출력 (기본 progress 콜백)"""
+    print(f"   🗑️  {stage}: {deleted}개 삭제 (누적 {total})")
@@ -0,0 +1,179 @@
+"""조항 단위 그래프 조회 계층
+
+MemgraphClient / EmbeddedGraphClient 위에서 문서·조항 조회, k-hop 주변 부분 그래프,
+페이지 단위 조회를 제공하고, 자주 조회되는 결과를 그래프 버전 스탬프를 키로 하는
+LRU 캐시에 보관합니다. 그래프가 저장/삭제/교체되면 스탬프가 바뀌어 이전 캐시는 더 이상
+사용되지 않습니다.
+"""
+import copy
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.metrics import metrics
+
+# 캐시에 없음 (None도 캐시되는 조회 결과이므로 따로 구분)
+_MISSING = object()
+
+
+class GraphQueryService:
+    """캐시를 갖춘 조항 조회 서비스
+
+    Args:
+        client: MemgraphClient 또는 EmbeddedGraphClient
+        cache_size: LRU 캐시 항목 수 (기본: QUERY_CACHE_SIZE 또는 256, 0이면 캐시 안 함)
+        version_ttl: 그래프 버전 스탬프 재확인 간격(초). 이 시간 동안은 조회 한 번으로 응답합니다.
+            (기본: QUERY_VERSION_TTL 또는 1.0)
+    """
+
+    def __init__(self, client, cache_size: int = None, version_ttl: float = None):
+        self.client = client
+        self.cache_size = cache_size if cache_size is not None else int(os.getenv("QUERY_CACHE_SIZE", "256"))
+        self.version_ttl = version_ttl if version_ttl is not None else float(os.getenv("QUERY_VERSION_TTL", "1.0"))
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+
+    def graph_version(self) -> int:
+        """그래프 버전 스탬프 (version_ttl 동안 재사용)"""
+        if not self._version_fresh():
+            self._observe_version(self.client.graph_version())
+        return self._version
+
+    def _version_fresh(self) -> bool:
+        return self._version is not None and time.monotonic() - self._version_checked < self.version_ttl
+
+    def _observe_version(self, version: int):
+        """조회로 알게 된 버전 스탬프 반영 (바뀌었으면 캐시 비움)"""
+        if version != self._version:
+            self._cache.clear()
+            self._version = version
+        self._version_checked = time.monotonic()
+
+    def invalidate(self):
+        """캐시 비우기 (같은 프로세스에서 그래프를 수정한 직후 등)"""
+        self._cache.clear()
+        self._version = None
+
+    def _lookup(self, key: Optional[Tuple]):
+        """캐시 조회. 호출자가 결과를 고쳐도 캐시가 바뀌지 않도록 복사본을 반환 (없으면 _MISSING)"""
+        if key is not None and key in self._cache:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            metrics.inc("kg_query_cache_hits_total")
+            return copy.deepcopy(self._cache[key])
+        self.misses += 1
+        metrics.inc("kg_query_cache_misses_total")
+        return _MISSING
+
+    def _store(self, key: Tuple, value):
+        self._cache[key] = copy.deepcopy(value)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _cached(self, key: Tuple, loader):
+        if self.cache_size <= 0:
+            return loader()
+
+        key = (self.graph_version(),) + key
+        value = self._lookup(key)
+        if value is _MISSING:
+            value = loader()
+            self._store(key, value)
+        return value
+
+    def cache_info(self) -> Dict[str, int]:
+        """캐시 적중/미스 통계"""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache), "max_size": self.cache_size}
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def article(self, article_number: str, document: str = None) -> Optional[Dict[str, Any]]:
+        """조항 조회"""
+        return self._cached(
+            ("article", document, article_number),
+            lambda: self.client.query_article(article_number, document=document)
+        )
+
+    def relations(
+        self,
+        article_number: str,
+        document: str = None,
+        relation_types: List[str] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """조항에서 추출된 관계 한 페이지"""
+        types = tuple(sorted(relation_types)) if relation_types else None
+        return self._cached(
+            ("relations", document, article_number, types, limit, offset),
+            lambda: _page(
+                self.client.query_relations(
+                    article_number, document=document,
+                    relation_types=list(types) if types else None,
+                    limit=limit + 1, offset=offset
+                ),
+                limit, offset
+            )
+        )
+
+    def references(self, article_number: str, document: str = None) -> List[Dict[str, Any]]:
+        """조항에서 나가는/들어오는 법령 간 조항 참조"""
+        return self._cached(
+            ("references", document, article_number),
+            lambda: self.client.query_article_references(article_number, document=document)
+        )
+
+    def article_context(
+        self,
+        article_number: str,
+        document: str = None,
+        hops: int = 1,
+        relation_types: List[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """조항과 주변 부분 그래프 한 페이지
+
+        Returns:
+            {"article": 조항, "relations": 관계 목록, "offset", "limit", "has_more"}
+        """
+        types = tuple(sorted(relation_types)) if relation_types else None
+        key = ("context", document, article_number, hops, types, limit, offset)
+        # 버전 재확인 간격 안에서는 캐시만 보고, 지났으면 조회 결과의 스탬프로 버전을 갱신 (왕복 한 번)
+        if self.cache_size > 0:
+            page = self._lookup((self._version,) + key if self._version_fresh() else None)
+            if page is not _MISSING:
+                return page
+
+        with metrics.timer("kg_query_duration_seconds", query="article_context"):
+            context = self.client.query_article_context(
+                article_number, document=document, hops=hops,
+                relation_types=list(types) if types else None,
+                limit=limit + 1, offset=offset
+            )
+        page = _page(context["relations"], limit, offset)
+        page["article"] = context["article"]
+        if self.cache_size > 0:
+            self._observe_version(context["stamp"])
+            self._store((self._version,) + key, page)
+        return page
+
+
+def _page(rows: List[Dict[str, Any]], limit: int, offset: int) -> Dict[str, Any]:
+    """limit + 1개 조회 결과를 페이지로 변환"""
+    return {
+        "relations": rows[:limit],
+        "offset": offset,
+        "limit": limit,
+        "has_more": len(rows) > limit,
+    }
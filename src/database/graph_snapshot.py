@@ -0,0 +1,327 @@
+"""처리된 LegalDocument 그래프의 mmap 바이너리 스냅샷
+
+파일 구성 (리틀 엔디언, 각 섹션은 8바이트 정렬):
+    헤더        매직/버전/개수/섹션 오프셋
+    문자열 테이블  u32 오프셋 배열 + UTF-8 데이터
+    조항 배열     필드별 i32 문자열 ID 열 + 원문 위치(블록 ID, 시작, 끝)
+    개체 노드 배열  i32 이름 문자열 ID
+    간선 배열     출발/도착 노드, 관계, 조항 문자열 ID (i32) + 신뢰도 (f32)
+    원문 블록     zlib 압축 블록의 (오프셋, 길이) 인덱스 + 압축 데이터
+
+GraphSnapshot은 파일을 mmap으로 열고 배열을 memoryview로 직접 참조하므로 전체를
+역직렬화하지 않으며, 여러 프로세스가 같은 페이지 캐시를 공유합니다.
+"""
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional, Union
+
+from models.compact import CompactTriplet
+from models.schemas import LegalEntity, GraphTriplet, LegalDocument
+
+MAGIC = b"KGSNAP01"
+VERSION = 1
+NONE = -1
+
+# 원문 압축 블록 크기 (압축 해제 기준 바이트)
+TEXT_BLOCK_SIZE = 64 * 1024
+
+ARTICLE_COLUMNS = ("number", "concept", "subject", "action", "object")
+TEXT_COLUMNS = ("text_block", "text_start", "text_end")
+EDGE_COLUMNS = ("src", "dst", "relation", "article")
+
+SECTIONS = (
+    "string_offsets", "string_data",
+    *(f"article_{c}" for c in ARTICLE_COLUMNS),
+    *(f"article_{c}" for c in TEXT_COLUMNS),
+    "entity_names",
+    *(f"edge_{c}" for c in EDGE_COLUMNS),
+    "edge_confidence",
+    "block_offsets", "block_data",
+)
+
+# magic, version, 문자열/조항/개체/간선/블록 수, 제목/법령번호 문자열 ID, 섹션별 (오프셋, 길이)
+HEADER = struct.Struct(f"<8sI5Iii{len(SECTIONS) * 2}Q")
+
+
+class _StringTable:
+    def __init__(self):
+        self.values: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    def intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return NONE
+        sid = self.ids.get(value)
+        if sid is None:
+            sid = len(self.values)
+            self.values.append(value)
+            self.ids[value] = sid
+        return sid
+
+
+def _le_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def write_snapshot(document: LegalDocument, path: str) -> str:
+    """문서 그래프를 스냅샷 파일로 저장 (원자적 교체)"""
+    strings = _StringTable()
+    title = strings.intern(document.title)
+    law_number = strings.intern(document.law_number)
+
+    # 조항 열 + 원문 블록
+    columns = {c: array("i") for c in ARTICLE_COLUMNS + TEXT_COLUMNS}
+    blocks: List[bytes] = []
+    pending = bytearray()
+    for entity in document.entities:
+        for column in ARTICLE_COLUMNS:
+            field = "article_number" if column == "number" else column
+            columns[column].append(strings.intern(getattr(entity, field)))
+
+        text = entity.text.encode("utf-8")
+        if pending and len(pending) + len(text) > TEXT_BLOCK_SIZE:
+            blocks.append(zlib.compress(bytes(pending), 6))
+            pending = bytearray()
+        columns["text_block"].append(len(blocks))
+        columns["text_start"].append(len(pending))
+        pending.extend(text)
+        columns["text_end"].append(len(pending))
+    if pending:
+        blocks.append(zlib.compress(bytes(pending), 6))
+
+    # 개체 노드 + 간선
+    entity_names = array("i")
+    node_ids: Dict[int, int] = {}
+
+    def entity_node(name: str) -> int:
+        sid = strings.intern(name)
+        node = node_ids.get(sid)
+        if node is None:
+            node = node_ids[sid] = len(entity_names)
+            entity_names.append(sid)
+        return node
+
+    edges = {c: array("i") for c in EDGE_COLUMNS}
+    confidence = array("f")
+    for triplet in document.triplets:
+        edges["src"].append(entity_node(triplet.subject))
+        edges["dst"].append(entity_node(triplet.object))
+        edges["relation"].append(strings.intern(triplet.relation))
+        edges["article"].append(strings.intern(triplet.article_number))
+        confidence.append(triplet.confidence)
+
+    # 문자열 테이블
+    string_offsets = array("I", [0])
+    string_data = bytearray()
+    for value in strings.values:
+        string_data.extend(value.encode("utf-8"))
+        string_offsets.append(len(string_data))
+
+    block_offsets = array("Q", [0])
+    for block in blocks:
+        block_offsets.append(block_offsets[-1] + len(block))
+
+    payloads = {
+        "string_offsets": _le_bytes(string_offsets),
+        "string_data": bytes(string_data),
+        **{f"article_{c}": _le_bytes(columns[c]) for c in ARTICLE_COLUMNS + TEXT_COLUMNS},
+        "entity_names": _le_bytes(entity_names),
+        **{f"edge_{c}": _le_bytes(edges[c]) for c in EDGE_COLUMNS},
+        "edge_confidence": _le_bytes(confidence),
+        "block_offsets": _le_bytes(block_offsets),
+        "block_data": b"".join(blocks),
+    }
+
+    # 섹션 배치 (8바이트 정렬)
+    position = HEADER.size
+    layout = []
+    for name in SECTIONS:
+        position += -position % 8
+        layout.extend((position, len(payloads[name])))
+        position += len(payloads[name])
+
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        len(strings.values), len(document.entities), len(entity_names),
+        len(document.triplets), len(blocks),
+        title, law_number,
+        *layout
+    )
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        for i, name in enumerate(SECTIONS):
+            f.write(b"\0" * (layout[i * 2] - f.tell()))
+            f.write(payloads[name])
+    os.replace(tmp_path, path)
+    return path
+
+
+class GraphSnapshot:
+    """mmap으로 여는 읽기 전용 스냅샷
+
+    사용 예:
+        with GraphSnapshot("data/snapshots/law.kgsnap") as snapshot:
+            for triplet in snapshot.iter_triplets():
+                ...
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+
+        fields = HEADER.unpack_from(self._mmap, 0)
+        magic, version = fields[0], fields[1]
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"스냅샷 형식이 아닙니다: {path}")
+        (self.string_count, self.article_count, self.entity_count,
+         self.triplet_count, self.block_count, self._title, self._law_number) = fields[2:9]
+
+        layout = fields[9:]
+        self._sections = {
+            name: (layout[i * 2], layout[i * 2 + 1]) for i, name in enumerate(SECTIONS)
+        }
+
+        self._string_offsets = self._array("string_offsets", "I")
+        self._columns = {
+            c: self._array(f"article_{c}", "i") for c in ARTICLE_COLUMNS + TEXT_COLUMNS
+        }
+        self._entity_names = self._array("entity_names", "i")
+        self._edges = {c: self._array(f"edge_{c}", "i") for c in EDGE_COLUMNS}
+        self._confidence = self._array("edge_confidence", "f")
+        self._block_offsets = self._array("block_offsets", "Q")
+
+        self._cached_block: Optional[int] = None
+        self._cached_block_data = b""
+        self._article_index: Optional[Dict[str, List[int]]] = None
+
+    def _raw(self, name: str) -> memoryview:
+        offset, length = self._sections[name]
+        return self._view[offset:offset + length]
+
+    def _array(self, name: str, typecode: str):
+        raw = self._raw(name)
+        if sys.byteorder == "little":
+            return raw.cast(typecode)
+        values = array(typecode, raw.tobytes())
+        values.byteswap()
+        return values
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """mmap 해제"""
+        for name in ("_string_offsets", "_entity_names", "_confidence", "_block_offsets"):
+            view = self.__dict__.pop(name, None)
+            if isinstance(view, memoryview):
+                view.release()
+        for group in ("_columns", "_edges"):
+            for view in self.__dict__.pop(group, {}).values():
+                if isinstance(view, memoryview):
+                    view.release()
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_mmap", None) is not None:
+            self._mmap.close()
+            self._mmap = None
+        if getattr(self, "_file", None) is not None:
+            self._file.close()
+            self._file = None
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+
+    def string(self, sid: int) -> Optional[str]:
+        """문자열 ID -> 문자열"""
+        if sid == NONE:
+            return None
+        base = self._sections["string_data"][0]
+        start, end = self._string_offsets[sid], self._string_offsets[sid + 1]
+        return str(self._mmap[base + start:base + end], "utf-8")
+
+    @property
+    def title(self) -> str:
+        return self.string(self._title)
+
+    @property
+    def law_number(self) -> str:
+        return self.string(self._law_number)
+
+    def article_text(self, index: int) -> str:
+        """index번째 조항 원문 (해당 압축 블록만 해제)"""
+        block = self._columns["text_block"][index]
+        if block != self._cached_block:
+            base = self._sections["block_data"][0]
+            start, end = self._block_offsets[block], self._block_offsets[block + 1]
+            self._cached_block_data = zlib.decompress(self._mmap[base + start:base + end])
+            self._cached_block = block
+        start, end = self._columns["text_start"][index], self._columns["text_end"][index]
+        return self._cached_block_data[start:end].decode("utf-8")
+
+    def article(self, index: int, with_text: bool = True) -> LegalEntity:
+        """index번째 조항 개체"""
+        values = {
+            ("article_number" if c == "number" else c): self.string(self._columns[c][index])
+            for c in ARTICLE_COLUMNS
+        }
+        # 스냅샷에는 검증된 값만 저장되므로 다시 검증하지 않음
+        return LegalEntity.model_construct(full_text=self.article_text(index) if with_text else "", **values)
+
+    def find_articles(self, article_number: str) -> List[int]:
+        """조항 번호로 조항 인덱스 조회 (첫 호출 시 인덱스 생성)"""
+        if self._article_index is None:
+            index: Dict[str, List[int]] = {}
+            numbers = self._columns["number"]
+            for i in range(self.article_count):
+                index.setdefault(self.string(numbers[i]), []).append(i)
+            self._article_index = index
+        return self._article_index.get(article_number, [])
+
+    def triplet(self, index: int, compact: bool = False) -> Union[GraphTriplet, CompactTriplet]:
+        """index번째 간선 (compact=True면 경량 표현)"""
+        values = dict(
+            subject=self.string(self._entity_names[self._edges["src"][index]]),
+            relation=self.string(self._edges["relation"][index]),
+            object=self.string(self._entity_names[self._edges["dst"][index]]),
+            article_number=self.string(self._edges["article"][index]),
+            confidence=round(self._confidence[index], 6)
+        )
+        return CompactTriplet(**values) if compact else GraphTriplet.model_construct(**values)
+
+    def iter_triplets(self, compact: bool = False) -> Iterator[Union[GraphTriplet, CompactTriplet]]:
+        for i in range(self.triplet_count):
+            yield self.triplet(i, compact=compact)
+
+    def iter_articles(self, with_text: bool = True) -> Iterator[LegalEntity]:
+        for i in range(self.article_count):
+            yield self.article(i, with_text=with_text)
+
+    def to_document(self) -> LegalDocument:
+        """전체를 LegalDocument로 복원 (content는 조항 원문을 결합)"""
+        entities = list(self.iter_articles())
+        return LegalDocument(
+            title=self.title,
+            law_number=self.law_number,
+            content="\n\n".join(entity.full_text for entity in entities),
+            entities=entities,
+            triplets=list(self.iter_triplets())
+        )
@@ -0,0 +1,210 @@
+"""그래프 대량 내보내기/가져오기 (CSV, JSONL, Parquet)
+
+Document / Article / Entity / RELATION을 종류별 파일(documents.csv, articles.csv, ...)로
+청크 단위 스트리밍하여 메모리 사용량이 그래프 크기와 무관하게 유지됩니다.
+가져오기는 Memgraph의 LOAD CSV(서버에서 파일을 직접 읽음) 또는 UNWIND 배치,
+내장 그래프의 배열 직접 적재를 사용하므로 save_document를 반복하는 것보다 훨씬 빠릅니다.
+
+Parquet는 pyarrow가 설치된 경우에만 사용할 수 있습니다.
+"""
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# 종류별 열 (가져오기 순서대로)
+EXPORT_FIELDS = {
+    "documents": ("title", "law_number", "version", "created_at"),
+    "articles": ("document", "version", "number", "concept", "subject", "action", "object", "full_text"),
+    "entities": ("name",),
+    "relations": ("subject", "object", "type", "confidence", "article", "document", "version"),
+}
+FORMATS = {"csv": "csv", "jsonl": "jsonl", "parquet": "parquet"}
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def export_path(directory: str, kind: str, fmt: str) -> str:
+    return os.path.join(directory, f"{kind}.{FORMATS[fmt]}")
+
+
+def _document_key(kind: str, row: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """행이 속한 (문서 제목, 버전) (개체 행은 문서에 속하지 않음)"""
+    if kind == "documents":
+        return row.get("title"), row.get("version")
+    if kind in ("articles", "relations"):
+        return row.get("document"), row.get("version")
+    return None
+
+
+# ----------------------------------------------------------------------
+# 포맷별 쓰기/읽기
+# ----------------------------------------------------------------------
+
+def _write_csv(path: str, fields, chunks: Iterable[List[Dict[str, Any]]]) -> int:
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+        for rows in chunks:
+            writer.writerows(rows)
+            count += len(rows)
+    return count
+
+
+def _read_csv(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    with open(path, newline="", encoding="utf-8") as f:
+        chunk = []
+        for row in csv.DictReader(f):
+            row = {key: (value if value != "" else None) for key, value in row.items()}
+            if row.get("confidence") is not None:
+                row["confidence"] = float(row["confidence"])
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _write_jsonl(path: str, fields, chunks: Iterable[List[Dict[str, Any]]]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rows in chunks:
+            f.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+            count += len(rows)
+    return count
+
+
+def _read_jsonl(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    with open(path, encoding="utf-8") as f:
+        chunk = []
+        for line in f:
+            if line.strip():
+                chunk.append(json.loads(line))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise ImportError("Parquet 형식을 사용하려면 pyarrow를 설치하세요: pip install pyarrow")
+
+
+def _write_parquet(path: str, fields, chunks: Iterable[List[Dict[str, Any]]]) -> int:
+    pa = _pyarrow()
+    schema = pa.schema([
+        (field, pa.float64() if field == "confidence" else pa.string()) for field in fields
+    ])
+    count = 0
+    with pa.parquet.ParquetWriter(path, schema) as writer:
+        for rows in chunks:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+            count += len(rows)
+    return count
+
+
+def _read_parquet(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    pa = _pyarrow()
+    for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+        yield batch.to_pylist()
+
+
+WRITERS: Dict[str, Callable] = {"csv": _write_csv, "jsonl": _write_jsonl, "parquet": _write_parquet}
+READERS: Dict[str, Callable] = {"csv": _read_csv, "jsonl": _read_jsonl, "parquet": _read_parquet}
+
+
+# ----------------------------------------------------------------------
+# 내보내기 / 가져오기
+# ----------------------------------------------------------------------
+
+def export_graph(client, directory: str, fmt: str = "csv", chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+    """그래프를 종류별 파일로 내보내기
+
+    Args:
+        client: MemgraphClient 또는 EmbeddedGraphClient (export_rows 제공)
+        directory: 출력 디렉토리
+        fmt: "csv" | "jsonl" | "parquet"
+        chunk_size: 한 번에 읽고 쓰는 행 수
+
+    Returns:
+        종류별 내보낸 행 수
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+    os.makedirs(directory, exist_ok=True)
+
+    counts = {}
+    for kind, fields in EXPORT_FIELDS.items():
+        path = export_path(directory, kind, fmt)
+        counts[kind] = WRITERS[fmt](path, fields, client.export_rows(kind, chunk_size))
+        print(f"📤 {kind}: {counts[kind]}개 -> {path}")
+    return counts
+
+
+def import_graph(
+    client,
+    directory: str,
+    fmt: str = "csv",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    server_directory: str = None
+) -> Dict[str, int]:
+    """내보낸 파일을 그래프에 적재
+
+    Args:
+        client: MemgraphClient 또는 EmbeddedGraphClient (import_rows 제공)
+        directory: export_graph 출력 디렉토리
+        fmt: "csv" | "jsonl" | "parquet"
+        chunk_size: 배치 크기
+        server_directory: Memgraph 서버에서 보이는 같은 디렉토리 경로.
+            지정하면 CSV를 LOAD CSV로 서버가 직접 읽습니다.
+
+    대상 그래프에 같은 (제목, 버전)의 문서가 이미 있으면 그 문서와 조항·관계는 가져오지 않습니다.
+
+    Returns:
+        종류별 적재한 행 수 (건너뛴 행 제외)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"지원하지 않는 형식: {fmt}")
+
+    # 대상에 이미 있는 (제목, 버전)의 문서는 조항·관계까지 건너뜀 (같은 내보내기를 다시 가져와도 중복 없음)
+    existing = client.document_versions()
+    skipped: Set[Tuple[str, str]] = set()
+    documents_path = export_path(directory, "documents", fmt)
+    if existing and os.path.exists(documents_path):
+        skipped = {
+            key for rows in READERS[fmt](documents_path, chunk_size)
+            for key in (_document_key("documents", row) for row in rows) if key in existing
+        }
+        if skipped:
+            print(f"⏭️  이미 있는 문서 {len(skipped)}개 건너뜀: "
+                  + ", ".join(f"{title} ({version})" for title, version in sorted(skipped, key=str)))
+
+    counts = {}
+    for kind in EXPORT_FIELDS:
+        path = export_path(directory, kind, fmt)
+        if not os.path.exists(path):
+            counts[kind] = 0
+            continue
+
+        # 서버가 파일을 직접 읽으면 행을 거를 수 없으므로 건너뛸 문서가 있으면 배치 적재
+        if server_directory and fmt == "csv" and hasattr(client, "load_csv") and not skipped:
+            counts[kind] = client.load_csv(kind, export_path(server_directory, kind, fmt))
+        else:
+            counts[kind] = 0
+            for rows in READERS[fmt](path, chunk_size):
+                if skipped:
+                    rows = [row for row in rows if _document_key(kind, row) not in skipped]
+                if rows:
+                    client.import_rows(kind, rows)
+                counts[kind] += len(rows)
+        print(f"📥 {kind}: {counts[kind]}개 <- {path}")
+
+    client.finish_import()
+    return counts
@@ -0,0 +1,288 @@
+"""SQLite 기반 내구성 작업 큐 (조항 단위 분산 처리용)"""
+import json
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class QueueJob(BaseModel):
+    """큐에서 임대(lease)된 작업"""
+    id: int = Field(description="작업 ID")
+    run_id: str = Field(description="실행(문서) ID")
+    kind: str = Field(description="작업 종류 (entity / relation)")
+    key: str = Field(description="실행 내 작업 키 (조항 순번)")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="작업 입력")
+    attempts: int = Field(default=0, description="시도 횟수")
+    lease_token: str = Field(description="임대 토큰")
+
+
+class SQLiteJobQueue:
+    """SQLite 파일을 브로커로 사용하는 작업 큐
+
+    여러 프로세스/호스트의 워커가 같은 파일을 공유하며 작업을 가져갑니다.
+    - 임대(lease): 가져간 작업은 lease_seconds 동안 다른 워커에게 보이지 않습니다.
+    - 재시도: 실패하거나 임대가 만료된 작업은 max_attempts까지 다시 배정됩니다.
+    - 멱등 완료: 같은 작업을 두 번 완료해도 첫 번째 결과만 저장됩니다.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        lease_seconds: float = None,
+        max_attempts: int = None,
+        retry_backoff: float = 2.0
+    ):
+        self.path = path or os.getenv("JOB_QUEUE_PATH", "data/job_queue.sqlite3")
+        self.lease_seconds = lease_seconds or float(os.getenv("JOB_LEASE_SECONDS", "300"))
+        self.max_attempts = max_attempts or int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+        self.retry_backoff = retry_backoff
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_schema(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    available_at REAL NOT NULL DEFAULT 0,
+                    lease_until REAL,
+                    lease_token TEXT,
+                    worker_id TEXT,
+                    result TEXT,
+                    error TEXT,
+                    updated_at REAL NOT NULL,
+                    UNIQUE (run_id, kind, key)
+                )
+            """)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_ready ON jobs (status, kind, available_at)"
+            )
+        finally:
+            conn.close()
+
+    def enqueue(self, run_id: str, kind: str, key: str, payload: Dict[str, Any]) -> bool:
+        """작업 추가 (같은 run_id/kind/key가 이미 있으면 무시)
+
+        Returns:
+            새로 추가되었으면 True
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute("""
+                INSERT OR IGNORE INTO jobs (run_id, kind, key, payload, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, (run_id, kind, key, json.dumps(payload, ensure_ascii=False), time.time()))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def enqueue_many(self, run_id: str, kind: str, items: List[tuple]) -> int:
+        """여러 작업 일괄 추가
+
+        Args:
+            items: (key, payload) 튜플 리스트
+
+        Returns:
+            새로 추가된 작업 수
+        """
+        now = time.time()
+        rows = [
+            (run_id, kind, key, json.dumps(payload, ensure_ascii=False), now)
+            for key, payload in items
+        ]
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany("""
+                INSERT OR IGNORE INTO jobs (run_id, kind, key, payload, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("COMMIT")
+            return conn.total_changes - before
+        finally:
+            conn.close()
+
+    def lease(self, worker_id: str, kinds: Optional[List[str]] = None) -> Optional[QueueJob]:
+        """처리 가능한 작업 하나를 임대
+
+        대기 중인 작업과 임대가 만료된 작업을 대상으로 합니다.
+        """
+        now = time.time()
+        kind_filter = ""
+        params: List[Any] = [now, now, self.max_attempts]
+        if kinds:
+            kind_filter = f"AND kind IN ({','.join('?' for _ in kinds)})"
+            params.extend(kinds)
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(f"""
+                SELECT * FROM jobs
+                WHERE (
+                    (status = 'pending' AND available_at <= ?)
+                    OR (status = 'leased' AND lease_until < ?)
+                )
+                AND attempts < ?
+                {kind_filter}
+                ORDER BY available_at, id
+                LIMIT 1
+            """, params).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            token = uuid.uuid4().hex
+            conn.execute("""
+                UPDATE jobs
+                SET status = 'leased', attempts = attempts + 1, lease_until = ?,
+                    lease_token = ?, worker_id = ?, updated_at = ?
+                WHERE id = ?
+            """, (now + self.lease_seconds, token, worker_id, now, row["id"]))
+            conn.execute("COMMIT")
+
+            return QueueJob(
+                id=row["id"],
+                run_id=row["run_id"],
+                kind=row["kind"],
+                key=row["key"],
+                payload=json.loads(row["payload"]),
+                attempts=row["attempts"] + 1,
+                lease_token=token
+            )
+        finally:
+            conn.close()
+
+    def extend_lease(self, job: QueueJob) -> bool:
+        """임대 연장 (오래 걸리는 작업용 하트비트)"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute("""
+                UPDATE jobs SET lease_until = ?, updated_at = ?
+                WHERE id = ? AND status = 'leased' AND lease_token = ?
+            """, (time.time() + self.lease_seconds, time.time(), job.id, job.lease_token))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job: QueueJob, result: Any) -> bool:
+        """작업 완료 처리 (멱등)
+
+        임대가 만료되어 다른 워커가 다시 가져간 경우에도 먼저 도착한 결과를 인정하고,
+        이미 완료된 작업에 대한 중복 완료는 무시합니다.
+
+        Returns:
+            결과가 저장되었으면 True, 이미 완료된 작업이면 False
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute("""
+                UPDATE jobs
+                SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ?
+                WHERE id = ? AND status IN ('pending', 'leased')
+            """, (json.dumps(result, ensure_ascii=False), time.time(), job.id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def fail(self, job: QueueJob, error: str):
+        """작업 실패 처리
+
+        시도 횟수가 남아 있으면 지수 백오프 후 재시도되도록 대기 상태로 되돌리고,
+        모두 소진했으면 failed 상태로 확정합니다.
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            if job.attempts >= self.max_attempts:
+                conn.execute("""
+                    UPDATE jobs SET status = 'failed', error = ?, lease_until = NULL, updated_at = ?
+                    WHERE id = ? AND status = 'leased' AND lease_token = ?
+                """, (error, now, job.id, job.lease_token))
+            else:
+                delay = self.retry_backoff ** (job.attempts - 1)
+                conn.execute("""
+                    UPDATE jobs
+                    SET status = 'pending', error = ?, available_at = ?, lease_until = NULL,
+                        updated_at = ?
+                    WHERE id = ? AND status = 'leased' AND lease_token = ?
+                """, (error, now + delay, now, job.id, job.lease_token))
+        finally:
+            conn.close()
+
+    def counts(self, run_id: str, kind: Optional[str] = None) -> Dict[str, int]:
+        """상태별 작업 수 (임대 만료 후 재시도 한도를 넘긴 작업은 failed로 집계)"""
+        query = """
+            SELECT
+                CASE
+                    WHEN status = 'leased' AND lease_until < ? AND attempts >= ? THEN 'failed'
+                    ELSE status
+                END AS effective_status,
+                count(*) AS n
+            FROM jobs WHERE run_id = ?
+        """
+        params: List[Any] = [time.time(), self.max_attempts, run_id]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        query += " GROUP BY effective_status"
+
+        conn = self._connect()
+        try:
+            return {row["effective_status"]: row["n"] for row in conn.execute(query, params)}
+        finally:
+            conn.close()
+
+    def results(self, run_id: str, kind: str) -> Dict[str, Any]:
+        """완료된 작업 결과 (key -> result)"""
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT key, result FROM jobs
+                WHERE run_id = ? AND kind = ? AND status = 'done'
+            """, (run_id, kind))
+            return {row["key"]: json.loads(row["result"]) for row in rows}
+        finally:
+            conn.close()
+
+    def failures(self, run_id: str, kind: Optional[str] = None) -> Dict[str, str]:
+        """재시도 한도를 넘긴 작업의 오류 메시지 (key -> error)"""
+        query = """
+            SELECT key, kind, error FROM jobs
+            WHERE run_id = ?
+            AND (status = 'failed' OR (status = 'leased' AND lease_until < ? AND attempts >= ?))
+        """
+        params: List[Any] = [run_id, time.time(), self.max_attempts]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+
+        conn = self._connect()
+        try:
+            return {
+                row["key"]: row["error"] or "lease expired"
+                for row in conn.execute(query, params)
+            }
+        finally:
+            conn.close()
@@ -1,7 +1,146 @@
+import base64
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple
 from neo4j import GraphDatabase
-from src.models.schemas import LegalDocument
+from models.schemas import LegalDocument
+from database.graph_common import NEIGHBORHOOD_MAX_DEGREE, new_version, print_progress
+from utils.text_store import text_store
+
+
+def _blob_rows(hashes) -> List[Dict[str, Any]]:
+    """TextBlob 노드 행 (압축 원문을 base64 문자열로)"""
+    return [
+        {"hash": key, "data": base64.b64encode(text_store.compressed(key)).decode("ascii")}
+        for key in sorted(set(hashes))
+    ]
+
+
+def build_save_parameters(document: LegalDocument) -> Dict[str, Any]:
+    """save_document에서 사용할 쿼리 파라미터 구성 (UNWIND용 행 리스트)
+    
+    조항 원문은 TextBlob(압축 원문)으로 한 번만 저장하고 조항에는 (해시, 구간)만 둡니다.
+    저장소 참조가 없는 조항은 원문을 이어 붙여 하나의 TextBlob으로 만듭니다.
+    """
+    packed = iter(text_store.pack([e.full_text for e in document.entities if e.text_ref is None]))
+    refs = [entity.text_ref or next(packed) for entity in document.entities]
+    return {
+        "document": {
+            "title": document.title,
+            "law_number": document.law_number,
+        },
+        "articles": [
+            {
+                "number": entity.article_number,
+                "concept": entity.concept,
+                "subject": entity.subject,
+                "action": entity.action,
+                "object": entity.object,
+                "text_hash": ref.hash,
+                "text_start": ref.start,
+                "text_end": ref.end,
+            }
+            for entity, ref in zip(document.entities, refs)
+        ],
+        "blobs": _blob_rows(ref.hash for ref in refs),
+        "triplets": [
+            {
+                "article_number": triplet.article_number,
+                "subject": triplet.subject,
+                "object": triplet.object,
+                "relation": triplet.relation,
+                "confidence": triplet.confidence,
+            }
+            for triplet in document.triplets
+        ],
+    }
+
+
+def _batches(rows: List[Dict[str, Any]], size: int):
+    """행 리스트를 size 단위로 분할"""
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+# 대량 내보내기 쿼리 (graph_transfer.EXPORT_FIELDS 열 순서)
+EXPORT_QUERIES = {
+    "documents": """
+        MATCH (d:Document)
+        RETURN d.title AS title, d.law_number AS law_number, d.version AS version,
+               toString(d.created_at) AS created_at
+    """,
+    "articles": """
+        MATCH (d:Document)-[:CONTAINS]->(a:Article)
+        RETURN d.title AS document, d.version AS version, a.number AS number, a.concept AS concept,
+               a.subject AS subject, a.action AS action, a.object AS object, a.full_text AS full_text,
+               a.text_hash AS text_hash, a.text_start AS text_start, a.text_end AS text_end
+    """,
+    "entities": """
+        MATCH (e:Entity)
+        RETURN e.name AS name
+    """,
+    "relations": """
+        MATCH (s:Entity)-[r:RELATION]->(o:Entity)
+        RETURN s.name AS subject, o.name AS object, r.type AS type, r.confidence AS confidence,
+               r.article AS article, r.document AS document, r.version AS version
+    """,
+}
+
+# 대량 가져오기 쿼리 본문 (앞에 UNWIND $rows AS row 또는 LOAD CSV ... AS row가 붙음)
+IMPORT_QUERIES = {
+    "documents": """
+        CREATE (:Document {
+            title: row.title,
+            law_number: row.law_number,
+            version: row.version,
+            current: true,
+            created_at: CASE WHEN row.created_at IS NULL THEN localdatetime()
+                        ELSE localdatetime(row.created_at) END
+        })
+    """,
+    "articles": """
+        MATCH (d:Document {title: row.document, version: row.version})
+        CREATE (a:Article {
+            document: row.document,
+            version: row.version,
+            number: row.number,
+            concept: row.concept,
+            subject: row.subject,
+            action: row.action,
+            object: row.object,
+            full_text: row.full_text,
+            text_hash: row.text_hash,
+            text_start: row.text_start,
+            text_end: row.text_end
+        })
+        CREATE (d)-[:CONTAINS]->(a)
+        WITH a, row WHERE row.text_hash IS NOT NULL
+        MATCH (b:TextBlob {hash: row.text_hash})
+        CREATE (a)-[:TEXT]->(b)
+    """,
+    "entities": """
+        MERGE (:Entity {name: row.name})
+    """,
+    "relations": """
+        MATCH (s:Entity {name: row.subject}), (o:Entity {name: row.object})
+        CREATE (s)-[:RELATION {
+            type: row.type,
+            confidence: toFloat(row.confidence),
+            article: row.article,
+            document: row.document,
+            version: row.version
+        }]->(o)
+        WITH s, row
+        OPTIONAL MATCH (a:Article {document: row.document, version: row.version, number: row.article})
+        FOREACH (_ IN CASE WHEN a IS NULL THEN [] ELSE [1] END | MERGE (a)-[:MENTIONS]->(s))
+    """,
+}
+
+COUNT_QUERIES = {
+    "documents": "MATCH (d:Document) RETURN count(d) AS n",
+    "articles": "MATCH (a:Article) RETURN count(a) AS n",
+    "entities": "MATCH (e:Entity) RETURN count(e) AS n",
+    "relations": "MATCH ()-[r:RELATION]->() RETURN count(r) AS n",
+}
 
 
 class MemgraphClient:
@@ -12,24 +151,163 @@ class MemgraphClient:
         host: str = None,
         port: int = None,
         username: str = "",
-        password: str = ""
+        password: str = "",
+        batch_size: int = None
     ):
         self.host = host or os.getenv("MEMGRAPH_HOST", "memgraph")
         self.port = port or int(os.getenv("MEMGRAPH_PORT", "7687"))
         self.username = username or os.getenv("MEMGRAPH_USERNAME", "")
         self.password = password or os.getenv("MEMGRAPH_PASSWORD", "")
+        self.batch_size = batch_size or int(os.getenv("MEMGRAPH_BATCH_SIZE", "1000"))
         
         # Neo4j 드라이버 (Bolt 프로토콜 - Memgraph 호환)
         uri = f"bolt://{self.host}:{self.port}"
         auth = (self.username, self.password) if self.username else None
         self.driver = GraphDatabase.driver(uri, auth=auth)
     
-    def clear_database(self):
-        """데이터베이스 초기화"""
+    def clear_database(self, progress: Callable[[str, int, int], None] = print_progress):
+        """데이터베이스 초기화 (batch_size 단위 트랜잭션으로 나누어 삭제)"""
         with self.driver.session() as session:
-            session.run("MATCH (n) DETACH DELETE n")
+            self._delete_in_batches(session, "노드", """
+                MATCH (n)
+                WITH n LIMIT $limit
+                DETACH DELETE n
+                RETURN count(*) AS deleted
+            """, progress)
+            self._reset_statistics(session)
         print("🗑️  데이터베이스 초기화 완료")
     
+    def _delete_in_batches(self, session, stage: str, query: str,
+                           progress: Optional[Callable[[str, int, int], None]], **params) -> int:
+        """삭제 쿼리를 결과가 0이 될 때까지 반복 (쿼리마다 별도 트랜잭션)"""
+        total = 0
+        while True:
+            deleted = session.run(query, limit=self.batch_size, **params).single()["deleted"]
+            if not deleted:
+                return total
+            total += deleted
+            if progress:
+                progress(stage, deleted, total)
+    
+    def delete_document(
+        self,
+        title: str,
+        version: str = None,
+        keep_version: str = None,
+        progress: Callable[[str, int, int], None] = print_progress
+    ) -> Dict[str, int]:
+        """문서 단위 삭제 (다른 문서는 유지)
+        
+        관계 → 조항 → 고아 개체 → 문서 순으로 batch_size씩 나누어 삭제하므로
+        한 트랜잭션이 그래프 전체를 잡지 않습니다.
+        
+        Args:
+            title: 문서 제목
+            version: 지정 시 해당 버전만 삭제
+            keep_version: 지정 시 해당 버전을 제외한 나머지 버전 삭제
+            progress: 배치마다 (단계, 삭제 수, 누적) 으로 호출되는 콜백
+        
+        Returns:
+            단계별 삭제 개수
+        """
+        scope = dict(title=title, version=version, keep_version=keep_version)
+        version_filter = """
+            ($version IS NULL OR {alias}.version = $version)
+            AND ($keep_version IS NULL OR coalesce({alias}.version, '') <> $keep_version)
+        """
+        counts = {"relations": 0, "entities": 0, "articles": 0, "documents": 0}
+        
+        with self.driver.session() as session:
+            # 1. 관계 삭제 (끝점 개체 이름 수집)
+            touched = set()
+            while True:
+                record = session.run(f"""
+                    MATCH (s:Entity)-[r:RELATION {{document: $title}}]->(o:Entity)
+                    WHERE {version_filter.format(alias="r")}
+                    WITH s, r, o LIMIT $limit
+                    DELETE r
+                    RETURN count(*) AS deleted, collect(DISTINCT s.name) + collect(DISTINCT o.name) AS names
+                """, limit=self.batch_size, **scope).single()
+                if not record["deleted"]:
+                    break
+                touched.update(record["names"])
+                counts["relations"] += record["deleted"]
+                if progress:
+                    progress("관계", record["deleted"], counts["relations"])
+            
+            # 2. 조항 삭제 (MENTIONS/TEXT 간선 포함)
+            hashes = session.run(f"""
+                MATCH (a:Article {{document: $title}})
+                WHERE {version_filter.format(alias="a")} AND a.text_hash IS NOT NULL
+                RETURN collect(DISTINCT a.text_hash) AS hashes
+            """, **scope).single()["hashes"]
+            counts["articles"] = self._delete_in_batches(session, "조항", f"""
+                MATCH (a:Article {{document: $title}})
+                WHERE {version_filter.format(alias="a")}
+                WITH a LIMIT $limit
+                DETACH DELETE a
+                RETURN count(*) AS deleted
+            """, progress, **scope)
+            
+            # 3. 다른 관계가 없는 개체 삭제
+            for names in _batches(sorted(touched), self.batch_size):
+                deleted = session.run("""
+                    UNWIND $names AS name
+                    MATCH (e:Entity {name: name})
+                    WHERE NOT (e)--()
+                    DELETE e
+                    RETURN count(*) AS deleted
+                """, names=names).single()["deleted"]
+                counts["entities"] += deleted
+                if progress and deleted:
+                    progress("개체", deleted, counts["entities"])
+            
+            # 다른 조항(다른 버전 포함)이 참조하지 않는 원문 삭제
+            session.run("""
+                UNWIND $hashes AS hash
+                MATCH (b:TextBlob {hash: hash})
+                WHERE NOT (b)<-[:TEXT]-()
+                DELETE b
+            """, hashes=hashes)
+            
+            # 4. 문서 노드 삭제
+            counts["documents"] = session.run(f"""
+                MATCH (d:Document {{title: $title}})
+                WHERE {version_filter.format(alias="d")}
+                DETACH DELETE d
+                RETURN count(*) AS deleted
+            """, **scope).single()["deleted"]
+            
+            # 5. 통계 카운터 감소
+            self._update_statistics(session, **{key: -value for key, value in counts.items()})
+        
+        print(f"🗑️  '{title}' 삭제 완료 - 문서: {counts['documents']}, 조항: {counts['articles']}, "
+              f"관계: {counts['relations']}, 개체: {counts['entities']}")
+        return counts
+    
+    def replace_document(
+        self,
+        document: LegalDocument,
+        progress: Callable[[str, int, int], None] = print_progress
+    ) -> str:
+        """같은 제목의 문서를 새 버전으로 교체
+        
+        새 버전을 모두 저장하고 current 표시를 한 트랜잭션에서 넘긴 뒤 이전 버전을 삭제하므로,
+        교체 중에도 조회 측에서 문서가 비어 보이지 않습니다.
+        
+        Returns:
+            새 버전 문자열
+        """
+        version = self.save_document(document, current=False)
+        with self.driver.session() as session:
+            session.run("""
+                MATCH (d:Document {title: $title})
+                SET d.current = (d.version = $version)
+            """, title=document.title, version=version)
+            self._update_statistics(session)
+        self.delete_document(document.title, keep_version=version, progress=progress)
+        return version
+    
     def create_indexes(self):
         """인덱스 생성"""
         with self.driver.session() as session:
@@ -50,105 +328,516 @@ class MemgraphClient:
                 session.run("CREATE INDEX ON :Entity(name)")
             except: 
                 pass
+            
+            # 문서 단위 삭제/조회용 조항 인덱스
+            try:
+                session.run("CREATE INDEX ON :Article(document)")
+            except:
+                pass
+            
+            # 원문 저장소 노드 인덱스
+            try:
+                session.run("CREATE INDEX ON :TextBlob(hash)")
+            except:
+                pass
+            
+            # 통계 카운터 노드 인덱스
+            try:
+                session.run("CREATE INDEX ON :GraphStats(key)")
+            except:
+                pass
         
         print("📑 인덱스 생성 완료")
     
-    def save_document(self, document: LegalDocument):
-        """법률 문서를 Memgraph에 저장"""
+    def save_document(self, document: LegalDocument, version: str = None, current: bool = True) -> str:
+        """법률 문서를 Memgraph에 저장
+        
+        문서/조항/관계에 문서 제목과 버전을 기록해 문서 단위로 삭제·교체할 수 있게 합니다.
+        
+        Returns:
+            저장된 버전 문자열
+        """
+        params = build_save_parameters(document)
+        version = version or new_version()
+        
+        # 조항이 있는 트리플만 저장
+        numbers = {row["number"] for row in params["articles"]}
+        triplets = [row for row in params["triplets"] if row["article_number"] in numbers]
+        names = sorted({row["subject"] for row in triplets} | {row["object"] for row in triplets})
+        
         with self.driver.session() as session:
+            self._ensure_statistics(session)
+            
             # 1. 문서 노드 생성
             session.run("""
                 CREATE (d:Document {
                     title: $title,
                     law_number: $law_number,
+                    version: $version,
+                    current: $current,
                     created_at: localdatetime()
                 })
-            """,
-                title=document.title,
-                law_number=document.law_number
-            )
+            """, version=version, current=current, **params["document"])
             
-            # 2. 조항 노드 및 관계 생성
-            for entity in document.entities:
+            # 2. 원문(TextBlob) 노드 생성 (같은 해시는 재사용) 후 조항 노드 및 관계 생성 (UNWIND 배치)
+            self._save_blobs(session, params["blobs"])
+            for rows in _batches(params["articles"], self.batch_size):
                 session.run("""
-                    MATCH (d:Document {title: $doc_title})
+                    MATCH (d:Document {title: $doc_title, version: $version})
+                    UNWIND $rows AS row
                     CREATE (a:Article {
-                        number: $number,
-                        concept: $concept,
-                        subject: $subject,
-                        action: $action,
-                        object: $object,
-                        full_text: $full_text
+                        document: $doc_title,
+                        version: $version,
+                        number: row.number,
+                        concept: row.concept,
+                        subject: row.subject,
+                        action: row.action,
+                        object: row.object,
+                        text_hash: row.text_hash,
+                        text_start: row.text_start,
+                        text_end: row.text_end
                     })
                     CREATE (d)-[:CONTAINS]->(a)
-                """,
-                    doc_title=document.title,
-                    number=entity.article_number,
-                    concept=entity.concept,
-                    subject=entity.subject,
-                    action=entity.action,
-                    object=entity.object,
-                    full_text=entity.full_text
-                )
-            
-            # 3. 트리플 관계 생성
-            for triplet in document.triplets:
-                session.run("""
-                    MATCH (a:Article {number: $article_number})
-                    MERGE (s:Entity {name: $subject})
-                    MERGE (o:Entity {name: $object})
+                    WITH a, row
+                    MATCH (b:TextBlob {hash: row.text_hash})
+                    CREATE (a)-[:TEXT]->(b)
+                """, doc_title=document.title, version=version, rows=rows)
+            
+            # 3. 개체 노드 생성 (새로 만든 개수 집계)
+            created_entities = 0
+            for batch in _batches(names, self.batch_size):
+                created_entities += session.run("""
+                    UNWIND $names AS name
+                    OPTIONAL MATCH (e:Entity {name: name})
+                    WITH name, e WHERE e IS NULL
+                    CREATE (:Entity {name: name})
+                    RETURN count(*) AS created
+                """, names=batch).single()["created"]
+            
+            # 4. 트리플 관계 생성 (UNWIND 배치, 관계 유형별 개수 집계)
+            relation_types: Dict[str, int] = {}
+            for rows in _batches(triplets, self.batch_size):
+                result = session.run("""
+                    UNWIND $rows AS row
+                    MATCH (s:Entity {name: row.subject}), (o:Entity {name: row.object})
                     CREATE (s)-[r:RELATION {
-                        type: $relation,
-                        confidence: $confidence,
-                        article: $article_number
+                        type: row.relation,
+                        confidence: row.confidence,
+                        article: row.article_number,
+                        document: $doc_title,
+                        version: $version
                     }]->(o)
-                """,
-                    article_number=triplet.article_number,
-                    subject=triplet.subject,
-                    object=triplet.object,
-                    relation=triplet.relation,
-                    confidence=triplet.confidence
-                )
+                    RETURN r.type AS type, count(*) AS created
+                """, doc_title=document.title, version=version, rows=rows)
+                for record in result:
+                    relation_types[record["type"]] = relation_types.get(record["type"], 0) + record["created"]
+            
+            # 5. 조항 -> 주어 개체 MENTIONS 간선 (조항별 관계 조회의 시작점)
+            mentions = sorted({(row["article_number"], row["subject"]) for row in triplets})
+            for batch in _batches(mentions, self.batch_size):
+                session.run("""
+                    UNWIND $rows AS row
+                    MATCH (a:Article {document: $doc_title, version: $version, number: row[0]})
+                    MATCH (s:Entity {name: row[1]})
+                    MERGE (a)-[:MENTIONS]->(s)
+                """, doc_title=document.title, version=version, rows=[list(pair) for pair in batch])
+            
+            # 6. 문서별 통계와 전역 카운터 갱신
+            relation_count = sum(relation_types.values())
+            session.run("""
+                MATCH (d:Document {title: $title, version: $version})
+                SET d.article_count = $articles,
+                    d.relation_count = $relations,
+                    d.relation_types = $relation_types
+            """, title=document.title, version=version, articles=len(params["articles"]),
+                relations=relation_count, relation_types=relation_types)
+            self._update_statistics(
+                session,
+                documents=1,
+                articles=len(params["articles"]),
+                relations=relation_count,
+                entities=created_entities
+            )
         
         print(f"✅ '{document.title}' 지식 그래프가 Memgraph에 저장되었습니다.")
+        return version
+    
+    def _save_blobs(self, session, blobs: List[Dict[str, Any]]):
+        """압축 원문 노드 생성 (이미 있는 해시는 건너뜀)"""
+        for rows in _batches(blobs, self.batch_size):
+            session.run("""
+                UNWIND $rows AS row
+                MERGE (b:TextBlob {hash: row.hash})
+                ON CREATE SET b.data = row.data
+            """, rows=rows)
+    
+    def _with_text(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """조항 행의 (해시, 구간) 참조를 원문(full_text)으로 바꿈
+        
+        저장소에 없는 원문만 Memgraph에서 한 번 읽어 오므로 같은 문서의 조항은 압축 해제를 공유합니다.
+        """
+        missing = sorted({
+            row["text_hash"] for row in rows
+            if row.get("text_hash") and row["text_hash"] not in text_store
+        })
+        if missing:
+            with self.driver.session() as session:
+                for record in session.run("""
+                    UNWIND $hashes AS hash
+                    MATCH (b:TextBlob {hash: hash})
+                    RETURN b.hash AS hash, b.data AS data
+                """, hashes=missing):
+                    text_store.add_compressed(record["hash"], base64.b64decode(record["data"]))
+        
+        for row in rows:
+            key, start, end = row.pop("text_hash", None), row.pop("text_start", None), row.pop("text_end", None)
+            if row.get("full_text") is None and key in text_store:
+                row["full_text"] = text_store.get(key)[start:end]
+        return rows
     
-    def query_article(self, article_number: str) -> Dict[str, Any]:
-        """조항 조회"""
+    @staticmethod
+    def _match_article(document: Optional[str]) -> str:
+        """조항 매칭 구문 (문서 지정 시 현재 버전의 조항만)"""
+        if document is None:
+            return "MATCH (a:Article {number: $number})"
+        return """
+            MATCH (d:Document {title: $document})-[:CONTAINS]->(a:Article {number: $number})
+            WHERE coalesce(d.current, true)
+        """
+    
+    # 조항에서 만들어진 관계: 조항 -MENTIONS-> 주어 -RELATION-> 목적어
+    _ARTICLE_RELATIONS = """
+        MATCH (a)-[:MENTIONS]->(s:Entity)-[r:RELATION]->(o:Entity)
+        WHERE r.article = a.number AND r.document = a.document AND r.version = a.version
+          AND ($relation_types IS NULL OR r.type IN $relation_types)
+    """
+    
+    def query_article(self, article_number: str, document: str = None) -> Dict[str, Any]:
+        """조항 조회
+        
+        Args:
+            article_number: 조항 번호 (예: "제1조")
+            document: 문서 제목 (지정 시 해당 문서의 현재 버전에서만 조회)
+        """
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (a:Article {number: $number})
-                RETURN a
-            """, number=article_number)
+            result = session.run(f"""
+                {self._match_article(document)}
+                RETURN a LIMIT 1
+            """, number=article_number, document=document)
             
             record = result.single()
-            if record:
-                return dict(record["a"])
-            return None
+        if record:
+            return self._with_text([dict(record["a"])])[0]
+        return None
     
-    def query_relations(self, article_number: str) -> List[Dict[str, Any]]:
-        """조항 관련 관계 조회"""
+    def query_relations(
+        self,
+        article_number: str,
+        document: str = None,
+        relation_types: List[str] = None,
+        limit: int = None,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조항에서 추출된 관계 조회 (신뢰도 내림차순)"""
+        page = "SKIP $offset LIMIT $limit" if limit is not None else "SKIP $offset"
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (a:Article {number: $number})-[:HAS_RELATION]->(r:RELATION)
-                MATCH (s)-[r]->(o)
-                RETURN s.name as subject, r.type as relation, o.name as object, r.confidence as confidence
-            """, number=article_number)
+            result = session.run(f"""
+                {self._match_article(document)}
+                {self._ARTICLE_RELATIONS}
+                RETURN s.name AS subject, r.type AS relation, o.name AS object, r.confidence AS confidence
+                ORDER BY confidence DESC, subject, relation, object
+                {page}
+            """, number=article_number, document=document, relation_types=relation_types,
+                limit=limit, offset=offset)
             
             return [dict(record) for record in result]
     
-    def get_graph_statistics(self) -> Dict[str, int]:
-        """그래프 통계"""
+    def query_neighborhood(
+        self,
+        article_number: str,
+        document: str = None,
+        hops: int = 1,
+        relation_types: List[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조항 주변 부분 그래프 조회
+        
+        조항의 관계와, 그 관계에 등장하는 개체에서 시작해 hops 단계 이내의 RELATION 간선을 반환합니다.
+        각 문서 현재 버전의 간선만 따라가고(교체 중인 새 버전 제외), 차수가 NEIGHBORHOOD_MAX_DEGREE를
+        넘는 허브 개체("이 법" 등)는 거쳐 가지 않아 페이지 크기와 관계없이 확장 범위가 제한됩니다.
+        
+        Args:
+            hops: 확장 단계 수 (1이면 시작 개체에 직접 연결된 관계)
+            relation_types: 지정 시 해당 관계 유형만 따라감
+            limit, offset: 페이지 크기와 시작 위치
+        """
+        return self.query_article_context(
+            article_number, document=document, hops=hops,
+            relation_types=relation_types, limit=limit, offset=offset
+        )["relations"]
+    
+    def query_article_context(
+        self,
+        article_number: str,
+        document: str = None,
+        hops: int = 1,
+        relation_types: List[str] = None,
+        limit: int = 100,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """조항, 주변 부분 그래프 한 페이지, 그래프 버전 스탬프를 쿼리 한 번으로 조회
+        
+        조회 캐시(GraphQueryService.article_context)용입니다. 관계는 query_neighborhood와 같습니다.
+        조항 원문 블롭이 이 프로세스의 text_store에 없을 때만 원문을 한 번 더 읽습니다.
+        
+        Returns:
+            {"article": 조항 (없으면 None), "relations": 관계 목록, "stamp": 그래프 버전 스탬프}
+        """
+        hops = max(1, int(hops))
         with self.driver.session() as session:
-            result = session.run("""
-                MATCH (n)
-                RETURN 
-                    count(CASE WHEN 'Document' IN labels(n) THEN 1 END) as documents,
-                    count(CASE WHEN 'Article' IN labels(n) THEN 1 END) as articles,
-                    count(CASE WHEN 'Entity' IN labels(n) THEN 1 END) as entities
-            """)
+            record = session.run(f"""
+                OPTIONAL MATCH (g:GraphStats {{key: 'global'}})
+                WITH coalesce(g.stamp, 0) AS stamp
+                OPTIONAL {self._match_article(document).strip()}
+                WITH stamp, collect(a) AS articles
+                UNWIND (CASE WHEN size(articles) = 0 THEN [null] ELSE articles END) AS a
+                OPTIONAL {self._ARTICLE_RELATIONS.strip()}
+                WITH stamp, articles, collect(r) AS own, collect(DISTINCT s) + collect(DISTINCT o) AS seeds
+                {self._NEIGHBORHOOD.format(hops=hops, keep="stamp, articles, ")}
+                UNWIND (CASE WHEN size(rels) = 0 THEN [null] ELSE rels END) AS r
+                WITH DISTINCT stamp, articles, r
+                WITH stamp, articles, r, startNode(r).name AS subject, endNode(r).name AS object
+                ORDER BY r.document, r.article, subject, r.type, object
+                WITH stamp, articles, collect(CASE WHEN r IS NULL THEN null ELSE {{
+                    subject: subject, relation: r.type, object: object,
+                    confidence: r.confidence, article: r.article, document: r.document
+                }} END) AS rows
+                RETURN stamp, articles[0] AS article, rows[$offset..$offset + $limit] AS relations
+            """, number=article_number, document=document, relation_types=relation_types,
+                max_degree=NEIGHBORHOOD_MAX_DEGREE, limit=limit, offset=offset).single()
+        
+        article = record["article"] if record else None
+        return {
+            "article": self._with_text([dict(article)])[0] if article is not None else None,
+            "relations": [dict(row) for row in record["relations"]] if record else [],
+            "stamp": record["stamp"] if record else 0,
+        }
+    
+    # 조항 관계(own)의 개체(seeds)에서 hops 단계 확장 -> rels (현재 버전 간선만, 허브 개체는 거치지 않음)
+    # keep: 확장 전후로 유지할 앞 단계 변수 ("stamp, articles, " 등)
+    _NEIGHBORHOOD = """
+        OPTIONAL MATCH (cd:Document) WHERE coalesce(cd.current, true)
+        WITH {keep}own, seeds, collect(cd.title + '@' + coalesce(cd.version, '')) AS current
+        UNWIND (CASE WHEN size(seeds) = 0 THEN [null] ELSE seeds END) AS seed
+        OPTIONAL MATCH p = (seed)-[:RELATION *1..{hops} (e, n |
+            ($relation_types IS NULL OR e.type IN $relation_types)
+            AND e.document + '@' + coalesce(e.version, '') IN current
+            AND degree(n) <= $max_degree)]-(:Entity)
+        WHERE degree(seed) <= $max_degree
+        WITH {keep}own, collect(p) AS paths
+        WITH {keep}own + reduce(found = [], q IN paths | found + relationships(q)) AS rels
+    """
+    
+    def save_article_references(self, edges: List[Any]) -> int:
+        """조항 간 참조 간선 저장 (각 문서 현재 버전의 조항끼리 MERGE)
+        
+        (:Article)-[:REFERENCES {type, paragraph}]->(:Article) 간선을 만들어 법령 간 이동을
+        인덱스 조회 한 번으로 할 수 있게 합니다. 조항이 삭제(문서 교체)되면 간선도 함께 삭제됩니다.
+        
+        Args:
+            edges: utils.reference_resolver.ArticleReference 목록
+        
+        Returns:
+            연결된 간선 수
+        """
+        rows = [edge._asdict() for edge in edges]
+        linked = 0
+        with self.driver.session() as session:
+            for batch in _batches(rows, self.batch_size):
+                linked += session.run("""
+                    UNWIND $rows AS row
+                    MATCH (sd:Document {title: row.source_document})-[:CONTAINS]->(s:Article {number: row.source_article})
+                    WHERE coalesce(sd.current, true)
+                    MATCH (td:Document {title: row.target_document})-[:CONTAINS]->(t:Article {number: row.target_article})
+                    WHERE coalesce(td.current, true)
+                    MERGE (s)-[r:REFERENCES {type: row.relation}]->(t)
+                    SET r.paragraph = row.paragraph
+                    RETURN count(r) AS linked
+                """, rows=batch).single()["linked"]
+            self._update_statistics(session)
+        return linked
+    
+    def query_article_references(self, article_number: str, document: str = None) -> List[Dict[str, Any]]:
+        """조항에서 나가는/들어오는 조항 참조
+        
+        Returns:
+            [{direction("out"/"in"), relation, document, article, paragraph}, ...]
+        """
+        with self.driver.session() as session:
+            result = session.run(f"""
+                {self._match_article(document)}
+                MATCH (a)-[r:REFERENCES]-(other:Article)
+                RETURN CASE WHEN startNode(r) = a THEN 'out' ELSE 'in' END AS direction,
+                       r.type AS relation, other.document AS document, other.number AS article,
+                       r.paragraph AS paragraph
+                ORDER BY direction DESC, document, article, relation
+            """, number=article_number, document=document)
             
-            record = result.single()
-            return dict(record) if record else {}
+            return [dict(record) for record in result]
+    
+    def graph_version(self) -> int:
+        """그래프 버전 스탬프 (저장/삭제/교체 시 증가, 조회 캐시 무효화용)"""
+        with self.driver.session() as session:
+            record = session.run("""
+                MATCH (g:GraphStats {key: 'global'})
+                RETURN coalesce(g.stamp, 0) AS stamp
+            """).single()
+            return record["stamp"] if record else 0
+    
+    def get_graph_statistics(self) -> Dict[str, Any]:
+        """그래프 통계
+        
+        저장/삭제 시 갱신되는 카운터(:GraphStats)와 문서 노드의 통계 속성만 읽으므로
+        그래프 크기와 무관하게 문서 수에만 비례합니다. 카운터가 없는 기존 그래프는
+        처음 한 번 rebuild_statistics()로 집계합니다.
+        """
+        with self.driver.session() as session:
+            self._ensure_statistics(session)
+            stats = dict(session.run("""
+                MATCH (g:GraphStats {key: 'global'})
+                RETURN g.documents AS documents, g.articles AS articles,
+                       g.entities AS entities, g.relations AS relations
+            """).single())
+            
+            stats["relation_types"] = {}
+            stats["by_document"] = []
+            for record in session.run("""
+                MATCH (d:Document)
+                RETURN d.title AS title, d.version AS version,
+                       d.article_count AS articles, d.relation_count AS relations,
+                       d.relation_types AS relation_types
+                ORDER BY title, version
+            """):
+                row = dict(record)
+                row["relation_types"] = row["relation_types"] or {}
+                for rel_type, count in row["relation_types"].items():
+                    stats["relation_types"][rel_type] = stats["relation_types"].get(rel_type, 0) + count
+                stats["by_document"].append(row)
+            return stats
+    
+    def rebuild_statistics(self):
+        """전체 그래프를 한 번 집계해 통계 카운터 재구성 (카운터 도입 이전 그래프용)"""
+        with self.driver.session() as session:
+            self._rebuild_statistics(session)
+        print("📊 그래프 통계 재구성 완료")
+    
+    def _ensure_statistics(self, session):
+        if session.run("MATCH (g:GraphStats {key: 'global'}) RETURN count(g) AS n").single()["n"] == 0:
+            self._rebuild_statistics(session)
+    
+    def _rebuild_statistics(self, session):
+        per_document: Dict[tuple, Dict[str, int]] = {}
+        for record in session.run("""
+            MATCH ()-[r:RELATION]->()
+            RETURN r.document AS document, r.version AS version, r.type AS type, count(*) AS n
+        """):
+            types = per_document.setdefault((record["document"], record["version"]), {})
+            types[record["type"]] = record["n"]
+        
+        documents = articles = relations = 0
+        for record in session.run("""
+            MATCH (d:Document)
+            OPTIONAL MATCH (d)-[:CONTAINS]->(a:Article)
+            RETURN d.title AS title, d.version AS version, count(a) AS articles
+        """):
+            relation_types = per_document.get((record["title"], record["version"]), {})
+            session.run("""
+                MATCH (d:Document {title: $title})
+                WHERE d.version = $version OR ($version IS NULL AND d.version IS NULL)
+                SET d.article_count = $articles,
+                    d.relation_count = $relations,
+                    d.relation_types = $relation_types
+            """, title=record["title"], version=record["version"], articles=record["articles"],
+                relations=sum(relation_types.values()), relation_types=relation_types)
+            documents += 1
+            articles += record["articles"]
+        relations = session.run("MATCH ()-[r:RELATION]->() RETURN count(r) AS n").single()["n"]
+        entities = session.run("MATCH (e:Entity) RETURN count(e) AS n").single()["n"]
+        
+        self._reset_statistics(session)
+        self._update_statistics(
+            session, documents=documents, articles=articles, relations=relations, entities=entities
+        )
+    
+    def _reset_statistics(self, session):
+        session.run("""
+            MERGE (g:GraphStats {key: 'global'})
+            SET g.documents = 0, g.articles = 0, g.entities = 0, g.relations = 0,
+                g.stamp = coalesce(g.stamp, 0) + 1
+        """)
+    
+    def _update_statistics(self, session, documents: int = 0, articles: int = 0,
+                           relations: int = 0, entities: int = 0):
+        session.run("""
+            MATCH (g:GraphStats {key: 'global'})
+            SET g.documents = g.documents + $documents,
+                g.articles = g.articles + $articles,
+                g.entities = g.entities + $entities,
+                g.relations = g.relations + $relations,
+                g.stamp = coalesce(g.stamp, 0) + 1
+        """, documents=documents, articles=articles, relations=relations, entities=entities)
+    
+    # ------------------------------------------------------------------
+    # 대량 내보내기/가져오기 (database.graph_transfer에서 사용)
+    # ------------------------------------------------------------------
+    
+    def document_versions(self) -> Set[Tuple[str, str]]:
+        """저장된 문서의 (제목, 버전) 목록"""
+        with self.driver.session() as session:
+            return {
+                (record["title"], record["version"])
+                for record in session.run("MATCH (d:Document) RETURN d.title AS title, d.version AS version")
+            }
+    
+    def export_rows(self, kind: str, chunk_size: int = 10000):
+        """종류별 행을 chunk_size 단위로 스트리밍 (드라이버가 결과를 나누어 가져옴)"""
+        with self.driver.session(fetch_size=chunk_size) as session:
+            chunk = []
+            # 조항 원문은 청크마다 별도 세션에서 참조를 풀어 채움 (스트리밍 결과는 그대로 유지)
+            finish = self._with_text if kind == "articles" else (lambda rows: rows)
+            for record in session.run(EXPORT_QUERIES[kind]):
+                chunk.append(dict(record))
+                if len(chunk) >= chunk_size:
+                    yield finish(chunk)
+                    chunk = []
+            if chunk:
+                yield finish(chunk)
+    
+    def import_rows(self, kind: str, rows: List[Dict[str, Any]]):
+        """행 배치를 UNWIND로 적재 (조항 원문은 배치 단위로 묶어 TextBlob으로 저장)"""
+        with self.driver.session() as session:
+            if kind == "articles":
+                refs = text_store.pack([row.get("full_text") or "" for row in rows])
+                rows = [
+                    {**row, "full_text": None, "text_hash": ref.hash, "text_start": ref.start, "text_end": ref.end}
+                    for row, ref in zip(rows, refs)
+                ]
+                self._save_blobs(session, _blob_rows(ref.hash for ref in refs))
+            for batch in _batches(rows, self.batch_size):
+                session.run("UNWIND $rows AS row\n" + IMPORT_QUERIES[kind], rows=batch)
+    
+    def load_csv(self, kind: str, path: str) -> int:
+        """Memgraph 서버가 직접 CSV 파일을 읽어 적재 (path는 서버 기준 경로)"""
+        with self.driver.session() as session:
+            session.run(
+                "LOAD CSV FROM $path WITH HEADER NULLIF '' AS row\n" + IMPORT_QUERIES[kind], path=path
+            )
+            return session.run(COUNT_QUERIES[kind]).single()["n"]
+    
+    def finish_import(self):
+        """가져오기 후 통계 카운터 재구성"""
+        self.rebuild_statistics()
     
     def close(self):
         """연결 종료"""
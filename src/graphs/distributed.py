@@ -0,0 +1,303 @@
+"""작업 큐 기반 분산 처리 (코디네이터 / 워커)
+
+코디네이터가 조항 단위 작업을 큐에 넣으면, 여러 프로세스/호스트의 상태 없는 워커가
+작업을 가져가 개체·관계 추출 체인을 실행하고 결과를 큐에 되돌려 놓습니다.
+모든 결과가 모이면 코디네이터가 `_validate_graph`로 병합합니다.
+"""
+import os
+import socket
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from chains.entity_extraction_chain import known_fields
+from models.compact import CompactTriplet
+from models.schemas import ErrorCode, ExtractionError, LegalEntity, LegalDocument
+from database.job_queue import SQLiteJobQueue, QueueJob
+from graphs.legal_graph import (
+    RETRY_CODES, GraphState, LegalKnowledgeGraphWorkflow, print_canonicalization, print_retry, print_reuse,
+    relation_contexts
+)
+from utils.article_chunker import ArticleChunk, chunk_article, chunk_views, merge_chunk_entities
+from utils.near_duplicate import NearDuplicateIndex, ReusePlan, record_reuse
+from utils.text_processor import article_spans, split_articles
+from utils.text_store import text_store
+from utils.metrics import metrics
+from utils.profiler import stage_scope
+
+ENTITY_JOB = "entity"
+RELATION_JOB = "relation"
+
+
+class DistributedCoordinator:
+    """문서를 조항 단위 작업으로 나눠 큐에 넣고 결과를 병합하는 코디네이터"""
+
+    def __init__(
+        self,
+        queue: Optional[SQLiteJobQueue] = None,
+        poll_interval: float = 1.0,
+        duplicate_index: Optional[NearDuplicateIndex] = None
+    ):
+        self.queue = queue or SQLiteJobQueue()
+        self.poll_interval = poll_interval
+        self.duplicate_index = duplicate_index if duplicate_index is not None else NearDuplicateIndex()
+        self._plans: Dict[str, ReusePlan] = {}
+        self._chunks: Dict[str, Dict[int, List[ArticleChunk]]] = {}
+
+    def submit(self, document: LegalDocument, run_id: Optional[str] = None) -> str:
+        """Step 1: 조항 분리 후 개체 추출 작업 등록 (근사 중복 조항은 작업 없이 재사용)
+
+        토큰 예산을 넘는 조항은 항/호 단위 조각마다 작업("조항순번.조각순번")을 만들어
+        여러 워커가 동시에 추출합니다.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        articles = split_articles(document.content)
+        plan = self._plans[run_id] = self.duplicate_index.plan(articles)
+        chunks = self._chunks[run_id] = {i: chunk_article(articles[i]) for i in plan.fresh}
+        self.queue.enqueue_many(run_id, ENTITY_JOB, [
+            (_job_key(i) if len(chunks[i]) == 1 else f"{_job_key(i)}.{c:03d}", {"text": chunk.text})
+            for i in plan.fresh
+            for c, chunk in enumerate(chunks[i])
+        ])
+        return run_id
+
+    def wait(self, run_id: str, kind: str, timeout: Optional[float] = None) -> Dict[str, int]:
+        """해당 종류의 작업이 모두 완료(또는 최종 실패)될 때까지 대기"""
+        started = time.monotonic()
+        while True:
+            counts = self.queue.counts(run_id, kind)
+            if not counts.get("pending") and not counts.get("leased"):
+                return counts
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"작업 대기 시간 초과 ({kind}): {counts}")
+            time.sleep(self.poll_interval)
+
+    def run(
+        self,
+        document: LegalDocument,
+        run_id: Optional[str] = None,
+        timeout: Optional[float] = None
+    ) -> LegalDocument:
+        """문서 처리 실행 (워커는 별도 프로세스에서 실행 중이어야 함)"""
+        run_id = self.submit(document, run_id)
+        plan = self._plans.pop(run_id)
+        chunks = self._chunks.pop(run_id)
+        errors: List[ExtractionError] = []
+
+        # Step 2: 개체 추출 결과 수집 (재사용 조항은 원본 개체를 조항 번호만 바꿔 사용)
+        with stage_scope("wait_entity_jobs"):
+            self.wait(run_id, ENTITY_JOB, timeout)
+        entity_results = self.queue.results(run_id, ENTITY_JOB)
+        # 최종 실패한 작업이나 시간 초과·마감 경과가 있는 조항은 결과가 불완전해 재처리 대상
+        retry = set()
+        for key, error in sorted(self.queue.failures(run_id, ENTITY_JOB).items()):
+            i = int(key.split(".")[0])
+            retry.add(i)
+            labels = plan.labels[i]
+            errors.append(ExtractionError(
+                code=ErrorCode.JOB_FAILED, article_number=labels[0] if labels else None,
+                message=f"{ENTITY_JOB} job {key}: {error}"
+            ))
+
+        # 조항 하나에서 여러 개체가 나올 수 있음 (이전 워커의 목록·단일 개체 결과도 허용)
+        chunk_results: Dict[int, List[List[LegalEntity]]] = {i: [[] for _ in chunks[i]] for i in chunks}
+        for key, value in sorted(entity_results.items()):
+            i, _, c = key.partition(".")
+            if isinstance(value, dict) and "entities" in value:
+                job_errors = [ExtractionError(**error) for error in value.get("errors", [])]
+                if any(error.code in RETRY_CODES for error in job_errors):
+                    retry.add(int(i))
+                errors.extend(job_errors)
+                value = value["entities"]
+            items = value if isinstance(value, list) else [value]
+            chunk_results[int(i)][int(c or 0)] = [LegalEntity(**item) for item in items]
+        
+        # 조각 결과는 조항 개체 하나로 병합 (조각의 항 단위 번호와 구간은 출처로 유지)
+        extracted_entities = {i: merge_chunk_entities(chunks[i], results) for i, results in chunk_results.items()}
+        groups = plan.entities(extracted_entities)
+        entities, positions = [], []
+        # 워커가 돌려준 원문 대신 저장소 참조 사용
+        refs = text_store.refs(document.content, article_spans(document.content))
+        for i, group in enumerate(groups):
+            for entity in group:
+                entity.attach_text(refs[i])
+                entities.append(entity)
+                positions.append(i)
+
+        # Step 3: 참조·상위 조항 컨텍스트와 함께 관계 추출 작업 등록 (새로 추출한 조항만, 개체 단위)
+        # 분할한 조항의 개체는 조각 구간마다 작업("개체순번.조각순번")을 만듦
+        contexts = relation_contexts(entities, document.title)
+        jobs = []
+        for k, (i, entity, context) in enumerate(zip(positions, entities, contexts)):
+            if plan.matches[i] is not None:
+                continue
+            views = chunk_views(entity)
+            for u, view in enumerate(views):
+                jobs.append((_job_key(k) if len(views) == 1 else f"{_job_key(k)}.{u:03d}", {
+                    "entity": {**view.model_dump(exclude={"text_ref", "source_units"}), "full_text": view.text},
+                    "context": [e.model_dump(exclude={"text_ref", "source_units"}) for e in context]
+                }))
+        self.queue.enqueue_many(run_id, RELATION_JOB, jobs)
+        with stage_scope("wait_relation_jobs"):
+            self.wait(run_id, RELATION_JOB, timeout)
+
+        # 워커가 LLM 응답을 검증해 돌려준 결과이므로 다시 검증하지 않고 경량 표현으로 보관
+        relation_results = self.queue.results(run_id, RELATION_JOB)
+        extracted: Dict[int, List[CompactTriplet]] = {}
+        # 관계 추출에 실패한 조각이 있는 조항 (결과가 불완전해 색인에 넣지 않음, 이전 워커의 목록 결과도 허용)
+        incomplete = set()
+        for key, items in sorted(relation_results.items()):
+            position = positions[int(key.split(".")[0])]
+            if isinstance(items, dict):
+                job_errors = [ExtractionError(**error) for error in items.get("errors", [])]
+                if job_errors:
+                    incomplete.add(position)
+                errors.extend(job_errors)
+                items = items["triplets"]
+            extracted.setdefault(position, []).extend(CompactTriplet(**item) for item in items)
+        triplets: List[CompactTriplet] = []
+        for i in dict.fromkeys(positions):
+            reused = plan.triplets(i, extracted)
+            triplets.extend(reused if reused is not None else extracted.get(i, []))
+        for key, error in sorted(self.queue.failures(run_id, RELATION_JOB).items()):
+            k = int(key.split(".")[0])
+            retry.add(positions[k])
+            errors.append(ExtractionError(
+                code=ErrorCode.JOB_FAILED, article_number=entities[k].article_number,
+                message=f"{RELATION_JOB} job {key}: {error}"
+            ))
+        # 재처리 대상·실패 조항을 재사용한 같은 문서의 조항도 마찬가지
+        for marked in (retry, incomplete):
+            marked.update(
+                i for i, match in enumerate(plan.matches)
+                if match is not None and match.source == "document" and match.target in marked
+            )
+
+        # 재처리 대상이거나 실패한 조각이 있는 조항의 불완전한 결과는 색인에 넣지 않음
+        skipped = retry | incomplete
+        self.duplicate_index.add(
+            plan, groups, {i: found for i, found in extracted.items() if i not in skipped}, document.title
+        )
+        reuse = plan.report()
+        record_reuse(reuse)
+
+        # Step 4: 병합 및 검증
+        document.entities = entities
+        state: GraphState = {
+            "document": document,
+            "articles": [],
+            "article_refs": refs,
+            "entities": entities,
+            "entity_positions": positions,
+            "triplets": triplets,
+            "current_index": len(entities),
+            "errors": errors,
+            "canonicalization": {},
+            "duplicates": plan,
+            "reuse": reuse,
+            "deadline": None,
+            "retry": sorted(retry)
+        }
+        with stage_scope("validate_graph"):
+            final_state = LegalKnowledgeGraphWorkflow._validate_graph(state)
+        # 워커에서 시간 초과됐거나 재시도 끝에 작업이 실패한 조항 (작업 중 시간 초과는 큐가 먼저 재시도)
+        final_state["document"].retry_articles = [
+            known_fields(plan.articles[i]).get("article_number", f"{i + 1}번째 조항") for i in sorted(retry)
+        ]
+        metrics.inc("kg_articles_retry_total", len(final_state["document"].retry_articles))
+        print_canonicalization(document.title, final_state["canonicalization"])
+        print_reuse(document.title, reuse)
+        print_retry(document.title, final_state["document"], None)
+
+        if final_state["errors"]:
+            print(f"⚠️  Warning: {len(final_state['errors'])} errors occurred")
+            for error in final_state["errors"]:
+                print(f"  - {error}")
+
+        return final_state["document"]
+
+
+class QueueWorker:
+    """큐에서 작업을 가져와 추출 체인을 실행하는 상태 없는 워커"""
+
+    def __init__(
+        self,
+        queue: Optional[SQLiteJobQueue] = None,
+        workflow: Optional[LegalKnowledgeGraphWorkflow] = None,
+        worker_id: Optional[str] = None
+    ):
+        self.queue = queue or SQLiteJobQueue()
+        self.workflow = workflow or LegalKnowledgeGraphWorkflow()
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        # 종류별 처리한 작업 수
+        self.processed: Counter = Counter()
+
+    def process_job(self, job: QueueJob):
+        """작업 하나 실행 후 결과 반환 (예외는 호출자가 처리)"""
+        if job.kind == ENTITY_JOB:
+            errors: List[ExtractionError] = []
+            entities = self.workflow.entity_chain.extract_all(job.payload["text"], errors)
+            return {
+                "entities": [entity.model_dump() for entity in entities],
+                "errors": [error.model_dump(mode="json") for error in errors]
+            }
+
+        if job.kind == RELATION_JOB:
+            entity = LegalEntity(**job.payload["entity"])
+            context = [LegalEntity(**item) for item in job.payload.get("context", [])]
+            errors: List[ExtractionError] = []
+            triplets = self.workflow.relation_chain.extract(entity, context, errors)
+            return {
+                "triplets": [triplet.model_dump() for triplet in triplets],
+                "errors": [error.model_dump(mode="json") for error in errors]
+            }
+
+        raise ValueError(f"알 수 없는 작업 종류: {job.kind}")
+
+    def run_once(self) -> bool:
+        """작업 하나 처리
+
+        Returns:
+            처리한 작업이 있으면 True
+        """
+        job = self.queue.lease(self.worker_id)
+        if job is None:
+            return False
+        if job.attempts > 1:
+            metrics.inc("kg_retries_total", stage=job.kind)
+
+        try:
+            with metrics.timer("kg_queue_job_duration_seconds", kind=job.kind), stage_scope(f"{job.kind}_job"):
+                result = self.process_job(job)
+        except Exception as e:
+            metrics.inc("kg_queue_job_failures_total", kind=job.kind)
+            self.queue.fail(job, str(e))
+            print(f"⚠️ 작업 실패 ({job.kind} {job.key}, {job.attempts}회차): {e}")
+            return True
+
+        self.processed[job.kind] += 1
+        if not self.queue.complete(job, result):
+            print(f"   ℹ️ 이미 완료된 작업 결과 무시: {job.kind} {job.key}")
+        return True
+
+    def run_forever(self, idle_timeout: Optional[float] = None, poll_interval: float = 1.0):
+        """작업이 없으면 대기하며 계속 처리
+
+        Args:
+            idle_timeout: 이 시간(초) 동안 작업이 없으면 종료 (None이면 무한 대기)
+            poll_interval: 큐 확인 간격 (초)
+        """
+        idle_since = time.monotonic()
+        while True:
+            if self.run_once():
+                idle_since = time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                return
+            time.sleep(poll_interval)
+
+
+def _job_key(index: int) -> str:
+    """정렬 가능한 작업 키 (개체 추출은 조항 순번, 관계 추출은 개체 순번)"""
+    return f"{index:06d}"
@@ -1,38 +1,154 @@
-from typing import List, TypedDict
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict, Union
 from langgraph.graph import StateGraph, END
-from models.schemas import LegalEntity, GraphTriplet, LegalDocument
-from chains.entity_extraction_chain import EntityExtractionChain
+from models.schemas import ErrorCode, ExtractionError, LegalEntity, GraphTriplet, LegalDocument, TextRef
+from chains.entity_extraction_chain import EntityExtractionChain, ReaskBudget, known_fields
 from chains.relation_extraction_chain import RelationExtractionChain
-from utils.text_processor import split_articles
+from llm.router import ModelRouter, RoutingPolicy, record_routing, router_from_env
+from models.compact import compact_triplets, to_models
+from models.triplet_table import TripletTable
+from utils.article_chunker import (
+    ARTICLE_CHUNK_WORKERS, chunk_article, chunk_views, merge_chunk_entities
+)
+from utils.text_processor import article_spans
+from utils.text_store import text_store
+from utils.entity_canonicalizer import canonicalize_table, rewrite_triplets
+from utils.near_duplicate import NearDuplicateIndex, ReusePlan, record_reuse
+from utils.deadline import CallTimeout, Deadline, DeadlineExceeded, deadline_scope, document_deadline, in_context
+from utils.metrics import estimate_tokens, metrics
+from utils.relation_context import format_context, select_relation_contexts
+from utils.profiler import stage_scope
 
 
 class GraphState(TypedDict):
     """그래프 상태"""
     document: LegalDocument
     articles: List[str]
+    article_refs: List[TextRef]
     entities: List[LegalEntity]
+    entity_positions: List[int]
     triplets: List[GraphTriplet]
     current_index: int
-    errors: List[str]
+    errors: List[ExtractionError]
+    canonicalization: Dict[str, int]
+    duplicates: Optional[ReusePlan]
+    reuse: Dict[str, int]
+    deadline: Optional[Deadline]
+    retry: List[int]
+
+
+# 그래프에 남길 관계의 최소 신뢰도 (기본 0: 필터링 안 함)
+MIN_TRIPLET_CONFIDENCE = float(os.getenv("MIN_TRIPLET_CONFIDENCE", "0"))
+
+# 조항을 재처리 대상으로 표시하는 오류 (호출 시간 초과, 문서 마감 경과)
+RETRY_CODES = (ErrorCode.LLM_CALL_TIMEOUT, ErrorCode.DEADLINE_EXCEEDED)
+
+
+def relation_error(error: Exception, article_number: Optional[str]) -> ExtractionError:
+    """관계 추출 예외의 오류 (시간 초과·마감 경과는 재처리 대상 코드)"""
+    if isinstance(error, DeadlineExceeded):
+        code = ErrorCode.DEADLINE_EXCEEDED
+    elif isinstance(error, CallTimeout):
+        code = ErrorCode.LLM_CALL_TIMEOUT
+    else:
+        code = ErrorCode.RELATION_CALL_FAILED
+    return ExtractionError(code=code, article_number=article_number, message=str(error))
+
+
+def relation_contexts(entities: List[LegalEntity], title: str) -> List[List[LegalEntity]]:
+    """조항별 관계 추출 컨텍스트 (참조·상위 조항, 토큰 예산 이내)와 사용량 계측"""
+    contexts = select_relation_contexts(entities, title)
+    for context in contexts:
+        metrics.inc("kg_relation_context_articles_total", len(context))
+        metrics.inc("kg_relation_context_tokens_total", estimate_tokens(format_context(context)))
+    return contexts
+
+
+def print_canonicalization(title: str, report: Dict[str, int]):
+    """개체 병합에 따른 노드/간선 감소 출력"""
+    if report and report["nodes_before"]:
+        print(f"🔗 '{title}' 개체 병합 - 노드: {report['nodes_before']} → {report['nodes_after']}, "
+              f"간선: {report['edges_before']} → {report['edges_after']}")
+
+
+def print_reuse(title: str, report: Dict[str, int]):
+    """근사 중복 조항 재사용 통계 출력"""
+    if report and report["index"] + report["document"]:
+        reused = report["index"] + report["document"]
+        print(f"♻️  '{title}' 근사 중복 재사용 - 조항: {reused}/{report['articles']} "
+              f"(색인 {report['index']}, 문서 내 {report['document']}), "
+              f"LLM 호출 {report['llm_calls_avoided']}회 절감")
+
+
+def print_repairs(title: str, report: Dict[str, int]):
+    """LLM JSON 응답 복구 통계 출력"""
+    if report.get("repaired"):
+        kinds = ", ".join(
+            f"{kind} {count}" for kind, count in sorted(report.items())
+            if kind not in ("responses", "repaired", "failed")
+        )
+        print(f"🩹 '{title}' JSON 응답 복구 - {report['repaired']}/{report['responses']}건 ({kinds})")
+
+
+def print_routing(title: str, report: Dict[str, Any]):
+    """모델 단계 라우팅 결정, 올림 비율, 단계별 지연·비용 출력"""
+    if not report.get("tiers"):
+        return
+    print(f"🧭 '{title}' 모델 라우팅 ({report['mode']})")
+    for chain, entry in sorted(report["chains"].items()):
+        routed = ", ".join(f"{tier} {count}" for tier, count in sorted(entry["routed"].items()))
+        print(f"   {chain}: {routed} (올림 {entry['escalated']}회, {entry['escalation_rate']:.1%})")
+    for tier, entry in sorted(report["tiers"].items()):
+        print(f"   {tier}: 호출 {entry['calls']}회 (기각 {entry['rejected']}), 평균 {entry['mean_seconds']:.2f}초, "
+              f"토큰 {entry['prompt_tokens']}/{entry['completion_tokens']}, ${entry['cost_usd']:.4f}")
+
+
+def print_retry(title: str, document: LegalDocument, deadline: Optional[Deadline]):
+    """시간 초과·마감 경과로 재처리할 조항 출력"""
+    if document.retry_articles:
+        limit = f" (마감 {deadline.seconds:g}초)" if deadline is not None else ""
+        print(f"⏰ '{title}' 재처리 필요 조항{limit} - {len(document.retry_articles)}개: "
+              f"{', '.join(document.retry_articles)}")
+
+
+def repair_stats(*chains) -> Dict[str, int]:
+    """체인 출력 파서의 누적 복구 통계 합계"""
+    total: Dict[str, int] = {}
+    for chain in chains:
+        for kind, count in getattr(getattr(chain, "parser", None), "stats", {}).items():
+            total[kind] = total.get(kind, 0) + count
+    return total
 
 
 class LegalKnowledgeGraphWorkflow:
     """법률 지식 그래프 생성 워크플로우"""
     
-    def __init__(self):
-        self.entity_chain = EntityExtractionChain()
-        self.relation_chain = RelationExtractionChain()
+    def __init__(
+        self,
+        entity_chain: Optional[EntityExtractionChain] = None,
+        relation_chain: Optional[RelationExtractionChain] = None,
+        duplicate_index: Optional[NearDuplicateIndex] = None,
+        router: Optional[ModelRouter] = None
+    ):
+        # 라우터(인자 또는 LLM_ROUTING)가 있으면 조항마다 충분한 가장 싼 모델로 추출
+        self.router = router if router is not None else router_from_env()
+        self.entity_chain = entity_chain or EntityExtractionChain(router=self.router)
+        self.relation_chain = relation_chain or RelationExtractionChain(router=self.router)
+        # 처리한 조항의 근사 중복 색인 (비슷한 조항은 추출 결과 재사용)
+        self.duplicate_index = duplicate_index if duplicate_index is not None else NearDuplicateIndex()
         self.workflow = self._build_workflow()
     
     def _build_workflow(self) -> StateGraph:
         """워크플로우 구성"""
         workflow = StateGraph(GraphState)
         
-        # 노드 추가
-        workflow.add_node("split_articles", self._split_articles)
-        workflow.add_node("extract_entities", self._extract_entities)
-        workflow.add_node("extract_relations", self._extract_relations)
-        workflow.add_node("validate_graph", self._validate_graph)
+        # 노드 추가 (노드별 소요 시간 계측)
+        workflow.add_node("split_articles", self._instrument("split_articles", self._split_articles))
+        workflow.add_node("extract_entities", self._instrument("extract_entities", self._extract_entities))
+        workflow.add_node("extract_relations", self._instrument("extract_relations", self._extract_relations))
+        workflow.add_node("validate_graph", self._instrument("validate_graph", self._validate_graph))
         
         # 엣지 설정
         workflow.set_entry_point("split_articles")
@@ -43,74 +159,237 @@ class LegalKnowledgeGraphWorkflow:
         
         return workflow.compile()
     
+    @staticmethod
+    def _instrument(name: str, node: Callable[[GraphState], GraphState]) -> Callable[[GraphState], GraphState]:
+        """노드 실행 시간을 메트릭으로 기록하고 프로파일러 단계로 귀속하는 래퍼"""
+        def wrapper(state: GraphState) -> GraphState:
+            # 노드 안의 LLM 호출에 문서 마감 적용
+            with metrics.timer("kg_node_duration_seconds", node=name), stage_scope(name), \
+                    deadline_scope(state.get("deadline")):
+                return node(state)
+        return wrapper
+    
     def _split_articles(self, state: GraphState) -> GraphState:
         """Step 1: 조항 분리"""
-        articles = split_articles(state["document"].content)
-        state["articles"] = articles
+        content = state["document"].content
+        spans = article_spans(content)
+        state["articles"] = [content[start:end] for start, end in spans]
+        # 원문은 저장소에 한 번만 두고 조항은 (해시, 구간) 참조만 가짐
+        state["article_refs"] = text_store.refs(content, spans)
         state["current_index"] = 0
         return state
     
     def _extract_entities(self, state: GraphState) -> GraphState:
         """Step 2: 개체 추출"""
         try:
-            entities = self.entity_chain.batch_extract(state["articles"])
+            # 이미 처리한 조항(이전 문서 또는 이 문서의 앞선 조항)과 거의 같은 조항은 재사용
+            articles = state["articles"]
+            plan = self.duplicate_index.plan(articles)
+            # 빠진 필드는 그 필드만 재질문하고, 해결하지 못한 문제는 오류 코드로 기록
+            budget = ReaskBudget(self.entity_chain.reask_budget)
+            extracted: Dict[int, List[LegalEntity]] = {}
+            retry = set(state.get("retry") or ())
+            for i in plan.fresh:
+                reported = len(state["errors"])
+                # 토큰 예산을 넘는 조항은 항/호 단위 조각으로 나눠 동시에 추출한 뒤 조항 개체 하나로 병합
+                chunks = chunk_article(articles[i])
+                if len(chunks) > 1:
+                    metrics.inc("kg_chunked_articles_total")
+                    metrics.inc("kg_article_chunks_total", len(chunks))
+                results = self.entity_chain.batch_extract_all(
+                    [chunk.text for chunk in chunks], state["errors"], budget, workers=ARTICLE_CHUNK_WORKERS
+                )
+                # 시간 초과·마감 경과로 일부라도 추출하지 못한 조항은 재처리 대상
+                if any(error.code in RETRY_CODES for error in state["errors"][reported:]):
+                    retry.add(i)
+                extracted[i] = merge_chunk_entities(chunks, results)
+            
+            # 조항 하나에서 여러 개체(항별 개체)가 나올 수 있어 개체별 조항 위치를 함께 보관
+            groups = plan.entities(extracted)
+            entities, positions = [], []
+            for i, (group, ref) in enumerate(zip(groups, state["article_refs"])):
+                for entity in group:
+                    entity.attach_text(ref)
+                    entities.append(entity)
+                    positions.append(i)
+            # 재처리 대상 조항을 재사용한 같은 문서의 조항도 재처리 대상
+            retry.update(
+                i for i, match in enumerate(plan.matches)
+                if match is not None and match.source == "document" and match.target in retry
+            )
+            state["retry"] = sorted(retry)
+            state["duplicates"] = plan
             state["entities"] = entities
+            state["entity_positions"] = positions
             state["document"].entities = entities
         except Exception as e:
-            state["errors"]. append(f"Entity extraction error: {str(e)}")
+            state["errors"].append(ExtractionError(code=ErrorCode.ENTITY_STAGE_FAILED, message=str(e)))
         return state
     
     def _extract_relations(self, state: GraphState) -> GraphState:
         """Step 3: 관계 추출"""
         triplets = []
         entities = state["entities"]
+        positions = state.get("entity_positions") or list(range(len(entities)))
+        plan = state.get("duplicates")
+        # 조항 위치 -> 그 조항 개체들에서 추출한 트리플
+        extracted: Dict[int, List] = {}
+        # 원문이 참조하는 조항과 상위 조항을 컨텍스트로 제공
+        contexts = relation_contexts(entities, state["document"].title)
         
-        for i, entity in enumerate(entities):
-            try:
-                # 이전 조항들을 컨텍스트로 제공
-                context = entities[max(0, i-3):i]
-                entity_triplets = self.relation_chain.extract(entity, context)
+        retry = set(state.get("retry") or ())
+        # 관계 추출에 실패한 조각이 있는 조항 (결과가 불완전해 재사용 색인에 넣지 않음)
+        incomplete = set()
+        
+        # 조항 순서대로 처리 (문서 내 재사용은 앞선 조항의 추출 결과가 필요)
+        jobs = zip(entities, contexts, positions)
+        for i, members in groupby(jobs, key=lambda job: job[2]):
+            members = list(members)
+            match = plan.matches[i] if plan is not None else None
+            if match is not None and match.source == "document":
+                if match.target in retry:
+                    retry.add(i)
+                if match.target in incomplete:
+                    incomplete.add(i)
+            reused = plan.triplets(i, extracted) if plan is not None else None
+            if reused is not None:
+                # 재사용 트리플은 조항 단위라 한 번만 추가
+                triplets.extend(reused)
+                continue
+            
+            # 같은 조항의 개체(항별 개체, 분할한 조항은 조각 구간별 개체)는 동시에 추출
+            members = [(view, context, pos) for entity, context, pos in members for view in chunk_views(entity)]
+            for result, errors in self._map_relations(members):
+                if errors:
+                    state["errors"].extend(errors)
+                    incomplete.add(i)
+                    if any(error.code in RETRY_CODES for error in errors):
+                        retry.add(i)
                 
-                if isinstance(entity_triplets, list):
-                    triplets.extend(entity_triplets)
-                else:
-                    triplets.append(entity_triplets)
-            except Exception as e:
-                state["errors"].append(f"Relation extraction error for {entity.article_number}: {str(e)}")
+                # 체인에서 검증된 트리플은 검증 단계까지 경량 표현으로 보관
+                entity_triplets = result if isinstance(result, list) else [result]
+                compact = compact_triplets(entity_triplets)
+                extracted[i] = extracted.get(i, []) + compact
+                triplets.extend(compact)
+        
+        if plan is not None:
+            groups: List[List[LegalEntity]] = [[] for _ in plan.articles]
+            for entity, i in zip(entities, positions):
+                groups[i].append(entity)
+            # 재처리 대상이거나 실패한 조각이 있는 조항의 불완전한 결과는 색인에 넣지 않음
+            skipped = retry | incomplete
+            self.duplicate_index.add(
+                plan, groups, {i: found for i, found in extracted.items() if i not in skipped}, state["document"].title
+            )
+            state["reuse"] = plan.report()
+            record_reuse(state["reuse"])
         
+        state["retry"] = sorted(retry)
         state["triplets"] = triplets
-        state["document"].triplets = triplets
         return state
     
-    def _validate_graph(self, state: GraphState) -> GraphState:
-        """Step 4: 그래프 검증"""
-        # 중복 제거 및 신뢰도 낮은 관계 필터링
-        unique_triplets = {}
-        for triplet in state["triplets"]:
-            key = (triplet. subject, triplet.relation, triplet.object)
-            if key not in unique_triplets or triplet.confidence > unique_triplets[key]. confidence:
-                unique_triplets[key] = triplet
+    def _map_relations(self, members) -> List[Tuple[List, List[ExtractionError]]]:
+        """(개체, 컨텍스트, 위치) 목록의 (관계 추출 결과, 오류) 목록 (시간 초과 등 예외도 오류로 기록)"""
+        def extract(job):
+            errors: List[ExtractionError] = []
+            try:
+                return self.relation_chain.extract(job[0], job[1], errors), errors
+            except Exception as e:
+                return [], errors + [relation_error(e, job[0].article_number)]
+        
+        if len(members) <= 1 or ARTICLE_CHUNK_WORKERS <= 1:
+            return [extract(job) for job in members]
+        with ThreadPoolExecutor(max_workers=min(ARTICLE_CHUNK_WORKERS, len(members))) as pool:
+            return list(pool.map(in_context(extract), members))
+    
+    @staticmethod
+    def _validate_graph(state: GraphState) -> GraphState:
+        """Step 4: 그래프 검증 (분산 처리 결과 병합에도 사용)"""
+        # 열 지향 테이블에서 개체 표기 정규화 및 별칭 병합
+        table = TripletTable.from_triplets(state["triplets"])
+        canonical, aliases, report = canonicalize_table(table, state["entities"])
+        state["document"].entity_aliases = aliases
+        state["canonicalization"] = report
+        metrics.inc("kg_entities_merged_total", report["nodes_before"] - report["nodes_after"])
+        metrics.inc("kg_edges_merged_total", report["edges_before"] - report["edges_after"])
         
-        state["triplets"] = list(unique_triplets.values())
+        # 중복 제거(최대 신뢰도 선택) 및 신뢰도 낮은 관계 필터링 (벡터 연산)
+        keep = canonical.dedup_indices()
+        if MIN_TRIPLET_CONFIDENCE > 0:
+            keep = keep[canonical.confidence[keep] >= MIN_TRIPLET_CONFIDENCE]
+        
+        # 내보내기 경계: 경량 표현을 검증 없이 pydantic 모델로 되돌림
+        state["triplets"] = to_models(rewrite_triplets(state["triplets"], table, canonical, keep.tolist()))
         state["document"].triplets = state["triplets"]
         return state
     
-    def process(self, document: LegalDocument) -> LegalDocument:
-        """문서 처리 실행"""
+    def process(
+        self,
+        document: LegalDocument,
+        routing: Union[None, str, Dict[str, Any], RoutingPolicy] = None,
+        deadline: Optional[float] = None
+    ) -> LegalDocument:
+        """문서 처리 실행
+        
+        Args:
+            routing: 이 실행에만 쓸 라우팅 정책 (모드 이름, JSON 파일 경로, dict 등, 라우터가 있을 때)
+            deadline: 문서 처리 마감 (초, 기본: DOCUMENT_DEADLINE_SECONDS, 0이면 마감 없음).
+                마감이 지나면 남은 호출을 취소하고 그 조항을 document.retry_articles에 남깁니다.
+        """
+        if routing is not None and self.router is None:
+            raise ValueError("라우터 없이 만든 워크플로우에는 라우팅 정책을 지정할 수 없습니다 (LLM_ROUTING 또는 router 인자)")
+
         initial_state:  GraphState = {
             "document": document,
             "articles":  [],
+            "article_refs": [],
             "entities": [],
+            "entity_positions": [],
             "triplets": [],
             "current_index": 0,
-            "errors": []
+            "errors": [],
+            "canonicalization": {},
+            "duplicates": None,
+            "reuse": {},
+            "deadline": document_deadline(deadline),
+            "retry": []
         }
         
-        final_state = self.workflow.invoke(initial_state)
+        repairs_before = repair_stats(self.entity_chain, self.relation_chain)
+        default_policy = self.router.policy if self.router is not None else None
+        if self.router is not None:
+            self.router.begin(routing)
+        try:
+            with metrics.timer("kg_document_duration_seconds"):
+                final_state = self.workflow.invoke(initial_state)
+        finally:
+            if self.router is not None:
+                routing_report = self.router.report()
+                self.router.policy = default_policy
+        repairs = repair_stats(self.entity_chain, self.relation_chain)
+        metrics.inc("kg_documents_total")
+        metrics.inc("kg_articles_total", len(final_state["articles"]))
+        metrics.inc("kg_triplets_total", len(final_state["triplets"]))
+        metrics.inc("kg_workflow_errors_total", len(final_state["errors"]))
+        result = final_state["document"]
+        result.retry_articles = [
+            known_fields(final_state["articles"][i]).get("article_number", f"{i + 1}번째 조항")
+            for i in final_state["retry"]
+        ]
+        metrics.inc("kg_articles_retry_total", len(result.retry_articles))
+        print_canonicalization(document.title, final_state["canonicalization"])
+        print_reuse(document.title, final_state["reuse"])
+        print_repairs(document.title, {
+            kind: count - repairs_before.get(kind, 0) for kind, count in repairs.items()
+        })
+        if self.router is not None:
+            record_routing(routing_report)
+            print_routing(document.title, routing_report)
+        print_retry(document.title, result, final_state["deadline"])
         
         if final_state["errors"]:
             print(f"⚠️  Warning: {len(final_state['errors'])} errors occurred")
             for error in final_state["errors"]:
                 print(f"  - {error}")
         
-        return final_state["document"]
+        return result
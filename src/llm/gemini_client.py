@@ -4,9 +4,29 @@ from langchain_core.language_models.llms import LLM
 from langchain_core.callbacks.manager import CallbackManagerForLLMRun
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import Field
+from utils.deadline import call_timeout
 import google.generativeai as genai
 
 
+class DeadlineChatGoogleGenerativeAI(ChatGoogleGenerativeAI):
+    """호출별 제한 시간(utils.deadline.call_timeout)을 요청 deadline으로 적용하는 Gemini 챗 모델
+
+    bounded_call이 제한 시간을 넘겨 기다리기를 그만둔 호출도 같은 시간에 API 요청이 끊깁니다.
+    (langchain_google_genai의 재시도 2회는 그대로라 최악의 경우 제한 시간의 약 2배 뒤에 끝남)
+    """
+
+    def _request_timeout(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = call_timeout(self.timeout or float(os.getenv("LLM_TIMEOUT", "120")))
+        return kwargs
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        return super()._generate(messages, stop, run_manager, **self._request_timeout(kwargs))
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        return await super()._agenerate(messages, stop, run_manager, **self._request_timeout(kwargs))
+
+
 class GeminiClient:
     """Google Gemini API 클라이언트"""
     
@@ -29,11 +49,13 @@ class GeminiClient:
         genai.configure(api_key=self.api_key)
         
         # LangChain Gemini 클라이언트
-        self.llm = ChatGoogleGenerativeAI(
+        self.llm = DeadlineChatGoogleGenerativeAI(
             model=self.model_name,
             google_api_key=self.api_key,
             temperature=self.temperature,
             max_output_tokens=self.max_tokens,
+            # 호출별 제한 시간은 utils.deadline.bounded_call이 정해 요청마다 적용 (여기서는 상한)
+            timeout=float(os.getenv("LLM_TIMEOUT", "120")),
             convert_system_message_to_human=True  # system 메시지를 user로 변환
         )
     
@@ -87,7 +109,7 @@ class LlamaCppClient(LLM):
         }
         
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with httpx.Client(timeout=call_timeout(self.timeout)) as client:
                 response = client.post(
                     f"{self.api_url}/v1/completions",
                     json=payload,
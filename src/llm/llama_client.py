@@ -4,6 +4,7 @@ from typing import Optional, Dict, Any, List
 from langchain_core.language_models.llms import LLM
 from langchain_core.callbacks.manager import CallbackManagerForLLMRun
 from pydantic import Field
+from utils.deadline import call_timeout
 
 
 class LlamaCppClient(LLM):
@@ -41,7 +42,7 @@ class LlamaCppClient(LLM):
         }
         
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with httpx.Client(timeout=call_timeout(self.timeout)) as client:
                 # llama-cpp-python 서버의 OpenAI 호환 API 엔드포인트
                 response = client.post(
                     f"{self.api_url}/v1/completions",
@@ -83,7 +84,7 @@ class LlamaCppClient(LLM):
         }
         
         try: 
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
+            async with httpx.AsyncClient(timeout=call_timeout(self.timeout)) as client:
                 response = await client.post(
                     f"{self.api_url}/v1/completions",
                     json=payload,
@@ -151,7 +152,7 @@ class LlamaCppChatClient(LLM):
         }
         
         try:
-            with httpx.Client(timeout=self.timeout) as client:
+            with httpx.Client(timeout=call_timeout(self.timeout)) as client:
                 response = client.post(
                     f"{self.api_url}/v1/chat/completions",
                     json=payload,
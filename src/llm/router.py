@@ -0,0 +1,314 @@
+"""비용·지연을 고려한 모델 단계(tier) 라우팅
+
+조항마다 충분한 가장 싼 모델로 보냅니다. 짧거나 정형적인 조항(목적·시행일·삭제 조항 등)은
+로컬 llama.cpp 소형 모델로, 길거나 단서·준용·참조가 많은 조항은 Gemini로 보내고, 소형 모델의
+응답이 검증을 통과하지 못하거나 신뢰도가 기준보다 낮으면 다음 단계로 올려(escalation) 다시 묻습니다.
+소형 모델의 관측 지연(올림 포함)이 대형 모델보다 크게 느리면 처음부터 대형 모델로 보냅니다.
+
+정책은 실행마다 바꿀 수 있습니다 (모드 이름, JSON 파일 경로, JSON 문자열 또는 dict).
+
+사용 예:
+    router = router_from_env("cascade")            # 인자와 LLM_ROUTING이 모두 비어 있으면 None
+    workflow = LegalKnowledgeGraphWorkflow(router=router)
+    workflow.process(document, routing={"small_max_tokens": 300})
+"""
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import BaseModel, Field
+
+from utils.deadline import DeadlineExceeded
+from utils.metrics import LLMMetricsCallback, MetricsRecorder, estimate_tokens, metrics
+from utils.reference_resolver import ARTICLE_NUMBER, PARAGRAPH_MARKS
+
+# 기본 라우팅 정책 (비우면 라우팅 없이 USE_LOCAL_LLM으로 정한 모델 하나만 사용)
+#   cascade | 단계 이름(local, gemini) | 정책 JSON 파일 경로 | JSON 문자열
+LLM_ROUTING = os.getenv("LLM_ROUTING", "")
+
+CASCADE = "cascade"
+# 조항 제목: 제N조(제목)
+HEADING_PATTERN = re.compile(r'^\s*제\s*\d+\s*조(?:\s*의\s*\d+)?\s*(?:\(([^()\n]{1,40})\))?')
+
+
+class TierCost(BaseModel):
+    """모델 단계의 토큰 단가 (USD, 100만 토큰당)"""
+    input: float = Field(default=0.0, description="입력 토큰 단가")
+    output: float = Field(default=0.0, description="출력 토큰 단가")
+
+
+class RoutingPolicy(BaseModel):
+    """조항별 모델 단계 선택 정책"""
+    mode: str = Field(default=CASCADE, description="cascade 또는 고정할 단계 이름")
+    tiers: List[str] = Field(default_factory=lambda: ["local", "gemini"], description="싼 모델부터 비싼 모델 순서")
+    small_max_tokens: int = Field(default=400, description="소형 모델로 보낼 조항의 최대 토큰 수")
+    small_max_paragraphs: int = Field(default=3, description="소형 모델로 보낼 조항의 최대 항 수")
+    small_max_references: int = Field(default=1, description="소형 모델로 보낼 조항이 참조하는 다른 조항의 최대 수")
+    boilerplate_titles: List[str] = Field(
+        default_factory=lambda: ["목적", "시행일", "삭제", "약칭", "경과조치"],
+        description="길이와 관계없이 소형 모델로 보낼 조항 제목"
+    )
+    complex_markers: List[str] = Field(
+        default_factory=lambda: ["다만", "준용", "불구하고", "본다", "추정한다"],
+        description="있으면 대형 모델로 보낼 표현 (단서, 준용, 간주, 추정)"
+    )
+    min_confidence: float = Field(default=0.6, description="이보다 낮은 평균 신뢰도의 관계 응답은 다음 단계로")
+    max_latency_ratio: float = Field(
+        default=1.5, description="소형 모델의 예상 지연(올림 포함)이 대형 모델의 이 배수를 넘으면 소형 모델 건너뜀"
+    )
+    latency_min_samples: int = Field(default=10, description="지연 비교에 필요한 단계별 최소 호출 수")
+    costs: Dict[str, TierCost] = Field(
+        default_factory=lambda: {"local": TierCost(), "gemini": TierCost(input=0.30, output=2.50)},
+        description="단계별 토큰 단가"
+    )
+
+
+def load_policy(spec: Union[None, str, Dict[str, Any], RoutingPolicy] = None) -> Optional[RoutingPolicy]:
+    """라우팅 정책 읽기 (spec이 None이면 LLM_ROUTING, 비어 있거나 "off"면 None)"""
+    spec = LLM_ROUTING if spec is None else spec
+    if isinstance(spec, RoutingPolicy):
+        return spec
+    if isinstance(spec, dict):
+        return RoutingPolicy(**spec)
+    spec = spec.strip()
+    if not spec or spec.lower() == "off":
+        return None
+    if spec.startswith("{"):
+        return RoutingPolicy(**json.loads(spec))
+    if spec.endswith(".json") or os.path.isfile(spec):
+        with open(spec, "r", encoding="utf-8") as f:
+            return RoutingPolicy(**json.load(f))
+    return RoutingPolicy(mode=spec)
+
+
+def default_tiers() -> Dict[str, Callable[[], Any]]:
+    """기본 모델 단계 (처음 쓸 때 생성하므로 쓰지 않는 단계의 API 키는 필요 없음)"""
+    from llm.gemini_client import GeminiClient, LlamaCppClient
+    return {
+        "local": LlamaCppClient,
+        "gemini": lambda: GeminiClient().get_llm(),
+    }
+
+
+class _TierStats:
+    """단계별 누적 호출 통계 (지연 비교용)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.rejected = 0
+        self.seconds = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.seconds / self.calls if self.calls else 0.0
+
+    @property
+    def escalation_rate(self) -> float:
+        return self.rejected / self.calls if self.calls else 0.0
+
+
+class ModelRouter:
+    """조항별 모델 단계 선택, 올림(escalation), 단계별 지연·비용 집계 (스레드 안전)
+
+    Args:
+        tiers: 단계 이름 -> LLM 생성 함수 (처음 쓸 때 한 번 생성)
+        policy: 라우팅 정책 (기본: LLM_ROUTING 또는 cascade)
+    """
+
+    def __init__(self, tiers: Optional[Dict[str, Callable[[], Any]]] = None, policy: Optional[RoutingPolicy] = None):
+        self.factories = tiers or default_tiers()
+        self._llms: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        # 실행 간 누적 (지연 비교), 실행별 집계 (리포트)
+        self._tiers: Dict[str, _TierStats] = {}
+        self.usage = MetricsRecorder()
+        self._callbacks: Dict[str, LLMMetricsCallback] = {}
+        self._run: Dict[str, Dict[Tuple[str, ...], int]] = {}
+        self.policy = self._check(policy or load_policy() or RoutingPolicy())
+        self.begin()
+
+    def _check(self, policy: RoutingPolicy) -> RoutingPolicy:
+        unknown = [tier for tier in policy.tiers if tier not in self.factories]
+        if not policy.tiers or unknown:
+            raise ValueError(f"알 수 없는 모델 단계: {unknown or '(비어 있음)'} (사용 가능: {', '.join(self.factories)})")
+        if policy.mode != CASCADE and policy.mode not in policy.tiers:
+            raise ValueError(f"알 수 없는 라우팅 모드: {policy.mode} ({CASCADE} 또는 {', '.join(policy.tiers)})")
+        return policy
+
+    def begin(self, policy: Union[None, str, Dict[str, Any], RoutingPolicy] = None):
+        """실행 시작: 정책 교체(지정 시)와 실행별 집계 초기화"""
+        if policy is not None:
+            self.policy = self._check(load_policy(policy) or RoutingPolicy())
+        with self._lock:
+            self.usage.reset()
+            self._run = {"routed": {}, "escalated": {}, "calls": {}, "rejected": {}, "seconds": {}}
+
+    def llm(self, tier: str):
+        """단계의 LLM (처음 요청할 때 생성)"""
+        with self._lock:
+            if tier not in self._llms:
+                self._llms[tier] = self.factories[tier]()
+            return self._llms[tier]
+
+    def callbacks(self, tier: str) -> List[LLMMetricsCallback]:
+        """단계별 토큰 사용량을 실행별 레코더에 남기는 콜백"""
+        with self._lock:
+            if tier not in self._callbacks:
+                self._callbacks[tier] = LLMMetricsCallback(tier, recorder=self.usage)
+            return [self._callbacks[tier]]
+
+    @property
+    def last_tier(self) -> str:
+        """모든 호출이 마지막으로 거치는 단계 (올림의 끝)"""
+        return self.policy.mode if self.policy.mode != CASCADE else self.policy.tiers[-1]
+
+    def is_simple(self, text: str) -> Tuple[bool, str]:
+        """소형 모델로 충분한 조항인지와 그 이유"""
+        policy = self.policy
+        heading = HEADING_PATTERN.match(text)
+        if heading and heading.group(1) and heading.group(1).strip() in policy.boilerplate_titles:
+            return True, "boilerplate"
+        if estimate_tokens(text) > policy.small_max_tokens:
+            return False, "long"
+        if sum(text.count(mark) for mark in PARAGRAPH_MARKS) > policy.small_max_paragraphs:
+            return False, "paragraphs"
+        # 조항 제목의 자기 번호는 참조가 아님
+        body = heading.end() if heading else 0
+        references = {re.sub(r'\s+', '', match.group(0)) for match in ARTICLE_NUMBER.finditer(text, body)}
+        if len(references) > policy.small_max_references:
+            return False, "references"
+        if any(marker in text for marker in policy.complex_markers):
+            return False, "complex"
+        return True, "short"
+
+    def _too_slow(self, small: str, large: str) -> bool:
+        """소형 모델의 예상 지연(올림 시 대형 모델 호출 포함)이 대형 모델보다 크게 느린지"""
+        with self._lock:
+            small_stats, large_stats = self._tiers.get(small), self._tiers.get(large)
+            samples = self.policy.latency_min_samples
+            if not small_stats or not large_stats or min(small_stats.calls, large_stats.calls) < samples:
+                return False
+            expected = small_stats.mean_seconds + small_stats.escalation_rate * large_stats.mean_seconds
+            return expected > self.policy.max_latency_ratio * large_stats.mean_seconds
+
+    def route(self, chain: str, text: str) -> List[str]:
+        """호출할 단계 순서 (앞 단계 응답이 검증을 통과하지 못하면 다음 단계)"""
+        policy = self.policy
+        if policy.mode != CASCADE:
+            tiers, reason = [policy.mode], "fixed"
+        else:
+            simple, reason = self.is_simple(text)
+            if simple and len(policy.tiers) > 1 and self._too_slow(policy.tiers[0], policy.tiers[-1]):
+                simple, reason = False, "slow"
+            tiers = list(policy.tiers) if simple else [policy.tiers[-1]]
+        self._count("routed", chain, tiers[0], reason)
+        metrics.inc("kg_llm_routed_total", chain=chain, tier=tiers[0], reason=reason)
+        return tiers
+
+    def invoke(self, chain: str, text: str, call: Callable[[str], Any], accept: Callable[[Any], bool]) -> Tuple[Any, str]:
+        """라우팅한 단계 순서대로 호출해 검증을 통과한 첫 응답 반환
+
+        Args:
+            chain: 체인 이름 (entity, relation 등)
+            text: 라우팅 판단에 쓸 조항 원문
+            call: 단계 이름을 받아 그 단계로 호출한 결과를 반환
+            accept: 결과가 검증을 통과했는지 (마지막 단계 결과는 검증과 관계없이 반환)
+
+        Returns:
+            (결과, 응답한 단계). 마지막 단계 호출이 실패하거나 문서 마감이 지나면 그 예외를 그대로 전달합니다.
+        """
+        tiers = self.route(chain, text)
+        for k, tier in enumerate(tiers):
+            last = k == len(tiers) - 1
+            started = time.perf_counter()
+            try:
+                result = call(tier)
+                accepted = accept(result)
+            except Exception as e:
+                self._record(chain, tier, time.perf_counter() - started, accepted=False)
+                # 문서 마감이 지나면 다음 단계로 올리지 않음
+                if last or isinstance(e, DeadlineExceeded):
+                    raise
+                result, accepted = None, False
+            else:
+                self._record(chain, tier, time.perf_counter() - started, accepted)
+            if accepted or last:
+                return result, tier
+            self._count("escalated", chain, tier)
+            metrics.inc("kg_llm_escalations_total", chain=chain, tier=tier)
+            metrics.inc("kg_retries_total", stage=f"{chain}_escalation")
+        raise RuntimeError("라우팅할 모델 단계가 없습니다")
+
+    def _count(self, kind: str, *key: str, value: float = 1):
+        with self._lock:
+            counts = self._run[kind]
+            counts[key] = counts.get(key, 0) + value
+
+    def _record(self, chain: str, tier: str, seconds: float, accepted: bool):
+        metrics.observe("kg_llm_tier_duration_seconds", seconds, chain=chain, tier=tier)
+        with self._lock:
+            stats = self._tiers.setdefault(tier, _TierStats())
+            stats.calls += 1
+            stats.seconds += seconds
+            stats.rejected += 0 if accepted else 1
+        self._count("calls", chain, tier)
+        self._count("seconds", chain, tier, value=seconds)
+        if not accepted:
+            self._count("rejected", chain, tier)
+
+    def report(self) -> Dict[str, Any]:
+        """이번 실행의 라우팅 결정, 올림 비율, 단계별 지연·토큰·비용"""
+        with self._lock:
+            run = {kind: dict(counts) for kind, counts in self._run.items()}
+
+        chains: Dict[str, Dict[str, Any]] = {}
+        for (chain, tier, reason), count in run["routed"].items():
+            entry = chains.setdefault(chain, {"routed": {}, "reasons": {}, "escalated": 0})
+            entry["routed"][tier] = entry["routed"].get(tier, 0) + count
+            entry["reasons"][reason] = entry["reasons"].get(reason, 0) + count
+        for (chain, _), count in run["escalated"].items():
+            chains.setdefault(chain, {"routed": {}, "reasons": {}, "escalated": 0})["escalated"] += count
+        for entry in chains.values():
+            routed = sum(entry["routed"].values())
+            entry["escalation_rate"] = round(entry["escalated"] / routed, 4) if routed else 0.0
+
+        tiers: Dict[str, Dict[str, Any]] = {}
+        for (_, tier), count in run["calls"].items():
+            entry = tiers.setdefault(tier, {"calls": 0, "rejected": 0, "seconds": 0.0})
+            entry["calls"] += count
+        for (_, tier), count in run["rejected"].items():
+            tiers[tier]["rejected"] += count
+        for (_, tier), seconds in run["seconds"].items():
+            tiers[tier]["seconds"] += seconds
+        for tier, entry in tiers.items():
+            cost = self.policy.costs.get(tier, TierCost())
+            entry["prompt_tokens"] = int(self.usage.counter_value("kg_llm_prompt_tokens_total", chain=tier))
+            entry["completion_tokens"] = int(self.usage.counter_value("kg_llm_completion_tokens_total", chain=tier))
+            entry["mean_seconds"] = round(entry["seconds"] / entry["calls"], 4) if entry["calls"] else 0.0
+            entry["seconds"] = round(entry["seconds"], 4)
+            entry["cost_usd"] = round(
+                (entry["prompt_tokens"] * cost.input + entry["completion_tokens"] * cost.output) / 1e6, 6
+            )
+        return {"mode": self.policy.mode, "chains": chains, "tiers": tiers}
+
+
+def record_routing(report: Dict[str, Any]):
+    """실행별 단계 비용을 메트릭으로 기록 (호출 수·지연·올림은 호출 시점에 기록)"""
+    for tier, entry in report.get("tiers", {}).items():
+        if entry["cost_usd"]:
+            metrics.inc("kg_llm_cost_usd_total", entry["cost_usd"], tier=tier)
+
+
+def add_routing_argument(parser):
+    """CLI에 --routing 옵션 추가"""
+    parser.add_argument("--routing", default=None,
+                        help="모델 라우팅 정책: cascade | local | gemini | 정책 JSON 파일 (기본: LLM_ROUTING)")
+
+
+def router_from_env(spec: Union[None, str, Dict[str, Any], RoutingPolicy] = None) -> Optional[ModelRouter]:
+    """정책이 지정되어 있으면(인자 또는 LLM_ROUTING) 기본 단계의 라우터, 아니면 None"""
+    policy = load_policy(spec)
+    return ModelRouter(policy=policy) if policy is not None else None
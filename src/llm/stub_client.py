@@ -0,0 +1,102 @@
+import json
+import re
+import time
+from typing import Optional, Dict, Any, List
+from langchain_core.language_models.llms import LLM
+from langchain_core.callbacks.manager import CallbackManagerForLLMRun
+from pydantic import Field
+
+ARTICLE_PATTERN = re.compile(r'제\s*\d+\s*조(?:의\s*\d+)?')
+REFERENCE_PATTERN = re.compile(r'제\s*(\d+)\s*조(?:의\s*\d+)?(?:제\s*\d+\s*항)?에\s*따라')
+
+
+class StubLLM(LLM):
+    """오프라인 벤치마크/테스트용 결정적 LLM
+
+    체인 프롬프트에서 조항 원문을 찾아 규칙 기반으로 개체(JSON 객체), 재질문한
+    필드, 관계(JSON 배열)를 생성합니다. latency를 지정하면 호출마다 그만큼 대기합니다.
+    """
+
+    latency: float = Field(default=0.0, description="호출당 모의 지연 시간(초)")
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def _call(
+        self,
+        prompt: str,
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> str:
+        """프롬프트 종류에 따라 개체 또는 관계 JSON 반환"""
+        if self.latency:
+            time.sleep(self.latency)
+
+        if "다음 법령 조항을 분석하세요" in prompt:
+            return json.dumps(self._entity(prompt), ensure_ascii=False)
+        if "채울 필드:" in prompt:
+            return json.dumps(self._fields(prompt), ensure_ascii=False)
+        return json.dumps(self._relations(prompt), ensure_ascii=False)
+
+    @staticmethod
+    def _entity(prompt: str) -> Dict[str, Any]:
+        text = prompt.split("다음 법령 조항을 분석하세요:", 1)[-1].strip()
+        match = ARTICLE_PATTERN.search(text)
+        title = re.search(r'\(([^)]*)\)', text[:80])
+        delegated = "대통령령" in text
+        return {
+            "article_number": re.sub(r'\s+', '', match.group(0)) if match else "Unknown",
+            "concept": title.group(1) if title else text[:20],
+            "subject": "대통령령" if delegated else "이 법",
+            "action": "정한다" if delegated else "규정한다",
+            "object": text[:30],
+            "full_text": text
+        }
+
+    @classmethod
+    def _fields(cls, prompt: str) -> Dict[str, Any]:
+        """필드 재질문: 요청한 필드만 개체 규칙으로 채움"""
+        text = prompt.split("조항:", 1)[-1].split("현재 결과:", 1)[0].strip()
+        fields = re.findall(r'^- (\w+):', prompt.split("채울 필드:", 1)[-1], re.MULTILINE)
+        entity = cls._entity(f"다음 법령 조항을 분석하세요:\n\n{text}")
+        return {field: entity[field] for field in fields if field in entity}
+
+    @staticmethod
+    def _relations(prompt: str) -> List[Dict[str, Any]]:
+        article_number = re.search(r'조항 번호:\s*(\S+)', prompt)
+        article_number = article_number.group(1) if article_number else "Unknown"
+        full_text = prompt.split("원문:", 1)[-1].split("관련 조항들", 1)[0]
+
+        triplets = [
+            {
+                "subject": article_number,
+                "relation": "참조함",
+                "object": f"제{ref}조",
+                "article_number": article_number,
+                "confidence": 0.9
+            }
+            for ref in REFERENCE_PATTERN.findall(full_text)
+        ]
+        if "대통령령으로 정" in full_text:
+            triplets.append({
+                "subject": article_number,
+                "relation": "위임함",
+                "object": "대통령령",
+                "article_number": article_number,
+                "confidence": 0.8
+            })
+        if not triplets:
+            triplets.append({
+                "subject": "이 법",
+                "relation": "정의함",
+                "object": article_number,
+                "article_number": article_number,
+                "confidence": 0.5
+            })
+        return triplets
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"latency": self.latency}
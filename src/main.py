@@ -1,3 +1,4 @@
+import argparse
 import os
 import sys
 from dotenv import load_dotenv
@@ -5,6 +6,9 @@ from rich.console import Console
 
 from models.schemas import LegalDocument
 from graphs.legal_graph import LegalKnowledgeGraphWorkflow
+from utils.metrics import start_metrics_from_env, export_metrics_from_env
+from utils.profiler import add_profile_arguments, profile_run
+from llm.router import add_routing_argument, router_from_env
 from utils.common_utils import check_gpu, test_llm_connection, save_to_memgraph, display_result_tables
 
 # 환경 변수 로드
@@ -14,12 +18,20 @@ console = Console()
 
 
 def main():
+    parser = argparse.ArgumentParser(description="예시 법률 문서로 지식 그래프 생성")
+    add_profile_arguments(parser)
+    add_routing_argument(parser)
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="문서 처리 마감(초), 넘으면 남은 호출을 취소하고 조항을 재처리 대상으로 표시 (기본: DOCUMENT_DEADLINE_SECONDS)")
+    args = parser.parse_args()
+    
     console.print("=" * 80, style="bold cyan")
     console.print("🏛️ Legal Knowledge Graph - Gemini & Memgraph Edition", style="bold cyan")
     console.print("=" * 80, style="bold cyan")
     
     # GPU 확인
     check_gpu()
+    start_metrics_from_env()
     
     # LLM 연결 테스트
     if not test_llm_connection():
@@ -41,16 +53,20 @@ def main():
     
     # 워크플로우 실행
     console.print("\n🚀 법률 지식 그래프 생성 시작...", style="bold green")
-    workflow = LegalKnowledgeGraphWorkflow()
-    
-    with console.status("[bold green]처리 중...", spinner="dots"):
-        result = workflow.process(sample_document)
-    
-    # 결과 테이블 표시
-    display_result_tables(result)
+    workflow = LegalKnowledgeGraphWorkflow(router=router_from_env(args.routing))
     
-    # Memgraph에 저장 (기존 데이터 삭제)
-    save_to_memgraph(result, clear_existing=True)
+    with profile_run(args) as profiler:
+        with console.status("[bold green]처리 중...", spinner="dots"):
+            result = workflow.process(sample_document, deadline=args.deadline)
+        
+        # 결과 테이블 표시
+        display_result_tables(result)
+        
+        # Memgraph에 저장 (기존 데이터 삭제)
+        save_to_memgraph(result, clear_existing=True)
+        if profiler:
+            profiler.articles = len(result.entities)
+    export_metrics_from_env()
     
     console.print("\n" + "=" * 80, style="bold cyan")
     console.print("✨ 처리 완료!", style="bold green")
@@ -0,0 +1,118 @@
+"""경량 개체/트리플 표현 (__slots__ + 문자열 interning)
+
+pydantic 모델은 생성 시마다 검증하고 인스턴스마다 __dict__와 fields_set을 가지므로,
+수만 개의 트리플을 메모리에 올리면 필요 이상으로 커집니다. 검증은 LLM 응답을 파싱하는
+경계에서만 하고, 그 뒤 내부 처리와 분석용 로드는 이 클래스로 들고 있다가
+내보낼 때(LegalDocument 구성 등) 검증 없이 pydantic 모델로 되돌립니다.
+
+주체/관계/대상/조항 번호처럼 반복되는 문자열은 sys.intern으로 한 객체를 공유합니다.
+"""
+import sys
+from typing import Any, Dict, Iterable, List, Optional
+
+from models.schemas import GraphTriplet, LegalEntity, TextRef
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class CompactTriplet:
+    """경량 트리플 (GraphTriplet과 같은 속성)"""
+
+    __slots__ = ("subject", "relation", "object", "article_number", "confidence")
+
+    def __init__(self, subject: str, relation: str, object: str, article_number: str, confidence: float = 1.0):
+        self.subject = sys.intern(subject)
+        self.relation = sys.intern(relation)
+        self.object = sys.intern(object)
+        self.article_number = sys.intern(article_number)
+        self.confidence = float(confidence)
+
+    @classmethod
+    def from_model(cls, triplet: GraphTriplet) -> "CompactTriplet":
+        return cls(triplet.subject, triplet.relation, triplet.object, triplet.article_number, triplet.confidence)
+
+    def to_model(self) -> GraphTriplet:
+        """검증 없이 GraphTriplet으로 변환 (이미 경계에서 검증된 값)"""
+        return GraphTriplet.model_construct(**self.model_dump())
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def model_copy(self, update: Optional[Dict[str, Any]] = None) -> "CompactTriplet":
+        """pydantic과 같은 형태의 복사 (update 필드만 교체)"""
+        return CompactTriplet(**{**self.model_dump(), **(update or {})})
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (CompactTriplet, GraphTriplet)):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return "CompactTriplet(" + ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__) + ")"
+
+
+class CompactEntity:
+    """경량 조항 개체 (LegalEntity와 같은 속성, 원문은 저장소 참조 가능)"""
+
+    __slots__ = ("article_number", "concept", "subject", "action", "object", "full_text", "text_ref")
+
+    def __init__(
+        self,
+        article_number: str,
+        concept: str,
+        subject: Optional[str] = None,
+        action: Optional[str] = None,
+        object: Optional[str] = None,
+        full_text: str = "",
+        text_ref: Optional[TextRef] = None
+    ):
+        self.article_number = sys.intern(article_number)
+        self.concept = sys.intern(concept)
+        self.subject = _intern(subject)
+        self.action = _intern(action)
+        self.object = _intern(object)
+        self.full_text = full_text
+        self.text_ref = TextRef(*text_ref) if text_ref is not None else None
+
+    @classmethod
+    def from_model(cls, entity: LegalEntity) -> "CompactEntity":
+        return cls(**{name: getattr(entity, name) for name in cls.__slots__})
+
+    @property
+    def text(self) -> str:
+        """원문 (저장소 참조만 있으면 필요할 때 읽음)"""
+        if self.full_text or self.text_ref is None:
+            return self.full_text
+        from utils.text_store import text_store
+        return text_store.slice(self.text_ref)
+
+    def attach_text(self, ref: TextRef):
+        self.text_ref = ref
+        self.full_text = ""
+
+    def to_model(self) -> LegalEntity:
+        """검증 없이 LegalEntity로 변환"""
+        return LegalEntity.model_construct(**self.model_dump())
+
+    def model_dump(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"CompactEntity(article_number={self.article_number!r}, concept={self.concept!r})"
+
+
+def compact_triplets(triplets: Iterable[GraphTriplet]) -> List[CompactTriplet]:
+    """GraphTriplet 목록을 경량 표현으로 (이미 경량이면 그대로)"""
+    return [t if isinstance(t, CompactTriplet) else CompactTriplet.from_model(t) for t in triplets]
+
+
+def compact_entities(entities: Iterable[LegalEntity]) -> List[CompactEntity]:
+    """LegalEntity 목록을 경량 표현으로 (이미 경량이면 그대로)"""
+    return [e if isinstance(e, CompactEntity) else CompactEntity.from_model(e) for e in entities]
+
+
+def to_models(items: Iterable[Any]) -> List[Any]:
+    """경량 표현을 pydantic 모델로 (이미 모델이면 그대로)"""
+    return [item.to_model() if isinstance(item, (CompactTriplet, CompactEntity)) else item for item in items]
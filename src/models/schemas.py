@@ -1,7 +1,26 @@
-from typing import List, Optional
+from typing import Dict, List, NamedTuple, Optional
 from pydantic import BaseModel, Field
+from pydantic.json_schema import SkipJsonSchema
 from enum import Enum
 
+
+class TextRef(NamedTuple):
+    """텍스트 저장소 참조 (원문 내용 해시 + 문자 구간)
+    
+    조항 수만큼 만들어지므로 모델 대신 튜플로 둡니다 (pydantic 필드로 검증/직렬화 가능).
+    """
+    hash: str
+    start: int
+    end: int
+
+
+class SourceUnit(NamedTuple):
+    """큰 조항을 나눠 추출한 조각의 출처 (항/호 단위 번호 + 조항 원문 안의 문자 구간)"""
+    unit: str
+    start: int
+    end: int
+
+
 class LegalEntity(BaseModel):
     """법률 개체"""
     article_number: str = Field(description="조항 번호")
@@ -9,7 +28,25 @@ class LegalEntity(BaseModel):
     subject: Optional[str] = Field(default=None, description="의무 주체")
     action: Optional[str] = Field(default=None, description="행위")
     object: Optional[str] = Field(default=None, description="대상")
-    full_text: str = Field(description="원문")
+    full_text: str = Field(default="", description="원문")
+    # LLM 출력 형식에는 포함하지 않음 (워크플로우가 조항 분리 결과로 채움)
+    text_ref: SkipJsonSchema[Optional[TextRef]] = Field(default=None, description="원문 저장소 참조")
+    source_units: SkipJsonSchema[List[SourceUnit]] = Field(
+        default_factory=list, description="조각별 추출 출처 (분할한 조항만, 조각 순서)"
+    )
+    
+    @property
+    def text(self) -> str:
+        """원문 (저장소 참조만 있으면 필요할 때 압축을 풀어 읽음)"""
+        if self.full_text or self.text_ref is None:
+            return self.full_text
+        from utils.text_store import text_store
+        return text_store.slice(self.text_ref)
+    
+    def attach_text(self, ref: TextRef):
+        """원문을 저장소 참조로 대체 (복사본 제거)"""
+        self.text_ref = ref
+        self.full_text = ""
 
 class RelationType(str, Enum):
     # --- 구조 및 참조 관계 ---
@@ -49,6 +86,32 @@ class GraphTriplet(BaseModel):
     confidence: float = Field(default=1.0, description="신뢰도")
 
 
+class ErrorCode(str, Enum):
+    """추출 오류 코드 (재처리 대상 선별용)"""
+    ENTITY_CALL_FAILED = "entity_call_failed"          # 개체 추출 호출/파싱 실패 (필드 재질문으로 복구 시도)
+    ENTITY_FIELD_MISSING = "entity_field_missing"      # 재질문 후에도 비어 있는 필드
+    ENTITY_FIELD_INVALID = "entity_field_invalid"      # 재질문 후에도 형식이 잘못된 필드
+    ENTITY_REASK_BUDGET = "entity_reask_budget"        # 문서의 재질문 예산 소진
+    ENTITY_DROPPED = "entity_dropped"                  # 필수 필드를 채우지 못해 개체 없음
+    ENTITY_STAGE_FAILED = "entity_stage_failed"        # 개체 추출 단계 전체 실패
+    RELATION_CALL_FAILED = "relation_call_failed"      # 관계 추출 호출 실패
+    LLM_CALL_TIMEOUT = "llm_call_timeout"              # 호출 하나가 제한 시간 초과 (조항 재처리 대상)
+    DEADLINE_EXCEEDED = "deadline_exceeded"            # 문서 마감 경과로 호출 취소·생략 (조항 재처리 대상)
+    JOB_FAILED = "job_failed"                          # 분산 작업 최종 실패
+
+
+class ExtractionError(BaseModel):
+    """추출 오류 (GraphState["errors"] 항목)"""
+    code: ErrorCode = Field(description="오류 코드")
+    article_number: Optional[str] = Field(default=None, description="조항 번호 (알 수 없으면 None)")
+    field: Optional[str] = Field(default=None, description="문제 필드")
+    message: str = Field(default="", description="상세 내용")
+    
+    def __str__(self) -> str:
+        where = " ".join(part for part in (self.article_number, self.field) if part)
+        return f"[{self.code.value}] {where}: {self.message}" if where else f"[{self.code.value}] {self.message}"
+
+
 class LegalDocument(BaseModel):
     """법률 문서"""
     title: str = Field(description="법령명")
@@ -56,3 +119,5 @@ class LegalDocument(BaseModel):
     content: str = Field(description="법령 내용")
     entities: List[LegalEntity] = Field(default_factory=list)
     triplets: List[GraphTriplet] = Field(default_factory=list)
+    entity_aliases: Dict[str, str] = Field(default_factory=dict, description="개체 별칭 -> 대표 이름")
+    retry_articles: List[str] = Field(default_factory=list, description="시간 초과·마감 경과로 다시 처리할 조항 번호")
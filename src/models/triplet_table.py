@@ -0,0 +1,212 @@
+"""열 지향(columnar) 트리플 테이블
+
+주체/관계/대상/조항 번호를 하나의 공유 문자열 사전에 정수 코드로 저장하고, 신뢰도는 float
+배열로 저장합니다. 중복 제거(최대 신뢰도 선택), 신뢰도 임계값 필터, 조항별 그룹화를
+numpy 벡터 연산으로 처리하며, 기존 코드에는 GraphTriplet 리스트로 보여줄 수 있습니다.
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+from pydantic import BaseModel
+
+from models.schemas import GraphTriplet
+
+COLUMNS = ("subject", "relation", "object", "article")
+
+
+class TripletTable:
+    """정수 코드 기반 트리플 테이블
+
+    Args:
+        strings: 공유 문자열 사전 (코드 -> 문자열)
+        subject, relation, object, article: int32 코드 배열
+        confidence: float64 신뢰도 배열
+    """
+
+    def __init__(
+        self,
+        strings: List[str],
+        subject: np.ndarray,
+        relation: np.ndarray,
+        object: np.ndarray,
+        article: np.ndarray,
+        confidence: np.ndarray
+    ):
+        self.strings = strings
+        self.subject = subject
+        self.relation = relation
+        self.object = object
+        self.article = article
+        self.confidence = confidence
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_columns(
+        cls,
+        subjects: Sequence[str],
+        relations: Sequence[str],
+        objects: Sequence[str],
+        articles: Sequence[str],
+        confidences: Sequence[float],
+        strings: Optional[List[str]] = None
+    ) -> "TripletTable":
+        """문자열 열로부터 테이블 생성 (strings를 주면 그 사전을 이어서 사용)"""
+        strings = strings if strings is not None else []
+        codes = {value: code for code, value in enumerate(strings)}
+        lookup = codes.setdefault
+
+        columns = [
+            np.array([lookup(value, len(codes)) for value in values], dtype=np.int32)
+            for values in (subjects, relations, objects, articles)
+        ]
+        # setdefault로 새로 부여된 코드 순서대로 사전 확장
+        strings.extend(list(codes)[len(strings):])
+        return cls(strings, *columns, np.asarray(confidences, dtype=np.float64))
+
+    @classmethod
+    def from_triplets(cls, triplets: Iterable[GraphTriplet]) -> "TripletTable":
+        """GraphTriplet (또는 경량 CompactTriplet) 리스트로부터 테이블 생성"""
+        # pydantic 속성 접근보다 필드 dict 조회가 훨씬 빠름
+        rows = [
+            triplet.__dict__ if isinstance(triplet, BaseModel) else triplet.model_dump()
+            for triplet in triplets
+        ]
+        return cls.from_columns(
+            [row["subject"] for row in rows],
+            [row["relation"] for row in rows],
+            [row["object"] for row in rows],
+            [row["article_number"] for row in rows],
+            [row["confidence"] for row in rows],
+        )
+
+    # ------------------------------------------------------------------
+    # 조회 / 변환
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.subject)
+
+    def __getitem__(self, index: int) -> GraphTriplet:
+        return GraphTriplet.model_construct(
+            subject=self.strings[self.subject[index]],
+            relation=self.strings[self.relation[index]],
+            object=self.strings[self.object[index]],
+            article_number=self.strings[self.article[index]],
+            confidence=float(self.confidence[index])
+        )
+
+    def __iter__(self) -> Iterator[GraphTriplet]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def to_triplets(self) -> List[GraphTriplet]:
+        """GraphTriplet 리스트로 변환 (검증 없이 생성)"""
+        strings = self.strings
+        return [
+            GraphTriplet.model_construct(
+                subject=strings[s], relation=strings[r], object=strings[o],
+                article_number=strings[a], confidence=c
+            )
+            for s, r, o, a, c in zip(
+                self.subject.tolist(), self.relation.tolist(), self.object.tolist(),
+                self.article.tolist(), self.confidence.tolist()
+            )
+        ]
+
+    def take(self, indices: np.ndarray) -> "TripletTable":
+        """indices 행만 가진 테이블 (문자열 사전은 공유)"""
+        return TripletTable(
+            self.strings,
+            self.subject[indices], self.relation[indices], self.object[indices],
+            self.article[indices], self.confidence[indices]
+        )
+
+    def remap(self, mapping: Dict[str, str], columns: Sequence[str] = ("subject", "object")) -> "TripletTable":
+        """columns의 문자열을 mapping에 따라 바꾼 테이블 (사전 항목 수만큼만 조회)"""
+        codes = {value: code for code, value in enumerate(self.strings)}
+        translation = np.arange(len(self.strings), dtype=np.int32)
+        for source, target in mapping.items():
+            code = codes.get(source)
+            if code is None or source == target:
+                continue
+            if target not in codes:
+                codes[target] = len(self.strings)
+                self.strings.append(target)
+                translation = np.append(translation, np.int32(codes[target]))
+            translation[code] = codes[target]
+
+        table = self.take(slice(None))
+        for column in columns:
+            setattr(table, column, translation[getattr(self, column)])
+        return table
+
+    @property
+    def nbytes(self) -> int:
+        """배열이 차지하는 바이트 수 (문자열 사전 제외)"""
+        return sum(getattr(self, column).nbytes for column in COLUMNS) + self.confidence.nbytes
+
+    # ------------------------------------------------------------------
+    # 벡터 연산
+    # ------------------------------------------------------------------
+
+    def _key_groups(self):
+        """(주체, 관계, 대상) 키로 안정 정렬한 순서와 각 키 그룹의 시작 위치"""
+        size = len(self.strings)
+        if size ** 3 < 2 ** 63:
+            # 세 코드를 int64 하나로 묶어 한 번만 정렬
+            key = (self.subject.astype(np.int64) * size + self.relation) * size + self.object
+            order = np.argsort(key, kind="stable")
+            sorted_key = key[order]
+            changed = sorted_key[1:] != sorted_key[:-1]
+        else:
+            order = np.lexsort((self.object, self.relation, self.subject))
+            s, r, o = self.subject[order], self.relation[order], self.object[order]
+            changed = (s[1:] != s[:-1]) | (r[1:] != r[:-1]) | (o[1:] != o[:-1])
+        return order, np.flatnonzero(np.concatenate(([True], changed)))
+
+    def count_distinct(self) -> int:
+        """서로 다른 (주체, 관계, 대상) 키 수"""
+        return len(self._key_groups()[1]) if len(self) else 0
+
+    def dedup_indices(self) -> np.ndarray:
+        """(주체, 관계, 대상)별로 신뢰도가 가장 높은 행의 인덱스
+
+        동률이면 먼저 나온 행을 고르고, 결과는 각 키가 처음 나온 순서로 정렬합니다
+        (dict 기반 중복 제거와 같은 결과).
+        """
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        order, starts = self._key_groups()
+        confidence = self.confidence[order]
+        flags = np.zeros(len(order), dtype=np.int64)
+        flags[starts] = 1
+        group = np.cumsum(flags) - 1
+        # 그룹 최대 신뢰도와 같은 행 중 그룹마다 첫 번째 (안정 정렬이므로 가장 먼저 나온 행)
+        candidates = np.flatnonzero(confidence == np.maximum.reduceat(confidence, starts)[group])
+        first = np.concatenate(([True], group[candidates][1:] != group[candidates][:-1]))
+        best = order[candidates[first]]
+        return best[np.argsort(order[starts], kind="stable")]
+
+    def dedup(self) -> "TripletTable":
+        """중복 제거된 테이블"""
+        return self.take(self.dedup_indices())
+
+    def filter_confidence(self, min_confidence: float) -> "TripletTable":
+        """신뢰도가 min_confidence 이상인 행만"""
+        return self.take(np.flatnonzero(self.confidence >= min_confidence))
+
+    def group_by_article(self) -> Dict[str, np.ndarray]:
+        """조항 번호 -> 행 인덱스 배열 (조항 내 원래 순서 유지)"""
+        if len(self) == 0:
+            return {}
+        order = np.argsort(self.article, kind="stable")
+        articles = self.article[order]
+        starts = np.flatnonzero(np.concatenate(([True], articles[1:] != articles[:-1])))
+        return {
+            self.strings[articles[start]]: group
+            for start, group in zip(starts, np.split(order, starts[1:]))
+        }
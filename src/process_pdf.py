@@ -1,4 +1,5 @@
 """PDF 파일을 읽어서 지식 그래프로 변환하는 스크립트"""
+import argparse
 import os
 import sys
 from pathlib import Path
@@ -11,7 +12,10 @@ from src.models.schemas import LegalDocument
 from graphs.legal_graph import LegalKnowledgeGraphWorkflow
 from utils.pdf_processor import extract_text_from_pdf, get_pdf_metadata, list_pdf_files
 from utils.text_processor import clean_text, split_articles
-from utils.common_utils import check_gpu, test_llm_connection, save_to_memgraph, display_result_tables
+from utils.metrics import start_metrics_from_env, export_metrics_from_env
+from utils.profiler import add_profile_arguments, profile_run, stage_scope
+from llm.router import add_routing_argument, router_from_env
+from utils.common_utils import check_gpu, test_llm_connection, save_to_memgraph, save_graph_snapshot, display_result_tables
 
 # 환경 변수 로드
 load_dotenv()
@@ -73,20 +77,23 @@ def select_pdf_file():
             return None
 
 
-def process_pdf_document(pdf_path: str):
+def process_pdf_document(pdf_path: str, routing: str = None, deadline: float = None):
     """PDF 문서를 처리하여 지식 그래프를 생성합니다."""
     console.print(f"\n📄 PDF 파일 읽기 중: {Path(pdf_path).name}", style="bold blue")
     
     try:
         # PDF에서 텍스트 추출
-        content = extract_text_from_pdf(pdf_path)
+        with stage_scope("extract_pdf"):
+            content = extract_text_from_pdf(pdf_path)
         
         # text_processor를 사용하여 텍스트 정제 및 파싱
-        content = clean_text(content)
+        with stage_scope("clean_text"):
+            content = clean_text(content)
         
         # split_articles를 사용하여 조항별로 분리하고 다시 결합
         # 이는 텍스트를 조항 단위로 정리하여 더 나은 파싱 결과를 제공합니다
-        articles = split_articles(content)
+        with stage_scope("split_articles"):
+            articles = split_articles(content)
         content = "\n\n".join(articles)  # 조항들을 개행으로 구분하여 재결합
         
         metadata = get_pdf_metadata(pdf_path)
@@ -104,10 +111,10 @@ def process_pdf_document(pdf_path: str):
         
         # 워크플로우 실행
         console.print("\n🚀 법률 지식 그래프 생성 시작...", style="bold green")
-        workflow = LegalKnowledgeGraphWorkflow()
+        workflow = LegalKnowledgeGraphWorkflow(router=router_from_env(routing))
         
         with console.status("[bold green]처리 중...", spinner="dots"):
-            result = workflow.process(document)
+            result = workflow.process(document, deadline=deadline)
         
         # 결과 출력
         console.print(f"   처리 완료!", style="bold green")
@@ -116,6 +123,7 @@ def process_pdf_document(pdf_path: str):
         
         # 결과 테이블 표시
         display_result_tables(result)
+        save_graph_snapshot(result)
         
         # Memgraph에 저장 여부 확인
         if Confirm.ask("\n💾 결과를 Memgraph에 저장하시겠습니까?", default=True):
@@ -136,12 +144,20 @@ def process_pdf_document(pdf_path: str):
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description="PDF 법률 문서를 지식 그래프로 변환")
+    add_profile_arguments(parser)
+    add_routing_argument(parser)
+    parser.add_argument("--deadline", type=float, default=None,
+                        help="문서 처리 마감(초), 넘으면 남은 호출을 취소하고 조항을 재처리 대상으로 표시 (기본: DOCUMENT_DEADLINE_SECONDS)")
+    args = parser.parse_args()
+    
     console.print("=" * 80, style="bold cyan")
     console.print("📄 PDF Legal Knowledge Graph Processor", style="bold cyan")
     console.print("=" * 80, style="bold cyan")
     
     # GPU 확인
     check_gpu()
+    start_metrics_from_env()
     
     # LLM 연결 테스트
     if not test_llm_connection():
@@ -155,7 +171,11 @@ def main():
         sys.exit(1)
     
     # PDF 문서 처리
-    result = process_pdf_document(pdf_path)
+    with profile_run(args) as profiler:
+        result = process_pdf_document(pdf_path, args.routing, args.deadline)
+        if profiler and result:
+            profiler.articles = len(result.entities)
+    export_metrics_from_env()
     
     if result:
         console.print("\n" + "=" * 80, style="bold cyan")
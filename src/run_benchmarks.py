@@ -0,0 +1,170 @@
+"""성능 회귀 벤치마크 실행 스크립트
+
+사용 예:
+    # 저장된 기준값과 비교 (중앙값이 기준값의 1.5배를 넘으면 실패, 종료 코드 1)
+    python src/run_benchmarks.py
+
+    # 현재 머신에서 기준값 갱신
+    python src/run_benchmarks.py --update-baselines
+
+    # 합성 코퍼스 스케일링 벤치마크 (1k -> 64k 조항, 스텁 LLM)
+    python src/run_benchmarks.py --scaling --max-articles 64000
+
+    # 샘플 내보내기 기반 표현 방식별 메모리 벤치마크 (pydantic / 경량 / 열 지향)
+    python src/run_benchmarks.py --memory
+
+    # 관계 추출 컨텍스트 선택 방식별 프롬프트 토큰 (이전 조항 3개 / 참조 조항)
+    python src/run_benchmarks.py --context
+"""
+import argparse
+import sys
+from rich.console import Console
+from rich.table import Table
+
+from benchmarks.context import run_context_report
+from benchmarks.harness import run_benchmarks, save_baselines
+from benchmarks.memory import run_memory
+from benchmarks.micro import BENCHMARKS
+from benchmarks.scaling import run_scaling
+
+console = Console()
+
+
+def print_scaling(rows):
+    """스케일링 벤치마크 결과 출력"""
+    table = Table(title="📈 스케일링 벤치마크 (스텁 LLM)")
+    table.add_column("조항", justify="right", style="cyan")
+    table.add_column("분리된 조항", justify="right")
+    table.add_column("트리플", justify="right")
+    table.add_column("소요(s)", justify="right", style="yellow")
+    table.add_column("조항/s", justify="right", style="green")
+    table.add_column("RSS(MB)", justify="right")
+    table.add_column("RSS 증가(MB)", justify="right", style="magenta")
+    table.add_column("적재(s)", justify="right")
+    for row in rows:
+        table.add_row(
+            str(row["articles"]),
+            str(row["split_articles"]),
+            str(row["triplets"]),
+            f"{row['seconds']:.2f}",
+            f"{row['articles_per_second']:.1f}",
+            f"{row['rss_mb']:.1f}",
+            f"{row['rss_growth_mb']:.1f}",
+            f"{row['ingest_seconds']:.2f}" if row["ingest_seconds"] is not None else "-"
+        )
+    console.print(table)
+
+
+def print_memory(rows):
+    """메모리 벤치마크 결과 출력"""
+    table = Table(title="🧠 메모리 벤치마크 (샘플 내보내기)")
+    table.add_column("표현", style="cyan")
+    table.add_column("항목 수", justify="right")
+    table.add_column("유지(MB)", justify="right", style="yellow")
+    table.add_column("최대(MB)", justify="right")
+    table.add_column("항목당(B)", justify="right", style="magenta")
+    table.add_column("로드(s)", justify="right", style="green")
+    for row in rows:
+        table.add_row(
+            row["name"],
+            str(row["items"]),
+            f"{row['retained_mb']:.2f}",
+            f"{row['peak_mb']:.2f}",
+            str(row["bytes_per_item"]),
+            f"{row['seconds']:.2f}"
+        )
+    console.print(table)
+
+
+def print_context(rows):
+    """관계 추출 컨텍스트 토큰 비교 출력"""
+    table = Table(title="🧩 관계 추출 컨텍스트 (합성 법령, 호출당 평균)")
+    table.add_column("방식", style="cyan")
+    table.add_column("호출 수", justify="right")
+    table.add_column("프롬프트 토큰", justify="right", style="yellow")
+    table.add_column("컨텍스트 토큰", justify="right")
+    table.add_column("컨텍스트 조항", justify="right")
+    table.add_column("참조 조항 포함률", justify="right", style="green")
+    for row in rows:
+        table.add_row(
+            row["strategy"],
+            str(row["calls"]),
+            f"{row['prompt_tokens']:.1f}",
+            f"{row['context_tokens']:.1f}",
+            f"{row['context_articles']:.2f}",
+            f"{row['reference_coverage']:.1%}"
+        )
+    console.print(table)
+
+    baseline, selected = rows[0], rows[-1]
+    saved = baseline["prompt_tokens"] - selected["prompt_tokens"]
+    context_saved = baseline["context_tokens"] - selected["context_tokens"]
+    console.print(f"📉 호출당 프롬프트 토큰 {saved:.1f}개 감소 ({saved / baseline['prompt_tokens']:.1%}), "
+                  f"컨텍스트 토큰 {context_saved / baseline['context_tokens']:.1%} 감소", style="bold green")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="텍스트/검증/저장 경로 마이크로 벤치마크")
+    parser.add_argument("--threshold", type=float, default=1.5, help="기준값 대비 허용 배율")
+    parser.add_argument("--rounds", type=int, default=5, help="벤치마크별 측정 횟수")
+    parser.add_argument("--only", nargs="*", default=None, help="실행할 벤치마크 이름")
+    parser.add_argument("--update-baselines", action="store_true", help="측정 결과로 기준값 갱신")
+    parser.add_argument("--scaling", action="store_true", help="합성 코퍼스 스케일링 벤치마크 실행")
+    parser.add_argument("--start-articles", type=int, default=1000, help="스케일링 시작 조항 수")
+    parser.add_argument("--max-articles", type=int, default=16000, help="스케일링 최대 조항 수")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="스텁 LLM 호출당 지연(초)")
+    parser.add_argument("--ingest", action="store_true", help="스케일링 결과를 Memgraph에 적재해 시간 측정")
+    parser.add_argument("--memory", action="store_true", help="표현 방식별 메모리 벤치마크 실행")
+    parser.add_argument("--context", action="store_true", help="관계 추출 컨텍스트 토큰 비교 실행")
+    args = parser.parse_args()
+
+    if args.context:
+        print_context(run_context_report(article_count=args.start_articles))
+        return
+
+    if args.memory:
+        print_memory(run_memory())
+        return
+
+    if args.scaling:
+        print_scaling(run_scaling(
+            start_articles=args.start_articles,
+            max_articles=args.max_articles,
+            stub_latency=args.stub_latency,
+            ingest=args.ingest
+        ))
+        return
+
+    results = run_benchmarks(BENCHMARKS, threshold=args.threshold, rounds=args.rounds, selected=args.only)
+
+    table = Table(title="⏱️ 벤치마크 결과")
+    table.add_column("벤치마크", style="cyan")
+    table.add_column("최소(ms)", justify="right")
+    table.add_column("중앙값(ms)", justify="right", style="yellow")
+    table.add_column("기준값(ms)", justify="right")
+    table.add_column("배율", justify="right", style="magenta")
+    table.add_column("결과")
+    for result in results:
+        table.add_row(
+            result.name,
+            f"{result.min_seconds * 1000:.2f}",
+            f"{result.median_seconds * 1000:.2f}",
+            f"{result.baseline_seconds * 1000:.2f}" if result.baseline_seconds else "-",
+            f"{result.ratio:.2f}x" if result.ratio else "-",
+            "✅" if result.passed else "❌"
+        )
+    console.print(table)
+
+    if args.update_baselines:
+        save_baselines(results)
+        console.print("💾 기준값 갱신 완료", style="bold green")
+        return
+
+    failed = [result.name for result in results if not result.passed]
+    if failed:
+        console.print(f"❌ 성능 회귀 감지 (임계값 {args.threshold}x): {', '.join(failed)}", style="bold red")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
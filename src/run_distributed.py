@@ -0,0 +1,114 @@
+"""작업 큐 기반 분산 처리 실행 스크립트
+
+사용 예:
+    # 워커 (여러 프로세스/호스트에서 같은 큐 파일을 지정해 실행)
+    python src/run_distributed.py --queue /shared/job_queue.sqlite3 worker
+
+    # 코디네이터 (PDF를 조항 단위 작업으로 등록하고 결과 병합)
+    python src/run_distributed.py --queue /shared/job_queue.sqlite3 submit data/pdfs/법률문서.pdf
+
+    # 워커·코디네이터 CPU 프로파일링 (하위 명령 앞에 지정)
+    python src/run_distributed.py --queue /shared/job_queue.sqlite3 --profile --profile-dir profiles/worker worker
+"""
+import argparse
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+from rich.console import Console
+from rich.prompt import Confirm
+
+from models.schemas import LegalDocument
+from database.job_queue import SQLiteJobQueue
+from graphs.distributed import ENTITY_JOB, DistributedCoordinator, QueueWorker
+from graphs.legal_graph import LegalKnowledgeGraphWorkflow
+from llm.router import add_routing_argument, router_from_env
+from utils.pdf_processor import extract_text_from_pdf, get_pdf_metadata
+from utils.text_processor import clean_text, split_articles
+from utils.metrics import start_metrics_from_env, export_metrics_from_env
+from utils.profiler import add_profile_arguments, profile_run, stage_scope
+from utils.common_utils import test_llm_connection, save_to_memgraph, save_graph_snapshot, display_result_tables
+
+# 환경 변수 로드
+load_dotenv()
+
+console = Console()
+
+
+def run_worker(args, profiler=None):
+    """워커 실행"""
+    if not test_llm_connection():
+        sys.exit(1)
+
+    queue = SQLiteJobQueue(args.queue)
+    worker = QueueWorker(queue, LegalKnowledgeGraphWorkflow(router=router_from_env(args.routing)))
+    console.print(f"👷 워커 시작: {worker.worker_id} (큐: {queue.path})", style="bold blue")
+    try:
+        worker.run_forever(idle_timeout=args.idle_timeout)
+    finally:
+        if profiler:
+            # 조항 조각 작업도 하나로 셈
+            profiler.articles = worker.processed[ENTITY_JOB]
+    console.print("👋 대기 작업이 없어 워커를 종료합니다.", style="bold green")
+
+
+def run_submit(args, profiler=None):
+    """코디네이터 실행"""
+    pdf_path = args.pdf
+    content = clean_text(extract_text_from_pdf(pdf_path))
+    content = "\n\n".join(split_articles(content))
+    metadata = get_pdf_metadata(pdf_path)
+    title = metadata.get('title') or metadata.get('subject') or Path(pdf_path).stem
+
+    document = LegalDocument(
+        title=title,
+        law_number=f"PDF 문서 - {Path(pdf_path).name}",
+        content=content
+    )
+
+    coordinator = DistributedCoordinator(SQLiteJobQueue(args.queue))
+    console.print(f"\n🚀 분산 처리 시작: {title}", style="bold green")
+
+    with console.status("[bold green]워커 처리 대기 중...", spinner="dots"), stage_scope("coordinator"):
+        result = coordinator.run(document, run_id=args.run_id, timeout=args.timeout)
+    if profiler:
+        profiler.articles = len(result.entities)
+
+    console.print(f"   추출된 조항: {len(result.entities)}개")
+    console.print(f"   추출된 관계: {len(result.triplets)}개")
+    display_result_tables(result)
+    save_graph_snapshot(result)
+
+    if args.save or Confirm.ask("\n💾 결과를 Memgraph에 저장하시겠습니까?", default=True):
+        save_to_memgraph(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="법률 지식 그래프 분산 처리")
+    parser.add_argument("--queue", default=None, help="작업 큐 SQLite 파일 경로 (기본: JOB_QUEUE_PATH)")
+    add_profile_arguments(parser)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    worker_parser = subparsers.add_parser("worker", help="큐에서 작업을 가져와 처리")
+    worker_parser.add_argument("--idle-timeout", type=float, default=None,
+                               help="작업이 없을 때 종료까지 대기 시간(초)")
+    add_routing_argument(worker_parser)
+    worker_parser.set_defaults(func=run_worker)
+
+    submit_parser = subparsers.add_parser("submit", help="PDF를 작업으로 등록하고 결과 병합")
+    submit_parser.add_argument("pdf", help="처리할 PDF 파일 경로")
+    submit_parser.add_argument("--run-id", default=None, help="재시작 시 이어서 처리할 실행 ID")
+    submit_parser.add_argument("--timeout", type=float, default=None, help="전체 대기 시간 제한(초)")
+    submit_parser.add_argument("--save", action="store_true", help="확인 없이 Memgraph에 저장")
+    submit_parser.set_defaults(func=run_submit)
+
+    args = parser.parse_args()
+    start_metrics_from_env()
+    try:
+        with profile_run(args) as profiler:
+            args.func(args, profiler)
+    finally:
+        export_metrics_from_env()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""그래프 대량 내보내기/가져오기 실행 스크립트
+
+사용 예:
+    # 현재 그래프(GRAPH_BACKEND)를 CSV로 내보내기
+    python src/run_transfer.py export data/exports/20260301 --format csv
+
+    # 다른 환경에서 가져오기 (Memgraph가 같은 디렉토리를 /import로 마운트한 경우 LOAD CSV 사용)
+    python src/run_transfer.py import data/exports/20260301 --server-dir /import/20260301
+"""
+import argparse
+import os
+import time
+from dotenv import load_dotenv
+from rich.console import Console
+
+from database.graph_backend import get_graph_client
+from database.graph_transfer import DEFAULT_CHUNK_SIZE, FORMATS, export_graph, import_graph
+
+# 환경 변수 로드
+load_dotenv()
+
+console = Console()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="법률 지식 그래프 대량 내보내기/가져오기")
+    parser.add_argument("--backend", default=None, help="memgraph | embedded (기본: GRAPH_BACKEND)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for command in ("export", "import"):
+        sub = subparsers.add_parser(command, help="내보내기" if command == "export" else "가져오기")
+        sub.add_argument("directory", help="파일 디렉토리 (documents/articles/entities/relations)")
+        sub.add_argument("--format", choices=sorted(FORMATS), default="csv", help="파일 형식")
+        sub.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="청크(배치) 행 수")
+        if command == "import":
+            sub.add_argument(
+                "--server-dir",
+                default=os.getenv("MEMGRAPH_IMPORT_DIR"),
+                help="Memgraph 서버에서 보이는 디렉토리 경로 (지정 시 LOAD CSV 사용)"
+            )
+            sub.add_argument("--clear", action="store_true", help="가져오기 전에 기존 그래프 삭제")
+
+    args = parser.parse_args()
+    client = get_graph_client(args.backend)
+    started = time.perf_counter()
+    try:
+        if args.command == "export":
+            counts = export_graph(client, args.directory, args.format, args.chunk_size)
+        else:
+            if args.clear:
+                client.clear_database()
+            client.create_indexes()
+            counts = import_graph(
+                client, args.directory, args.format, args.chunk_size, server_directory=args.server_dir
+            )
+    finally:
+        client.close()
+
+    console.print(
+        f"✅ {args.command} 완료 ({time.perf_counter() - started:.1f}초) - "
+        + ", ".join(f"{kind}: {count}" for kind, count in counts.items()),
+        style="bold green"
+    )
+
+
+if __name__ == "__main__":
+    main()
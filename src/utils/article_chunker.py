@@ -0,0 +1,255 @@
+"""큰 조항의 항/호/목 단위 분할
+
+자본시장법처럼 항·호·목이 수십 개인 조항을 통째로 보내면 로컬 llama.cpp 컨텍스트
+(n_ctx 4096)를 넘거나 그 호출 하나가 전체 지연을 좌우합니다. 토큰 예산을 넘는 조항만
+항 → 호 → 목 → 문장 → 글자 순으로 경계를 찾아 나누고, 각 조각 앞에는 조항 제목과 상위
+단위의 머리 문장("다음 각 호의 어느 하나에 해당하는 자는")을 붙여 문맥을 유지합니다.
+조각별 추출 결과는 조 단위 개체 하나로 병합하고, 조각의 항 단위 번호와 원문 구간은
+출처(source_units)로 남깁니다. 관계 추출은 다시 그 구간별로 나눠 호출합니다.
+
+사용 예:
+    chunks = chunk_article(article)          # 예산 이내면 조항 전체 하나
+    entities = merge_chunk_entities(chunks, [chain.extract_all(c.text) for c in chunks])
+    views = chunk_views(entities[0])         # 관계 추출용 조각별 개체
+"""
+import os
+import re
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+from models.schemas import LegalEntity, SourceUnit
+from utils.metrics import estimate_tokens
+from utils.reference_resolver import PARAGRAPH_MARKS, article_label
+from utils.text_processor import ARTICLE_HEADER
+
+# 추출 호출 하나에 넣을 조항 원문 최대 토큰 수 (n_ctx 4096에서 프롬프트·응답 몫을 뺀 값)
+ARTICLE_CHUNK_TOKENS = int(os.getenv("ARTICLE_CHUNK_TOKENS", "1200"))
+# 한 조항의 조각을 동시에 추출할 최대 호출 수
+ARTICLE_CHUNK_WORKERS = int(os.getenv("ARTICLE_CHUNK_WORKERS", "4"))
+
+# 조각 앞에 붙이는 상위 단위 머리 문장의 최대 비율 (예산 대비)
+LEAD_RATIO = 0.25
+LEAD_SEPARATOR = " … "
+
+ITEM_START = re.compile(r'(?<!\S)(\d{1,2})\.(?=\s)')
+SUBITEM_START = re.compile(r'(?<!\S)([가-하])\.(?=\s)')
+SENTENCE_END = re.compile(r'다\.(?=\s)')
+SUBITEM_ORDER = "가나다라마바사아자차카타파하"
+
+
+class ArticleChunk(NamedTuple):
+    """조항 조각 (text는 프롬프트용, start/end는 조항 원문 안의 출처 구간)"""
+    text: str
+    start: int
+    end: int
+    label: Optional[str]
+
+
+def _outside_brackets(text: str, start: int, pos: int) -> bool:
+    """<개정 2024. 1. 1.> 같은 괄호 안이 아닌지"""
+    return text.rfind("<", start, pos) <= text.rfind(">", start, pos)
+
+
+def _sequential(candidates: Sequence[Tuple[int, int]], first: int = 1) -> List[Tuple[int, int]]:
+    """번호가 first부터 1씩 늘어나는 후보만 (본문 속 숫자·날짜 제외)"""
+    found, expected = [], first
+    for pos, number in candidates:
+        if number == expected:
+            found.append((pos, number))
+            expected += 1
+    return found
+
+
+def _paragraphs(text: str, start: int, end: int) -> List[Tuple[int, str]]:
+    candidates = [
+        (pos, PARAGRAPH_MARKS.index(text[pos]) + 1)
+        for pos in range(start, end) if text[pos] in PARAGRAPH_MARKS
+    ]
+    return [(pos, f"제{number}항") for pos, number in _sequential(candidates)]
+
+
+def _items(text: str, start: int, end: int) -> List[Tuple[int, str]]:
+    candidates = [
+        (match.start(), int(match.group(1)))
+        for match in ITEM_START.finditer(text, start, end)
+        if _outside_brackets(text, start, match.start())
+    ]
+    return [(pos, f"제{number}호") for pos, number in _sequential(candidates)]
+
+
+def _subitems(text: str, start: int, end: int) -> List[Tuple[int, str]]:
+    candidates = [
+        (match.start(), SUBITEM_ORDER.index(match.group(1)) + 1)
+        for match in SUBITEM_START.finditer(text, start, end)
+        if match.group(1) in SUBITEM_ORDER
+    ]
+    return [(pos, f"{SUBITEM_ORDER[number - 1]}목") for pos, number in _sequential(candidates)]
+
+
+def _sentences(text: str, start: int, end: int) -> List[Tuple[int, str]]:
+    starts = [match.end() + 1 for match in SENTENCE_END.finditer(text, start, end) if match.end() + 1 < end]
+    return [(start, "")] + [(pos, "") for pos in starts]
+
+
+# 분할 경계 (큰 단위부터), 단위 이름이 빈 문자열이면 출처 번호에 넣지 않음
+LEVELS: Tuple[Callable[[str, int, int], List[Tuple[int, str]]], ...] = (_paragraphs, _items, _subitems, _sentences)
+
+
+def _clip(text: str, tokens: int) -> str:
+    """토큰 예산 이내로 앞부분만 (한글 1.5자당 1토큰 기준이라 다른 문자는 더 적게 셈)"""
+    text = text.strip()
+    if estimate_tokens(text) <= tokens:
+        return text
+    return text[:max(1, int(tokens * 1.5) - 1)] + "…"
+
+
+class _Splitter:
+    """조항 하나를 예산 이내 구간으로 분할"""
+
+    def __init__(self, text: str, budget: int):
+        self.text = text
+        self.budget = budget
+        # (시작, 끝, 단위 경로, 앞에 붙일 문맥)
+        self.pieces: List[Tuple[int, int, Tuple[str, ...], Tuple[str, ...]]] = []
+
+    def _room(self, prefix: Tuple[str, ...]) -> int:
+        return self.budget - sum(estimate_tokens(part) + estimate_tokens(LEAD_SEPARATOR) for part in prefix)
+
+    def fits(self, start: int, end: int, prefix: Tuple[str, ...]) -> bool:
+        return estimate_tokens(self.text[start:end]) <= self._room(prefix)
+
+    def split(self, start: int, end: int, level: int, path: Tuple[str, ...], prefix: Tuple[str, ...]):
+        if self.fits(start, end, prefix):
+            self.pieces.append((start, end, path, prefix))
+            return
+        if level == len(LEVELS):
+            self._split_chars(start, end, path, prefix)
+            return
+
+        starts = LEVELS[level](self.text, start, end)
+        if not starts or (len(starts) == 1 and starts[0][0] == start):
+            self.split(start, end, level + 1, path, prefix)
+            return
+
+        # 첫 단위 앞 머리 문장: 짧으면 첫 조각에 포함하고 나머지 조각의 문맥으로,
+        # 길면 따로 나누고 앞부분만 모든 조각의 문맥으로
+        units = [
+            [pos, starts[k + 1][0] if k + 1 < len(starts) else end, name]
+            for k, (pos, name) in enumerate(starts)
+        ]
+        lead = self.text[start:units[0][0]].strip()
+        lead_budget = int(self.budget * LEAD_RATIO)
+        child_prefix = prefix + ((_clip(lead, lead_budget),) if lead else ())
+        lead_inside = estimate_tokens(lead) <= lead_budget
+        if lead_inside:
+            units[0][0] = start
+        else:
+            self.split(start, units[0][0], level + 1, path, prefix)
+
+        def prefix_of(group) -> Tuple[str, ...]:
+            return prefix if lead_inside and group[0] is units[0] else child_prefix
+
+        group: List[list] = []
+        for unit in units:
+            if group and self.fits(group[0][0], unit[1], prefix_of(group)):
+                group.append(unit)
+                continue
+            if group:
+                self._flush(group, level, path, prefix_of(group))
+            group = [unit]
+        self._flush(group, level, path, prefix_of(group))
+
+    def _flush(self, group: List[list], level: int, path: Tuple[str, ...], prefix: Tuple[str, ...]):
+        start, end = group[0][0], group[-1][1]
+        # 단위 하나짜리 조각은 그 단위까지 출처 번호에 넣음 (제N항, 제N호 등)
+        group_path = path + (group[0][2],) if len(group) == 1 and group[0][2] else path
+        if self.fits(start, end, prefix):
+            self.pieces.append((start, end, group_path, prefix))
+        else:
+            self.split(start, end, level + 1, group_path, prefix)
+
+    def _split_chars(self, start: int, end: int, path: Tuple[str, ...], prefix: Tuple[str, ...]):
+        """경계가 없는 긴 문장은 글자 단위로 (한글 1.5자 = 1토큰 기준이라 예산을 넘지 않음)"""
+        size = max(1, int(self._room(prefix) * 1.5) - 1)
+        for pos in range(start, end, size):
+            self.pieces.append((pos, min(end, pos + size), path, prefix))
+
+
+def chunk_article(text: str, budget: int = None) -> List[ArticleChunk]:
+    """조항을 토큰 예산 이내 조각으로 분할 (예산 이내면 조항 전체 하나)
+
+    Args:
+        text: 조항 원문 (조항 제목으로 시작)
+        budget: 조각당 최대 토큰 수 (기본: ARTICLE_CHUNK_TOKENS)
+
+    Returns:
+        원문 순서의 조각. 첫 조각 외에는 text 앞에 조항 제목과 상위 단위 머리 문장이 붙습니다.
+    """
+    budget = ARTICLE_CHUNK_TOKENS if budget is None else budget
+    heading = ARTICLE_HEADER.match(text)
+    label = article_label(heading.group(0)) if heading else None
+    if estimate_tokens(text) <= budget:
+        return [ArticleChunk(text, 0, len(text), label)]
+
+    splitter = _Splitter(text, budget)
+    splitter.split(0, len(text), 0, (), ())
+    chunks = []
+    for start, end, path, prefix in splitter.pieces:
+        body = text[start:end].strip()
+        if not body:
+            continue
+        chunk_text = LEAD_SEPARATOR.join(prefix + (body,))
+        chunks.append(ArticleChunk(
+            chunk_text, start, end,
+            label + "".join(name for name in path if name) if label else None
+        ))
+    return chunks
+
+
+def merge_chunk_entities(
+    chunks: Sequence[ArticleChunk],
+    results: Sequence[List[LegalEntity]]
+) -> List[LegalEntity]:
+    """조각별 추출 개체를 조항 단위 개체 하나로 병합
+
+    조항 번호는 조 단위 번호("제3조") 그대로 두고, 조각마다 항 단위 번호("제3조제2항")와
+    조항 원문 안의 구간을 source_units로 남깁니다. 여러 조각에서 나온 같은 항의 개체도
+    조항 개체 하나로 합쳐집니다. 첫 조각(조항 제목·머리 문장 포함)의 개체를 기준으로 하고,
+    비어 있는 필드는 뒤 조각의 개체로 채웁니다.
+
+    Returns:
+        조각이 하나면 그 개체 목록 그대로, 여럿이면 조항 개체 하나 (추출한 개체가 없으면 빈 목록)
+    """
+    found = [entity for entities in results for entity in entities]
+    if len(chunks) <= 1 or not found:
+        return found
+    label = article_label(chunks[0].label or "") or article_label(found[0].article_number) or found[0].article_number
+    filled = {
+        name: next((getattr(entity, name) for entity in found if getattr(entity, name)), None)
+        for name in ("subject", "action", "object")
+    }
+    return [found[0].model_copy(update={
+        **filled,
+        "article_number": label,
+        "source_units": [SourceUnit(chunk.label or label, chunk.start, chunk.end) for chunk in chunks],
+    })]
+
+
+def chunk_views(entity: LegalEntity) -> List[LegalEntity]:
+    """관계 추출용 조각별 개체 (분할하지 않은 조항은 개체 그대로)
+
+    조각 개체는 조항 개체와 필드·조항 번호가 같고 원문만 그 출처 구간입니다.
+    """
+    if len(entity.source_units) <= 1:
+        return [entity]
+    ref = entity.text_ref
+    if ref is None:
+        return [
+            entity.model_copy(update={"full_text": entity.full_text[unit.start:unit.end], "source_units": []})
+            for unit in entity.source_units
+        ]
+    return [
+        entity.model_copy(update={
+            "text_ref": ref._replace(start=ref.start + unit.start, end=ref.start + unit.end), "source_units": []
+        })
+        for unit in entity.source_units
+    ]
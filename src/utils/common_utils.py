@@ -5,6 +5,7 @@ from rich.table import Table
 # from typing import Optional
 
 from models.schemas import LegalDocument
+from utils.profiler import stage_scope
 
 console = Console()
 
@@ -66,41 +67,159 @@ def test_llm_connection() -> bool:
 
 
 def save_to_memgraph(document: LegalDocument, clear_existing: bool = False):
-    """처리된 문서를 Memgraph에 저장합니다.
+    """처리된 문서를 그래프 데이터베이스에 저장합니다.
+    
+    GRAPH_BACKEND=embedded이면 Memgraph 대신 내장 그래프에 저장하고,
+    Memgraph 저장에 실패하면 결과를 잃지 않도록 내장 그래프 스냅샷에 저장합니다.
     
     Args:
         document: 저장할 법률 문서
-        clear_existing: 기존 데이터 삭제 여부
+        clear_existing: 기존 데이터 전체 삭제 여부 (False면 같은 제목의 문서만 교체)
     """
-    # Import MemgraphClient here to avoid circular imports
-    from database.memgraph_client import MemgraphClient
+    # Import graph clients here to avoid circular imports
+    from database.graph_backend import get_graph_client, get_embedded_client
     
-    console.print("\n💾 Memgraph에 저장 중...", style="bold blue")
+    backend = os.getenv("GRAPH_BACKEND", "memgraph").lower()
+    console.print(f"\n💾 그래프 저장 중... ({backend})", style="bold blue")
     
-    mg_client = None
     try:
-        mg_client = MemgraphClient()
+        _save_document(get_graph_client(backend), document, clear_existing)
+        
+        if backend == "memgraph":
+            console.print("\n🌐 Memgraph Lab에서 확인하세요:", style="bold cyan")
+            console.print("   http://localhost:3000")
         
+    except Exception as e:
+        console.print(f"⚠️ {backend} 저장 실패: {e}", style="bold yellow")
+        if backend != "embedded":
+            console.print("   ↪ 내장 그래프 스냅샷에 대신 저장합니다.", style="yellow")
+            try:
+                _save_document(get_embedded_client(), document, clear_existing)
+            except Exception as fallback_error:
+                console.print(f"⚠️ 내장 그래프 저장 실패: {fallback_error}", style="bold yellow")
+
+
+def _save_document(client, document: LegalDocument, clear_existing: bool):
+    """클라이언트에 문서 저장 후 통계 출력"""
+    try:
         if clear_existing:
-            mg_client.clear_database()
+            client.clear_database()
             console.print("   🗑️ 기존 데이터 삭제 완료", style="yellow")
         
-        mg_client.create_indexes()
-        mg_client.save_document(document)
+        client.create_indexes()
+        with stage_scope("save_memgraph"):
+            # 같은 제목의 기존 문서는 새 버전 저장 후 삭제 (다른 문서는 유지)
+            client.replace_document(document)
         
-        stats = mg_client.get_graph_statistics()
-        console.print(f"✅ 저장 완료 - 문서: {stats.get('documents', 0)}, "
-                     f"조항: {stats.get('articles', 0)}, "
-                     f"개체: {stats.get('entities', 0)}", style="bold green")
+        with stage_scope("link_references"):
+            link_article_references(client, document, reset=clear_existing)
         
-        console.print("\n🌐 Memgraph Lab에서 확인하세요:", style="bold cyan")
-        console.print("   http://localhost:3000")
+        with stage_scope("fulltext_index"):
+            index_article_text(document, reset=clear_existing)
         
-    except Exception as e:
-        console.print(f"⚠️ Memgraph 저장 실패: {e}", style="bold yellow")
+        with stage_scope("entity_name_index"):
+            index_entity_names(document, reset=clear_existing)
+        
+        stats = client.get_graph_statistics()
+        console.print(f"✅ 저장 완료 - 문서: {stats.get('documents', 0)}, "
+                     f"조항: {stats.get('articles', 0)}, "
+                     f"개체: {stats.get('entities', 0)}, "
+                     f"관계: {stats.get('relations', 0)}", style="bold green")
+    finally:
+        client.close()
+
+
+def link_article_references(client, document: LegalDocument, reset: bool = False) -> int:
+    """문서 간 조항 참조를 해석해 그래프에 REFERENCES 간선으로 저장합니다.
+    
+    참조 조인 인덱스(REFERENCE_INDEX_PATH)에 문서를 추가해 이 문서에서 나가는 참조와
+    이미 저장된 문서에서 이 문서로 들어오는 참조를 연결합니다.
+    
+    Args:
+        reset: 그래프를 초기화한 경우 True (저장된 인덱스를 버리고 새로 시작)
+    
+    Returns:
+        저장한 간선 수
+    """
+    from utils.reference_resolver import ReferenceResolver
+    
+    resolver = ReferenceResolver() if reset else ReferenceResolver.open()
+    edges = resolver.add_document(document)
+    linked = client.save_article_references(edges) if edges else 0
+    resolver.save()
+    
+    stats = resolver.stats()
+    console.print(f"🔗 조항 참조 연결: {linked}개 (인덱스 문서 {stats['documents']}개, "
+                  f"대상 미수집 참조 {stats['pending']}개)", style="cyan")
+    return linked
+
+
+def index_article_text(document: LegalDocument, reset: bool = False) -> int:
+    """조항 원문과 핵심 개념을 전문 검색 색인(FULLTEXT_INDEX_DIR)에 추가합니다.
+    
+    같은 제목으로 이미 색인된 문서는 새 세그먼트로 교체됩니다.
+    
+    Args:
+        reset: 그래프를 초기화한 경우 True (기존 색인 삭제 후 시작)
+    
+    Returns:
+        색인한 조항 수
+    """
+    from database.fulltext_index import FullTextIndex
+    
+    index = FullTextIndex()
+    try:
+        if reset:
+            index.clear()
+        count = index.add_document(document)
+        stats = index.stats()
     finally:
-        if mg_client:
-            mg_client.close()
+        index.close()
+    
+    console.print(f"🔎 전문 검색 색인: 조항 {count}개 (전체 문서 {stats['documents']}개, "
+                  f"조항 {stats['articles']}개, 세그먼트 {stats['segments']}개)", style="cyan")
+    return count
+
+
+def index_entity_names(document: LegalDocument, reset: bool = False) -> int:
+    """문서 트리플의 개체 이름을 퍼지 조회 색인(ENTITY_NAME_INDEX_PATH)에 추가합니다.
+    
+    Args:
+        reset: 그래프를 초기화한 경우 True (기존 색인을 버리고 새로 시작)
+    
+    Returns:
+        문서의 개체 이름 수
+    """
+    from database.entity_name_index import EntityNameIndex
+    
+    index = EntityNameIndex()
+    if reset:
+        index.clear()
+    count = index.add_document(document)
+    index.save()
+    
+    stats = index.stats()
+    console.print(f"🏷️ 개체 이름 색인: {count}개 (전체 이름 {stats['names']}개, "
+                  f"문서 {stats['documents']}개)", style="cyan")
+    return count
+
+
+def save_graph_snapshot(document: LegalDocument) -> str:
+    """GRAPH_SNAPSHOT_DIR가 설정되어 있으면 처리 결과를 mmap 스냅샷으로 저장합니다.
+    
+    Returns:
+        저장된 스냅샷 경로 (미설정 시 None)
+    """
+    snapshot_dir = os.getenv("GRAPH_SNAPSHOT_DIR")
+    if not snapshot_dir:
+        return None
+    
+    from database.graph_snapshot import write_snapshot
+    
+    filename = "".join(c if c.isalnum() or c in "-_" else "_" for c in document.title)
+    path = write_snapshot(document, os.path.join(snapshot_dir, f"{filename}.kgsnap"))
+    console.print(f"💾 그래프 스냅샷 저장: {path}", style="green")
+    return path
 
 
 def display_result_tables(result: LegalDocument, max_items: int = 10):
@@ -0,0 +1,246 @@
+"""LLM 호출 제한 시간과 문서 마감
+
+고정된 LLM_TIMEOUT(최대 600초) 하나로는 멈춘 요청 하나가 직렬 파이프라인을 수 분씩 붙잡습니다.
+호출마다 (체인, 모델 단계)별 관측 지연의 백분위와 예상 출력 크기로 제한 시간을 정하고,
+문서 마감(Deadline)이 있으면 남은 시간으로 다시 줄입니다. 마감이 지나면 진행 중인 호출을
+기다리지 않고(llama.cpp·Gemini 클라이언트는 call_timeout()으로 같은 시간에 요청 자체를 끊음)
+아직 시작하지 않은 호출은 보내지 않으며, 그 조항은 재처리 대상으로 표시됩니다.
+
+    제한 시간 = LLM_TIMEOUT_MULTIPLIER x p95(초/출력 토큰) x 예상 출력 토큰
+                (LLM_TIMEOUT_MIN ~ 상한)
+    상한 = 호출하는 LLM 클라이언트의 timeout (로컬 llama.cpp 600초, Gemini 120초, 없으면 LLM_TIMEOUT)
+    관측값이 LLM_TIMEOUT_MIN_SAMPLES보다 적으면 (실행 시작, 새 체인·단계)
+        제한 시간 = max(LLM_TIMEOUT_COLD_START, LLM_TIMEOUT_MULTIPLIER x 최대 관측 지연)  (상한 이하)
+    제한 시간을 넘긴 호출도 관측값으로 남으므로, 느린 로컬 모델은 첫 호출만 잘리고 다음 호출부터 늘어납니다.
+    예상 출력 토큰 = max(p50(출력 토큰), p95(출력/입력 토큰 비) x 입력 토큰)  (LLM_MAX_TOKENS 이하)
+
+사용 예:
+    with deadline_scope(Deadline(300)):
+        result = bounded_call("entity", lambda: chain.invoke(inputs), estimate_tokens(text))
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, TypeVar
+
+from utils.metrics import estimate_tokens, metrics
+from utils.profiler import worker_scope
+
+# timeout이 없는 LLM 클라이언트의 호출 제한 시간 상한
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+# 관측값이 적을 때의 호출 제한 시간 (멈춘 첫 요청이 클라이언트 상한까지 붙잡지 않도록)
+LLM_TIMEOUT_COLD_START = float(os.getenv("LLM_TIMEOUT_COLD_START", "120"))
+# 호출 제한 시간 하한
+LLM_TIMEOUT_MIN = float(os.getenv("LLM_TIMEOUT_MIN", "5"))
+# 관측 지연 대비 여유 배수
+LLM_TIMEOUT_MULTIPLIER = float(os.getenv("LLM_TIMEOUT_MULTIPLIER", "3"))
+# 적응형 제한 시간을 쓰기 위한 (체인, 모델 단계)별 최소 관측 수
+LLM_TIMEOUT_MIN_SAMPLES = int(os.getenv("LLM_TIMEOUT_MIN_SAMPLES", "10"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "2048"))
+# 문서 하나의 처리 마감 (초, 0이면 마감 없음)
+DOCUMENT_DEADLINE_SECONDS = float(os.getenv("DOCUMENT_DEADLINE_SECONDS", "0"))
+
+# 키별로 보관하는 최근 관측값 수
+LATENCY_WINDOW = 500
+
+T = TypeVar("T")
+
+
+class CallTimeout(TimeoutError):
+    """LLM 호출 하나가 제한 시간을 넘김"""
+
+
+class DeadlineExceeded(TimeoutError):
+    """문서 마감이 지나 호출을 보내지 않거나 기다리지 않음"""
+
+
+class Deadline:
+    """문서 처리 마감 (단조 시계 기준)"""
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_deadline: contextvars.ContextVar[Optional[Deadline]] = contextvars.ContextVar("deadline", default=None)
+_call_timeout: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("call_timeout", default=None)
+
+
+def document_deadline(seconds: Optional[float] = None) -> Optional[Deadline]:
+    """문서 마감 (seconds가 None이면 DOCUMENT_DEADLINE_SECONDS, 0 이하면 마감 없음)"""
+    seconds = DOCUMENT_DEADLINE_SECONDS if seconds is None else seconds
+    return Deadline(seconds) if seconds > 0 else None
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """블록 안의 LLM 호출에 마감 적용 (None이면 바깥 마감 유지)"""
+    if deadline is None:
+        yield
+        return
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _deadline.get()
+
+
+def call_timeout(default: float) -> float:
+    """진행 중인 호출의 제한 시간 (LLM 클라이언트가 HTTP 요청에 적용, 없으면 default)"""
+    timeout = _call_timeout.get()
+    return default if timeout is None else min(default, timeout)
+
+
+def client_timeout(llm: Any) -> Optional[float]:
+    """LLM 클라이언트 자신의 요청 제한 시간 (bounded_call의 상한, 없으면 None)"""
+    timeout = getattr(llm, "timeout", None)
+    return float(timeout) if isinstance(timeout, (int, float)) and timeout > 0 else None
+
+
+def _in_worker(fn: Callable[..., T], *args, **kwargs) -> T:
+    with worker_scope():
+        return fn(*args, **kwargs)
+
+
+def in_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """현재 컨텍스트(문서 마감, 프로파일 단계)를 스레드 풀 작업으로 넘기는 래퍼"""
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(_in_worker, fn, *args, **kwargs)
+    return run
+
+
+def _quantile(values: Iterable[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class LatencyModel:
+    """(체인, 모델 단계)별 최근 호출의 지연·토큰으로 제한 시간 계산 (스레드 안전)"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        # 키 -> (초, 입력 토큰, 출력 토큰)
+        self._samples: Dict[str, Deque[Tuple[float, int, int]]] = {}
+
+    def observe(self, key: str, seconds: float, input_tokens: int, output_tokens: int):
+        with self._lock:
+            samples = self._samples.setdefault(key, deque(maxlen=self.window))
+            samples.append((seconds, max(1, input_tokens), max(1, output_tokens)))
+
+    def _snapshot(self, key: str):
+        with self._lock:
+            return list(self._samples.get(key, ()))
+
+    def expected_output(self, key: str, input_tokens: int) -> int:
+        """예상 출력 토큰 수 (관측값이 없으면 LLM_MAX_TOKENS)"""
+        samples = self._snapshot(key)
+        if not samples:
+            return LLM_MAX_TOKENS
+        typical = _quantile((out for _, _, out in samples), 0.5)
+        ratio = _quantile((out / inp for _, inp, out in samples), 0.95)
+        return int(min(LLM_MAX_TOKENS, max(typical, ratio * max(1, input_tokens))))
+
+    def timeout(self, key: str, input_tokens: int, max_timeout: Optional[float] = None) -> float:
+        """호출 제한 시간 (관측값이 LLM_TIMEOUT_MIN_SAMPLES보다 적으면 시작 제한 시간과 최대 관측 지연 기준)
+
+        Args:
+            max_timeout: 상한 (기본: LLM_TIMEOUT)
+        """
+        max_timeout = max_timeout or LLM_TIMEOUT
+        samples = self._snapshot(key)
+        if len(samples) < LLM_TIMEOUT_MIN_SAMPLES:
+            slowest = max((seconds for seconds, _, _ in samples), default=0.0)
+            return min(max_timeout, max(LLM_TIMEOUT_COLD_START, LLM_TIMEOUT_MULTIPLIER * slowest))
+        per_token = _quantile((seconds / out for seconds, _, out in samples), 0.95)
+        timeout = LLM_TIMEOUT_MULTIPLIER * per_token * self.expected_output(key, input_tokens)
+        return min(max_timeout, max(min(LLM_TIMEOUT_MIN, max_timeout), timeout))
+
+
+latency_model = LatencyModel()
+
+
+def output_tokens(result: Any) -> int:
+    """파싱된 응답의 출력 토큰 수 근사치"""
+    return estimate_tokens(result if isinstance(result, str) else json.dumps(result, ensure_ascii=False, default=str))
+
+
+def bounded_call(
+    key: str,
+    call: Callable[[], T],
+    input_tokens: int,
+    model: Optional[LatencyModel] = None,
+    max_timeout: Optional[float] = None
+) -> T:
+    """제한 시간(관측 지연 기반, 문서 마감 이내) 안에 LLM 호출
+
+    호출은 별도 스레드에서 실행하고 제한 시간이 지나면 기다리지 않습니다. 그 스레드의
+    LLM 클라이언트는 call_timeout()으로 같은 제한 시간을 HTTP 요청에 적용해 스스로 끊습니다.
+
+    Args:
+        key: 지연 관측 키 (체인 이름, 라우팅 시 "체인/단계")
+        call: LLM 호출 (파싱 결과 반환)
+        input_tokens: 프롬프트 가변 입력(조항 원문 등)의 토큰 수
+        max_timeout: 제한 시간 상한 (보통 client_timeout(llm), 기본: LLM_TIMEOUT)
+
+    Raises:
+        DeadlineExceeded: 마감이 이미 지났거나 호출 중에 지남
+        CallTimeout: 마감 전에 호출 제한 시간을 넘김
+    """
+    model = model or latency_model
+    deadline = current_deadline()
+    timeout = model.timeout(key, input_tokens, max_timeout)
+    limited_by_deadline = False
+    if deadline is not None:
+        remaining = deadline.remaining()
+        if remaining <= 0:
+            metrics.inc("kg_llm_deadline_skipped_total", chain=key)
+            raise DeadlineExceeded(f"문서 마감({deadline.seconds:g}초) 경과로 호출하지 않음")
+        if remaining < timeout:
+            timeout, limited_by_deadline = remaining, True
+
+    outcome: Dict[str, Any] = {}
+    done = threading.Event()
+
+    def run():
+        _call_timeout.set(timeout)
+        try:
+            with worker_scope():
+                outcome["result"] = call()
+        except BaseException as e:
+            outcome["error"] = e
+        finally:
+            done.set()
+
+    started = time.perf_counter()
+    context = contextvars.copy_context()
+    threading.Thread(target=context.run, args=(run,), daemon=True, name=f"llm-{key}").start()
+    if not done.wait(timeout):
+        if limited_by_deadline:
+            metrics.inc("kg_llm_timeouts_total", chain=key, cause="deadline")
+            raise DeadlineExceeded(f"문서 마감({deadline.seconds:g}초) 경과로 진행 중인 호출 취소")
+        metrics.inc("kg_llm_timeouts_total", chain=key, cause="timeout")
+        # 끝나지 않은 호출도 관측값으로 남겨 느려진 모델의 제한 시간이 늘어나도록
+        model.observe(key, timeout, input_tokens, model.expected_output(key, input_tokens))
+        raise CallTimeout(f"LLM 호출 제한 시간 {timeout:.1f}초 초과")
+    if "error" in outcome:
+        raise outcome["error"]
+    model.observe(key, time.perf_counter() - started, input_tokens, output_tokens(outcome["result"]))
+    return outcome["result"]
@@ -0,0 +1,192 @@
+"""개체명 정규화 및 병합 (union-find)
+
+LLM이 같은 개체를 "이 법" / "본법" / "이 법률", "「자본시장법」" / "자본시장법",
+"금융위원회는" / "금융위원회"처럼 다르게 표기하면 Entity 노드와 관계가 중복됩니다.
+표기를 정규화한 키가 같거나 별칭 테이블로 연결된 이름을 하나의 집합으로 묶고,
+집합마다 대표 이름(canonical)을 정해 트리플을 다시 씁니다.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from models.schemas import GraphTriplet, LegalEntity
+from models.triplet_table import TripletTable
+
+# 가운뎃점 변형 (U+00B7, U+318D, U+2022, U+2027, U+30FB, U+FF65, U+2219)
+MIDDLE_DOTS = "·ㆍ•‧・･∙"
+
+# 감싸는 괄호/따옴표 (법령명 인용 등)
+QUOTES = "「」『』〈〉《》“”‘’\"'"
+
+# 가운뎃점은 "·"으로 통일하고 괄호/따옴표는 제거하는 변환 테이블
+_TRANSLATION = str.maketrans({**{dot: "·" for dot in MIDDLE_DOTS}, **{quote: None for quote in QUOTES}})
+_NEEDS_TRANSLATION = re.compile("[" + re.escape(MIDDLE_DOTS.replace("·", "") + QUOTES) + "]")
+
+# 개체명 끝에 붙은 조사 (합의/국가/결과/경로처럼 명사 끝 글자와 겹치는 의/이/가/과/로는 제외하므로
+# "금융위원회가"는 "금융위원회"와 병합되지 않음)
+TRAILING_PARTICLES = ("으로서", "으로써", "에게서", "에게", "에서", "으로", "은", "는", "을", "를")
+# 한 글자 조사(은/는/을/를)를 떼려면 남는 이름이 이 글자 수 이상이어야 함 (금·은, 대상을 등 보호)
+SHORT_PARTICLE_MIN_STEM = 3
+# 남는 이름이 이 문자로 끝나면 조사가 아니라 나열된 명사 (금·은)
+STEM_SEPARATORS = ("·", " ")
+
+# 같은 법률 자신을 가리키는 표현
+SELF_REFERENCE = "이 법"
+DEFAULT_ALIASES: List[Tuple[str, str]] = [
+    ("본법", SELF_REFERENCE),
+    ("이 법률", SELF_REFERENCE),
+    ("본 법", SELF_REFERENCE),
+    ("본 법률", SELF_REFERENCE),
+]
+
+
+@lru_cache(maxsize=65536)
+def normalize_entity(name: str) -> str:
+    """표기 정규화: 괄호/따옴표 제거, 가운뎃점 통일, 공백 정리, 끝 조사 제거"""
+    if _NEEDS_TRANSLATION.search(name):
+        name = name.translate(_TRANSLATION)
+    name = " ".join(name.split())
+    if not name.endswith(TRAILING_PARTICLES):
+        return name
+    for particle in TRAILING_PARTICLES:
+        if not name.endswith(particle):
+            continue
+        stem = name[:-len(particle)]
+        min_stem = SHORT_PARTICLE_MIN_STEM if len(particle) == 1 else 2
+        if len(stem) >= min_stem and not stem.endswith(STEM_SEPARATORS):
+            return stem
+    return name
+
+
+def entity_key(name: str) -> str:
+    """병합 키 (정규화 후 공백 제거)"""
+    return normalize_entity(name).replace(" ", "")
+
+
+class EntityCanonicalizer:
+    """union-find 기반 개체 병합기
+
+    Args:
+        aliases: (별칭, 대표 이름) 쌍. 기본은 "본법"/"이 법률" 등 -> "이 법"
+    """
+
+    def __init__(self, aliases: Optional[Iterable[Tuple[str, str]]] = None):
+        self._parent: Dict[str, str] = {}
+        self._preferred: Dict[str, str] = {}
+        for alias, canonical in (DEFAULT_ALIASES if aliases is None else aliases):
+            self.union(entity_key(alias), entity_key(canonical))
+            self._preferred[entity_key(canonical)] = canonical
+
+    def find(self, key: str) -> str:
+        parent = self._parent.setdefault(key, key)
+        if parent == key:
+            return key
+        root = self.find(parent)
+        self._parent[key] = root
+        return root
+
+    def union(self, a: str, b: str):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self._parent[root_a] = root_b
+
+    def build(self, names: Iterable[str]) -> Dict[str, str]:
+        """이름 목록(또는 {이름: 등장 횟수})에 대한 별칭 테이블 {원래 이름: 대표 이름}
+
+        대표 이름은 별칭 테이블에 지정된 이름이 있으면 그것을, 없으면 집합 안에서
+        가장 많이 쓰인 정규화 표기(동률이면 짧은 것)를 사용합니다.
+        """
+        occurrences = Counter(names)
+        normalized = {name: normalize_entity(name) for name in occurrences}
+        roots = {name: self.find(form.replace(" ", "")) for name, form in normalized.items()}
+        preferred = {self.find(key): form for key, form in self._preferred.items()}
+
+        usage: Dict[str, Dict[str, int]] = {}
+        for name, count in occurrences.items():
+            forms = usage.setdefault(roots[name], {})
+            forms[normalized[name]] = forms.get(normalized[name], 0) + count
+
+        canonical = {}
+        for root, counter in usage.items():
+            if root in preferred:
+                canonical[root] = preferred[root]
+            elif len(counter) == 1:
+                canonical[root] = next(iter(counter))
+            else:
+                canonical[root] = min(counter, key=lambda form: (-counter[form], len(form), form))
+        return {name: canonical[root] for name, root in roots.items()}
+
+
+def canonicalize_table(
+    table: TripletTable,
+    entities: Optional[List[LegalEntity]] = None,
+    canonicalizer: Optional[EntityCanonicalizer] = None
+) -> Tuple[TripletTable, Dict[str, str], Dict[str, int]]:
+    """열 지향 테이블의 주체/대상(과 조항 개체의 주체/대상)을 대표 이름으로 다시 씀
+
+    이름별 등장 횟수는 문자열 코드로 집계하므로 정규화/병합은 서로 다른 이름 수만큼만 수행합니다.
+
+    Returns:
+        (다시 쓴 테이블, 별칭 테이블 {원래 이름: 대표 이름} (바뀐 것만), 축소 보고서)
+    """
+    canonicalizer = canonicalizer or EntityCanonicalizer()
+    counts = np.bincount(np.concatenate((table.subject, table.object)), minlength=len(table.strings))
+    codes = np.flatnonzero(counts)
+    occurrences = Counter(dict(zip((table.strings[code] for code in codes), counts[codes].tolist())))
+    occurrences.update(
+        value for entity in (entities or []) for value in (entity.subject, entity.object) if value
+    )
+    aliases = canonicalizer.build(occurrences)
+
+    rewritten = table.remap(aliases)
+    for entity in entities or []:
+        if entity.subject:
+            entity.subject = aliases[entity.subject]
+        if entity.object:
+            entity.object = aliases[entity.object]
+
+    canonical_codes = np.unique(np.concatenate((rewritten.subject, rewritten.object)))
+    report = {
+        "nodes_before": len(codes),
+        "nodes_after": len(canonical_codes),
+        "edges_before": table.count_distinct(),
+        "edges_after": rewritten.count_distinct(),
+    }
+    return rewritten, {name: value for name, value in aliases.items() if name != value}, report
+
+
+def canonicalize_triplets(
+    triplets: List[GraphTriplet],
+    entities: Optional[List[LegalEntity]] = None,
+    canonicalizer: Optional[EntityCanonicalizer] = None
+) -> Tuple[List[GraphTriplet], Dict[str, str], Dict[str, int]]:
+    """트리플의 주체/대상(과 조항 개체의 주체/대상)을 대표 이름으로 다시 씀
+
+    Returns:
+        (다시 쓴 트리플, 별칭 테이블 {원래 이름: 대표 이름} (바뀐 것만), 축소 보고서)
+    """
+    table = TripletTable.from_triplets(triplets)
+    rewritten, aliases, report = canonicalize_table(table, entities, canonicalizer)
+    return rewrite_triplets(triplets, table, rewritten, range(len(triplets))), aliases, report
+
+
+def rewrite_triplets(
+    triplets: List[GraphTriplet],
+    table: TripletTable,
+    rewritten: TripletTable,
+    indices: Iterable[int]
+) -> List[GraphTriplet]:
+    """indices 위치의 트리플 목록 (주체/대상이 바뀐 것만 복사하고 나머지는 원래 객체 재사용)"""
+    changed = (table.subject != rewritten.subject) | (table.object != rewritten.object)
+    strings = rewritten.strings
+    return [
+        triplets[i].model_copy(update={
+            "subject": strings[rewritten.subject[i]],
+            "object": strings[rewritten.object[i]],
+        })
+        if changed[i] else triplets[i]
+        for i in indices
+    ]
@@ -0,0 +1,466 @@
+"""LLM 출력용 관대한 스트리밍 JSON 파서
+
+LLM 응답은 코드 펜스(```json), 앞뒤 설명문, 후행 쉼표, 작은따옴표, 잘린 배열처럼 조금씩
+JSON 규칙을 어깁니다. 이 파서는 응답을 앞에서부터 한 번 훑으며(조각 단위로 feed 가능)
+명시적 스택으로 값을 쌓고, 흔한 결함은 고쳐 읽고, 더 읽을 수 없는 지점에서 멈춰 그때까지의
+가장 긴 유효 접두부를 돌려줍니다. 잘린 응답은 열린 괄호를 닫고 완성되지 않은 마지막 값만
+버립니다 (입력 끝에서 끊긴 숫자도 0.95가 0.9로 잘렸을 수 있어 버림).
+
+    result = repair_json('```json\\n[{"a": 1,}, {"a": 2\\n')
+    result.value    # [{"a": 1}, {"a": 2}]
+    result.repairs  # {"code_fence": 1, "trailing_comma": 1, "truncated": 1}
+"""
+import json
+import re
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser
+from pydantic import Field
+
+from utils.metrics import metrics
+
+WHITESPACE = " \t\r\n\ufeff\xa0"
+ROOT_START = re.compile(r'[\[{]')
+CODE_FENCE = re.compile(r'```(?:json)?', re.IGNORECASE)
+FENCED = re.compile(r'\A```[A-Za-z]*[ \t]*\n(.*)\n\s*```\Z', re.DOTALL)
+NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+NUMBER_TOKEN = re.compile(r'[-+0-9.eE]+')
+BARE_WORD = re.compile(r'[^\s,:{}\[\]"\']+')
+LITERALS = {"true": True, "false": False, "null": None, "True": True, "False": False, "None": None}
+INVALID_ESCAPE = re.compile(r'\\(?!["\\/bfnrtu])')
+UNESCAPED_QUOTE = re.compile(r'(?<!\\)((?:\\\\)*)"')
+
+# 스택 프레임 상태
+OPEN, AFTER_COMMA, AFTER_KEY, AFTER_COLON, AFTER_VALUE = range(5)
+
+# 아직 끝나지 않은 토큰 (조각을 더 받아야 판단 가능)
+_INCOMPLETE = object()
+
+
+class RepairResult(NamedTuple):
+    """파싱 결과
+
+    value: 복구한 값 (JSON 객체/배열을 찾지 못하면 None)
+    repairs: 고친 결함 종류별 횟수
+    complete: 잘리거나 손상된 부분 없이 끝까지 읽었는지
+    """
+    value: Any
+    repairs: Dict[str, int]
+    complete: bool
+
+
+class _Frame:
+    __slots__ = ("container", "key", "state")
+
+    def __init__(self, container):
+        self.container = container
+        self.key: Optional[str] = None
+        self.state = OPEN
+
+
+class StreamingJsonParser:
+    """조각 단위로 입력받는 관대한 JSON 파서
+
+    사용 예:
+        parser = StreamingJsonParser()
+        for chunk in stream:
+            parser.feed(chunk)
+        result = parser.close()
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.pos = 0
+        self.stack: List[_Frame] = []
+        self.roots: List[Any] = []
+        self.repairs: Dict[str, int] = {}
+        # 토큰이 끝나 단계가 확정될 때 반영할 수리 (조각 경계에서 중복 집계 방지)
+        self._pending: List[str] = []
+        self.broken = False
+        self.final = False
+        self.finished = False
+
+    def _repair(self, kind: str):
+        self._pending.append(kind)
+
+    def _commit(self):
+        for kind in self._pending:
+            self.repairs[kind] = self.repairs.get(kind, 0) + 1
+        self._pending.clear()
+
+    def feed(self, chunk: str) -> "StreamingJsonParser":
+        """입력 조각 추가 후 가능한 만큼 파싱"""
+        if self.pos > 4096:
+            self.buf, self.pos = self.buf[self.pos:], 0
+        self.buf += chunk
+        self._scan()
+        return self
+
+    def close(self) -> RepairResult:
+        """입력 종료: 남은 토큰을 처리하고 열린 괄호를 닫아 결과 반환"""
+        self.final = True
+        self._scan()
+        self._pending.clear()
+        complete = not self.broken
+        if self.stack:
+            self._repair("truncated")
+            complete = False
+            while self.stack:
+                frame = self.stack.pop()
+                self._attach(frame.container)
+        if self.broken:
+            self._repair("invalid")
+
+        if not self.roots:
+            value = None
+        elif len(self.roots) == 1:
+            value = self.roots[0]
+        else:
+            self._repair("multiple_values")
+            value = []
+            for root in self.roots:
+                value.extend(root if isinstance(root, list) else [root])
+        self._commit()
+        return RepairResult(value, dict(self.repairs), complete)
+
+    # ------------------------------------------------------------------
+    # 스캔
+    # ------------------------------------------------------------------
+
+    def _skip(self) -> Optional[int]:
+        """공백과 // 주석 건너뛰기 (주석인지 아직 알 수 없으면 None)"""
+        buf, pos, n = self.buf, self.pos, len(self.buf)
+        while pos < n:
+            if buf[pos] in WHITESPACE:
+                pos += 1
+            elif self.stack and buf[pos] == "/" and (buf.startswith("//", pos) or pos + 1 == n):
+                end = buf.find("\n", pos)
+                if end < 0 and not self.final:
+                    self.pos = pos
+                    return None
+                if not buf.startswith("//", pos):
+                    break
+                self._repair("comment")
+                self._commit()
+                pos = n if end < 0 else end + 1
+            else:
+                break
+        self.pos = pos
+        return pos
+
+    def _skip_prose(self, pos: int):
+        """최상위 값 밖의 설명문/코드 펜스 건너뛰기
+
+        첫 값을 읽은 뒤에는 코드 펜스만 건너뛰고, 설명문이 나오면 나머지 입력을 모두 무시합니다.
+        """
+        if self.roots:
+            fence = CODE_FENCE.match(self.buf, pos)
+            if fence is not None:
+                self._mark("code_fence")
+                self.pos = fence.end()
+            elif len(self.buf) - pos < 3 and "```".startswith(self.buf[pos:]) and not self.final:
+                return  # 코드 펜스 일부일 수 있음
+            else:
+                self._mark("prose")
+                self.finished = True
+            return
+        match = ROOT_START.search(self.buf, pos)
+        end = match.start() if match else len(self.buf)
+        if match is None and not self.final:
+            # 조각 경계에 걸친 코드 펜스(```json)는 다음 조각과 함께 판단
+            hold = self.buf.find("`", max(pos, end - len("```json")))
+            if hold >= 0:
+                while hold > pos and self.buf[hold - 1] == "`":
+                    hold -= 1
+                end = hold
+        skipped = self.buf[pos:end]
+        if "```" in skipped:
+            self._mark("code_fence")
+        if CODE_FENCE.sub("", skipped).strip():
+            self._mark("prose")
+        self.pos = end
+
+    def _mark(self, kind: str):
+        """응답당 한 번만 세는 수리"""
+        if kind not in self.repairs:
+            self.repairs[kind] = 1
+
+    def _scan(self):
+        while not self.broken and not self.finished:
+            pos = self._skip()
+            if pos is None or pos >= len(self.buf):
+                return
+            c = self.buf[pos]
+
+            if not self.stack:
+                if c in "{[":
+                    self.stack.append(_Frame({} if c == "{" else []))
+                    self.pos = pos + 1
+                else:
+                    before = self.pos
+                    self._skip_prose(pos)
+                    if self.pos == before and not self.finished:
+                        return
+                continue
+
+            frame = self.stack[-1]
+            if isinstance(frame.container, list):
+                done = self._list_step(frame, c, pos)
+            else:
+                done = self._dict_step(frame, c, pos)
+            if done is _INCOMPLETE:
+                self._pending.clear()
+                return
+            self._commit()
+
+    def _list_step(self, frame: _Frame, c: str, pos: int):
+        if c == "]" or c == "}":
+            if frame.state == AFTER_COMMA:
+                self._repair("trailing_comma")
+            self._close_with(c, pos, "]")
+        elif c == ",":
+            if frame.state != AFTER_VALUE:
+                self._repair("extra_comma")
+            frame.state = AFTER_COMMA
+            self.pos = pos + 1
+        else:
+            if frame.state == AFTER_VALUE:
+                self._repair("missing_comma")
+            return self._value(pos)
+
+    def _dict_step(self, frame: _Frame, c: str, pos: int):
+        state = frame.state
+        if c == "}" or c == "]":
+            if state == AFTER_COMMA:
+                self._repair("trailing_comma")
+            elif state in (AFTER_KEY, AFTER_COLON):
+                self._repair("missing_value")
+                frame.key = None
+            self._close_with(c, pos, "}")
+        elif c == ",":
+            if state in (AFTER_KEY, AFTER_COLON):
+                self._repair("missing_value")
+                frame.key = None
+            elif state != AFTER_VALUE:
+                self._repair("extra_comma")
+            frame.state = AFTER_COMMA
+            self.pos = pos + 1
+        elif state == AFTER_KEY:
+            if c == ":" or c == "=":
+                frame.state = AFTER_COLON
+                self.pos = pos + 1
+            else:
+                self.broken = True
+        elif state == AFTER_COLON:
+            return self._value(pos)
+        else:
+            if state == AFTER_VALUE:
+                self._repair("missing_comma")
+            return self._key(frame, c, pos)
+
+    def _key(self, frame: _Frame, c: str, pos: int):
+        if c in "\"'":
+            key = self._string(pos, c)
+            if key is _INCOMPLETE:
+                return _INCOMPLETE
+        else:
+            match = BARE_WORD.match(self.buf, pos)
+            if match is None:
+                self.broken = True
+                return None
+            if match.end() == len(self.buf) and not self.final:
+                return _INCOMPLETE
+            self._repair("unquoted_key")
+            key = match.group(0)
+            self.pos = match.end()
+        frame.key = key
+        frame.state = AFTER_KEY
+
+    def _value(self, pos: int):
+        buf = self.buf
+        c = buf[pos]
+        if c in "{[":
+            self.stack.append(_Frame({} if c == "{" else []))
+            self.pos = pos + 1
+            return None
+        if c in "\"'":
+            value = self._string(pos, c)
+            if value is _INCOMPLETE:
+                return _INCOMPLETE
+        elif c == "-" or c.isdigit():
+            token = NUMBER_TOKEN.match(buf, pos)
+            if token.end() == len(buf):
+                # 더 이어질 수 있는 숫자 (입력이 끝났으면 0.95가 0.9로 잘렸을 수 있어 close에서 버림)
+                return _INCOMPLETE
+            match = NUMBER.match(buf, pos)
+            if match is None:
+                self.broken = True
+                return None
+            text = match.group(0)
+            value = float(text) if any(ch in text for ch in ".eE") else int(text)
+            self.pos = match.end()
+        else:
+            match = BARE_WORD.match(buf, pos)
+            if match is None:
+                self.broken = True
+                return None
+            if match.end() == len(buf) and not self.final:
+                return _INCOMPLETE
+            word = match.group(0)
+            if word in LITERALS:
+                if word not in ("true", "false", "null"):
+                    self._repair("python_literal")
+                value = LITERALS[word]
+            elif match.end() == len(buf):
+                return _INCOMPLETE  # 잘린 리터럴 (close에서 버림)
+            else:
+                self._repair("unquoted_value")
+                value = word
+            self.pos = match.end()
+        self._attach(value)
+        return None
+
+    def _string(self, pos: int, quote: str):
+        """따옴표 문자열 (값 안의 이스케이프되지 않은 따옴표는 뒤따르는 문자로 판별)"""
+        buf, n = self.buf, len(self.buf)
+        i = pos + 1
+        inner_quote = False
+        while True:
+            end = buf.find(quote, i)
+            if end < 0:
+                return _INCOMPLETE
+            backslashes = 0
+            k = end - 1
+            while k > pos and buf[k] == "\\":
+                backslashes += 1
+                k -= 1
+            if backslashes % 2:
+                i = end + 1
+                continue
+            after = end + 1
+            while after < n and buf[after] in WHITESPACE:
+                after += 1
+            if after >= n:
+                if not self.final:
+                    return _INCOMPLETE
+                break
+            # 다음 줄에서 새 문자열이 시작되면 쉼표가 빠진 것으로 봄
+            if buf[after] in ",}]:" or buf[after] == '"' and "\n" in buf[end:after]:
+                break
+            inner_quote = True
+            i = end + 1
+
+        raw = buf[pos + 1:end]
+        if quote == "'":
+            self._repair("single_quotes")
+            raw = raw.replace("\\'", "'")
+            inner_quote = '"' in raw
+        if inner_quote:
+            if quote == '"':
+                self._repair("unescaped_quote")
+            raw = UNESCAPED_QUOTE.sub(r'\1\\"', raw)
+        try:
+            value = json.loads('"' + raw + '"', strict=False)
+        except json.JSONDecodeError:
+            self._repair("invalid_escape")
+            value = json.loads('"' + INVALID_ESCAPE.sub(r'\\\\', raw) + '"', strict=False)
+        self.pos = end + 1
+        return value
+
+    def _attach(self, value: Any):
+        if not self.stack:
+            self._add_root(value)
+            return
+        frame = self.stack[-1]
+        if isinstance(frame.container, list):
+            frame.container.append(value)
+        elif frame.key is not None:
+            frame.container[frame.key] = value
+            frame.key = None
+        frame.state = AFTER_VALUE
+
+    def _close(self):
+        frame = self.stack.pop()
+        self._attach(frame.container)
+
+    def _close_with(self, c: str, pos: int, expected: str):
+        """현재 괄호 닫기 (짝이 맞지 않는 닫는 괄호는 바깥 괄호까지 닫도록 다시 처리)"""
+        if c == expected:
+            self.pos = pos + 1
+        else:
+            self._repair("mismatched_bracket")
+            if len(self.stack) == 1:
+                self.pos = pos + 1
+        self._close()
+
+    def _add_root(self, value: Any):
+        """최상위 값 추가 (첫 값 뒤의 설명문 속 괄호는 객체 배열일 때만 값으로 인정)"""
+        if self.roots and not (
+            isinstance(value, dict) and value
+            or isinstance(value, list) and value and all(isinstance(item, dict) for item in value)
+        ):
+            self._mark("prose")
+            return
+        self.roots.append(value)
+
+
+def repair_json(text: str) -> RepairResult:
+    """응답 전체를 한 번에 파싱 (코드 펜스만 두른 올바른 JSON은 json.loads로 바로 처리)"""
+    candidate = text.strip()
+    fenced = FENCED.match(candidate)
+    if fenced:
+        candidate = fenced.group(1).strip()
+    if candidate[:1] in ("{", "["):
+        try:
+            return RepairResult(json.loads(candidate), {"code_fence": 1} if fenced else {}, True)
+        except json.JSONDecodeError:
+            pass
+    return StreamingJsonParser().feed(text).close()
+
+
+def json_objects(value: Any) -> List[Dict[str, Any]]:
+    """파싱 결과에서 객체 목록 (단일 객체, 배열, 중첩 배열, {"entities": [...]} 같은 래퍼 모두 허용)"""
+    if isinstance(value, dict):
+        if len(value) == 1:
+            inner = next(iter(value.values()))
+            if isinstance(inner, list) and inner and all(isinstance(item, dict) for item in inner):
+                return json_objects(inner)
+        return [value]
+    if isinstance(value, list):
+        objects: List[Dict[str, Any]] = []
+        for item in value:
+            objects.extend(json_objects(item))
+        return objects
+    return []
+
+
+class TolerantJsonOutputParser(BaseOutputParser[Any]):
+    """repair_json 기반 LangChain 출력 파서
+
+    복구할 수 있는 응답은 예외 없이 값을 돌려주므로 LLM을 다시 호출하지 않습니다.
+    고친 결함은 stats와 kg_json_repairs_total 메트릭에 기록합니다.
+    """
+
+    chain: str = "json"
+    stats: Dict[str, int] = Field(default_factory=dict)
+
+    @property
+    def _type(self) -> str:
+        return "tolerant_json"
+
+    def _count(self, key: str, value: int = 1):
+        self.stats[key] = self.stats.get(key, 0) + value
+
+    def parse(self, text: str) -> Any:
+        result = repair_json(text)
+        self._count("responses")
+        if result.value is None:
+            self._count("failed")
+            raise OutputParserException(f"응답에서 JSON을 찾을 수 없습니다: {text[:200]}", llm_output=text)
+        if result.repairs:
+            self._count("repaired")
+            for kind, count in result.repairs.items():
+                self._count(kind, count)
+                metrics.inc("kg_json_repairs_total", count, chain=self.chain, repair=kind)
+        return result.value
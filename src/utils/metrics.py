@@ -0,0 +1,298 @@
+"""파이프라인 계측 (단계별 소요 시간, LLM 호출, 토큰 사용량, 파싱 실패 등)
+
+프로세스 전역 `metrics` 레코더에 기록하고, Prometheus 텍스트 형식 또는
+JSON 실행 리포트로 내보냅니다.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+# 백분위 계산용으로 보관하는 최근 관측값 수 (키별, 오래된 값부터 버림)
+MAX_SAMPLES = 10000
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in key
+    )
+    return "{" + body + "}"
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 근사치 (공급자가 사용량을 반환하지 않을 때 사용)
+
+    한국어는 대략 1.5자당 1토큰, 그 외 문자는 4자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    hangul = sum(1 for ch in text if "가" <= ch <= "힣")
+    return max(1, int(hangul / 1.5 + (len(text) - hangul) / 4))
+
+
+class MetricsRecorder:
+    """카운터와 소요 시간 관측값을 모으는 레코더 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._timings: Dict[Tuple[str, LabelKey], Dict[str, Any]] = {}
+        self.started_at = time.time()
+
+    def reset(self):
+        """모든 기록 초기화"""
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+            self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1, **labels):
+        """카운터 증가"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels):
+        """소요 시간 관측값 기록"""
+        key = (name, _label_key(labels))
+        with self._lock:
+            timing = self._timings.get(key)
+            if timing is None:
+                timing = {"count": 0, "sum": 0.0, "max": 0.0, "samples": deque(maxlen=MAX_SAMPLES)}
+                self._timings[key] = timing
+            timing["count"] += 1
+            timing["sum"] += seconds
+            timing["max"] = max(timing["max"], seconds)
+            timing["samples"].append(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """블록 실행 시간 측정"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter_value(self, name: str, **labels) -> float:
+        """카운터 현재 값 (labels를 생략하면 모든 라벨 합계)"""
+        with self._lock:
+            if labels:
+                return self._counters.get((name, _label_key(labels)), 0)
+            return sum(v for (n, _), v in self._counters.items() if n == name)
+
+    def _timing_snapshot(self) -> List[Tuple[Tuple[str, LabelKey], Dict[str, Any]]]:
+        # 락 안에서 호출 (관측값 창은 기록 중에도 바뀌므로 복사)
+        return sorted((key, dict(timing, samples=list(timing["samples"]))) for key, timing in self._timings.items())
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식으로 변환"""
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timings = self._timing_snapshot()
+
+        seen = set()
+        for (name, key), value in counters:
+            if name not in seen:
+                lines.append(f"# TYPE {name} counter")
+                seen.add(name)
+            lines.append(f"{name}{_format_labels(key)} {value:g}")
+
+        for (name, key), timing in timings:
+            if name not in seen:
+                lines.append(f"# TYPE {name} summary")
+                seen.add(name)
+            samples = sorted(timing["samples"])
+            for q in (0.5, 0.95, 0.99):
+                q_key = key + (("quantile", str(q)),)
+                lines.append(f"{name}{_format_labels(q_key)} {_percentile(samples, q):.6f}")
+            lines.append(f"{name}_sum{_format_labels(key)} {timing['sum']:.6f}")
+            lines.append(f"{name}_count{_format_labels(key)} {timing['count']}")
+
+        return "\n".join(lines) + "\n"
+
+    def report(self) -> Dict[str, Any]:
+        """JSON 직렬화 가능한 실행 리포트"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            timings = self._timing_snapshot()
+
+        report: Dict[str, Any] = {
+            "started_at": self.started_at,
+            "elapsed_seconds": round(time.time() - self.started_at, 3),
+            "counters": [],
+            "timings": [],
+        }
+        for (name, key), value in counters:
+            report["counters"].append({"name": name, "labels": dict(key), "value": value})
+        for (name, key), timing in timings:
+            samples = sorted(timing["samples"])
+            report["timings"].append({
+                "name": name,
+                "labels": dict(key),
+                "count": timing["count"],
+                "total_seconds": round(timing["sum"], 6),
+                "mean_seconds": round(timing["sum"] / timing["count"], 6),
+                "p50_seconds": round(_percentile(samples, 0.5), 6),
+                "p95_seconds": round(_percentile(samples, 0.95), 6),
+                "max_seconds": round(timing["max"], 6),
+            })
+        return report
+
+    def write_prometheus(self, path: str):
+        """Prometheus 텍스트 파일로 저장 (node_exporter textfile collector 호환)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def write_report(self, path: str):
+        """JSON 실행 리포트로 저장"""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
+
+    def start_http_server(self, port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+        """/metrics (Prometheus) 및 /report (JSON) 엔드포인트를 백그라운드로 제공"""
+        recorder = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/metrics"):
+                    body = recorder.to_prometheus().encode("utf-8")
+                    content_type = "text/plain; version=0.0.4; charset=utf-8"
+                elif self.path.startswith("/report"):
+                    body = json.dumps(recorder.report(), ensure_ascii=False).encode("utf-8")
+                    content_type = "application/json; charset=utf-8"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+# 프로세스 전역 레코더
+metrics = MetricsRecorder()
+
+
+class LLMMetricsCallback(BaseCallbackHandler):
+    """LLM 호출별 소요 시간과 토큰 사용량을 기록하는 LangChain 콜백
+
+    LLM 캐시(set_llm_cache)에서 응답한 채팅 모델 호출은 호출·토큰 대신 kg_llm_cache_hits_total로
+    셉니다. 텍스트 LLM(llama.cpp 클라이언트)의 캐시 적중은 LangChain이 콜백을 부르지 않아 셀 수 없습니다.
+    """
+
+    def __init__(self, chain: str, recorder: Optional[MetricsRecorder] = None):
+        self.chain = chain
+        self.recorder = recorder or metrics
+        self._started: Dict[UUID, Tuple[float, int]] = {}
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, **kwargs):
+        self._started[run_id] = (time.perf_counter(), sum(estimate_tokens(p) for p in prompts))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        prompt_tokens = sum(
+            estimate_tokens(str(m.content)) for batch in messages for m in batch
+        )
+        self._started[run_id] = (time.perf_counter(), prompt_tokens)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs):
+        started, estimated_prompt = self._started.pop(run_id, (time.perf_counter(), 0))
+        if _cache_hit(response):
+            self.recorder.inc("kg_llm_cache_hits_total", chain=self.chain)
+            return
+        self.recorder.observe("kg_llm_call_duration_seconds", time.perf_counter() - started,
+                              chain=self.chain)
+        self.recorder.inc("kg_llm_calls_total", chain=self.chain)
+
+        prompt_tokens, completion_tokens = _token_usage(response)
+        if prompt_tokens is None:
+            prompt_tokens = estimated_prompt
+        if completion_tokens is None:
+            completion_tokens = sum(
+                estimate_tokens(g.text) for gens in response.generations for g in gens
+            )
+        self.recorder.inc("kg_llm_prompt_tokens_total", prompt_tokens, chain=self.chain)
+        self.recorder.inc("kg_llm_completion_tokens_total", completion_tokens, chain=self.chain)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs):
+        started, _ = self._started.pop(run_id, (time.perf_counter(), 0))
+        self.recorder.observe("kg_llm_call_duration_seconds", time.perf_counter() - started,
+                              chain=self.chain)
+        self.recorder.inc("kg_llm_errors_total", chain=self.chain)
+
+
+def _cache_hit(response: LLMResult) -> bool:
+    """LLM 캐시에서 온 응답인지 (채팅 모델의 캐시 조회는 응답 메시지 usage_metadata에 total_cost 0을 넣음)"""
+    generations = [generation for gens in response.generations for generation in gens]
+    return bool(generations) and all(
+        (getattr(getattr(generation, "message", None), "usage_metadata", None) or {}).get("total_cost") == 0
+        for generation in generations
+    )
+
+
+def _token_usage(response: LLMResult) -> Tuple[Optional[int], Optional[int]]:
+    """공급자가 반환한 토큰 사용량 (없으면 None)"""
+    for gens in response.generations:
+        for generation in gens:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if usage:
+                return usage.get("input_tokens"), usage.get("output_tokens")
+
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    if usage:
+        return usage.get("prompt_tokens"), usage.get("completion_tokens")
+    return None, None
+
+
+def start_metrics_from_env():
+    """METRICS_PORT가 설정되어 있으면 메트릭 HTTP 엔드포인트 시작"""
+    port = os.getenv("METRICS_PORT")
+    if port:
+        metrics.start_http_server(int(port))
+        print(f"📈 메트릭 엔드포인트: http://localhost:{port}/metrics")
+
+
+def export_metrics_from_env():
+    """METRICS_DIR이 설정되어 있으면 Prometheus 텍스트 파일과 JSON 리포트 저장"""
+    directory = os.getenv("METRICS_DIR")
+    if not directory:
+        return
+    os.makedirs(directory, exist_ok=True)
+    metrics.write_prometheus(os.path.join(directory, "metrics.prom"))
+    metrics.write_report(os.path.join(directory, "run_report.json"))
+    print(f"📈 메트릭 저장 완료: {directory}")
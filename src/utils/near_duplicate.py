@@ -0,0 +1,354 @@
+"""근사 중복 조항 탐지와 추출 결과 재사용 (MinHash + LSH)
+
+법령과 개정본에는 과태료 조항, 준용 조항, 개정 일자만 다른 같은 조항처럼 거의 같은 조항이
+많습니다. 조항 제목과 개정 표시를 뗀 원문을 문자 5-gram 집합으로 보고 MinHash 서명을 만든 뒤,
+LSH 밴드 버킷으로 후보를 찾고 서명 일치율(추정 자카드 유사도)이 임계값 이상이면 이미 추출한
+LegalEntity와 트리플을 재사용합니다. 재사용할 때는 원문에 나오는 조항 번호(자기 조항, 참조 조항)를
+새 조항의 번호로 바꿔 씁니다.
+
+    index = NearDuplicateIndex()
+    plan = index.plan(articles)              # 조항별 재사용 대상
+    ...plan.fresh 조항만 LLM으로 추출...
+    index.add(plan, entities, triplets, title)
+
+색인 파일 경로를 지정하면 생성 시 불러오고 프로세스 종료 시 (바뀐 경우에만) 한 번 저장합니다.
+"""
+import atexit
+import os
+import pickle
+import re
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from models.compact import CompactTriplet
+from models.schemas import LegalEntity
+from utils.metrics import metrics
+from utils.reference_resolver import ARTICLE_NUMBER, article_label
+
+# 재사용할 최소 유사도 (추정 자카드, 1보다 크면 재사용 안 함)
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.9"))
+# 지정 시 색인을 파일로 유지해 실행 간에도 재사용 (비우면 워크플로우 인스턴스 동안만 유지)
+# 벤치마크·테스트용 스텁 LLM 결과가 섞이지 않도록 실제 문서를 처리하는 환경에서만 지정
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", "")
+
+INDEX_VERSION = 2
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+BANDS = 16  # 밴드당 4행: 유사도 약 0.5부터 후보로 잡힘
+
+# (a * x + b) mod p 해시 함수족 (crc32 값 x < 2^32이므로 uint64에서 넘치지 않음)
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(1, 2 ** 32, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2 ** 32, NUM_PERM, dtype=np.uint64)
+
+HEADER = re.compile(r'^\s*제\s*\d+\s*조(?:\s*의\s*\d+)?(?:\s*\([^()\n]{1,40}\))?')
+ANNOTATION = re.compile(r'[<\[](?:개정|신설|본조신설|전문개정|제목개정|타법개정|종전|시행일)[^>\]]*[>\]]')
+
+ENTITY_FIELDS = ("article_number", "concept", "subject", "action", "object")
+
+
+def normalize(text: str) -> str:
+    """비교용 원문 (조항 제목, 개정 표시, 공백 제거)"""
+    text = ANNOTATION.sub("", HEADER.sub("", text, count=1))
+    return re.sub(r'\s+', '', text)
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """MinHash 서명 (비교할 내용이 없으면 None)"""
+    normalized = normalize(text)
+    if not normalized:
+        return None
+    shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(max(1, len(normalized) - SHINGLE_SIZE + 1))}
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64, count=len(shingles)
+    )
+    return ((hashes[:, None] * _A + _B) % _PRIME).min(axis=0)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """추정 자카드 유사도 (서명 일치율)"""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+def article_labels(text: str) -> Tuple[str, ...]:
+    """원문에 나오는 조항 번호 (등장 순서, 첫 번째는 보통 자기 조항)"""
+    return tuple(article_label(match.group(0)) for match in ARTICLE_NUMBER.finditer(text))
+
+
+def _label_mapping(old: Sequence[str], new: Sequence[str]) -> Dict[str, str]:
+    """같은 위치에 나오는 조항 번호끼리 대응 (개수가 다르거나 대응이 엇갈리면 해당 번호는 유지)"""
+    if len(old) != len(new):
+        return {}
+    mapping: Dict[str, Optional[str]] = {}
+    for before, after in zip(old, new):
+        if mapping.setdefault(before, after) != after:
+            mapping[before] = None
+    return {before: after for before, after in mapping.items() if after is not None and after != before}
+
+
+def _remap(value: Optional[str], mapping: Dict[str, str]) -> Optional[str]:
+    if not mapping or not value:
+        return value
+    return ARTICLE_NUMBER.sub(lambda m: mapping.get(article_label(m.group(0)), m.group(0)), value)
+
+
+class _Record(NamedTuple):
+    document: str
+    labels: Tuple[str, ...]
+    entities: List[Dict[str, Any]]
+    triplets: List[Tuple[str, str, str, str, float]]
+
+
+class DuplicateMatch(NamedTuple):
+    """재사용 대상 ("index": 색인된 조항 ID, "document": 같은 문서의 앞선 조항 위치)"""
+    source: str
+    target: int
+    similarity: float
+
+
+class _Buckets:
+    """LSH 밴드 버킷"""
+
+    def __init__(self):
+        self.signatures: List[np.ndarray] = []
+        self.buckets: Dict[bytes, List[int]] = {}
+
+    @staticmethod
+    def _keys(sig: np.ndarray) -> List[bytes]:
+        rows = NUM_PERM // BANDS
+        return [bytes([band]) + sig[band * rows:(band + 1) * rows].tobytes() for band in range(BANDS)]
+
+    def insert(self, sig: np.ndarray) -> int:
+        item = len(self.signatures)
+        self.signatures.append(sig)
+        for key in self._keys(sig):
+            self.buckets.setdefault(key, []).append(item)
+        return item
+
+    def query(self, sig: np.ndarray, threshold: float) -> Optional[Tuple[int, float]]:
+        """임계값 이상인 가장 유사한 항목 (같으면 먼저 들어온 항목)"""
+        candidates = set()
+        for key in self._keys(sig):
+            candidates.update(self.buckets.get(key, ()))
+        best = None
+        for item in sorted(candidates):
+            score = similarity(sig, self.signatures[item])
+            if score >= threshold and (best is None or score > best[1]):
+                best = (item, score)
+        return best
+
+
+class ReusePlan:
+    """문서 조항별 재사용 계획"""
+
+    def __init__(self, index: "NearDuplicateIndex", articles: Sequence[str]):
+        self.index = index
+        self.articles = list(articles)
+        self.signatures = [signature(article) for article in self.articles]
+        self.labels = [article_labels(article) for article in self.articles]
+        self.matches: List[Optional[DuplicateMatch]] = []
+
+        local = _Buckets()
+        positions: List[int] = []
+        for i, sig in enumerate(self.signatures):
+            match = None
+            if sig is not None:
+                found = index._buckets.query(sig, index.threshold)
+                if found is not None:
+                    match = DuplicateMatch("index", *found)
+                else:
+                    found = local.query(sig, index.threshold)
+                    if found is not None:
+                        match = DuplicateMatch("document", positions[found[0]], found[1])
+                    else:
+                        local.insert(sig)
+                        positions.append(i)
+            self.matches.append(match)
+
+    @property
+    def fresh(self) -> List[int]:
+        """LLM으로 추출해야 하는 조항 위치"""
+        return [i for i, match in enumerate(self.matches) if match is None]
+
+    def _source(self, i: int, entities: Dict[int, List[LegalEntity]], triplets: Dict[int, List[CompactTriplet]]):
+        """재사용 원본 (조항 번호, 개체별 필드, 트리플)"""
+        match = self.matches[i]
+        if match.source == "index":
+            record = self.index._records[match.target]
+            return record.labels, record.entities, record.triplets
+        fields = [
+            {name: getattr(entity, name) for name in ENTITY_FIELDS}
+            for entity in entities.get(match.target, [])
+        ]
+        source_triplets = triplets.get(match.target)
+        if source_triplets is not None:
+            source_triplets = [
+                (t.subject, t.relation, t.object, t.article_number, t.confidence) for t in source_triplets
+            ]
+        return self.labels[match.target], fields, source_triplets
+
+    def entities(self, extracted: Dict[int, List[LegalEntity]]) -> List[List[LegalEntity]]:
+        """추출한 조항 개체와 재사용 개체를 조항 위치 순서로 (추출 결과가 없는 위치는 빈 목록)"""
+        groups: List[List[LegalEntity]] = []
+        for i, article in enumerate(self.articles):
+            if self.matches[i] is None:
+                groups.append(list(extracted.get(i, [])))
+                continue
+            labels, fields, _ = self._source(i, extracted, {})
+            mapping = _label_mapping(labels, self.labels[i])
+            groups.append([
+                LegalEntity(
+                    **{name: _remap(value, mapping) for name, value in entity.items()},
+                    full_text=article
+                )
+                for entity in fields
+            ])
+        return groups
+
+    def triplets(self, i: int, extracted: Dict[int, List[CompactTriplet]]) -> Optional[List[CompactTriplet]]:
+        """재사용 트리플 (재사용 대상이 아니거나 원본 트리플이 없으면 None)"""
+        if self.matches[i] is None:
+            return None
+        labels, _, source = self._source(i, {}, extracted)
+        if not source:
+            return None
+        mapping = _label_mapping(labels, self.labels[i])
+        return [
+            CompactTriplet(_remap(subject, mapping), relation, _remap(obj, mapping),
+                           _remap(article_number, mapping), confidence)
+            for subject, relation, obj, article_number, confidence in source
+        ]
+
+    def report(self) -> Dict[str, int]:
+        """재사용 통계 (조항당 개체·관계 추출 호출 2회 기준)"""
+        index = sum(1 for match in self.matches if match is not None and match.source == "index")
+        document = sum(1 for match in self.matches if match is not None and match.source == "document")
+        return {
+            "articles": len(self.articles),
+            "index": index,
+            "document": document,
+            "llm_calls_avoided": 2 * (index + document),
+        }
+
+
+class NearDuplicateIndex:
+    """처리한 조항의 MinHash 색인과 추출 결과
+
+    Args:
+        threshold: 재사용 최소 유사도 (기본: NEAR_DUPLICATE_THRESHOLD)
+        path: 색인 파일 경로 (기본: NEAR_DUPLICATE_INDEX_PATH, 비우면 메모리에만 유지)
+    """
+
+    def __init__(self, threshold: float = None, path: str = None):
+        self.threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+        self.path = NEAR_DUPLICATE_INDEX_PATH if path is None else path
+        self._buckets = _Buckets()
+        self._records: List[_Record] = []
+        self._dirty = False
+        if self.path:
+            if os.path.exists(self.path):
+                self.load(self.path)
+            # 문서마다 전체 파일을 다시 쓰지 않고 종료 시 한 번 저장
+            atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def plan(self, articles: Sequence[str]) -> ReusePlan:
+        """문서 조항별 재사용 대상 탐색 (색인, 같은 문서의 앞선 조항 순)"""
+        return ReusePlan(self, articles)
+
+    def add(self, plan: ReusePlan, groups: Sequence[List[LegalEntity]],
+            triplets: Dict[int, List[CompactTriplet]], title: str) -> int:
+        """문서의 조항을 색인에 추가 (같은 제목의 이전 기록은 교체, 추출 실패로 보이는 조항은 제외)
+
+        같은 제목의 이전 기록에서 재사용한 조항은 새 기록으로 옮겨 남기고, 나머지 이전 기록은 버립니다.
+
+        Args:
+            plan: 이 문서의 재사용 계획
+            groups: 조항 위치 순서의 개체 목록 (plan.entities() 결과)
+            triplets: 조항 위치 -> 추출한 트리플
+        """
+        added: List[Tuple[np.ndarray, _Record]] = []
+        for i, match in enumerate(plan.matches):
+            if match is None:
+                found = triplets.get(i)
+            elif match.source == "index" and self._records[match.target].document == title:
+                found = plan.triplets(i, triplets)
+            else:
+                continue
+            sig = plan.signatures[i]
+            group = groups[i] if i < len(groups) else []
+            if sig is None or not group or not found or any(entity.concept == "Unknown" for entity in group):
+                continue
+            added.append((sig, _Record(
+                document=title,
+                labels=plan.labels[i],
+                entities=[{name: getattr(entity, name) for name in ENTITY_FIELDS} for entity in group],
+                triplets=[(t.subject, t.relation, t.object, t.article_number, t.confidence) for t in found],
+            )))
+
+        if any(record.document == title for record in self._records):
+            kept = [
+                (sig, record) for sig, record in zip(self._buckets.signatures, self._records)
+                if record.document != title
+            ]
+            self._buckets = _Buckets()
+            self._records = []
+            for sig, record in kept:
+                self._buckets.insert(sig)
+                self._records.append(record)
+            self._dirty = True
+        for sig, record in added:
+            self._buckets.insert(sig)
+            self._records.append(record)
+        self._dirty = self._dirty or bool(added)
+        return len(added)
+
+    def save(self, path: str = None) -> Optional[str]:
+        """색인 저장 (경로가 없거나 색인 파일이 이미 최신이면 쓰지 않음)"""
+        path = path or self.path
+        if not path:
+            return None
+        if path == self.path and not self._dirty and os.path.exists(path):
+            return path
+        state = {
+            "version": INDEX_VERSION,
+            "signatures": np.stack(self._buckets.signatures) if self._records else np.empty((0, NUM_PERM), np.uint64),
+            "records": [tuple(record) for record in self._records],
+        }
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        if path == self.path:
+            self._dirty = False
+        return path
+
+    def load(self, path: str):
+        """저장된 색인 불러오기 (형식이 다르면 무시)"""
+        with open(path, "rb") as f:
+            state = pickle.load(f)
+        if state.get("version") != INDEX_VERSION:
+            return
+        self._buckets = _Buckets()
+        self._records = []
+        for sig, record in zip(state["signatures"], state["records"]):
+            self._buckets.insert(np.asarray(sig, dtype=np.uint64))
+            self._records.append(_Record(*record))
+        self._dirty = False
+
+
+def record_reuse(report: Dict[str, int]):
+    """재사용 통계를 메트릭으로 기록"""
+    for source in ("index", "document"):
+        if report.get(source):
+            metrics.inc("kg_near_duplicate_reused_total", report[source], source=source)
+    if report.get("llm_calls_avoided"):
+        metrics.inc("kg_llm_calls_avoided_total", report["llm_calls_avoided"])
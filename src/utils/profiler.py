@@ -0,0 +1,305 @@
+"""워크플로우 단계별 CPU 프로파일링 (샘플링 방식)
+
+`--profile` 옵션으로 활성화하면 백그라운드 스레드가 일정 간격으로 각 단계를 실행 중인
+스레드의 호출 스택을 수집합니다. 단계 안에서 스레드 풀이나 LLM 호출 스레드(`utils.deadline`)로
+넘긴 작업은 `worker_scope`로 같은 단계에 귀속되어 샘플과 CPU 시간에 포함됩니다. 결과는 flamegraph.pl / speedscope에서 바로 읽을 수 있는
+collapsed-stack 파일과 상위 N개 핫스팟 표로 저장됩니다.
+"""
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from rich.console import Console
+from rich.table import Table
+
+# 현재 활성화된 프로파일러 (없으면 stage_scope는 아무 것도 하지 않음)
+_active: Optional["StageProfiler"] = None
+# 현재 컨텍스트의 단계 경로 (스레드로 넘긴 작업이 호출자의 단계를 이어받도록)
+_stage_path: contextvars.ContextVar[Tuple[str, ...]] = contextvars.ContextVar("stage_path", default=())
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StageProfiler:
+    """단계(stage) 단위로 범위를 지정하는 샘플링 프로파일러
+
+    Args:
+        interval: 샘플링 간격 (초)
+        max_depth: 수집할 최대 스택 깊이
+    """
+
+    def __init__(self, interval: float = None, max_depth: int = 64):
+        self.interval = interval or float(os.getenv("PROFILE_INTERVAL", "0.005"))
+        self.max_depth = max_depth
+        self.stacks: Counter = Counter()
+        self.stage_samples: Counter = Counter()
+        self.stage_wall: Dict[str, float] = {}
+        self.stage_cpu: Dict[str, float] = {}
+        self.stage_calls: Counter = Counter()
+        self.articles = 0
+        self._threads: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._switch_interval: Optional[float] = None
+
+    def start(self):
+        """샘플링 시작 및 전역 프로파일러로 등록
+
+        GIL 전환 간격(기본 5ms)보다 짧게 끝나는 작업 스레드(스텁·캐시 LLM 호출 등)는 샘플러가
+        GIL을 얻기 전에 끝나 샘플에 잡히지 않으므로, 샘플링 동안 전환 간격을 간격의 1/10로 줄입니다.
+        """
+        global _active
+        _active = self
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 10))
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._run, name="stage-profiler", daemon=True)
+        self._sampler.start()
+
+    def stop(self):
+        """샘플링 종료"""
+        global _active
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        if self._switch_interval is not None:
+            sys.setswitchinterval(self._switch_interval)
+            self._switch_interval = None
+        if _active is self:
+            _active = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """현재 스레드의 실행을 name 단계로 귀속 (중첩 가능)"""
+        ident = threading.get_ident()
+        with self._lock:
+            stack = self._threads.setdefault(ident, [])
+            stack.append(name)
+        token = _stage_path.set(_stage_path.get() + (name,))
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.thread_time() - cpu_started
+            _stage_path.reset(token)
+            with self._lock:
+                stack.pop()
+                if not stack:
+                    del self._threads[ident]
+                self.stage_wall[name] = self.stage_wall.get(name, 0.0) + wall
+                self.stage_cpu[name] = self.stage_cpu.get(name, 0.0) + cpu
+                self.stage_calls[name] += 1
+
+    @contextmanager
+    def worker(self, path: Tuple[str, ...]):
+        """다른 스레드의 단계(path)에서 넘겨받은 작업을 현재 스레드에서 실행
+
+        실행 동안 현재 스레드를 그 단계로 샘플링하고, 스레드 CPU 시간을 경로의 모든 단계에 더합니다
+        (같은 스레드의 중첩 단계처럼 바깥 단계의 CPU 시간에도 포함). 호출 수와 wall 시간은 세지 않습니다.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            if ident in self._threads:
+                registered = False
+            else:
+                self._threads[ident] = list(path)
+                registered = True
+        cpu_started = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu_started
+            with self._lock:
+                if registered:
+                    del self._threads[ident]
+                    for name in dict.fromkeys(path):
+                        self.stage_cpu[name] = self.stage_cpu.get(name, 0.0) + cpu
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        frames = sys._current_frames()
+        with self._lock:
+            active = {ident: ";".join(stages) for ident, stages in self._threads.items()}
+
+        for ident, stage_path in active.items():
+            frame = frames.get(ident)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.reverse()
+            self.stacks[f"{stage_path};" + ";".join(labels)] += 1
+            self.stage_samples[stage_path.split(";")[0]] += 1
+
+    def collapsed(self) -> str:
+        """collapsed-stack 형식 (한 줄에 `stage;frame;...;frame count`)"""
+        return "\n".join(f"{stack} {count}" for stack, count in sorted(self.stacks.items())) + "\n"
+
+    def hotspots(self, top: int = 20) -> List[Tuple[str, int, int]]:
+        """상위 핫스팟 목록
+
+        Returns:
+            (함수, self 샘플 수, 누적 샘플 수) 리스트, self 샘플 수 내림차순
+        """
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_counts[frames[-1]] += count
+            for label in set(frames):
+                total_counts[label] += count
+        return [
+            (label, count, total_counts[label])
+            for label, count in self_counts.most_common(top)
+        ]
+
+    def stage_summary(self, articles: int = 0) -> List[Dict[str, float]]:
+        """단계별 wall/CPU 시간 요약 (처리한 조항 수를 알면 조항당 CPU 시간 포함)"""
+        articles = articles or self.articles
+        rows = []
+        for name in sorted(self.stage_wall, key=self.stage_wall.get, reverse=True):
+            row = {
+                "stage": name,
+                "calls": self.stage_calls[name],
+                "wall_seconds": round(self.stage_wall[name], 4),
+                "cpu_seconds": round(self.stage_cpu[name], 4),
+                "samples": self.stage_samples[name],
+            }
+            if articles:
+                row["cpu_ms_per_article"] = round(self.stage_cpu[name] * 1000 / articles, 3)
+            rows.append(row)
+        return rows
+
+    def write(self, directory: str, top: int = 20, articles: int = 0) -> Dict[str, str]:
+        """collapsed-stack 파일과 핫스팟 표 저장
+
+        Returns:
+            저장된 파일 경로 딕셔너리
+        """
+        os.makedirs(directory, exist_ok=True)
+        collapsed_path = os.path.join(directory, "profile.collapsed")
+        hotspots_path = os.path.join(directory, "hotspots.txt")
+
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+
+        total = sum(self.stacks.values()) or 1
+        with open(hotspots_path, "w", encoding="utf-8") as f:
+            f.write(f"{'stage':<24}{'calls':>8}{'wall(s)':>12}{'cpu(s)':>12}{'cpu ms/article':>16}\n")
+            for row in self.stage_summary(articles):
+                f.write(
+                    f"{row['stage']:<24}{row['calls']:>8}{row['wall_seconds']:>12.4f}"
+                    f"{row['cpu_seconds']:>12.4f}{row.get('cpu_ms_per_article', 0):>16.3f}\n"
+                )
+            f.write(f"\n{'self%':>7}{'total%':>8}  function\n")
+            for label, self_count, total_count in self.hotspots(top):
+                f.write(f"{self_count * 100 / total:>6.1f}%{total_count * 100 / total:>7.1f}%  {label}\n")
+
+        return {"collapsed": collapsed_path, "hotspots": hotspots_path}
+
+
+@contextmanager
+def stage_scope(name: str):
+    """활성 프로파일러가 있으면 해당 단계로 귀속, 없으면 아무 것도 하지 않음"""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.stage(name):
+        yield
+
+
+@contextmanager
+def worker_scope():
+    """스레드 풀·호출 스레드 작업을 호출자의 단계로 귀속 (호출자 컨텍스트에서 실행해야 함)
+
+    사용 예:
+        context = contextvars.copy_context()   # 호출자 스레드에서
+        context.run(lambda: ...)               # 작업 스레드에서 worker_scope() 안에서 실행
+    """
+    profiler = _active
+    path = _stage_path.get()
+    if profiler is None or not path:
+        yield
+        return
+    with profiler.worker(path):
+        yield
+
+
+def print_profile_summary(profiler: StageProfiler, top: int = 20, articles: int = 0):
+    """단계 요약과 핫스팟 표를 콘솔에 출력"""
+    articles = articles or profiler.articles
+    console = Console()
+
+    stage_table = Table(title="⏱️ 단계별 CPU 사용량")
+    stage_table.add_column("단계", style="cyan")
+    stage_table.add_column("호출", justify="right")
+    stage_table.add_column("Wall(s)", justify="right", style="yellow")
+    stage_table.add_column("CPU(s)", justify="right", style="green")
+    stage_table.add_column("조항당 CPU(ms)", justify="right", style="magenta")
+    for row in profiler.stage_summary(articles):
+        stage_table.add_row(
+            row["stage"],
+            str(row["calls"]),
+            f"{row['wall_seconds']:.3f}",
+            f"{row['cpu_seconds']:.3f}",
+            f"{row.get('cpu_ms_per_article', 0):.3f}" if articles else "-"
+        )
+    console.print(stage_table)
+
+    total = sum(profiler.stacks.values()) or 1
+    hotspot_table = Table(title=f"🔥 상위 {top}개 핫스팟 (샘플 {total}개)")
+    hotspot_table.add_column("Self %", justify="right", style="red")
+    hotspot_table.add_column("Total %", justify="right", style="yellow")
+    hotspot_table.add_column("함수", style="cyan")
+    for label, self_count, total_count in profiler.hotspots(top):
+        hotspot_table.add_row(
+            f"{self_count * 100 / total:.1f}",
+            f"{total_count * 100 / total:.1f}",
+            label
+        )
+    console.print(hotspot_table)
+
+
+def add_profile_arguments(parser):
+    """CLI에 --profile 관련 옵션 추가"""
+    parser.add_argument("--profile", action="store_true",
+                        help="단계별 CPU 프로파일링 (collapsed-stack 및 핫스팟 표 출력)")
+    parser.add_argument("--profile-dir", default="profiles", help="프로파일 결과 저장 디렉토리")
+    parser.add_argument("--profile-top", type=int, default=20, help="핫스팟 표에 출력할 함수 수")
+
+
+@contextmanager
+def profile_run(args):
+    """--profile 옵션이 켜져 있으면 블록 실행 동안 프로파일링 후 결과 저장
+
+    블록 안에서 profiler.articles에 처리한 조항 수를 설정하면 조항당 CPU 시간이 계산됩니다.
+    """
+    if not getattr(args, "profile", False):
+        yield None
+        return
+
+    profiler = StageProfiler()
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        paths = profiler.write(args.profile_dir, top=args.profile_top)
+        print_profile_summary(profiler, top=args.profile_top)
+        print(f"🔥 프로파일 저장 완료: {paths['collapsed']}, {paths['hotspots']}")
@@ -0,0 +1,358 @@
+"""법령 간 조항 참조 해석기
+
+조항 원문의 "법 제N조제M항에 따라", "「OO법」 제N조", "제N조를 준용한다", "대통령령으로 정하는"
+같은 표현을 파싱해 실제 Article 대상으로 연결합니다.
+
+수집한 모든 문서의 조항을 (법령군, 단계, 조) 키로 색인하는 조인 인덱스를 유지하므로,
+문서가 추가될 때 그 문서의 참조를 한 번씩 조회하고(선형), 아직 들어오지 않은 문서를
+가리키던 참조는 키별로 보관해 두었다가 대상 문서가 들어오는 시점에 연결합니다.
+
+    법령군: 제목에서 " 시행령"/" 시행규칙"과 괄호 부분을 뗀 이름 (자본시장과금융투자업에관한법률)
+    단계:   법률 0, 시행령 1, 시행규칙 2
+"""
+import json
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from models.schemas import RelationType
+
+# 조인 인덱스 저장 경로 (문서 저장 시 점진적으로 갱신, 기본값은 실행 위치와 관계없이 프로젝트의 data/)
+REFERENCE_INDEX_PATH = os.getenv("REFERENCE_INDEX_PATH") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "reference_index.json"
+)
+
+INDEX_VERSION = 1
+
+LAW, DECREE, RULE = 0, 1, 2
+LEVEL_SUFFIXES = (("시행규칙", RULE), ("시행령", DECREE))
+
+# 참조 앞의 한정어 -> 같은 법령군의 단계
+QUALIFIER_LEVELS = {"법": LAW, "이법": LAW, "영": DECREE, "시행령": DECREE, "규칙": RULE, "시행규칙": RULE}
+
+REFERENCE_PATTERN = re.compile(
+    r'(?:(「[^」\n]{1,80}」|(?<![가-힣])(?:같은\s*법|이\s*법|시행규칙|시행령|규칙|법|영))\s*)?'
+    r'제\s*(\d+)\s*조(?:\s*의\s*(\d+))?(?:\s*제\s*(\d+)\s*항)?'
+)
+ARTICLE_NUMBER = re.compile(r'제\s*(\d+)\s*조(?:\s*의\s*(\d+))?')
+PARAGRAPH_MARKS = "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳"
+
+# 하위 법령 위임 표현 (공백 제거한 원문에서 검색)
+DELEGATION_PATTERNS = (
+    (DECREE, re.compile(r'대통령령으로정')),
+    (RULE, re.compile(r'(?:총리령|부령|시행규칙)으로정')),
+)
+
+
+class LawIdentity(NamedTuple):
+    family: str
+    level: int
+
+
+class ArticleReference(NamedTuple):
+    """해석된 조항 간 참조 (그래프의 REFERENCES 간선)"""
+    source_document: str
+    source_article: str
+    target_document: str
+    target_article: str
+    relation: str
+    paragraph: Optional[int] = None
+
+
+# (법령군, 단계, 조 라벨)
+ArticleKey = Tuple[str, int, str]
+
+
+class _Target(NamedTuple):
+    document: str
+    article: str
+    paragraphs: Tuple[int, ...]
+    delegates: Tuple[int, ...]
+
+
+class _Reference(NamedTuple):
+    article: str
+    key: ArticleKey
+    paragraph: Optional[int]
+    relation: str
+
+
+class _Document(NamedTuple):
+    identity: LawIdentity
+    numbers: Dict[str, str]      # 조 라벨 -> 그래프에 저장된 조항 번호
+    articles: List[Tuple]        # (라벨, 조항 번호, 항 번호들, 위임 단계들)
+    references: List[_Reference]
+
+
+def law_identity(title: str) -> LawIdentity:
+    """문서 제목 -> (법령군, 단계)"""
+    name = re.split(r'[(\[]', title, 1)[0]
+    name = re.sub(r'[\s「」]', '', name)
+    for suffix, level in LEVEL_SUFFIXES:
+        if name.endswith(suffix):
+            return LawIdentity(name[:-len(suffix)], level)
+    return LawIdentity(name, LAW)
+
+
+def article_label(article_number: str) -> Optional[str]:
+    """조항 번호 정규화 ("제 5 조의 2 제1항" -> "제5조의2", 번호가 없으면 None)"""
+    match = ARTICLE_NUMBER.search(article_number or "")
+    if match is None:
+        return None
+    number, branch = match.groups()
+    return f"제{int(number)}조" + (f"의{int(branch)}" if branch else "")
+
+
+def _paragraphs(text: str) -> Tuple[int, ...]:
+    return tuple(sorted({PARAGRAPH_MARKS.index(c) + 1 for c in text if c in PARAGRAPH_MARKS}))
+
+
+def _delegates(text: str) -> Tuple[int, ...]:
+    compact = re.sub(r'\s+', '', text)
+    return tuple(level for level, pattern in DELEGATION_PATTERNS if pattern.search(compact))
+
+
+def parse_references(text: str, identity: LawIdentity, own_label: Optional[str] = None) -> List[_Reference]:
+    """조항 원문의 참조 목록 (자기 조항을 가리키는 것은 제외)"""
+    references = []
+    previous = None  # 「」로 마지막에 언급한 법령 ("같은 법" 해석용)
+    for match in REFERENCE_PATTERN.finditer(text):
+        qualifier, number, branch, paragraph = match.groups()
+        label = f"제{int(number)}조" + (f"의{int(branch)}" if branch else "")
+
+        family, level = identity
+        if qualifier is not None:
+            qualifier = re.sub(r'\s+', '', qualifier)
+            if qualifier.startswith("「"):
+                family, level = previous = law_identity(qualifier.strip("「」"))
+            elif qualifier == "같은법":
+                family, level = previous or identity
+            else:
+                level = QUALIFIER_LEVELS[qualifier]
+        if (family, level) == tuple(identity) and label == own_label:
+            continue  # 조항 제목 또는 자기 조항의 다른 항
+
+        # 참조가 걸린 문장의 나머지에서 준용 여부 판단
+        tail_end = text.find(".", match.end())
+        tail = text[match.end():tail_end if tail_end != -1 else len(text)][:80]
+        if "준용" in tail:
+            relation = RelationType.APPLIES_MUTATIS_MUTANDIS.value
+        elif family == identity.family and level < identity.level:
+            relation = RelationType.BASED_ON.value
+        else:
+            relation = RelationType.REFERS_TO.value
+        references.append(_Reference(
+            article=own_label, key=(family, level, label),
+            paragraph=int(paragraph) if paragraph else None, relation=relation
+        ))
+    return references
+
+
+class ReferenceResolver:
+    """문서 간 조항 참조 조인 인덱스
+
+    사용 예:
+        resolver = ReferenceResolver.load()
+        edges = resolver.add_document(document)   # 새로 연결된 참조만 반환
+        resolver.save()
+    """
+
+    def __init__(self):
+        # (법령군, 단계, 조) -> 조항
+        self._articles: Dict[ArticleKey, _Target] = {}
+        # 대상 키 -> 출발 문서 -> 참조 (대상 문서가 아직 없어도 보관)
+        self._incoming: Dict[ArticleKey, Dict[str, List[_Reference]]] = {}
+        # 문서 제목 -> 색인한 조항과 참조
+        self._documents: Dict[str, _Document] = {}
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+
+    def add_document(self, document) -> List[ArticleReference]:
+        """문서의 조항과 참조를 색인하고 새로 연결된 참조 반환
+
+        같은 제목의 문서가 이미 있으면 교체합니다. 반환값에는 이 문서에서 나가는 참조와,
+        이미 색인된 다른 문서에서 이 문서로 들어오는 참조가 모두 포함됩니다
+        (그래프에서 문서를 교체하면 이전 버전 조항의 간선이 함께 지워지므로 다시 연결합니다).
+        """
+        identity = law_identity(document.title)
+        articles = []
+        references = []
+        for entity in document.entities:
+            label = article_label(entity.article_number)
+            text = entity.text
+            if label is None:
+                # 조항 번호를 찾지 못한 개체는 원문 첫머리(조항 제목)에서 번호를 얻음
+                label = article_label(text[:20])
+            if label is None:
+                continue
+            articles.append((label, entity.article_number, _paragraphs(text), _delegates(text)))
+            references.extend(parse_references(text, identity, label))
+        return self._add(document.title, identity, articles, references)
+
+    def _add(self, title: str, identity: LawIdentity, articles: Iterable[Tuple], references: List[_Reference]):
+        self.remove_document(title)
+        keys, references = self._index(title, identity, articles, references)
+
+        edges = self._edges(title, references)
+        for key in keys:
+            for source, refs in self._incoming.get(key, {}).items():
+                if source != title:
+                    edges.extend(self._edges(source, refs))
+        return list(dict.fromkeys(edges))
+
+    def _index(self, title: str, identity: LawIdentity, articles: Iterable[Tuple],
+               references: List[_Reference]) -> Tuple[List[ArticleKey], List[_Reference]]:
+        """문서의 조항·참조를 조인 인덱스에 넣음 (간선은 만들지 않음)
+
+        Returns:
+            (색인한 조항 키, 조항이 있는 참조)
+        """
+        numbers: Dict[str, str] = {}
+        kept = []
+        keys: List[ArticleKey] = []
+        for label, number, paragraphs, delegates in articles:
+            if label in numbers:
+                continue  # 같은 조가 여러 개체로 나뉜 경우 첫 개체로 연결
+            numbers[label] = number
+            kept.append((label, number, tuple(paragraphs), tuple(delegates)))
+            key = (identity.family, identity.level, label)
+            self._articles[key] = _Target(title, number, tuple(paragraphs), tuple(delegates))
+            keys.append(key)
+
+        references = [ref for ref in references if ref.article in numbers]
+        self._documents[title] = _Document(identity, numbers, kept, references)
+        for ref in references:
+            self._incoming.setdefault(ref.key, {}).setdefault(title, []).append(ref)
+        return keys, references
+
+    def remove_document(self, title: str):
+        """문서의 조항과 참조를 색인에서 제거"""
+        entry = self._documents.pop(title, None)
+        if entry is None:
+            return
+        identity, numbers, _, references = entry
+        for label in numbers:
+            key = (identity.family, identity.level, label)
+            if key in self._articles and self._articles[key].document == title:
+                del self._articles[key]
+        for ref in references:
+            sources = self._incoming.get(ref.key)
+            if sources is not None:
+                sources.pop(title, None)
+                if not sources:
+                    del self._incoming[ref.key]
+
+    def _edges(self, source: str, references: List[_Reference]) -> List[ArticleReference]:
+        """참조 -> 간선 (대상이 색인되어 있는 것만)"""
+        identity, numbers, _, _ = self._documents[source]
+        edges = []
+        for ref in references:
+            target = self._articles.get(ref.key)
+            if target is None:
+                continue
+            paragraph = ref.paragraph
+            if paragraph is not None and target.paragraphs and paragraph not in target.paragraphs:
+                paragraph = None  # 없는 항을 가리키면 조 단위로 연결
+            source_article = numbers[ref.article]
+            edges.append(ArticleReference(
+                source, source_article, target.document, target.article, ref.relation, paragraph
+            ))
+            # 상위 법령 조항이 이 단계로 위임했으면 위임 간선도 연결
+            family, level, _ = ref.key
+            if family == identity.family and level < identity.level and identity.level in target.delegates:
+                edges.append(ArticleReference(
+                    target.document, target.article, source, source_article,
+                    RelationType.DELEGATES_TO.value, None
+                ))
+        return edges
+
+    def resolved(self) -> List[ArticleReference]:
+        """색인된 모든 문서의 연결된 참조"""
+        edges = []
+        for title, document in self._documents.items():
+            edges.extend(self._edges(title, document.references))
+        return list(dict.fromkeys(edges))
+
+    def stats(self) -> Dict[str, int]:
+        """문서/조항/참조 수와 대상이 아직 없는 참조 수"""
+        references = sum(len(document.references) for document in self._documents.values())
+        pending = sum(
+            len(refs) for key, sources in self._incoming.items()
+            if key not in self._articles for refs in sources.values()
+        )
+        return {
+            "documents": len(self._documents),
+            "articles": len(self._articles),
+            "references": references,
+            "pending": pending,
+        }
+
+    # ------------------------------------------------------------------
+    # 저장/불러오기
+    # ------------------------------------------------------------------
+
+    def save(self, path: str = REFERENCE_INDEX_PATH) -> str:
+        """색인 저장 (원자적 교체)"""
+        documents = {
+            title: {
+                "family": document.identity.family,
+                "level": document.identity.level,
+                "articles": document.articles,
+                "references": [[ref.article, *ref.key, ref.paragraph, ref.relation] for ref in document.references],
+            }
+            for title, document in self._documents.items()
+        }
+        _opened.pop(os.path.abspath(path), None)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "documents": documents}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        _opened[os.path.abspath(path)] = (os.stat(path).st_mtime_ns, self)
+        return path
+
+    @classmethod
+    def load(cls, path: str = REFERENCE_INDEX_PATH) -> "ReferenceResolver":
+        """저장된 색인 불러오기 (파일이 없으면 빈 색인)
+
+        저장된 조항·참조로 조인 인덱스만 다시 만들고 간선은 해석하지 않으므로 색인 크기에 선형입니다.
+        """
+        resolver = cls()
+        if not path or not os.path.exists(path):
+            return resolver
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+        if state.get("version") != INDEX_VERSION:
+            return resolver
+        for title, entry in state["documents"].items():
+            references = [
+                _Reference(article, (family, level, label), paragraph, relation)
+                for article, family, level, label, paragraph, relation in entry["references"]
+            ]
+            resolver._index(title, LawIdentity(entry["family"], entry["level"]), entry["articles"], references)
+        return resolver
+
+    @classmethod
+    def open(cls, path: str = REFERENCE_INDEX_PATH) -> "ReferenceResolver":
+        """저장된 색인 (이 프로세스에서 마지막으로 불러오거나 저장한 뒤 파일이 그대로면 메모리의 색인 재사용)
+
+        문서를 저장할 때마다 색인 파일 전체를 다시 읽지 않도록 link_article_references에서 사용합니다.
+        다른 프로세스가 파일을 바꿨으면 다시 불러옵니다.
+        """
+        key = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns if os.path.exists(path) else None
+        cached = _opened.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        resolver = cls.load(path)
+        if mtime is not None:
+            _opened[key] = (mtime, resolver)
+        return resolver
+
+
+# 색인 경로 -> (파일 수정 시각, 색인): ReferenceResolver.open 재사용용
+_opened: Dict[str, Tuple[int, ReferenceResolver]] = {}
+
@@ -0,0 +1,99 @@
+"""관계 추출 컨텍스트 선택
+
+관계 추출 프롬프트에 바로 앞 조항 몇 개를 일괄로 넣는 대신, 조항 원문이 실제로 참조하는
+같은 법령 안의 조항(제N조)과 상위 조항(항/호 단위로 나뉜 개체가 속한 조)을 골라
+토큰 예산 안에서 제공합니다. 멀리 떨어진 조항을 참조해도 컨텍스트에 들어가고,
+관련 없는 이웃 조항은 프롬프트에서 빠집니다.
+"""
+import os
+import re
+from typing import Dict, List, Optional, Sequence
+
+from models.schemas import LegalEntity
+from utils.metrics import estimate_tokens
+from utils.reference_resolver import article_label, law_identity, parse_references
+
+# 관계 추출 컨텍스트에 쓸 최대 토큰 수 (조항당)
+RELATION_CONTEXT_TOKENS = int(os.getenv("RELATION_CONTEXT_TOKENS", "120"))
+
+# "제103조제1항제1호"처럼 조 아래 단위를 가리키는 조항 번호
+SUBUNIT_PATTERN = re.compile(r'조(?:\s*의\s*\d+)?\s*제\s*\d+\s*[항호]')
+
+
+def context_line(entity: LegalEntity) -> str:
+    """컨텍스트 한 줄 (조항 번호: 핵심 개념)"""
+    return f"- {entity.article_number}: {entity.concept}"
+
+
+def format_context(context: Optional[Sequence[LegalEntity]]) -> str:
+    """프롬프트에 넣을 컨텍스트 문자열"""
+    return "\n".join(context_line(e) for e in (context or []))
+
+
+def _parents(entities: Sequence[LegalEntity], labels: List[Optional[str]], index: Dict[str, int]) -> List[Optional[int]]:
+    """개체별 상위 조항 위치
+
+    조 아래 단위(제N조제M항 등)로 나뉜 개체는 같은 조의 개체, 조항 번호가 없는 개체는
+    바로 앞의 조 단위 개체를 상위 조항으로 봅니다.
+    """
+    parents: List[Optional[int]] = []
+    last_article = None
+    for i, (entity, label) in enumerate(zip(entities, labels)):
+        if label is None:
+            parents.append(last_article)
+            continue
+        subunit = SUBUNIT_PATTERN.search(entity.article_number) is not None
+        parent = index.get(label) if subunit else None
+        parents.append(parent if parent != i else None)
+        if not subunit:
+            last_article = i
+    return parents
+
+
+def select_relation_contexts(
+    entities: Sequence[LegalEntity],
+    title: str = "",
+    budget: int = None
+) -> List[List[LegalEntity]]:
+    """조항별 관계 추출 컨텍스트 (상위 조항, 원문 참조 순으로 토큰 예산까지)
+
+    Args:
+        entities: 문서의 조항 개체 (순서대로)
+        title: 문서 제목 ("법 제N조", "영 제N조" 같은 한정어를 같은 법령 안에서 해석)
+        budget: 조항당 컨텍스트 토큰 예산 (기본: RELATION_CONTEXT_TOKENS)
+
+    Returns:
+        entities와 같은 길이의 컨텍스트 목록
+    """
+    budget = RELATION_CONTEXT_TOKENS if budget is None else budget
+    identity = law_identity(title)
+    labels = [article_label(entity.article_number) for entity in entities]
+
+    # 조 라벨 -> 개체 위치 (조 단위 개체 우선)
+    index: Dict[str, int] = {}
+    for i, (entity, label) in enumerate(zip(entities, labels)):
+        if label is not None and SUBUNIT_PATTERN.search(entity.article_number) is None:
+            index.setdefault(label, i)
+    for i, label in enumerate(labels):
+        if label is not None:
+            index.setdefault(label, i)
+    parents = _parents(entities, labels, index)
+
+    contexts = []
+    for i, entity in enumerate(entities):
+        candidates = [] if parents[i] is None else [parents[i]]
+        for ref in parse_references(entity.text, identity, labels[i]):
+            family, level, label = ref.key
+            if (family, level) == identity and index.get(label, i) != i:
+                candidates.append(index[label])
+
+        context = []
+        used = 0
+        for j in dict.fromkeys(candidates):
+            tokens = estimate_tokens(context_line(entities[j])) + 1
+            if used + tokens > budget:
+                continue
+            context.append(entities[j])
+            used += tokens
+        contexts.append(context)
+    return contexts
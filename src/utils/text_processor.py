@@ -1,33 +1,72 @@
 import re
-from typing import List
+from typing import List, Tuple
 
+# 조항 제목 앞에 오면 본문 속 참조로 보는 법령 한정어 (법 제3조, 영 제2조, 「신탁법」 제3조, 같은 법 제3조 등)
+# 고정 길이 lookbehind만 쓸 수 있어 한정어마다 붙은 형태와 공백 한 칸 형태를 따로 검사
+ARTICLE_QUALIFIERS = ("[법령」]", "규칙", "같은")
+# 한정어와 "제" 사이에 올 수 있는 같은 줄의 공백 (줄바꿈은 제외: 앞 줄 끝의 "시행령" 등은 한정어가 아님)
+INLINE_SPACE = r"[ \t\xa0]"
+NOT_QUALIFIED = "".join(
+    rf"(?<!{qualifier}제)(?<!{qualifier}{INLINE_SPACE}제)" for qualifier in ARTICLE_QUALIFIERS
+)
+# 괄호 뒤에 이어지면 제목이 아니라 본문 속 참조로 보는 조사와 접속어
+FOLLOWING_PARTICLES = r"(?:에|의|을|를|와|과|은|는|이|가|부터|까지)|\s*(?:및|또는|ㆍ)"
 
-def split_articles(text: str) -> List[str]:
-    """법령 텍스트를 조항별로 분리"""
-    # 제N조, 제N조의N, 제N조제N항 패턴 매칭
-    pattern = r'제\s*\d+\s*조(?:의\s*\d+)?(?:제\s*\d+\s*항)?'
+# 조항 제목: 제N조(제목) 또는 제N조 삭제
+# - "제3조(제2항은 제외한다)"처럼 괄호가 문장으로 끝나거나 조사가 이어지면 본문 속 참조로 봄
+# - 같은 줄에서 바로 앞에 법령 한정어가 있으면 참조로 봄 (clean_text는 조항 제목 앞 줄바꿈을 유지하므로
+#   "가나법 시행령" 다음 줄의 "제1조(목적)"은 제목)
+ARTICLE_HEADER = re.compile(
+    r'제' + NOT_QUALIFIED +
+    r'\s*\d+\s*조(?:\s*의\s*\d+)?'
+    r'(?:\s*\((?![^()]*다\))[^()\n]{1,40}\)(?!' + FOLLOWING_PARTICLES + r')'
+    r'|\s*삭제)'
+)
+
+# 줄 첫머리 조항 제목 앞의 줄바꿈 (clean_text에서 공백으로 합치지 않음)
+HEADER_LINE_BREAK = re.compile(r'\n(?=\s*제\s*\d+\s*조(?:\s*의\s*\d+)?\s*(?:\(|삭제))')
+
+# 제목 형식이 하나도 없는 텍스트용 (이전 방식)
+LOOSE_ARTICLE = re.compile(r'제\s*\d+\s*조(?:의\s*\d+)?(?:제\s*\d+\s*항)?')
+
+
+def article_spans(text: str) -> List[Tuple[int, int]]:
+    """법령 텍스트의 조항별 (시작, 끝) 위치 (앞뒤 공백 제외)
     
+    조항 제목(제N조(제목))에서만 나누고, 본문의 "제N조에 따라" 같은 참조에서는 나누지 않습니다.
+    """
     # 조항 시작 위치 찾기
-    matches = list(re.finditer(pattern, text))
+    matches = list(ARTICLE_HEADER.finditer(text))
+    if not matches:
+        matches = list(LOOSE_ARTICLE.finditer(text))
     
     if not matches:
-        return [text]
+        return [(0, len(text))]
     
-    articles = []
+    spans = []
     for i, match in enumerate(matches):
         start = match.start()
         end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
-        article = text[start:end].strip()
-        if article:
-            articles.append(article)
+        # 조항 시작은 패턴 위치이므로 뒤쪽 공백만 제외
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if end > start:
+            spans.append((start, end))
     
-    return articles
+    return spans
+
+
+def split_articles(text: str) -> List[str]:
+    """법령 텍스트를 조항별로 분리"""
+    return [text[start:end] for start, end in article_spans(text)]
 
 
 def clean_text(text: str) -> str:
-    """텍스트 정제"""
-    # 연속된 공백 제거
-    text = re.sub(r'\s+', ' ', text)
-    # 특수문자 정규화
-    text = text.replace('\xa0', ' ')
-    return text.strip()
+    """텍스트 정제 (조항 제목으로 시작하는 줄의 줄바꿈만 남기고 연속된 공백을 한 칸으로)"""
+    lines = []
+    for line in HEADER_LINE_BREAK.split(text):
+        # 연속된 공백 제거, 특수문자 정규화
+        line = re.sub(r'\s+', ' ', line).replace('\xa0', ' ').strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
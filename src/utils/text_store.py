@@ -0,0 +1,114 @@
+"""내용 주소(content-addressed) 텍스트 저장소
+
+법령 원문을 내용 해시를 키로 한 번만 zlib 압축해 보관하고, 조항 개체와 그래프 노드는
+(해시, 시작, 끝) 참조만 가집니다. 원문은 프롬프트 구성이나 조회처럼 실제로 필요할 때
+압축을 풀어 잘라 씁니다. 같은 문서를 다시 처리해도(버전 교체 등) 같은 해시를 재사용합니다.
+"""
+import hashlib
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from models.schemas import TextRef
+
+# 압축을 풀어 둘 원문 수 (문서 단위)
+TEXT_CACHE_SIZE = int(os.getenv("TEXT_CACHE_SIZE", "4"))
+
+COMPRESSION_LEVEL = 6
+
+
+def text_hash(text: str) -> str:
+    """원문 내용 해시 (blake2b 128비트, 16진수)"""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class TextBlobStore:
+    """압축 원문 저장소
+
+    Args:
+        cache_size: 압축을 풀어 둘 원문 수 (LRU)
+    """
+
+    def __init__(self, cache_size: int = TEXT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._blobs: Dict[str, bytes] = {}
+        self._sizes: Dict[str, int] = {}
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> str:
+        """원문 저장 후 해시 반환 (이미 있으면 압축하지 않음)"""
+        key = text_hash(text)
+        with self._lock:
+            if key not in self._blobs:
+                raw = text.encode("utf-8")
+                self._blobs[key] = zlib.compress(raw, COMPRESSION_LEVEL)
+                self._sizes[key] = len(raw)
+            self._remember(key, text)
+        return key
+
+    def add_compressed(self, key: str, data: bytes):
+        """다른 곳(Memgraph 등)에서 읽은 압축 원문 등록"""
+        with self._lock:
+            if key not in self._blobs:
+                self._blobs[key] = data
+                self._sizes[key] = len(zlib.decompress(data))
+
+    def compressed(self, key: str) -> bytes:
+        """압축된 원문"""
+        return self._blobs[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._blobs
+
+    def get(self, key: str) -> str:
+        """원문 전체 (압축 해제 결과는 LRU 캐시)"""
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+                return text
+            text = zlib.decompress(self._blobs[key]).decode("utf-8")
+            self._remember(key, text)
+            return text
+
+    def slice(self, ref: TextRef) -> str:
+        """참조 구간의 원문"""
+        return self.get(ref.hash)[ref.start:ref.end]
+
+    def refs(self, text: str, spans: Iterable[Tuple[int, int]]) -> List[TextRef]:
+        """원문을 저장하고 구간별 참조 생성"""
+        key = self.put(text)
+        return [TextRef(hash=key, start=start, end=end) for start, end in spans]
+
+    def pack(self, texts: List[str], separator: str = "\n\n") -> List[TextRef]:
+        """여러 원문을 이어 붙여 하나로 저장하고 원문별 참조 생성 (작은 원문끼리 함께 압축)"""
+        if not texts:
+            return []
+        spans = []
+        position = 0
+        for text in texts:
+            spans.append((position, position + len(text)))
+            position += len(text) + len(separator)
+        return self.refs(separator.join(texts), spans)
+
+    def stats(self) -> Dict[str, int]:
+        """저장된 원문 수와 원본/압축 바이트 수"""
+        with self._lock:
+            return {
+                "blobs": len(self._blobs),
+                "raw_bytes": sum(self._sizes.values()),
+                "stored_bytes": sum(len(data) for data in self._blobs.values()),
+            }
+
+    def _remember(self, key: str, text: str):
+        self._cache[key] = text
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# 프로세스 전역 저장소
+text_store = TextBlobStore()
@@ -0,0 +1,5 @@
+"""테스트 공통 설정 (src 모듈을 `python src/main.py`와 같은 경로로 import)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
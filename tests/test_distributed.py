@@ -0,0 +1,192 @@
+"""분산 처리: 워커 재시도 경로와 코디네이터 결과 병합"""
+import contextlib
+import io
+import threading
+
+import pytest
+
+from benchmarks.synthetic_corpus import SyntheticStatuteGenerator
+from chains.entity_extraction_chain import EntityExtractionChain
+from chains.relation_extraction_chain import RelationExtractionChain
+from database import job_queue
+from database.job_queue import SQLiteJobQueue
+from graphs.distributed import ENTITY_JOB, RELATION_JOB, DistributedCoordinator, QueueWorker
+from graphs.legal_graph import LegalKnowledgeGraphWorkflow
+from llm.stub_client import StubLLM
+from utils import article_chunker
+from utils.deadline import CallTimeout
+from utils.metrics import metrics
+from utils.near_duplicate import NearDuplicateIndex
+
+pytestmark = pytest.mark.integration
+
+
+def make_workflow() -> LegalKnowledgeGraphWorkflow:
+    llm = StubLLM()
+    return LegalKnowledgeGraphWorkflow(
+        EntityExtractionChain(llm=llm), RelationExtractionChain(llm=llm),
+        duplicate_index=NearDuplicateIndex(path="")
+    )
+
+
+def make_document(articles: int = 12):
+    return SyntheticStatuteGenerator(seed=0).generate_document(articles)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), max_attempts=2, retry_backoff=0.01)
+
+
+def run_distributed(queue, document, workflow=None, index=None):
+    """워커 하나를 백그라운드에서 돌리며 코디네이터 실행"""
+    worker = QueueWorker(queue, workflow or make_workflow(), worker_id="test")
+    thread = threading.Thread(
+        target=worker.run_forever, kwargs={"idle_timeout": 2, "poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    coordinator = DistributedCoordinator(
+        queue, poll_interval=0.01, duplicate_index=index if index is not None else NearDuplicateIndex(path="")
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = coordinator.run(document, timeout=60)
+    return result, worker
+
+
+def triplet_keys(document):
+    return sorted((t.subject, t.relation, t.object, t.article_number) for t in document.triplets)
+
+
+def indexed_labels(index):
+    return {record.labels[0] for record in index._records if record.labels}
+
+
+def test_coordinator_merge_matches_in_process_workflow(queue):
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = make_workflow().process(make_document())
+    result, worker = run_distributed(queue, make_document())
+
+    assert [e.article_number for e in result.entities] == [e.article_number for e in expected.entities]
+    assert triplet_keys(result) == triplet_keys(expected)
+    assert result.retry_articles == []
+    assert worker.processed[ENTITY_JOB] == len(expected.entities)
+    assert all(entity.text_ref is not None for entity in result.entities)
+
+
+def test_chunked_articles_merge_into_one_entity_per_article(queue, monkeypatch):
+    monkeypatch.setattr(article_chunker, "ARTICLE_CHUNK_TOKENS", 80)
+    result, worker = run_distributed(queue, make_document())
+
+    numbers = [entity.article_number for entity in result.entities]
+    assert len(numbers) == len(set(numbers))
+    chunked = [entity for entity in result.entities if entity.source_units]
+    assert chunked
+    assert worker.processed[ENTITY_JOB] > len(numbers)
+    for entity in chunked:
+        assert "항" not in entity.article_number
+        assert entity.source_units[0].start == 0
+        assert entity.source_units[-1].end == len(entity.text)
+        assert all(a.end <= b.start for a, b in zip(entity.source_units, entity.source_units[1:]))
+    assert {t.article_number for t in result.triplets} <= set(numbers)
+
+
+def test_worker_retries_failed_job_then_completes(queue, monkeypatch):
+    workflow = make_workflow()
+    calls = []
+    extract = workflow.relation_chain.extract
+
+    def flaky(entity, context=None, errors=None):
+        calls.append(entity.article_number)
+        if calls.count(entity.article_number) == 1 and entity.article_number == "제3조":
+            raise RuntimeError("temporary")
+        return extract(entity, context, errors)
+
+    monkeypatch.setattr(workflow.relation_chain, "extract", flaky)
+    retries = metrics.counter_value("kg_retries_total", stage=RELATION_JOB)
+    result, _ = run_distributed(queue, make_document(), workflow)
+
+    assert calls.count("제3조") == 2
+    assert metrics.counter_value("kg_retries_total", stage=RELATION_JOB) == retries + 1
+    assert "제3조" in {t.article_number for t in result.triplets}
+    assert result.retry_articles == []
+
+
+def test_failed_job_is_reported_and_kept_out_of_index(queue, monkeypatch):
+    workflow = make_workflow()
+    extract = workflow.relation_chain.extract
+
+    def timeout_on_third(entity, context=None, errors=None):
+        if entity.article_number == "제3조":
+            raise CallTimeout("stub")
+        return extract(entity, context, errors)
+
+    monkeypatch.setattr(workflow.relation_chain, "extract", timeout_on_third)
+    index = NearDuplicateIndex(path="")
+    result, _ = run_distributed(queue, make_document(), workflow, index)
+
+    assert result.retry_articles == ["제3조"]
+    indexed = indexed_labels(index)
+    assert "제3조" not in indexed
+    assert len(indexed) == len(result.entities) - 1
+
+
+def fail_chunk_view(workflow, monkeypatch, article_number="제5조"):
+    """분할한 조항의 첫 조각만 성공하고 나머지 조각의 관계 추출 호출은 (시간 초과가 아닌) 오류로 실패"""
+    monkeypatch.setattr(article_chunker, "ARTICLE_CHUNK_TOKENS", 80)
+    call = workflow.relation_chain._call
+    calls = []
+
+    def failing(inputs, tier):
+        if inputs["article_number"] == article_number:
+            calls.append(inputs["full_text"])
+            if len(calls) > 1:
+                raise RuntimeError("bad response")
+        return call(inputs, tier)
+
+    monkeypatch.setattr(workflow.relation_chain, "_call", failing)
+    return calls
+
+
+def test_partially_failed_article_is_kept_out_of_index_in_process(monkeypatch):
+    workflow = make_workflow()
+    calls = fail_chunk_view(workflow, monkeypatch)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = workflow.process(make_document())
+
+    assert len(calls) > 1
+    assert "제5조" in {t.article_number for t in result.triplets}
+    indexed = indexed_labels(workflow.duplicate_index)
+    assert "제5조" not in indexed
+    assert len(indexed) == len(result.entities) - 1
+    assert result.retry_articles == []
+
+
+def test_partially_failed_article_is_kept_out_of_index(queue, monkeypatch):
+    workflow = make_workflow()
+    calls = fail_chunk_view(workflow, monkeypatch)
+    index = NearDuplicateIndex(path="")
+    result, _ = run_distributed(queue, make_document(), workflow, index)
+
+    assert len(calls) > 1
+    assert "제5조" in {t.article_number for t in result.triplets}
+    indexed = indexed_labels(index)
+    assert "제5조" not in indexed
+    assert len(indexed) == len(result.entities) - 1
+    assert result.retry_articles == []
+
+
+def test_run_once_returns_false_on_empty_queue(queue):
+    assert not QueueWorker(queue, make_workflow()).run_once()
+
+
+def test_unknown_job_kind_fails_the_job(queue, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(job_queue.time, "time", lambda: clock[0])
+    queue.enqueue("run", "unknown", "000001", {})
+    worker = QueueWorker(queue, make_workflow())
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert worker.run_once()
+        clock[0] += 1
+        assert worker.run_once()
+    assert queue.failures("run") == {"000001": "알 수 없는 작업 종류: unknown"}
+    assert worker.processed["unknown"] == 0
@@ -0,0 +1,132 @@
+"""GraphQueryService / 내장 그래프 주변 부분 그래프 조회 테스트"""
+import pytest
+
+from database import embedded_graph
+from database.embedded_graph import EmbeddedGraphClient
+from database.graph_query import GraphQueryService
+from models.schemas import GraphTriplet, LegalDocument, LegalEntity
+
+pytestmark = pytest.mark.unit
+
+
+def make_document(title, triplets):
+    articles = sorted({article for _, _, _, article in triplets})
+    return LegalDocument(
+        title=title,
+        law_number="1",
+        content="",
+        entities=[LegalEntity(article_number=a, concept=a, full_text=f"{a} 본문") for a in articles],
+        triplets=[GraphTriplet(subject=s, relation=r, object=o, article_number=a) for s, r, o, a in triplets],
+    )
+
+
+def edges(rows):
+    return {(row["subject"], row["relation"], row["object"]) for row in rows}
+
+
+@pytest.fixture
+def client(tmp_path):
+    return EmbeddedGraphClient(path=str(tmp_path / "graph.snapshot"))
+
+
+def test_neighborhood_follows_hops(client):
+    client.save_document(make_document("법A", [
+        ("사업자", "의무", "신고", "제1조"),
+        ("신고", "대상", "장관", "제2조"),
+        ("장관", "권한", "명령", "제3조"),
+    ]))
+    one = edges(client.query_neighborhood("제1조", document="법A", hops=1))
+    two = edges(client.query_neighborhood("제1조", document="법A", hops=2))
+    assert one == {("사업자", "의무", "신고"), ("신고", "대상", "장관")}
+    assert two == one | {("장관", "권한", "명령")}
+
+
+def test_neighborhood_skips_hub_entities(client, monkeypatch):
+    monkeypatch.setattr(embedded_graph, "NEIGHBORHOOD_MAX_DEGREE", 2)
+    client.save_document(make_document("법A", [
+        ("사업자", "준용", "이 법", "제1조"),
+        ("장관", "준용", "이 법", "제2조"),
+        ("법원", "준용", "이 법", "제3조"),
+        ("사업자", "의무", "신고", "제4조"),
+    ]))
+    rows = edges(client.query_neighborhood("제1조", document="법A", hops=2))
+    # 조항 자신의 관계는 항상 포함되고, 허브("이 법")를 거친 다른 조항 관계는 제외
+    assert rows == {("사업자", "준용", "이 법"), ("사업자", "의무", "신고")}
+
+
+def test_neighborhood_ignores_old_versions(client):
+    client.save_document(make_document("법A", [
+        ("사업자", "의무", "신고", "제1조"),
+        ("신고", "대상", "구청장", "제2조"),
+    ]), version="1")
+    client.save_document(make_document("법A", [
+        ("사업자", "의무", "신고", "제1조"),
+        ("신고", "대상", "장관", "제2조"),
+    ]), version="2")
+    rows = edges(client.query_neighborhood("제1조", document="법A", hops=1))
+    assert rows == {("사업자", "의무", "신고"), ("신고", "대상", "장관")}
+
+
+class CountingClient:
+    """호출 횟수를 세는 클라이언트 래퍼"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+
+        def call(*args, **kwargs):
+            self.calls.append(name)
+            return attr(*args, **kwargs)
+        return call
+
+
+def test_article_context_single_round_trip(client):
+    client.save_document(make_document("법A", [("사업자", "의무", "신고", "제1조")]))
+    counting = CountingClient(client)
+    service = GraphQueryService(counting, cache_size=8, version_ttl=60)
+
+    page = service.article_context("제1조", document="법A")
+    assert counting.calls == ["query_article_context"]
+    assert page["article"]["number"] == "제1조"
+    assert edges(page["relations"]) == {("사업자", "의무", "신고")}
+
+    assert service.article_context("제1조", document="법A") == page
+    assert counting.calls == ["query_article_context"]
+
+
+def test_article_context_expired_version_uses_query_stamp(client):
+    client.save_document(make_document("법A", [("사업자", "의무", "신고", "제1조")]))
+    counting = CountingClient(client)
+    service = GraphQueryService(counting, cache_size=8, version_ttl=0)
+
+    service.article_context("제1조", document="법A")
+    client.save_document(make_document("법A", [("사업자", "의무", "보고", "제1조")]), version="9")
+    page = service.article_context("제1조", document="법A")
+    assert counting.calls == ["query_article_context", "query_article_context"]
+    assert edges(page["relations"]) == {("사업자", "의무", "보고")}
+
+
+def test_cached_results_are_copies(client):
+    client.save_document(make_document("법A", [("사업자", "의무", "신고", "제1조")]))
+    service = GraphQueryService(client, cache_size=8, version_ttl=60)
+
+    first = service.article_context("제1조", document="법A")
+    first["relations"].clear()
+    first["article"]["concept"] = "변경"
+    second = service.article_context("제1조", document="법A")
+    assert service.cache_info()["hits"] == 1
+    assert len(second["relations"]) == 1
+    assert second["article"]["concept"] == "제1조"
+
+
+def test_missing_article_is_cached(client):
+    client.save_document(make_document("법A", [("사업자", "의무", "신고", "제1조")]))
+    counting = CountingClient(client)
+    service = GraphQueryService(counting, cache_size=8, version_ttl=60)
+
+    assert service.article("제9조", document="법A") is None
+    assert service.article("제9조", document="법A") is None
+    assert counting.calls.count("query_article") == 1
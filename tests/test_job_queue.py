@@ -0,0 +1,141 @@
+"""SQLiteJobQueue 임대·재시도·멱등 완료"""
+import pytest
+
+from database import job_queue
+from database.job_queue import SQLiteJobQueue
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_queue.time, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return SQLiteJobQueue(str(tmp_path / "queue.sqlite3"), lease_seconds=10, max_attempts=3, retry_backoff=2.0)
+
+
+def test_enqueue_is_idempotent_per_key(queue):
+    assert queue.enqueue("run", "entity", "000001", {"text": "a"})
+    assert not queue.enqueue("run", "entity", "000001", {"text": "b"})
+    assert queue.enqueue_many("run", "entity", [("000001", {}), ("000002", {}), ("000003", {})]) == 2
+    assert queue.counts("run") == {"pending": 3}
+
+
+def test_lease_hides_job_until_lease_expires(queue, clock):
+    queue.enqueue("run", "entity", "000001", {"text": "a"})
+    first = queue.lease("w1")
+    assert first.attempts == 1 and first.payload == {"text": "a"}
+    assert queue.lease("w2") is None
+
+    clock.advance(10.5)
+    second = queue.lease("w2")
+    assert second.id == first.id
+    assert second.attempts == 2
+    assert second.lease_token != first.lease_token
+
+
+def test_extend_lease_keeps_job_leased(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+    job = queue.lease("w1")
+    clock.advance(8)
+    assert queue.extend_lease(job)
+    clock.advance(8)
+    assert queue.lease("w2") is None
+
+
+def test_extend_lease_rejects_stale_token(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+    stale = queue.lease("w1")
+    clock.advance(11)
+    queue.lease("w2")
+    assert not queue.extend_lease(stale)
+
+
+def test_complete_is_idempotent_and_first_result_wins(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+    stale = queue.lease("w1")
+    clock.advance(11)
+    current = queue.lease("w2")
+
+    assert queue.complete(current, {"by": "w2"})
+    assert not queue.complete(stale, {"by": "w1"})
+    assert not queue.complete(current, {"by": "w2-again"})
+    assert queue.results("run", "entity") == {"000001": {"by": "w2"}}
+    assert queue.counts("run") == {"done": 1}
+    assert queue.lease("w3") is None
+
+
+def test_fail_backs_off_exponentially(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+
+    queue.fail(queue.lease("w1"), "first")
+    assert queue.counts("run") == {"pending": 1}
+    clock.advance(0.9)
+    assert queue.lease("w1") is None
+    clock.advance(0.2)
+    second = queue.lease("w1")
+    assert second.attempts == 2
+
+    queue.fail(second, "second")
+    clock.advance(1.5)
+    assert queue.lease("w1") is None
+    clock.advance(0.6)
+    assert queue.lease("w1").attempts == 3
+
+
+def test_fail_marks_failed_after_max_attempts(queue, clock):
+    queue.enqueue("run", "relation", "000001", {})
+    for attempt in range(1, 4):
+        job = queue.lease("w1")
+        assert job.attempts == attempt
+        queue.fail(job, f"error {attempt}")
+        clock.advance(10)
+
+    assert queue.lease("w1") is None
+    assert queue.counts("run", "relation") == {"failed": 1}
+    assert queue.failures("run", "relation") == {"000001": "error 3"}
+
+
+def test_fail_with_stale_token_is_ignored(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+    stale = queue.lease("w1")
+    clock.advance(11)
+    current = queue.lease("w2")
+    queue.fail(stale, "late failure")
+    assert queue.complete(current, ["ok"])
+    assert queue.failures("run") == {}
+
+
+def test_expired_lease_on_last_attempt_counts_as_failed(queue, clock):
+    queue.enqueue("run", "entity", "000001", {})
+    for _ in range(3):
+        queue.lease("w1")
+        clock.advance(11)
+
+    assert queue.lease("w2") is None
+    assert queue.counts("run") == {"failed": 1}
+    assert queue.failures("run") == {"000001": "lease expired"}
+
+
+def test_lease_filters_by_kind(queue):
+    queue.enqueue("run", "entity", "000001", {})
+    queue.enqueue("run", "relation", "000001", {})
+    assert queue.lease("w1", kinds=["relation"]).kind == "relation"
+    assert queue.lease("w1", kinds=["relation"]) is None
+    assert queue.lease("w1").kind == "entity"
@@ -0,0 +1,132 @@
+"""관대한 JSON 파서: 수리 종류별 결과, 조각 입력, 잘린 응답"""
+import json
+
+import pytest
+
+from utils.json_repair import StreamingJsonParser, json_objects, repair_json
+
+pytestmark = pytest.mark.unit
+
+SAMPLE = """```json
+[
+  {
+    "subject": "금융위원회",
+    "relation": "권한을가짐",
+    "object": "인가 취소",
+    "article_number": "제12조",
+    "confidence": 0.95
+  },
+  {
+    "subject": "제12조",
+    "relation": "위임함",
+    "object": "대통령령 \\"세부 기준\\"",
+    "article_number": "제12조",
+    "confidence": 1e-1
+  }
+]
+```"""
+
+REPAIRS = [
+    # (수리 종류, 응답, 복구한 값, 수리 횟수, 끝까지 읽었는지)
+    ("code_fence", '```json\n[{"a": 1}]\n```', [{"a": 1}], {"code_fence": 1}, True),
+    ("prose", 'Here is the result:\n[{"a": 1}]\nHope this helps.', [{"a": 1}], {"prose": 1}, True),
+    ("trailing_comma", '[{"a": 1,}, {"a": 2},]', [{"a": 1}, {"a": 2}], {"trailing_comma": 2}, True),
+    ("extra_comma", '[{"a": 1},, {"a": 2}]', [{"a": 1}, {"a": 2}], {"extra_comma": 1}, True),
+    ("missing_comma", '[{"a": 1} {"a": 2}]', [{"a": 1}, {"a": 2}], {"missing_comma": 1}, True),
+    ("missing_comma_in_object", '{"a": 1 "b": 2}', {"a": 1, "b": 2}, {"missing_comma": 1}, True),
+    ("missing_value", '{"a": , "b": 2}', {"b": 2}, {"missing_value": 1}, True),
+    ("unquoted_key", '{a: 1}', {"a": 1}, {"unquoted_key": 1}, True),
+    ("unquoted_value", '{"a": yes}', {"a": "yes"}, {"unquoted_value": 1}, True),
+    ("python_literal", '{"a": True, "b": None}', {"a": True, "b": None}, {"python_literal": 2}, True),
+    ("single_quotes", "{'a': 'x'}", {"a": "x"}, {"single_quotes": 2}, True),
+    ("unescaped_quote", '{"a": "say "hi" now"}', {"a": 'say "hi" now'}, {"unescaped_quote": 1}, True),
+    ("invalid_escape", '{"a": "C:\\path"}', {"a": "C:\\path"}, {"invalid_escape": 1}, True),
+    ("comment", '[\n// note\n{"a": 1}]', [{"a": 1}], {"comment": 1}, True),
+    ("mismatched_bracket", '[{"a": 1]', [{"a": 1}], {"mismatched_bracket": 1}, True),
+    ("multiple_values", '{"a": 1}\n{"b": 2}', [{"a": 1}, {"b": 2}], {"multiple_values": 1}, True),
+    ("truncated", '[{"a": 1}, {"a": 2, "b": "x', [{"a": 1}, {"a": 2}], {"truncated": 1}, False),
+    ("truncated_number", '{"a": "x", "confidence": 0.9', {"a": "x"}, {"truncated": 1}, False),
+    (
+        "docstring_example", '```json\n[{"a": 1,}, {"a": 2\n', [{"a": 1}, {"a": 2}],
+        {"code_fence": 1, "trailing_comma": 1, "truncated": 1}, False
+    ),
+    ("invalid", '{"a": 1, "b": 2, :}', {"a": 1, "b": 2}, {"truncated": 1, "invalid": 1}, False),
+    ("no_json", "죄송합니다. 답할 수 없습니다.", None, {"prose": 1}, True),
+    ("valid", '{"a": [1, 2.5, -3e2, true, false, null, "x"]}', {"a": [1, 2.5, -300.0, True, False, None, "x"]}, {},
+     True),
+]
+
+
+@pytest.mark.parametrize("kind,text,value,repairs,complete", REPAIRS, ids=[case[0] for case in REPAIRS])
+def test_repair_kinds(kind, text, value, repairs, complete):
+    result = repair_json(text)
+    assert result.value == value
+    assert result.repairs == repairs
+    assert result.complete is complete
+
+
+@pytest.mark.parametrize("kind,text,value,repairs,complete", REPAIRS, ids=[case[0] for case in REPAIRS])
+def test_streaming_parser_matches_repair_json(kind, text, value, repairs, complete):
+    result = StreamingJsonParser().feed(text).close()
+    assert result.value == value
+    assert result.complete is complete
+    # repair_json은 코드 펜스만 두른 올바른 JSON을 json.loads로 바로 읽음 (수리 종류 동일)
+    assert result.repairs == repairs
+
+
+def whole(text: str):
+    return StreamingJsonParser().feed(text).close()
+
+
+@pytest.mark.parametrize("text", [SAMPLE] + [case[1] for case in REPAIRS], ids=["sample"] + [case[0] for case in REPAIRS])
+def test_feed_at_every_split_matches_whole(text):
+    expected = whole(text)
+    for k in range(len(text) + 1):
+        assert StreamingJsonParser().feed(text[:k]).feed(text[k:]).close() == expected, k
+
+
+@pytest.mark.parametrize("text", [SAMPLE] + [case[1] for case in REPAIRS], ids=["sample"] + [case[0] for case in REPAIRS])
+def test_feed_char_by_char_matches_whole(text):
+    parser = StreamingJsonParser()
+    for ch in text:
+        parser.feed(ch)
+    assert parser.close() == whole(text)
+
+
+def is_prefix(partial, full) -> bool:
+    """잘린 결과가 전체 결과의 접두부인지 (마지막 값만 빠지거나 덜 채워질 수 있음)"""
+    if isinstance(full, dict):
+        return isinstance(partial, dict) and all(k in full and is_prefix(v, full[k]) for k, v in partial.items()) \
+            and list(partial) == list(full)[:len(partial)]
+    if isinstance(full, list):
+        return isinstance(partial, list) and len(partial) <= len(full) \
+            and all(p == f for p, f in zip(partial[:-1], full)) \
+            and (not partial or is_prefix(partial[-1], full[len(partial) - 1]))
+    return partial == full
+
+
+def test_truncation_at_every_offset_yields_prefix():
+    full = repair_json(SAMPLE)
+    assert full.complete and full.value == json.loads(SAMPLE.strip("`").removeprefix("json"))
+    for k in range(len(SAMPLE)):
+        result = repair_json(SAMPLE[:k])
+        if result.value is None:
+            assert "[" not in SAMPLE[:k], k
+            continue
+        assert is_prefix(result.value, full.value), (k, result.value)
+        if k < SAMPLE.rindex("]"):
+            assert not result.complete and "truncated" in result.repairs, k
+
+
+def test_truncation_never_keeps_partial_scalars():
+    for k in range(len(SAMPLE)):
+        for item in json_objects(repair_json(SAMPLE[:k]).value):
+            assert item.get("confidence") in (None, 0.95, 0.1), (k, item)
+            assert item.get("object") in (None, "인가 취소", '대통령령 "세부 기준"'), (k, item)
+
+
+def test_json_objects_unwraps_wrappers():
+    assert json_objects({"triplets": [{"a": 1}, {"a": 2}]}) == [{"a": 1}, {"a": 2}]
+    assert json_objects([[{"a": 1}], {"a": 2}, 3]) == [{"a": 1}, {"a": 2}]
+    assert json_objects({"a": 1}) == [{"a": 1}]
+    assert json_objects("text") == []
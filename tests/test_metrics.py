@@ -0,0 +1,31 @@
+"""LLM 메트릭 콜백: 호출·캐시 적중 집계"""
+import pytest
+from langchain_core.caches import InMemoryCache
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from utils.metrics import LLMMetricsCallback, MetricsRecorder
+
+pytestmark = pytest.mark.unit
+
+
+def test_cache_hits_are_counted_separately_from_calls():
+    recorder = MetricsRecorder()
+    llm = FakeListChatModel(responses=["[]", "[]"], cache=InMemoryCache())
+    callback = LLMMetricsCallback("relation", recorder)
+
+    for _ in range(3):
+        llm.invoke("제1조", config={"callbacks": [callback]})
+
+    assert recorder.counter_value("kg_llm_calls_total", chain="relation") == 1
+    assert recorder.counter_value("kg_llm_cache_hits_total", chain="relation") == 2
+
+
+def test_calls_without_cache_are_not_hits():
+    recorder = MetricsRecorder()
+    llm = FakeListChatModel(responses=["[]"])
+    callback = LLMMetricsCallback("entity", recorder)
+
+    llm.invoke("제1조", config={"callbacks": [callback]})
+
+    assert recorder.counter_value("kg_llm_calls_total", chain="entity") == 1
+    assert recorder.counter_value("kg_llm_cache_hits_total", chain="entity") == 0
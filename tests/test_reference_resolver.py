@@ -0,0 +1,70 @@
+"""조항 참조 조인 인덱스: 저장/불러오기"""
+import os
+
+import pytest
+
+from models.schemas import LegalDocument, LegalEntity
+from utils.reference_resolver import ReferenceResolver
+
+pytestmark = pytest.mark.unit
+
+
+def make_document(title, articles):
+    return LegalDocument(
+        title=title, law_number="1", content="",
+        entities=[LegalEntity(article_number=number, concept=number, full_text=text) for number, text in articles],
+    )
+
+
+LAW = make_document("가나법", [
+    ("제1조", "제1조(목적) 이 법은 가나에 관한 사항을 정한다."),
+    ("제3조", "제3조(신고) 사업자는 대통령령으로 정하는 바에 따라 신고하여야 한다."),
+])
+DECREE = make_document("가나법 시행령", [
+    ("제2조", "제2조(신고 절차) 법 제3조에 따른 신고는 서면으로 한다."),
+])
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "reference_index.json")
+
+
+def test_load_restores_index_without_resolving_edges(path, monkeypatch):
+    resolver = ReferenceResolver()
+    resolver.add_document(DECREE)
+    resolver.add_document(LAW)
+    resolver.save(path)
+
+    monkeypatch.setattr(ReferenceResolver, "_edges", lambda *args: pytest.fail("load resolved edges"))
+    loaded = ReferenceResolver.load(path)
+    monkeypatch.undo()
+
+    assert loaded.stats() == resolver.stats()
+    assert loaded.resolved() == resolver.resolved()
+    assert loaded.resolved()
+
+
+def test_loaded_index_links_later_documents(path):
+    resolver = ReferenceResolver()
+    resolver.add_document(DECREE)
+    resolver.save(path)
+
+    edges = ReferenceResolver.load(path).add_document(LAW)
+    assert ("가나법 시행령", "제2조", "가나법", "제3조") in {edge[:4] for edge in edges}
+
+
+def test_open_reuses_index_until_file_changes(path):
+    resolver = ReferenceResolver()
+    resolver.add_document(LAW)
+    resolver.save(path)
+
+    assert ReferenceResolver.open(path) is resolver
+
+    other = ReferenceResolver()
+    other.add_document(DECREE)
+    other.save(path + ".other")
+    os.replace(path + ".other", path)
+    reopened = ReferenceResolver.open(path)
+    assert reopened is not resolver
+    assert reopened.stats()["documents"] == 1
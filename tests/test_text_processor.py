@@ -0,0 +1,30 @@
+"""조항 분리: 제목과 본문 속 참조 구분"""
+import pytest
+
+from utils.text_processor import clean_text, split_articles
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("제1조(목적) 이 법은 정한다. 제2조(정의) 용어는 같다.", ["제1조", "제2조"]),
+    ("제1조(목적) 법 제3조(정의)에 따른다. 제2조 삭제", ["제1조", "제2조"]),
+    ("제1조(목적) 「신탁법」 제3조(신탁의 방법)를 준용한다. 제2조(정의) 같다.", ["제1조", "제2조"]),
+    ("제1조(목적) 같은 법 제3조(정의) 및 제4조에 따른다. 제2조(정의) 같다.", ["제1조", "제2조"]),
+    ("제1조(목적) 제3조(제2항은 제외한다)를 준용한다. 제2조(정의) 같다.", ["제1조", "제2조"]),
+    ("제1조(목적) 영 제3조(정의)의 규정. 시행규칙 제4조(서식)는 별지. 제2조(정의)", ["제1조", "제2조"]),
+])
+def test_split_articles_ignores_inline_references(text, expected):
+    assert [article.split("(")[0].split(" ")[0] for article in split_articles(text)] == expected
+
+
+@pytest.mark.parametrize("title", ["가나법", "가나법 시행령", "가나법 시행규칙", "「가나법」"])
+def test_header_after_title_line_is_kept_after_clean_text(title):
+    raw = f"{title}\n\n제1조(목적) 이 법은\n  정한다.\n제2조(정의)\xa0용어는 같다.\n"
+    articles = split_articles(clean_text(raw))
+    assert articles == ["제1조(목적) 이 법은 정한다.", "제2조(정의) 용어는 같다."]
+
+
+def test_clean_text_collapses_whitespace_but_keeps_header_breaks():
+    raw = "  제1조(목적)  이 법은\n\n 가나법\n제3조에 따른다.\n\n  제2조 삭제 "
+    assert clean_text(raw) == "제1조(목적) 이 법은 가나법 제3조에 따른다.\n제2조 삭제"